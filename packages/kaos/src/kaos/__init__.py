@@ -4,8 +4,11 @@ import contextvars
 from collections.abc import AsyncGenerator, AsyncIterator, Iterable, Mapping
 from dataclasses import dataclass
 from pathlib import PurePath
+from stat import S_ISDIR, S_ISREG
 from typing import TYPE_CHECKING, Literal, Protocol, runtime_checkable
 
+from kaos._lines import READ_CHUNK_SIZE as READ_CHUNK_SIZE
+
 if TYPE_CHECKING:
     from asyncio import StreamReader, StreamWriter
 
@@ -170,8 +173,26 @@ class Kaos(Protocol):
         """Search for files/directories matching a pattern in the given path."""
         ...
 
-    async def readbytes(self, path: StrOrKaosPath, n: int | None = None) -> bytes:
-        """Read the entire file contents as bytes, or the first n bytes if provided."""
+    async def scandir(self, path: StrOrKaosPath) -> list[DirEntry]:
+        """List the entries in a directory, stat-ed in the same batch."""
+        ...
+
+    async def globstat(
+        self, path: StrOrKaosPath, pattern: str, *, case_sensitive: bool = True
+    ) -> list[DirEntry]:
+        """Like `glob`, with every match stat-ed in the same batch."""
+        ...
+
+    async def readbytes(
+        self, path: StrOrKaosPath, n: int | None = None, *, offset: int = 0
+    ) -> bytes:
+        """Read the file contents from `offset` as bytes, all of them or the first n if provided."""
+        ...
+
+    def readchunks(
+        self, path: StrOrKaosPath, *, offset: int = 0, chunk_size: int = READ_CHUNK_SIZE
+    ) -> AsyncGenerator[bytes]:
+        """Read the file from `offset` on in chunks of up to `chunk_size`, from one open handle."""
         ...
 
     async def readtext(
@@ -194,6 +215,16 @@ class Kaos(Protocol):
         """Iterate over the lines of the file."""
         ...
 
+    def readlines_reverse(
+        self,
+        path: StrOrKaosPath,
+        *,
+        encoding: str = "utf-8",
+        errors: Literal["strict", "ignore", "replace"] = "strict",
+    ) -> AsyncGenerator[str]:
+        """Iterate over the lines of the file from the last to the first, reading from the end."""
+        ...
+
     async def writebytes(self, path: StrOrKaosPath, data: bytes) -> int:
         """Write bytes data to the file."""
         ...
@@ -244,6 +275,29 @@ class StatResult:
     st_ctime: float
 
 
+@dataclass
+class DirEntry:
+    """KAOS directory entry data class, returned by `scandir` and `globstat`."""
+
+    path: KaosPath
+    stat: StatResult | None
+    """The stat result following symlinks, or None if it failed (e.g. for a broken symlink)."""
+    symlink: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def is_symlink(self) -> bool:
+        return self.symlink
+
+    def is_dir(self) -> bool:
+        return self.stat is not None and S_ISDIR(self.stat.st_mode)
+
+    def is_file(self) -> bool:
+        return self.stat is not None and S_ISREG(self.stat.st_mode)
+
+
 def get_current_kaos() -> Kaos:
     """Get the current KAOS instance."""
     from kaos._current import current_kaos
@@ -299,8 +353,18 @@ def glob(
     return get_current_kaos().glob(path, pattern, case_sensitive=case_sensitive)
 
 
-async def readbytes(path: StrOrKaosPath, n: int | None = None) -> bytes:
-    return await get_current_kaos().readbytes(path, n=n)
+async def scandir(path: StrOrKaosPath) -> list[DirEntry]:
+    return await get_current_kaos().scandir(path)
+
+
+async def globstat(
+    path: StrOrKaosPath, pattern: str, *, case_sensitive: bool = True
+) -> list[DirEntry]:
+    return await get_current_kaos().globstat(path, pattern, case_sensitive=case_sensitive)
+
+
+async def readbytes(path: StrOrKaosPath, n: int | None = None, *, offset: int = 0) -> bytes:
+    return await get_current_kaos().readbytes(path, n=n, offset=offset)
 
 
 async def readtext(
@@ -321,6 +385,21 @@ def readlines(
     return get_current_kaos().readlines(path, encoding=encoding, errors=errors)
 
 
+def readchunks(
+    path: StrOrKaosPath, *, offset: int = 0, chunk_size: int = READ_CHUNK_SIZE
+) -> AsyncGenerator[bytes]:
+    return get_current_kaos().readchunks(path, offset=offset, chunk_size=chunk_size)
+
+
+def readlines_reverse(
+    path: StrOrKaosPath,
+    *,
+    encoding: str = "utf-8",
+    errors: Literal["strict", "ignore", "replace"] = "strict",
+) -> AsyncGenerator[str]:
+    return get_current_kaos().readlines_reverse(path, encoding=encoding, errors=errors)
+
+
 async def writebytes(path: StrOrKaosPath, data: bytes) -> int:
     return await get_current_kaos().writebytes(path, data)
 
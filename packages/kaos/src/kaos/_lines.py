@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import codecs
+import io
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+
+READ_CHUNK_SIZE = 256 << 10  # 256KiB
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], *, encoding: str, errors: str
+) -> AsyncGenerator[str]:
+    """
+    Decode byte chunks into lines like a file opened in text mode.
+
+    Newlines are translated to `\\n` and kept at the end of each line; the last line may have
+    none.
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding)(errors=errors), translate=True
+    )
+    pending = ""
+    async for data in chunks:
+        lines = (pending + decoder.decode(data)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    lines = (pending + decoder.decode(b"", final=True)).split("\n")
+    pending = lines.pop()
+    for line in lines:
+        yield line + "\n"
+    if pending:
+        yield pending
+
+
+async def iter_lines_reverse(
+    read_at: Callable[[int, int], Awaitable[bytes]],
+    size: int,
+    *,
+    encoding: str,
+    errors: str,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> AsyncGenerator[str]:
+    """
+    Yield the lines of a file from the last to the first, reading it backwards in chunks.
+
+    `read_at(offset, n)` returns `n` bytes from `offset`. Lines are split at `\\n` (`\\r\\n`
+    becomes `\\n`), so `encoding` must be ASCII-compatible; see `is_ascii_compatible`.
+    """
+    pos = size
+    pending = b""  # start of the line whose end has been read but not its beginning yet
+    at_eof = True
+    while pos > 0:
+        n = min(chunk_size, pos)
+        pos -= n
+        parts = (await read_at(pos, n) + pending).split(b"\n")
+        pending = parts[0]
+        for part in reversed(parts[1:]):
+            if line := _decode_line(part, encoding, errors, last=at_eof):
+                yield line
+            at_eof = False
+    if line := _decode_line(pending, encoding, errors, last=at_eof):
+        yield line
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    """Whether `\\n` is a single `0x0a` byte in `encoding`, as `iter_lines_reverse` requires."""
+    try:
+        return "\n".encode(encoding) == b"\n"
+    except LookupError:
+        return False
+
+
+def _decode_line(data: bytes, encoding: str, errors: str, *, last: bool) -> str:
+    if data.endswith(b"\r"):
+        return data[:-1].decode(encoding, errors) + "\n"
+    if last:
+        # The text after the final newline, empty if the file ends with one
+        return data.decode(encoding, errors)
+    return data.decode(encoding, errors) + "\n"
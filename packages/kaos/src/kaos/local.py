@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+import stat
 from asyncio.subprocess import Process as AsyncioProcess
 from collections.abc import AsyncGenerator
 from pathlib import Path, PurePath
@@ -19,7 +20,16 @@ from collections.abc import Mapping
 import aiofiles
 import aiofiles.os
 
-from kaos import AsyncReadable, AsyncWritable, Kaos, KaosProcess, StatResult, StrOrKaosPath
+from kaos import (
+    AsyncReadable,
+    AsyncWritable,
+    DirEntry,
+    Kaos,
+    KaosProcess,
+    StatResult,
+    StrOrKaosPath,
+)
+from kaos._lines import READ_CHUNK_SIZE, is_ascii_compatible, iter_lines_reverse
 from kaos.path import KaosPath
 
 if TYPE_CHECKING:
@@ -80,18 +90,7 @@ class LocalKaos:
     async def stat(self, path: StrOrKaosPath, *, follow_symlinks: bool = True) -> StatResult:
         local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
         st = await aiofiles.os.stat(local_path, follow_symlinks=follow_symlinks)
-        return StatResult(
-            st_mode=st.st_mode,
-            st_ino=st.st_ino,
-            st_dev=st.st_dev,
-            st_nlink=st.st_nlink,
-            st_uid=st.st_uid,
-            st_gid=st.st_gid,
-            st_size=st.st_size,
-            st_atime=st.st_atime,
-            st_mtime=st.st_mtime,
-            st_ctime=st.st_ctime if os.name != "nt" else st.st_birthtime,
-        )
+        return _stat_result(st)
 
     async def iterdir(self, path: StrOrKaosPath) -> AsyncGenerator[KaosPath]:
         local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
@@ -108,11 +107,58 @@ class LocalKaos:
         for entry in entries:
             yield KaosPath.unsafe_from_local_path(entry)
 
-    async def readbytes(self, path: StrOrKaosPath, n: int | None = None) -> bytes:
+    async def scandir(self, path: StrOrKaosPath) -> list[DirEntry]:
+        local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
+
+        def _scan() -> list[DirEntry]:
+            entries: list[DirEntry] = []
+            with os.scandir(local_path) as it:
+                for entry in it:
+                    try:
+                        st = _stat_result(entry.stat())
+                    except OSError:
+                        st = None
+                    entries.append(
+                        DirEntry(
+                            KaosPath.unsafe_from_local_path(local_path / entry.name),
+                            st,
+                            entry.is_symlink(),
+                        )
+                    )
+            return entries
+
+        return await asyncio.to_thread(_scan)
+
+    async def globstat(
+        self, path: StrOrKaosPath, pattern: str, *, case_sensitive: bool = True
+    ) -> list[DirEntry]:
+        local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
+        return await asyncio.to_thread(
+            lambda: [
+                _path_entry(match)
+                for match in local_path.glob(pattern, case_sensitive=case_sensitive)
+            ]
+        )
+
+    async def readbytes(
+        self, path: StrOrKaosPath, n: int | None = None, *, offset: int = 0
+    ) -> bytes:
         local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
         async with aiofiles.open(local_path, mode="rb") as f:
+            if offset:
+                await f.seek(offset)
             return await f.read() if n is None else await f.read(n)
 
+    async def readchunks(
+        self, path: StrOrKaosPath, *, offset: int = 0, chunk_size: int = READ_CHUNK_SIZE
+    ) -> AsyncGenerator[bytes]:
+        local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
+        async with aiofiles.open(local_path, mode="rb") as f:
+            if offset:
+                await f.seek(offset)
+            while data := await f.read(chunk_size):
+                yield data
+
     async def readtext(
         self,
         path: str | KaosPath,
@@ -136,6 +182,29 @@ class LocalKaos:
             async for line in f:
                 yield line
 
+    async def readlines_reverse(
+        self,
+        path: str | KaosPath,
+        *,
+        encoding: str = "utf-8",
+        errors: Literal["strict", "ignore", "replace"] = "strict",
+    ) -> AsyncGenerator[str]:
+        local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
+        if not is_ascii_compatible(encoding):
+            text = await self.readtext(str(local_path), encoding=encoding, errors=errors)
+            for line in reversed(text.splitlines(keepends=True)):
+                yield line
+            return
+        async with aiofiles.open(local_path, mode="rb") as f:
+
+            async def _read_at(offset: int, n: int) -> bytes:
+                await f.seek(offset)
+                return await f.read(n)
+
+            size = (await aiofiles.os.stat(local_path)).st_size
+            async for line in iter_lines_reverse(_read_at, size, encoding=encoding, errors=errors):
+                yield line
+
     async def writebytes(self, path: StrOrKaosPath, data: bytes) -> int:
         local_path = path.unsafe_to_local_path() if isinstance(path, KaosPath) else Path(path)
         async with aiofiles.open(local_path, mode="wb") as f:
@@ -176,5 +245,31 @@ class LocalKaos:
         return self.Process(process)
 
 
+def _stat_result(st: os.stat_result) -> StatResult:
+    return StatResult(
+        st_mode=st.st_mode,
+        st_ino=st.st_ino,
+        st_dev=st.st_dev,
+        st_nlink=st.st_nlink,
+        st_uid=st.st_uid,
+        st_gid=st.st_gid,
+        st_size=st.st_size,
+        st_atime=st.st_atime,
+        st_mtime=st.st_mtime,
+        st_ctime=st.st_ctime if os.name != "nt" else st.st_birthtime,
+    )
+
+
+def _path_entry(path: Path) -> DirEntry:
+    kaos_path = KaosPath.unsafe_from_local_path(path)
+    try:
+        st = path.lstat()
+        if not stat.S_ISLNK(st.st_mode):
+            return DirEntry(kaos_path, _stat_result(st))
+        return DirEntry(kaos_path, _stat_result(path.stat()), symlink=True)
+    except OSError:
+        return DirEntry(kaos_path, None, symlink=path.is_symlink())
+
+
 local_kaos = LocalKaos()
 """The default local KAOS instance."""
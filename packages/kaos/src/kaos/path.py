@@ -6,6 +6,7 @@ from stat import S_ISDIR, S_ISREG
 from typing import Any, Literal
 
 import kaos
+from kaos._lines import READ_CHUNK_SIZE
 
 
 class KaosPath:
@@ -154,9 +155,23 @@ class KaosPath:
         """Return all paths matching the pattern under this directory."""
         return kaos.glob(self, pattern, case_sensitive=case_sensitive)
 
-    async def read_bytes(self, n: int | None = None) -> bytes:
-        """Read the entire file contents as bytes, or the first n bytes if provided."""
-        return await kaos.readbytes(self, n=n)
+    async def scandir(self) -> list[kaos.DirEntry]:
+        """Return the direct children of the directory with their stat results."""
+        return await kaos.scandir(self)
+
+    async def globstat(self, pattern: str, *, case_sensitive: bool = True) -> list[kaos.DirEntry]:
+        """Return all entries matching the pattern under this directory, with stat results."""
+        return await kaos.globstat(self, pattern, case_sensitive=case_sensitive)
+
+    async def read_bytes(self, n: int | None = None, *, offset: int = 0) -> bytes:
+        """Read the file contents from `offset` as bytes, all of them or the first n if provided."""
+        return await kaos.readbytes(self, n=n, offset=offset)
+
+    def read_chunks(
+        self, *, offset: int = 0, chunk_size: int = READ_CHUNK_SIZE
+    ) -> AsyncGenerator[bytes]:
+        """Read the file from `offset` on in chunks of up to `chunk_size`, from one open handle."""
+        return kaos.readchunks(self, offset=offset, chunk_size=chunk_size)
 
     async def read_text(
         self,
@@ -176,6 +191,15 @@ class KaosPath:
         """Iterate over the lines of the file."""
         return kaos.readlines(self, encoding=encoding, errors=errors)
 
+    def read_lines_reverse(
+        self,
+        *,
+        encoding: str = "utf-8",
+        errors: Literal["strict", "ignore", "replace"] = "strict",
+    ) -> AsyncGenerator[str]:
+        """Iterate over the lines of the file from the last to the first."""
+        return kaos.readlines_reverse(self, encoding=encoding, errors=errors)
+
     async def write_bytes(self, data: bytes) -> int:
         """Write bytes data to the file."""
         return await kaos.writebytes(self, data)
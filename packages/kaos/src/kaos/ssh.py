@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import posixpath
 import shlex
 import stat
 from collections.abc import AsyncGenerator, Mapping
 from pathlib import PurePath, PurePosixPath
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, cast
 
 import asyncssh
 from asyncssh.constants import (
@@ -18,7 +19,16 @@ from asyncssh.constants import (
     FILEXFER_TYPE_SYMLINK,
 )
 
-from kaos import AsyncReadable, AsyncWritable, Kaos, KaosProcess, StatResult, StrOrKaosPath
+from kaos import (
+    AsyncReadable,
+    AsyncWritable,
+    DirEntry,
+    Kaos,
+    KaosProcess,
+    StatResult,
+    StrOrKaosPath,
+)
+from kaos._lines import READ_CHUNK_SIZE, is_ascii_compatible, iter_lines, iter_lines_reverse
 from kaos.path import KaosPath
 
 if TYPE_CHECKING:
@@ -58,6 +68,41 @@ def _sec_with_nanos(sec: int, ns: int | None) -> float:
     return float(sec) + (ns / 1_000_000_000.0)
 
 
+async def _read_chunks(
+    f: asyncssh.SFTPClientFile, *, offset: int = 0, chunk_size: int = READ_CHUNK_SIZE
+) -> AsyncGenerator[bytes]:
+    """Read `f` in chunks, requesting the next chunk while the current one is consumed."""
+    pending = asyncio.ensure_future(_read_at(f, offset, chunk_size))
+    try:
+        while data := await pending:
+            offset += len(data)
+            pending = asyncio.ensure_future(_read_at(f, offset, chunk_size))
+            yield data
+    finally:
+        # The consumer may stop early; do not download further.
+        pending.cancel()
+
+
+async def _read_at(f: asyncssh.SFTPClientFile, offset: int, n: int) -> bytes:
+    # Reads larger than the SFTP block size are split into parallel requests by asyncssh.
+    return cast(bytes, await f.read(n, offset))
+
+
+def _stat_result(attrs: asyncssh.SFTPAttrs) -> StatResult:
+    return StatResult(
+        st_mode=_build_st_mode(attrs),
+        st_uid=attrs.uid or 0,
+        st_gid=attrs.gid or 0,
+        st_size=attrs.size or 0,
+        st_atime=_sec_with_nanos(attrs.atime or 0, attrs.atime_ns),
+        st_mtime=_sec_with_nanos(attrs.mtime or 0, attrs.mtime_ns),
+        st_ctime=_sec_with_nanos(attrs.ctime or 0, attrs.ctime_ns),
+        st_ino=0,  # sftp does not support ino
+        st_dev=0,  # sftp does not support dev
+        st_nlink=attrs.nlink or 0,
+    )
+
+
 class SSHKaos:
     """
     A KAOS implementation that interacts with a remote machine via SSH and SFTP.
@@ -183,18 +228,7 @@ class SSHKaos:
         except asyncssh.SFTPError as e:
             raise OSError from e
 
-        return StatResult(
-            st_mode=_build_st_mode(st),
-            st_uid=st.uid or 0,
-            st_gid=st.gid or 0,
-            st_size=st.size or 0,
-            st_atime=_sec_with_nanos(st.atime or 0, st.atime_ns),
-            st_mtime=_sec_with_nanos(st.mtime or 0, st.mtime_ns),
-            st_ctime=_sec_with_nanos(st.ctime or 0, st.ctime_ns),
-            st_ino=0,  # sftp does not support ino
-            st_dev=0,  # sftp does not support dev
-            st_nlink=st.nlink or 0,
-        )
+        return _stat_result(st)
 
     async def iterdir(self, path: StrOrKaosPath) -> AsyncGenerator[KaosPath]:
         kaos_path = KaosPath(path) if isinstance(path, str) else path
@@ -217,9 +251,57 @@ class SSHKaos:
         for entry in await self._sftp.glob(f"{real_path}/{pattern}"):
             yield KaosPath(await self._sftp.realpath(str(entry)))
 
-    async def readbytes(self, path: StrOrKaosPath, n: int | None = None) -> bytes:
+    async def scandir(self, path: StrOrKaosPath) -> list[DirEntry]:
+        kaos_path = KaosPath(path) if isinstance(path, str) else path
+        try:
+            names = await self._sftp.readdir(str(path))
+        except asyncssh.SFTPError as e:
+            raise OSError from e
+        return [
+            await self._dir_entry(kaos_path / str(name.filename), name.attrs)
+            for name in names
+            # NOTE: sftp readdir gives . and ..
+            if name.filename not in {".", ".."}
+        ]
+
+    async def globstat(
+        self,
+        path: StrOrKaosPath,
+        pattern: str,
+        *,
+        case_sensitive: bool = True,
+    ) -> list[DirEntry]:
+        if not case_sensitive:
+            raise ValueError("Case insensitive glob is not supported in current environment")
+        real_path = await self._sftp.realpath(str(path))
+        try:
+            names = await self._sftp.glob_sftpname(f"{real_path}/{pattern}")
+        except asyncssh.SFTPError as e:
+            raise OSError from e
+        return [await self._dir_entry(KaosPath(str(name.filename)), name.attrs) for name in names]
+
+    async def _dir_entry(self, path: KaosPath, attrs: asyncssh.SFTPAttrs) -> DirEntry:
+        # Listing attributes describe links themselves, so only symlinks need another request.
+        if not stat.S_ISLNK(_build_st_mode(attrs)):
+            return DirEntry(path, _stat_result(attrs))
+        try:
+            target = await self._sftp.stat(str(path))
+        except asyncssh.SFTPError:
+            return DirEntry(path, None, symlink=True)
+        return DirEntry(path, _stat_result(target), symlink=True)
+
+    async def readbytes(
+        self, path: StrOrKaosPath, n: int | None = None, *, offset: int = 0
+    ) -> bytes:
         async with self._sftp.open(str(path), "rb") as f:
-            return await f.read() if n is None else await f.read(n)
+            return await f.read(-1 if n is None else n, offset)
+
+    async def readchunks(
+        self, path: StrOrKaosPath, *, offset: int = 0, chunk_size: int = READ_CHUNK_SIZE
+    ) -> AsyncGenerator[bytes]:
+        async with self._sftp.open(str(path), "rb") as f:
+            async for data in _read_chunks(f, offset=offset, chunk_size=chunk_size):
+                yield data
 
     async def readtext(
         self,
@@ -239,9 +321,28 @@ class SSHKaos:
         errors: Literal["strict", "ignore", "replace"] = "strict",
     ) -> AsyncGenerator[str]:
         # NOTE: readlines is not supported by SFTPClientFile
-        text = await self.readtext(path, encoding=encoding, errors=errors)
-        for line in text.splitlines():
-            yield line
+        async with self._sftp.open(str(path), "rb") as f:
+            async for line in iter_lines(_read_chunks(f), encoding=encoding, errors=errors):
+                yield line
+
+    async def readlines_reverse(
+        self,
+        path: str | KaosPath,
+        *,
+        encoding: str = "utf-8",
+        errors: Literal["strict", "ignore", "replace"] = "strict",
+    ) -> AsyncGenerator[str]:
+        if not is_ascii_compatible(encoding):
+            text = await self.readtext(path, encoding=encoding, errors=errors)
+            for line in reversed(text.splitlines(keepends=True)):
+                yield line
+            return
+        async with self._sftp.open(str(path), "rb") as f:
+            size = (await f.stat()).size or 0
+            async for line in iter_lines_reverse(
+                lambda offset, n: _read_at(f, offset, n), size, encoding=encoding, errors=errors
+            ):
+                yield line
 
     async def writebytes(self, path: StrOrKaosPath, data: bytes) -> int:
         async with self._sftp.open(str(path), "wb") as f:
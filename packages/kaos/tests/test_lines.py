@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from kaos._lines import is_ascii_compatible, iter_lines, iter_lines_reverse
+
+SAMPLES = [
+    "",
+    "single line",
+    "a\nb\n",
+    "a\r\nb\r\n\r\nlast",
+    "中文\n行二\n" * 5 + "尾",
+    "\n\n",
+]
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1024])
+async def test_lines_match_text_mode_reading_in_both_directions(text: str, chunk_size: int):
+    data = text.encode("utf-8")
+    expected = text.replace("\r\n", "\n").splitlines(keepends=True)
+
+    forward = [
+        line
+        async for line in iter_lines(_chunks(data, chunk_size), encoding="utf-8", errors="strict")
+    ]
+
+    async def _read_at(offset: int, n: int) -> bytes:
+        return data[offset : offset + n]
+
+    backward = [
+        line
+        async for line in iter_lines_reverse(
+            _read_at, len(data), encoding="utf-8", errors="strict", chunk_size=chunk_size
+        )
+    ]
+
+    assert forward == expected
+    assert backward == expected[::-1]
+
+
+def test_is_ascii_compatible():
+    assert is_ascii_compatible("utf-8")
+    assert is_ascii_compatible("gbk")
+    assert not is_ascii_compatible("utf-16")
+    assert not is_ascii_compatible("no-such-codec")
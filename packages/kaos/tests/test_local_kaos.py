@@ -66,6 +66,52 @@ async def test_iterdir_and_glob(local_kaos: LocalKaos):
     assert set(matched) == {"bravo.txt"}
 
 
+async def test_scandir_and_globstat_include_stat_results(local_kaos: LocalKaos):
+    tmp_path = local_kaos.getcwd()
+    await local_kaos.mkdir(tmp_path / "alpha")
+    await local_kaos.writetext(tmp_path / "bravo.txt", "bravo")
+    if os.name != "nt":
+        (tmp_path / "dangling").unsafe_to_local_path().symlink_to("missing")
+        (tmp_path / "link").unsafe_to_local_path().symlink_to("alpha")
+
+    entries = {entry.name: entry for entry in await local_kaos.scandir(tmp_path)}
+    assert entries["alpha"].is_dir() and not entries["alpha"].is_symlink()
+    assert entries["bravo.txt"].is_file()
+    assert entries["bravo.txt"].stat is not None and entries["bravo.txt"].stat.st_size == 5
+    if os.name != "nt":
+        assert entries["dangling"].stat is None and entries["dangling"].is_symlink()
+        assert entries["link"].is_dir() and entries["link"].is_symlink()
+
+    matched = await local_kaos.globstat(tmp_path, "*.txt")
+    assert [(entry.path, entry.is_file()) for entry in matched] == [(tmp_path / "bravo.txt", True)]
+
+
+async def test_readlines_reverse_matches_readlines(local_kaos: LocalKaos):
+    path = local_kaos.getcwd() / "log.txt"
+    await local_kaos.writetext(path, "".join(f"line {i}\n" for i in range(1000)) + "tail")
+
+    forward = [line async for line in local_kaos.readlines(path)]
+    backward = [line async for line in local_kaos.readlines_reverse(path)]
+    assert backward == forward[::-1]
+    assert backward[:2] == ["tail", "line 999\n"]
+
+    utf16 = local_kaos.getcwd() / "utf16.txt"
+    await local_kaos.writetext(utf16, "a\nb\n", encoding="utf-16")
+    assert [line async for line in local_kaos.readlines_reverse(utf16, encoding="utf-16")] == [
+        "b\n",
+        "a\n",
+    ]
+
+
+async def test_readchunks_reads_from_offset(local_kaos: LocalKaos):
+    path = local_kaos.getcwd() / "data.bin"
+    await local_kaos.writebytes(path, bytes(range(100)))
+
+    chunks = [chunk async for chunk in local_kaos.readchunks(path, offset=10, chunk_size=32)]
+    assert [len(chunk) for chunk in chunks] == [32, 32, 26]
+    assert b"".join(chunks) == bytes(range(10, 100))
+
+
 async def test_glob_includes_hidden_files(local_kaos: LocalKaos):
     """Glob should match dotfiles (hidden files) with * and ** patterns."""
     tmp_path = local_kaos.getcwd()
@@ -142,6 +188,8 @@ async def test_read_write_bytes(local_kaos: LocalKaos):
     file_path = tmp_path / "data.bin"
     await local_kaos.writebytes(file_path, b"\x00\x01\xff")
     assert await local_kaos.readbytes(file_path) == b"\x00\x01\xff"
+    assert await local_kaos.readbytes(file_path, 1, offset=1) == b"\x01"
+    assert await local_kaos.readbytes(file_path, offset=2) == b"\xff"
 
 
 def _python_code_args(code: str) -> tuple[str, str, str]:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
 import platform
 import stat
@@ -202,6 +203,43 @@ async def test_iterdir_lists_child_entries(ssh_kaos: SSHKaos, remote_base: str):
     assert all(isinstance(entry, KaosPath) for entry in entries)
 
 
+async def test_scandir_and_globstat_use_listing_attributes(ssh_kaos: SSHKaos, remote_base: str):
+    await ssh_kaos.writetext(os.path.join(remote_base, "file1.txt"), "1")
+    await ssh_kaos.mkdir(os.path.join(remote_base, "subdir"), exist_ok=True)
+
+    entries = {entry.name: entry for entry in await ssh_kaos.scandir(remote_base)}
+
+    assert set(entries) == {"file1.txt", "subdir"}
+    assert entries["file1.txt"].is_file()
+    assert entries["subdir"].is_dir()
+
+    matched = await ssh_kaos.globstat(remote_base, "*.txt")
+    assert [(str(entry.path), entry.is_file()) for entry in matched] == [
+        (os.path.join(remote_base, "file1.txt"), True)
+    ]
+
+
+async def test_readlines_streams_lines_with_endings(ssh_kaos: SSHKaos, remote_base: str):
+    path = os.path.join(remote_base, "big.log")
+    await ssh_kaos.writetext(path, "".join(f"line {i}\r\n" for i in range(100_000)) + "tail")
+
+    first = []
+    async with contextlib.aclosing(ssh_kaos.readlines(path)) as lines:
+        async for line in lines:
+            first.append(line)
+            if len(first) == 2:
+                break
+    assert first == ["line 0\n", "line 1\n"]
+
+    last = []
+    async with contextlib.aclosing(ssh_kaos.readlines_reverse(path)) as lines:
+        async for line in lines:
+            last.append(line)
+            if len(last) == 2:
+                break
+    assert last == ["tail", "line 99999\n"]
+
+
 async def test_glob_is_case_sensitive(ssh_kaos: SSHKaos, remote_base: str):
     await ssh_kaos.writetext(os.path.join(remote_base, "file.log"), "lowercase")
     await ssh_kaos.writetext(os.path.join(remote_base, "FILE.LOG"), "uppercase")
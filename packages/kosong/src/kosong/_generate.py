@@ -33,6 +33,7 @@ async def generate(
         tools: The tools available for the model to call.
         history: The message history to use for generation.
         on_message_part: An optional callback to be called for each raw message part.
+            The part is shared with the generated message and must not be mutated.
         on_tool_call: An optional callback to be called for each complete tool call.
 
     Returns:
@@ -48,22 +49,28 @@ async def generate(
     """
     message = Message(role="assistant", content=[])
     pending_part: StreamedMessagePart | None = None  # message part that is currently incomplete
+    # Parts are handed to `on_message_part` as is. The pending part is only copied before the
+    # first merge into it, so a run of N deltas costs one copy instead of N.
+    pending_part_shared = False
 
     logger.trace("Generating with history: {history}", history=history)
     stream = await chat_provider.generate(system_prompt, tools, history)
     async for part in stream:
         logger.trace("Received part: {part}", part=part)
         if on_message_part:
-            await callback(on_message_part, part.model_copy(deep=True))
+            await callback(on_message_part, part)
 
         if pending_part is None:
-            pending_part = part
-        elif not pending_part.merge_in_place(part):  # try merge into the pending part
+            pending_part, pending_part_shared = part, on_message_part is not None
+            continue
+        if pending_part_shared:
+            pending_part, pending_part_shared = pending_part.model_copy(deep=True), False
+        if not pending_part.merge_in_place(part):  # try merge into the pending part
             # unmergeable part must push the pending part to the buffer
             _message_append(message, pending_part)
             if isinstance(pending_part, ToolCall) and on_tool_call:
                 await callback(on_tool_call, pending_part)
-            pending_part = part
+            pending_part, pending_part_shared = part, on_message_part is not None
 
     # end of message
     if pending_part is not None:
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from kosong.message import Message
+
+
+@dataclass(slots=True)
+class _Lineage[T]:
+    messages: list[Message] = field(default_factory=list[Message])
+    converted: list[T] = field(default_factory=list[T])
+
+
+class MessageConversionCache[T]:
+    """
+    Reuse the provider payloads of messages that were already converted in an earlier call.
+
+    An agent loop sends the same history again on every step, with only a few messages appended
+    at the end. The cache remembers the messages of the previous call together with their
+    converted payloads, and on the next call only converts the messages past the longest common
+    prefix. Messages are compared by identity, so the cache holds strong references to them and
+    relies on callers never mutating a message once it is part of a history.
+
+    Compaction replaces the history with new message objects and revert truncates it, so both
+    are picked up by the identity comparison without explicit invalidation. A small number of
+    independent histories (lineages, keyed by their first message) are kept at once so that
+    subagents sharing a provider do not evict each other on every step.
+
+    The conversion of a message must only depend on the message itself and the messages
+    before it, and callers must not mutate the returned payloads.
+    """
+
+    def __init__(self, max_lineages: int = 4) -> None:
+        self._max_lineages = max_lineages
+        self._lineages: OrderedDict[int, _Lineage[T]] = OrderedDict()
+
+    def convert(self, messages: Sequence[Message], convert: Callable[[Message], T]) -> list[T]:
+        """Convert `messages`, reusing the payloads of the longest cached prefix."""
+        if not messages:
+            return []
+
+        key = id(messages[0])
+        lineage = self._lineages.get(key)
+        if lineage is None or not lineage.messages or lineage.messages[0] is not messages[0]:
+            lineage = _Lineage[T]()
+            self._lineages[key] = lineage
+        self._lineages.move_to_end(key)
+        while len(self._lineages) > self._max_lineages:
+            self._lineages.popitem(last=False)
+
+        cached = lineage.messages
+        n_common = 0
+        limit = min(len(cached), len(messages))
+        while n_common < limit and cached[n_common] is messages[n_common]:
+            n_common += 1
+
+        del lineage.messages[n_common:]
+        del lineage.converted[n_common:]
+        for message in messages[n_common:]:
+            lineage.converted.append(convert(message))
+            lineage.messages.append(message)
+        return list(lineage.converted)
+
+    def clear(self) -> None:
+        """Drop all cached payloads."""
+        self._lineages.clear()
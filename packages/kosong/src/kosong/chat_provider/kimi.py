@@ -26,6 +26,7 @@ from kosong.chat_provider import (
     ThinkingEffort,
     TokenUsage,
 )
+from kosong.chat_provider.conversion_cache import MessageConversionCache
 from kosong.chat_provider.openai_common import (
     close_replaced_openai_client,
     convert_error,
@@ -129,6 +130,7 @@ class Kimi:
         )
         """The underlying `AsyncOpenAI` client."""
         self._generation_kwargs: Kimi.GenerationKwargs = {}
+        self._conversion_cache = MessageConversionCache[ChatCompletionMessageParam]()
 
     @property
     def model_name(self) -> str:
@@ -158,7 +160,7 @@ class Kimi:
         messages: list[ChatCompletionMessageParam] = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
-        messages.extend(_convert_message(message) for message in history)
+        messages.extend(self._conversion_cache.convert(history, _convert_message))
 
         generation_kwargs: dict[str, Any] = {
             # default kimi generation kwargs
@@ -78,6 +78,7 @@ from kosong.chat_provider import (
     TokenUsage,
     convert_httpx_error,
 )
+from kosong.chat_provider.conversion_cache import MessageConversionCache
 from kosong.contrib.chat_provider.common import ToolMessageConversion
 from kosong.message import (
     ContentPart,
@@ -251,6 +252,7 @@ class Anthropic:
             "max_tokens": default_max_tokens,
             "beta_features": ["interleaved-thinking-2025-05-14"],
         }
+        self._conversion_cache = MessageConversionCache[MessageParam]()
 
     @property
     def model_name(self) -> str:
@@ -296,8 +298,9 @@ class Anthropic:
             else omit
         )
         messages: list[MessageParam] = []
-        for message in history:
-            converted = self._convert_message(message)
+        # Converted messages are cached across calls, so they are copied below instead of
+        # being mutated in place.
+        for converted in self._conversion_cache.convert(history, self._convert_message):
             # Per Anthropic spec, tool_result blocks for the same assistant turn
             # must live in a single user message. Internal Messages model one
             # tool call per entry, so merge consecutive tool-result-only user
@@ -313,7 +316,7 @@ class Anthropic:
             ):
                 prev_content = cast(list[ContentBlockParam], messages[-1]["content"])
                 new_content = cast(list[ContentBlockParam], converted["content"])
-                messages[-1]["content"] = [*prev_content, *new_content]
+                messages[-1] = MessageParam(role="user", content=[*prev_content, *new_content])
             else:
                 messages.append(converted)
         if messages:
@@ -336,7 +339,17 @@ class Anthropic:
                         | "server_tool_use"
                         | "web_search_tool_result"
                     ):
-                        last_block["cache_control"] = CacheControlEphemeralParam(type="ephemeral")
+                        last_block = cast(
+                            ContentBlockParam,
+                            {
+                                **last_block,
+                                "cache_control": CacheControlEphemeralParam(type="ephemeral"),
+                            },
+                        )
+                        messages[-1] = MessageParam(
+                            role=last_message["role"],
+                            content=[*content_blocks[:-1], last_block],
+                        )
                     case "thinking" | "redacted_thinking":
                         pass
         generation_kwargs: dict[str, Any] = {}
@@ -11,6 +11,7 @@ import copy
 import json
 import mimetypes
 from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Self, TypedDict, Unpack, cast
 
 import httpx
@@ -44,6 +45,7 @@ from kosong.chat_provider import (
     TokenUsage,
     convert_httpx_error,
 )
+from kosong.chat_provider.conversion_cache import MessageConversionCache
 from kosong.message import (
     AudioURLPart,
     ContentPart,
@@ -90,12 +92,17 @@ class GoogleGenAI:
         stream: bool = True,
         vertexai: bool | None = None,
         default_headers: dict[str, str] | None = None,
+        http_client: httpx.AsyncClient | None = None,
         **client_kwargs: Any,
     ):
         self._model = model
         self._stream = stream
         self._base_url = base_url
-        http_options = HttpOptions(base_url=base_url, headers=default_headers)
+        # A given `http_client` is used for async requests instead of the SDK's own, and is
+        # not closed by the SDK.
+        http_options = HttpOptions(
+            base_url=base_url, headers=default_headers, httpx_async_client=http_client
+        )
         self._client: genai_client.Client = genai.Client(
             http_options=http_options,
             api_key=api_key,
@@ -103,6 +110,7 @@ class GoogleGenAI:
             **client_kwargs,
         )
         self._generation_kwargs: GoogleGenAI.GenerationKwargs = {}
+        self._conversion_cache = MessageConversionCache[_ConvertedMessage]()
 
     @property
     def model_name(self) -> str:
@@ -145,7 +153,9 @@ class GoogleGenAI:
         tools: Sequence[KosongTool],
         history: Sequence[Message],
     ) -> "GoogleGenAIStreamedMessage":
-        contents = messages_to_google_genai_contents(history)
+        contents = messages_to_google_genai_contents(
+            history, conversion_cache=self._conversion_cache
+        )
 
         config = GenerateContentConfig(**self._generation_kwargs)
         config.system_instruction = system_prompt
@@ -469,6 +479,26 @@ def _tool_result_to_response_and_parts(
     return {"output": response}, genai_parts
 
 
+@dataclass(frozen=True, slots=True)
+class _ToolResponse:
+    """The name-independent part of a converted tool message."""
+
+    response: dict[str, str]
+    parts: list[FunctionResponsePart]
+
+
+type _ConvertedMessage = Content | _ToolResponse
+
+
+def _convert_message(message: Message) -> _ConvertedMessage:
+    # Tool messages are only converted up to their payload: the function name depends on the
+    # tool calls before them and the packing depends on the tool messages around them.
+    if message.role == "tool":
+        response, parts = _tool_result_to_response_and_parts(message.content)
+        return _ToolResponse(response=response, parts=parts)
+    return message_to_google_genai(message)
+
+
 def _tool_call_id_to_name(tool_call_id: str, tool_name_by_id: dict[str, str]) -> str:
     """Resolve Gemini `FunctionResponse.name` from a tool_call_id."""
     if tool_call_id in tool_name_by_id:
@@ -481,18 +511,20 @@ def _tool_message_to_function_response_part(
     message: Message,
     *,
     tool_name_by_id: dict[str, str],
+    converted: _ToolResponse | None = None,
 ) -> Part:
     if message.role != "tool":  # pragma: no cover - defensive guard
         raise ChatProviderError("Expected a tool message.")
     if message.tool_call_id is None:
         raise ChatProviderError("Tool response is missing `tool_call_id`.")
 
-    response_data, tool_result_parts = _tool_result_to_response_and_parts(message.content)
+    if converted is None:
+        converted = cast(_ToolResponse, _convert_message(message))
     return Part(
         function_response=FunctionResponse(
             name=_tool_call_id_to_name(message.tool_call_id, tool_name_by_id),
-            response=response_data,
-            parts=tool_result_parts,
+            response=converted.response,
+            parts=converted.parts,
         )
     )
 
@@ -503,6 +535,7 @@ def _tool_messages_to_google_genai_content(
     tool_name_by_id: dict[str, str],
     expected_tool_call_ids: Sequence[str] | None = None,
     require_all_expected: bool = False,
+    converted: Sequence[_ToolResponse] | None = None,
 ) -> Content:
     """Pack one-or-more tool results into a single Gemini "user" turn.
 
@@ -528,7 +561,7 @@ def _tool_messages_to_google_genai_content(
 
     parts: list[Part] = []
     actual_tool_call_ids: list[str] = []
-    for _, message in indexed_messages:
+    for index, message in indexed_messages:
         if message.tool_call_id is None:
             raise ChatProviderError("Tool response is missing `tool_call_id`.")
         if message.tool_call_id in seen_tool_call_ids:
@@ -536,7 +569,11 @@ def _tool_messages_to_google_genai_content(
         seen_tool_call_ids.add(message.tool_call_id)
         actual_tool_call_ids.append(message.tool_call_id)
         parts.append(
-            _tool_message_to_function_response_part(message, tool_name_by_id=tool_name_by_id)
+            _tool_message_to_function_response_part(
+                message,
+                tool_name_by_id=tool_name_by_id,
+                converted=converted[index] if converted is not None else None,
+            )
         )
 
     if expected_tool_call_ids is not None and require_all_expected:
@@ -559,14 +596,26 @@ def _tool_messages_to_google_genai_content(
     return Content(role="user", parts=parts)
 
 
-def messages_to_google_genai_contents(messages: Sequence[Message]) -> list[Content]:
+def messages_to_google_genai_contents(
+    messages: Sequence[Message],
+    *,
+    conversion_cache: MessageConversionCache[_ConvertedMessage] | None = None,
+) -> list[Content]:
     """Convert internal messages into a Gemini contents list.
 
     Tool results for a tool-calling turn are packed into a single "user" message
     with N `functionResponse` parts matching the preceding "model" message's
     N `functionCall` parts. This avoids ordering issues from parallel tool
     execution and satisfies VertexAI's stricter validation.
+
+    When `conversion_cache` is given, messages converted by an earlier call are
+    reused and only the packing of tool results is redone.
     """
+    converted = (
+        conversion_cache.convert(messages, _convert_message)
+        if conversion_cache is not None
+        else [_convert_message(message) for message in messages]
+    )
     contents: list[Content] = []
     tool_name_by_id: dict[str, str] = {}
 
@@ -575,7 +624,7 @@ def messages_to_google_genai_contents(messages: Sequence[Message]) -> list[Conte
         message = messages[i]
 
         if message.role == "assistant" and message.tool_calls:
-            contents.append(message_to_google_genai(message))
+            contents.append(cast(Content, converted[i]))
             expected_tool_call_ids: list[str] = []
             for tool_call in message.tool_calls:
                 tool_name_by_id[tool_call.id] = tool_call.function.name
@@ -595,6 +644,7 @@ def messages_to_google_genai_contents(messages: Sequence[Message]) -> list[Conte
                         tool_name_by_id=tool_name_by_id,
                         expected_tool_call_ids=expected_tool_call_ids,
                         require_all_expected=True,
+                        converted=cast(list[_ToolResponse], converted[i + 1 : j]),
                     )
                 )
                 i = j
@@ -607,12 +657,16 @@ def messages_to_google_genai_contents(messages: Sequence[Message]) -> list[Conte
             # Tool message without an immediately preceding tool-calling assistant
             # message (e.g. truncated history). Convert it best-effort.
             contents.append(
-                _tool_messages_to_google_genai_content([message], tool_name_by_id=tool_name_by_id)
+                _tool_messages_to_google_genai_content(
+                    [message],
+                    tool_name_by_id=tool_name_by_id,
+                    converted=[cast(_ToolResponse, converted[i])],
+                )
             )
             i += 1
             continue
 
-        contents.append(message_to_google_genai(message))
+        contents.append(cast(Content, converted[i]))
         if message.role == "assistant" and message.tool_calls:
             for tool_call in message.tool_calls:
                 tool_name_by_id[tool_call.id] = tool_call.function.name
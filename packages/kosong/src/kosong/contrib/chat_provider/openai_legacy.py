@@ -21,6 +21,7 @@ from kosong.chat_provider import (
     ThinkingEffort,
     TokenUsage,
 )
+from kosong.chat_provider.conversion_cache import MessageConversionCache
 from kosong.chat_provider.openai_common import (
     close_replaced_openai_client,
     convert_error,
@@ -101,6 +102,7 @@ class OpenAILegacy:
         self._reasoning_key = reasoning_key
         self._tool_message_conversion: ToolMessageConversion | None = tool_message_conversion
         self._generation_kwargs: OpenAILegacy.GenerationKwargs = {}
+        self._conversion_cache = MessageConversionCache[ChatCompletionMessageParam]()
 
     @property
     def model_name(self) -> str:
@@ -122,7 +124,7 @@ class OpenAILegacy:
         if system_prompt:
             # `system` vs `developer`: see `message_to_openai` comments
             messages.append({"role": "system", "content": system_prompt})
-        messages.extend(self._convert_message(message) for message in history)
+        messages.extend(self._conversion_cache.convert(history, self._convert_message))
 
         generation_kwargs: dict[str, Any] = {}
         generation_kwargs.update(self._generation_kwargs)
@@ -37,6 +37,7 @@ from kosong.chat_provider import (
     ThinkingEffort,
     TokenUsage,
 )
+from kosong.chat_provider.conversion_cache import MessageConversionCache
 from kosong.chat_provider.openai_common import (
     close_replaced_openai_client,
     convert_error,
@@ -137,6 +138,7 @@ class OpenAIResponses:
             client_kwargs=self._client_kwargs,
         )
         self._generation_kwargs: OpenAIResponses.GenerationKwargs = {}
+        self._conversion_cache = MessageConversionCache[list[ResponseInputItemParam]]()
 
     @property
     def model_name(self) -> str:
@@ -163,8 +165,8 @@ class OpenAIResponses:
             inputs.append(system_message)
         # The `Message` type is OpenAI-compatible for Responses API `input` messages.
 
-        for message in history:
-            inputs.extend(self._convert_message(message))
+        for items in self._conversion_cache.convert(history, self._convert_message):
+            inputs.extend(items)
 
         generation_kwargs: dict[str, Any] = {}
         generation_kwargs.update(self._generation_kwargs)
@@ -904,3 +904,50 @@ async def test_anthropic_parallel_tool_results_merged_into_single_user_message()
     )
     tool_results = [b for b in messages[-1]["content"] if b["type"] == "tool_result"]
     assert {b["tool_use_id"] for b in tool_results} == {"call_add", "call_mul"}
+
+
+async def test_anthropic_cached_conversion_is_not_mutated_across_calls():
+    """Converted messages are reused across calls; the cache_control marker on
+    the last block and the merged tool results must not leak into them."""
+    from common import ADD_TOOL, MUL_TOOL, capture_request
+
+    from kosong.message import ToolCall
+
+    history = [
+        Message(role="user", content="Calculate 2+3 and 4*5"),
+        Message(
+            role="assistant",
+            content="I'll calculate both.",
+            tool_calls=[
+                ToolCall(
+                    id="call_add",
+                    function=ToolCall.FunctionBody(name="add", arguments='{"a": 2, "b": 3}'),
+                ),
+                ToolCall(
+                    id="call_mul",
+                    function=ToolCall.FunctionBody(name="multiply", arguments='{"a": 4, "b": 5}'),
+                ),
+            ],
+        ),
+        Message(role="tool", content="5", tool_call_id="call_add"),
+        Message(role="tool", content="20", tool_call_id="call_mul"),
+    ]
+
+    with respx.mock(base_url="https://api.anthropic.com") as mock:
+        mock.post("/v1/messages").mock(return_value=Response(200, json=make_anthropic_response()))
+        provider = Anthropic(
+            model="claude-sonnet-4-20250514",
+            api_key="test-key",
+            default_max_tokens=1024,
+            stream=False,
+        )
+        first = await capture_request(mock, provider, "", [ADD_TOOL, MUL_TOOL], history)
+        history.append(Message(role="assistant", content="2+3=5 and 4*5=20."))
+        second = await capture_request(mock, provider, "", [ADD_TOOL, MUL_TOOL], history)
+
+    assert first["messages"][-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert second["messages"][:2] == first["messages"][:2]
+    tool_results = second["messages"][2]["content"]
+    assert [b["tool_use_id"] for b in tool_results] == ["call_add", "call_mul"]
+    assert all("cache_control" not in b for b in tool_results)
+    assert second["messages"][-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
@@ -0,0 +1,71 @@
+"""Tests for `MessageConversionCache` and its use by the chat providers."""
+
+from kosong.chat_provider.conversion_cache import MessageConversionCache
+from kosong.message import Message, TextPart
+
+
+def _msg(text: str, role: str = "user") -> Message:
+    return Message(role=role, content=[TextPart(text=text)])  # type: ignore[arg-type]
+
+
+class _CountingConverter:
+    def __init__(self) -> None:
+        self.converted: list[str] = []
+
+    def __call__(self, message: Message) -> str:
+        text = message.extract_text()
+        self.converted.append(text)
+        return text.upper()
+
+
+def test_only_appended_messages_are_converted() -> None:
+    cache = MessageConversionCache[str]()
+    convert = _CountingConverter()
+    history = [_msg("a"), _msg("b", "assistant")]
+
+    assert cache.convert(history, convert) == ["A", "B"]
+    history.append(_msg("c"))
+    assert cache.convert(history, convert) == ["A", "B", "C"]
+    assert convert.converted == ["a", "b", "c"]
+
+
+def test_replaced_and_truncated_messages_are_reconverted() -> None:
+    cache = MessageConversionCache[str]()
+    convert = _CountingConverter()
+    first = _msg("a")
+    history = [first, _msg("b"), _msg("c")]
+    cache.convert(history, convert)
+
+    # revert: a prefix of the same objects
+    assert cache.convert(history[:1], convert) == ["A"]
+    # an equal but distinct message object is not trusted
+    assert cache.convert([first, _msg("b")], convert) == ["A", "B"]
+    # compaction: a brand new history
+    assert cache.convert([_msg("summary")], convert) == ["SUMMARY"]
+    assert convert.converted == ["a", "b", "c", "b", "summary"]
+
+
+def test_independent_histories_do_not_evict_each_other() -> None:
+    cache = MessageConversionCache[str](max_lineages=2)
+    convert = _CountingConverter()
+    main = [_msg("main")]
+    sub = [_msg("sub")]
+
+    cache.convert(main, convert)
+    cache.convert(sub, convert)
+    cache.convert(main, convert)
+    assert convert.converted == ["main", "sub"]
+
+    cache.convert([_msg("other")], convert)
+    cache.convert(sub, convert)
+    assert convert.converted == ["main", "sub", "other", "sub"]
+
+
+def test_returned_list_is_a_copy() -> None:
+    cache = MessageConversionCache[str]()
+    convert = _CountingConverter()
+    history = [_msg("a")]
+
+    result = cache.convert(history, convert)
+    result.append("junk")
+    assert cache.convert(history, convert) == ["A"]
@@ -86,6 +86,37 @@ def test_generate_with_callbacks():
     assert output_tool_calls == message.tool_calls
 
 
+def test_generate_shares_parts_without_mutating_them():
+    input_parts: list[StreamedMessagePart] = [
+        TextPart(text="Hello, "),
+        TextPart(text="world"),
+        ToolCall(
+            id="get_weather#123",
+            function=ToolCall.FunctionBody(name="get_weather", arguments="{"),
+        ),
+        ToolCallPart(arguments_part="}"),
+        TextPart(text="done"),
+    ]
+    provider_parts = deepcopy(input_parts)
+    chat_provider = MockChatProvider(message_parts=provider_parts)
+
+    output_parts: list[StreamedMessagePart] = []
+
+    async def on_message_part(part: StreamedMessagePart):
+        output_parts.append(part)
+
+    message = asyncio.run(
+        generate(
+            chat_provider, system_prompt="", tools=[], history=[], on_message_part=on_message_part
+        )
+    ).message
+    # parts are handed over as is, and merging works on copies
+    assert all(out is part for out, part in zip(output_parts, provider_parts, strict=True))
+    assert provider_parts == input_parts
+    assert message.content == [TextPart(text="Hello, world"), TextPart(text="done")]
+    assert message.content[1] is provider_parts[-1]
+
+
 def test_generate_think_only_raises_error():
     """Think-only response (no text, no tool calls) should raise APIEmptyResponseError."""
     chat_provider = MockChatProvider(
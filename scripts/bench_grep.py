@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Compare the built-in search of the Grep tool with ripgrep.
+
+The script runs a few searches through the `SearchText` tool twice: once with ripgrep and
+once with the pure-Python fallback used when ripgrep is unavailable. It reports the best wall
+time of each over several rounds and whether both returned the same output. Without `--path`
+it searches a generated tree of source-like files.
+
+Usage:
+    python scripts/bench_grep.py                          # 2000 generated files, 3 rounds
+    python scripts/bench_grep.py --files 10000 --rounds 5
+    python scripts/bench_grep.py --path ~/src/some-repo
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from kimi_cli.tools.file import grep_local
+from kimi_cli.tools.file.grep_local import Grep, Params
+
+WORDS = ["alpha", "beta", "gamma", "delta", "value", "result", "config", "handler", "items"]
+
+
+def make_tree(root: Path, n_files: int, n_lines: int) -> None:
+    rng = random.Random(0)
+    for i in range(n_files):
+        path = root / f"pkg{i % 20}" / f"mod{i % 7}" / f"file_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [
+            f"    {rng.choice(WORDS)}_{j} = {rng.choice(WORDS)}({rng.randint(0, 999)})"
+            for j in range(n_lines)
+        ]
+        if i % 50 == 0:
+            lines.insert(n_lines // 2, "    raise NeedleError('needle in a haystack')")
+        path.write_text("def main():\n" + "\n".join(lines) + "\n")
+
+
+def searches(path: str) -> list[Params]:
+    return [
+        Params(pattern="NeedleError", path=path, output_mode="files_with_matches", head_limit=0),
+        Params(pattern=r"needle\s+in", path=path, output_mode="content", head_limit=0),
+        Params(pattern="config_1[0-9]", path=path, output_mode="count_matches", head_limit=0),
+        Params.model_validate(
+            {"pattern": "handler", "path": path, "output_mode": "content", "-C": 2}
+        ),
+    ]
+
+
+async def timed(tool: Grep, params: Params, *, builtin: bool, rounds: int) -> tuple[float, str]:
+    best = float("inf")
+    output = ""
+    for _ in range(rounds):
+        # The built-in search is what the tool falls back to while ripgrep is unavailable.
+        grep_local._rg_unavailable_since = time.monotonic() if builtin else None
+        start = time.perf_counter()
+        result = await tool(params)
+        best = min(best, time.perf_counter() - start)
+        output = str(result.output)
+    grep_local._rg_unavailable_since = None
+    return best, output
+
+
+async def run(path: str, rounds: int) -> None:
+    tool = Grep()
+    has_rg = grep_local._find_existing_rg(grep_local._rg_binary_name()) is not None
+    if not has_rg:
+        print("ripgrep not found; timing the built-in search only")
+    print(f"{'search':<44} {'built-in':>10} {'ripgrep':>10}  same output")
+    for params in searches(path):
+        label = f"{params.output_mode} /{params.pattern}/"
+        builtin_time, builtin_out = await timed(tool, params, builtin=True, rounds=rounds)
+        if has_rg:
+            rg_time, rg_out = await timed(tool, params, builtin=False, rounds=rounds)
+            # Files are visited in a different order, so compare the sets of lines.
+            same = sorted(builtin_out.splitlines()) == sorted(rg_out.splitlines())
+            print(f"{label:<44} {builtin_time * 1e3:>8.1f}ms {rg_time * 1e3:>8.1f}ms  {same}")
+        else:
+            print(f"{label:<44} {builtin_time * 1e3:>8.1f}ms {'-':>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", type=Path, help="directory to search instead of a generated one")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.path is not None:
+        asyncio.run(run(str(args.path.expanduser().resolve()), args.rounds))
+        return
+    with tempfile.TemporaryDirectory(prefix="kimi-bench-grep-") as tmp:
+        make_tree(Path(tmp), args.files, args.lines)
+        asyncio.run(run(tmp, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
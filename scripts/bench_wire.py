@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Measure the per-token overhead of the streaming path from provider to UI.
+
+A mock chat provider streams N small deltas (text, thinking and a tool call with
+streamed arguments) through `kosong.generate` into a `Wire`, the same way
+`KimiSoul` does. One raw UI subscriber, one merged UI subscriber and the
+wire.jsonl recorder consume every message. The script reports the wall time
+per streamed delta, averaged over several rounds.
+
+Usage:
+    python scripts/bench_wire.py                    # 20000 deltas, 5 rounds
+    python scripts/bench_wire.py --deltas 100000 --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import kosong
+from kosong.chat_provider import StreamedMessagePart
+from kosong.chat_provider.mock import MockChatProvider
+from kosong.message import TextPart, ThinkPart, ToolCall, ToolCallPart
+
+from kimi_cli.utils.aioqueue import QueueShutDown
+from kimi_cli.wire import Wire, WireUISide
+from kimi_cli.wire.file import WireFile
+from kimi_cli.wire.types import TurnBegin, TurnEnd
+
+
+def make_parts(n_deltas: int) -> list[StreamedMessagePart]:
+    """Build a stream of roughly `n_deltas` deltas, split between think, text and tool call."""
+    third = max(n_deltas // 3, 1)
+    parts: list[StreamedMessagePart] = [ThinkPart(think="th ") for _ in range(third)]
+    parts.extend(TextPart(text="tok ") for _ in range(third))
+    parts.append(
+        ToolCall(id="call_1", function=ToolCall.FunctionBody(name="Shell", arguments='{"c'))
+    )
+    parts.extend(ToolCallPart(arguments_part="x") for _ in range(third - 2))
+    parts.append(ToolCallPart(arguments_part='"}'))
+    return parts
+
+
+async def drain(ui: WireUISide) -> int:
+    count = 0
+    try:
+        while True:
+            await ui.receive()
+            count += 1
+    except QueueShutDown:
+        return count
+
+
+async def run_round(parts: list[StreamedMessagePart], wire_path: Path) -> float:
+    wire = Wire(file_backend=WireFile(wire_path))
+    raw_task = asyncio.create_task(drain(wire.ui_side(merge=False)))
+    merged_task = asyncio.create_task(drain(wire.ui_side(merge=True)))
+    soul_side = wire.soul_side
+
+    start = time.perf_counter()
+    soul_side.send(TurnBegin(user_input="bench"))
+    await kosong.generate(
+        MockChatProvider(parts),
+        system_prompt="",
+        tools=[],
+        history=[],
+        on_message_part=soul_side.send,
+    )
+    soul_side.send(TurnEnd())
+    wire.shutdown()
+    await wire.join()
+    await asyncio.gather(raw_task, merged_task)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the per-token overhead of the wire.")
+    parser.add_argument("--deltas", type=int, default=20_000, help="streamed deltas per round")
+    parser.add_argument("--rounds", type=int, default=5, help="number of measured rounds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timings: list[float] = []
+        for i in range(args.rounds + 1):
+            parts = make_parts(args.deltas)
+            elapsed = await run_round(parts, Path(tmp) / f"wire-{i}.jsonl")
+            if i > 0:  # the first round is a warm-up
+                timings.append(elapsed / len(parts))
+
+    best = min(timings) * 1e6
+    mean = sum(timings) / len(timings) * 1e6
+    print(f"deltas/round: {args.deltas}, rounds: {args.rounds}")
+    print(f"per delta: best {best:.2f} us, mean {mean:.2f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Compare the wire.jsonl scanner with validating every record.
+
+The script writes a wire file of streamed turns (text deltas, a tool call with streamed
+arguments, its result and a status update per step) and times the readers that only need a
+few fields: the per-session summary of `kimi vis`, the turn list of `/undo` and `/fork`, and
+the usage the session catalog keeps. Each is timed once through `scan_wire_file` and once
+through `parse_wire_file_line`, the pydantic path they used before; the best wall time of
+several rounds is reported, along with whether both gave the same result.
+
+Usage:
+    python scripts/bench_wire_scan.py                  # 200 turns, 5 rounds
+    python scripts/bench_wire_scan.py --turns 1000 --deltas 500
+    python scripts/bench_wire_scan.py --path ~/.kimi/sessions/<hash>/<id>/wire.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from kosong.chat_provider import TokenUsage
+from kosong.message import TextPart, ToolCall, ToolCallPart
+from kosong.tooling import ToolResult, ToolReturnValue
+
+from kimi_cli.session_catalog import _WireScan  # pyright: ignore[reportPrivateUsage]
+from kimi_cli.session_fork import enumerate_turns
+from kimi_cli.vis.api.sessions import _summarize_wire  # pyright: ignore[reportPrivateUsage]
+from kimi_cli.wire.file import WireFile, WireFileMetadata, parse_wire_file_line
+from kimi_cli.wire.scan import iter_events
+from kimi_cli.wire.types import StatusUpdate, StepBegin, TurnBegin, TurnEnd, WireMessage
+
+
+async def make_wire(path: Path, n_turns: int, n_deltas: int) -> None:
+    wire_file = WireFile(path)
+    writer = wire_file.open_writer(flush_bytes=1 << 20)
+    for turn in range(n_turns):
+        messages: list[WireMessage] = [TurnBegin(user_input=f"question {turn}"), StepBegin(n=1)]
+        messages.extend(TextPart(text="tok ") for _ in range(n_deltas))
+        call_id = f"call_{turn}"
+        messages.append(
+            ToolCall(id=call_id, function=ToolCall.FunctionBody(name="Shell", arguments="{"))
+        )
+        messages.extend(ToolCallPart(arguments_part="x") for _ in range(n_deltas // 4))
+        return_value = ToolReturnValue(
+            is_error=turn % 5 == 0, output="out " * 50, message="", display=[]
+        )
+        messages.append(ToolResult(tool_call_id=call_id, return_value=return_value))
+        messages.append(StatusUpdate(token_usage=TokenUsage(input_other=100, output=20)))
+        messages.append(TurnEnd())
+        for msg in messages:
+            writer.append_message(msg)
+        await writer.flush_if_needed()
+    await writer.close()
+
+
+def _parsed_records(path: Path) -> list[tuple[float, str, dict[str, Any]]]:
+    records: list[tuple[float, str, dict[str, Any]]] = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                parsed = parse_wire_file_line(line)
+            except ValueError:
+                continue
+            if isinstance(parsed, WireFileMetadata):
+                continue
+            records.append((parsed.timestamp, parsed.message.type, parsed.message.payload))
+    return records
+
+
+def parsed_summary(path: Path) -> dict[str, Any]:
+    counts = {"TurnBegin": 0, "StepBegin": 0, "ToolCall": 0, "errors": 0}
+    tokens = 0
+    records = _parsed_records(path)
+    for _, type_, payload in records:
+        for ev_type, ev_payload in iter_events(type_, payload):
+            if ev_type in counts:
+                counts[ev_type] += 1
+            elif ev_type == "ToolResult" and ev_payload["return_value"].get("is_error"):
+                counts["errors"] += 1
+            elif ev_type == "StatusUpdate" and (usage := ev_payload.get("token_usage")):
+                tokens += usage["input_other"] + usage["output"]
+    duration = records[-1][0] - records[0][0] if records else 0
+    return {
+        "turns": counts["TurnBegin"],
+        "steps": counts["StepBegin"],
+        "tool_calls": counts["ToolCall"],
+        "errors": counts["errors"],
+        "tokens": tokens,
+        "duration": duration,
+    }
+
+
+def scanned_summary(path: Path) -> dict[str, Any]:
+    summary = _summarize_wire(path)
+    return {
+        "turns": summary["turns"],
+        "steps": summary["steps"],
+        "tool_calls": summary["tool_calls"],
+        "errors": summary["errors"],
+        "tokens": summary["input_tokens"] + summary["output_tokens"],
+        "duration": summary["duration_sec"],
+    }
+
+
+def parsed_turns(path: Path) -> list[str]:
+    return [
+        payload["user_input"] for _, type_, payload in _parsed_records(path) if type_ == "TurnBegin"
+    ]
+
+
+def scanned_turns(path: Path) -> list[str]:
+    return [turn.user_text for turn in enumerate_turns(path)]
+
+
+def parsed_usage(path: Path) -> tuple[int, dict[str, list[int]]]:
+    summary = parsed_summary(path)
+    return summary["tokens"], {"Shell": [summary["tool_calls"], summary["errors"]]}
+
+
+def scanned_usage(path: Path) -> tuple[int, dict[str, list[int]]]:
+    scan = _WireScan().scan(path, path.stat().st_size)
+    return scan.input_tokens + scan.output_tokens, scan.tool_usage
+
+
+def timed(fn: Callable[[Path], Any], path: Path, rounds: int) -> tuple[float, Any]:
+    best = float("inf")
+    result: Any = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(path: Path, rounds: int, *, synthetic: bool) -> None:
+    size = path.stat().st_size
+    print(f"{path} ({size / 1e6:.1f} MB)")
+    readers: list[tuple[str, Callable[[Path], Any], Callable[[Path], Any]]] = [
+        ("session summary", scanned_summary, parsed_summary),
+        ("turn list", scanned_turns, parsed_turns),
+    ]
+    if synthetic:
+        # The baseline attributes every call and error to the one tool of the generated file.
+        readers.append(("catalog usage", scanned_usage, parsed_usage))
+    print(f"{'reader':<18} {'scanner':>10} {'pydantic':>10} {'speedup':>8}  same result")
+    for label, scanned, parsed in readers:
+        scan_time, scan_result = timed(scanned, path, rounds)
+        parse_time, parse_result = timed(parsed, path, rounds)
+        speedup = parse_time / scan_time
+        print(
+            f"{label:<18} {scan_time * 1e3:>8.1f}ms {parse_time * 1e3:>8.1f}ms "
+            f"{speedup:>7.1f}x  {scan_result == parse_result}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", type=Path, help="wire file to read instead of a generated one")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--deltas", type=int, default=200, help="text deltas per turn")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.path is not None:
+        run(args.path.expanduser(), args.rounds, synthetic=False)
+        return
+    with tempfile.TemporaryDirectory(prefix="kimi-bench-wire-scan-") as tmp:
+        path = Path(tmp) / "wire.jsonl"
+        asyncio.run(make_wire(path, args.turns, args.deltas))
+        run(path, args.rounds, synthetic=True)
+
+
+if __name__ == "__main__":
+    main()
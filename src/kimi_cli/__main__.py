@@ -40,4 +40,9 @@ def main(argv: Sequence[str] | None = None) -> int | str | None:
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    # In a frozen build, worker processes (e.g. of the Grep fallback) start by running this
+    # script; this hands them over to multiprocessing instead of running the CLI.
+    multiprocessing.freeze_support()
     raise SystemExit(main())
@@ -6,7 +6,16 @@ from contextlib import suppress
 from typing import Literal
 
 import acp
-from kaos import AsyncReadable, AsyncWritable, Kaos, KaosProcess, StatResult, StrOrKaosPath
+from kaos import (
+    READ_CHUNK_SIZE,
+    AsyncReadable,
+    AsyncWritable,
+    DirEntry,
+    Kaos,
+    KaosProcess,
+    StatResult,
+    StrOrKaosPath,
+)
 from kaos.local import local_kaos
 from kaos.path import KaosPath
 
@@ -213,8 +222,23 @@ class ACPKaos:
     ) -> AsyncGenerator[KaosPath]:
         return self._fallback.glob(path, pattern, case_sensitive=case_sensitive)
 
-    async def readbytes(self, path: StrOrKaosPath, n: int | None = None) -> bytes:
-        return await self._fallback.readbytes(path, n=n)
+    async def scandir(self, path: StrOrKaosPath) -> list[DirEntry]:
+        return await self._fallback.scandir(path)
+
+    async def globstat(
+        self, path: StrOrKaosPath, pattern: str, *, case_sensitive: bool = True
+    ) -> list[DirEntry]:
+        return await self._fallback.globstat(path, pattern, case_sensitive=case_sensitive)
+
+    async def readbytes(
+        self, path: StrOrKaosPath, n: int | None = None, *, offset: int = 0
+    ) -> bytes:
+        return await self._fallback.readbytes(path, n=n, offset=offset)
+
+    def readchunks(
+        self, path: StrOrKaosPath, *, offset: int = 0, chunk_size: int = READ_CHUNK_SIZE
+    ) -> AsyncGenerator[bytes]:
+        return self._fallback.readchunks(path, offset=offset, chunk_size=chunk_size)
 
     async def readtext(
         self,
@@ -240,6 +264,24 @@ class ACPKaos:
         for line in text.splitlines(keepends=True):
             yield line
 
+    async def readlines_reverse(
+        self,
+        path: StrOrKaosPath,
+        *,
+        encoding: str = "utf-8",
+        errors: Literal["strict", "ignore", "replace"] = "strict",
+    ) -> AsyncGenerator[str]:
+        if not self._supports_read:
+            async for line in self._fallback.readlines_reverse(
+                self._abs_path(path), encoding=encoding, errors=errors
+            ):
+                yield line
+            return
+        # The client may hold unsaved edits, so read through it like `readlines`.
+        text = await self.readtext(path, encoding=encoding, errors=errors)
+        for line in reversed(text.splitlines(keepends=True)):
+            yield line
+
     async def writebytes(self, path: StrOrKaosPath, data: bytes) -> int:
         return await self._fallback.writebytes(path, data)
 
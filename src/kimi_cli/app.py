@@ -29,8 +29,10 @@ from kimi_cli.soul.context import Context
 from kimi_cli.soul.kimisoul import KimiSoul
 from kimi_cli.utils.aioqueue import QueueShutDown
 from kimi_cli.utils.envvar import get_env_bool
+from kimi_cli.utils.httpx import configure_http_clients
 from kimi_cli.utils.logging import logger, open_original_stderr, redirect_stderr_to_logger
 from kimi_cli.utils.path import shorten_home
+from kimi_cli.utils.tokenizer import configure_tokenizer
 from kimi_cli.wire import Wire, WireUISide
 from kimi_cli.wire.types import ApprovalRequest, ApprovalResponse, ContentPart, WireMessage
 
@@ -201,6 +203,8 @@ class KimiCLI:
         if max_ralph_iterations is not None:
             config.loop_control.max_ralph_iterations = max_ralph_iterations
         logger.info("Loaded config: {config}", config=config)
+        configure_tokenizer(config.tokenizer)
+        configure_http_clients(config.http)
 
         _phase_t = time.monotonic()
         oauth = OAuthManager(config)
@@ -301,7 +305,7 @@ class KimiCLI:
 
         if startup_progress is not None:
             startup_progress("Restoring conversation...")
-        context = Context(session.context_file)
+        context = Context(session.context_file, durability=config.context.durability)
         await context.restore()
 
         if context.system_prompt is not None:
@@ -508,7 +512,7 @@ class KimiCLI:
             await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
 
     @contextlib.asynccontextmanager
-    async def _env(self) -> AsyncGenerator[None]:
+    async def _env(self, *, ends_session: bool = True) -> AsyncGenerator[None]:
         original_cwd = KaosPath.cwd()
         await kaos.chdir(self._runtime.session.work_dir)
         try:
@@ -517,6 +521,9 @@ class KimiCLI:
             async with self._runtime.oauth.refreshing(self._runtime):
                 yield
         finally:
+            if ends_session:
+                # A background compaction must not outlive the session.
+                await self._soul.cancel_precompaction()
             await kaos.chdir(original_cwd)
 
     async def run(
@@ -543,7 +550,7 @@ class KimiCLI:
             MaxStepsReached: When the maximum number of steps is reached.
             RunCancelled: When the run is cancelled by the cancel event.
         """
-        async with self._env():
+        async with self._env(ends_session=False):
             wire_future = asyncio.Future[WireUISide]()
             stop_ui_loop = asyncio.Event()
             approval_bridge_tasks: dict[str, asyncio.Task[None]] = {}
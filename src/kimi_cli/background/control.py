@@ -0,0 +1,161 @@
+"""
+Local control channel between the manager and a background task worker.
+
+Each bash worker listens on a unix socket. The JSON files in the task directory stay the
+durable record, and a manager that cannot reach the socket falls back to them. Over the
+socket:
+
+- ``kill``: re-read ``control.json`` now instead of at the next poll; answered with ``ok``.
+- ``ping``: liveness check for a worker whose heartbeat looks stale, and by the worker itself
+  to notice that its socket is gone; answered with ``pong``.
+- ``watch``: no answer; the worker closes the connection once its final runtime is written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import socket
+import stat
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+from kimi_cli.utils.logging import logger
+
+# `sun_path` is 108 bytes on Linux and 104 on macOS.
+_MAX_SOCKET_PATH = 100
+
+
+def control_socket_path(task_id: str) -> Path | None:
+    """The control socket for `task_id`, or None where unix sockets cannot be used."""
+    if os.name == "nt" or not hasattr(socket, "AF_UNIX"):
+        return None
+    # Task directories live too deep below the share dir for `sun_path`.
+    path = Path(tempfile.gettempdir()) / f"kimi-bg-{os.getuid()}" / f"{task_id}.sock"
+    if len(os.fsencode(path)) > _MAX_SOCKET_PATH:
+        return None
+    return path
+
+
+class WorkerControlServer:
+    """The worker side of the control channel."""
+
+    def __init__(self, path: Path, *, on_kill: Callable[[], None]) -> None:
+        self._path = path
+        self._on_kill = on_kill
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @classmethod
+    async def start(cls, path: Path, *, on_kill: Callable[[], None]) -> WorkerControlServer | None:
+        """Listen on `path`; returns None if the socket cannot be created."""
+        control = cls(path, on_kill=on_kill)
+        try:
+            _ensure_private_dir(path.parent)
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            control._server = await asyncio.start_unix_server(control._handle, path=str(path))
+        except OSError as exc:
+            logger.warning(
+                "Failed to open background task control socket {path}: {error}",
+                path=path,
+                error=exc,
+            )
+            return None
+        return control
+
+    async def answers_ping(self) -> bool:
+        """Whether the socket is still reachable at its path and answers a ping."""
+        return await send_control_command(self._path, "ping") == "pong"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                match line.strip():
+                    case b"kill":
+                        self._on_kill()
+                        writer.write(b"ok\n")
+                    case b"ping":
+                        writer.write(b"pong\n")
+                    case _:
+                        continue
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def close(self) -> None:
+        """Stop listening and close all connections, which tells watchers the worker is done."""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            with contextlib.suppress(OSError):
+                await self._server.wait_closed()
+        with contextlib.suppress(OSError):
+            self._path.unlink()
+
+
+def _ensure_private_dir(path: Path) -> None:
+    """
+    Create the socket directory, which sits at a predictable path in the shared temp dir.
+
+    Raises:
+        OSError: If the directory is a symlink, or not owned by and private to this user.
+    """
+    with contextlib.suppress(FileExistsError):
+        path.mkdir(mode=0o700, parents=True)
+    st = path.lstat()
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or st.st_uid != os.getuid()
+        or stat.S_IMODE(st.st_mode) != 0o700
+    ):
+        raise OSError(f"{path} is not a private directory of the current user")
+
+
+async def send_control_command(path: Path, command: str, *, timeout_s: float = 0.5) -> str | None:
+    """Send one command and return the answer, or None if the worker cannot be reached."""
+    writer: asyncio.StreamWriter | None = None
+    try:
+        async with asyncio.timeout(timeout_s):
+            reader, writer = await asyncio.open_unix_connection(str(path))
+            writer.write(command.encode() + b"\n")
+            await writer.drain()
+            return (await reader.readline()).decode().strip() or None
+    except (OSError, TimeoutError):
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def watch_worker(path: Path) -> bool:
+    """
+    Wait until the worker behind `path` has finished.
+
+    Returns False right away if the worker cannot be reached.
+    """
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path))
+    except OSError:
+        return False
+    try:
+        writer.write(b"watch\n")
+        await writer.drain()
+        await reader.read()
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+    return True
@@ -6,6 +6,7 @@ import signal
 import subprocess
 import sys
 import time
+from collections.abc import AsyncIterator
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -21,6 +22,7 @@ from kimi_cli.utils.logging import logger
 if TYPE_CHECKING:
     from kimi_cli.soul.agent import Runtime
 
+from .control import control_socket_path, send_control_command, watch_worker
 from .ids import generate_task_id
 from .models import (
     TaskOutputChunk,
@@ -50,6 +52,14 @@ class BackgroundTaskManager:
         self._runtime: Runtime | None = None
         self._live_agent_tasks: dict[str, asyncio.Task[None]] = {}
         self._completion_event: asyncio.Event = asyncio.Event()
+        # Terminal tasks whose notification is already in the notification store. Their state
+        # is final, so `reconcile()` before every step does not need to look at them again.
+        self._notified_task_ids: set[str] = set()
+        # Last successful ping per bash worker that answers on its control socket.
+        self._worker_seen_at: dict[str, float] = {}
+        # Pings of workers whose heartbeat looks stale; each resolves to whether it answered.
+        self._worker_pings: dict[str, asyncio.Task[bool]] = {}
+        self._worker_watchers: set[asyncio.Task[None]] = set()
 
     @property
     def completion_event(self) -> asyncio.Event:
@@ -104,23 +114,7 @@ class BackgroundTaskManager:
         return self._active_task_count() > 0
 
     def _worker_command(self, task_dir: Path) -> list[str]:
-        if getattr(sys, "frozen", False):
-            return [
-                sys.executable,
-                "__background-task-worker",
-                "--task-dir",
-                str(task_dir),
-                "--heartbeat-interval-ms",
-                str(self._config.worker_heartbeat_interval_ms),
-                "--control-poll-interval-ms",
-                str(self._config.wait_poll_interval_ms),
-                "--kill-grace-period-ms",
-                str(self._config.kill_grace_period_ms),
-            ]
-        return [
-            sys.executable,
-            "-m",
-            "kimi_cli.cli",
+        args = [
             "__background-task-worker",
             "--task-dir",
             str(task_dir),
@@ -131,6 +125,12 @@ class BackgroundTaskManager:
             "--kill-grace-period-ms",
             str(self._config.kill_grace_period_ms),
         ]
+        control_socket = control_socket_path(task_dir.name)
+        if control_socket is not None:
+            args += ["--control-socket", str(control_socket)]
+        if getattr(sys, "frozen", False):
+            return [sys.executable, *args]
+        return [sys.executable, "-m", "kimi_cli.cli", *args]
 
     def _launch_worker(self, task_dir: Path) -> int:
         kwargs: dict[str, Any] = {
@@ -204,8 +204,35 @@ class BackgroundTaskManager:
             runtime.worker_pid = worker_pid
             runtime.updated_at = time.time()
             self._store.write_runtime(task_id, runtime)
+        self._watch_worker_exit(task_id)
         return self._store.merged_view(task_id)
 
+    def _watch_worker_exit(self, task_id: str) -> None:
+        """Publish the completion of a bash task as soon as its worker exits."""
+        control_socket = control_socket_path(task_id)
+        if control_socket is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        async def _watch() -> None:
+            # The worker needs a moment to start listening; until then, and if it never does,
+            # the per-step reconcile picks the completion up instead.
+            deadline = time.monotonic() + self._config.worker_stale_after_ms / 1000
+            while not await watch_worker(control_socket):
+                if time.monotonic() >= deadline:
+                    return
+                if is_terminal_status(self._store.read_runtime(task_id).status):
+                    break
+                await asyncio.sleep(self._config.wait_poll_interval_ms / 1000)
+            self.publish_terminal_notifications()
+
+        watcher = loop.create_task(_watch())
+        self._worker_watchers.add(watcher)
+        watcher.add_done_callback(self._worker_watchers.discard)
+
     def create_agent_task(
         self,
         *,
@@ -320,6 +347,36 @@ class BackgroundTaskManager:
             status=view.runtime.status,
         )
 
+    def read_output_lines(self, task_id: str, *, start: int, count: int) -> TaskOutputChunk:
+        """Read output lines `[start, start + count)`, 0-based."""
+        view = self._store.merged_view(task_id)
+        return self._store.read_output_lines(task_id, start, count, status=view.runtime.status)
+
+    async def follow_output(
+        self,
+        task_id: str,
+        *,
+        offset: int = 0,
+        max_bytes: int | None = None,
+    ) -> AsyncIterator[TaskOutputChunk]:
+        """Yield output from `offset` on as it is appended, until the task has finished."""
+        while True:
+            # Read the status first: once it is terminal, all output is already on disk.
+            view = self._store.merged_view(task_id)
+            chunk = self._store.read_output(
+                task_id,
+                offset,
+                max_bytes or self._config.read_max_bytes,
+                status=view.runtime.status,
+            )
+            if chunk.text:
+                yield chunk
+                offset = chunk.next_offset
+            if chunk.eof:
+                if is_terminal_status(chunk.status):
+                    return
+                await asyncio.sleep(self._config.wait_poll_interval_ms / 1000)
+
     def tail_output(
         self,
         task_id: str,
@@ -340,9 +397,18 @@ class BackgroundTaskManager:
             view = self._store.merged_view(task_id)
             if is_terminal_status(view.runtime.status):
                 return view
-            if time.monotonic() >= end_time:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
                 return view
-            await asyncio.sleep(self._config.wait_poll_interval_ms / 1000)
+            if view.runtime.control_socket is not None:
+                try:
+                    if await asyncio.wait_for(
+                        watch_worker(Path(view.runtime.control_socket)), remaining
+                    ):
+                        continue
+                except TimeoutError:
+                    continue
+            await asyncio.sleep(min(self._config.wait_poll_interval_ms / 1000, remaining))
 
     def _best_effort_kill(self, runtime: TaskRuntime) -> None:
         try:
@@ -398,6 +464,8 @@ class BackgroundTaskManager:
             }
         )
         self._store.write_control(task_id, control)
+        if view.runtime.control_socket is not None:
+            self._nudge_worker(Path(view.runtime.control_socket))
         self._best_effort_kill(view.runtime)
         return self._store.merged_view(task_id)
 
@@ -420,7 +488,7 @@ class BackgroundTaskManager:
     def recover(self) -> None:
         now = time.time()
         stale_after = self._config.worker_stale_after_ms / 1000
-        for view in self._store.list_views():
+        for view in self._store.list_views(exclude=self._notified_task_ids):
             if is_terminal_status(view.runtime.status):
                 continue
             if view.spec.kind == "agent":
@@ -442,11 +510,12 @@ class BackgroundTaskManager:
                     if record is not None and record.status == "running_background":
                         self._runtime.subagent_store.update_instance(agent_id, status="failed")
                 continue
-            last_progress_at = (
+            last_progress_at = max(
                 view.runtime.heartbeat_at
                 or view.runtime.started_at
                 or view.runtime.updated_at
-                or view.spec.created_at
+                or view.spec.created_at,
+                self._worker_seen_at.get(view.spec.id, 0.0),
             )
             if now - last_progress_at <= stale_after:
                 continue
@@ -463,6 +532,13 @@ class BackgroundTaskManager:
             )
             if now - fresh_progress <= stale_after:
                 continue
+            # A worker with a control socket gets a ping before it is declared lost, in case
+            # only its heartbeat writes are held up. The ping runs in the background, and its
+            # answer is looked at by the next recover().
+            if fresh_runtime.control_socket is not None and self._ping_worker(
+                view.spec.id, Path(fresh_runtime.control_socket)
+            ):
+                continue
 
             runtime = fresh_runtime.model_copy()
             runtime.finished_at = now
@@ -480,13 +556,54 @@ class BackgroundTaskManager:
                 )
             self._store.write_runtime(view.spec.id, runtime)
 
+    def _nudge_worker(self, control_socket: Path) -> None:
+        """Tell a worker to act on its `control.json` now rather than at its next poll."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # The worker still polls `control.json`
+
+        async def _nudge() -> None:
+            await send_control_command(control_socket, "kill")
+
+        nudge = loop.create_task(_nudge())
+        self._worker_watchers.add(nudge)
+        nudge.add_done_callback(self._worker_watchers.discard)
+
+    def _ping_worker(self, task_id: str, control_socket: Path) -> bool:
+        """
+        Whether a worker whose heartbeat looks stale may still be alive.
+
+        True while its ping is in flight or once it has answered; False once it has not,
+        or if there is no event loop to ping from.
+        """
+        ping = self._worker_pings.get(task_id)
+        if ping is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return False
+
+            async def _ping() -> bool:
+                if await send_control_command(control_socket, "ping") != "pong":
+                    return False
+                self._worker_seen_at[task_id] = time.time()
+                return True
+
+            self._worker_pings[task_id] = loop.create_task(_ping())
+            return True
+        if not ping.done():
+            return True
+        del self._worker_pings[task_id]
+        return not ping.cancelled() and ping.result()
+
     def reconcile(self, *, limit: int | None = None) -> list[str]:
         self.recover()
         return self.publish_terminal_notifications(limit=limit)
 
     def publish_terminal_notifications(self, *, limit: int | None = None) -> list[str]:
         published: list[str] = []
-        for view in self._store.list_views():
+        for view in self._store.list_views(exclude=self._notified_task_ids):
             if not is_terminal_status(view.runtime.status):
                 continue
 
@@ -587,6 +704,7 @@ class BackgroundTaskManager:
                 body=event.body,
             )
             notification = self._notifications.publish(event)
+            self._notified_task_ids.add(view.spec.id)
             if notification.event.id == event.id:
                 published.append(notification.event.id)
                 self._completion_event.set()
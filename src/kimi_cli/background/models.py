@@ -68,6 +68,9 @@ class TaskRuntime(BaseModel):
     interrupted: bool = False
     timed_out: bool = False
     failure_reason: str | None = None
+    control_socket: str | None = None
+    """Unix socket of the bash worker; while it answers, the worker does not rewrite
+    `heartbeat_at`. Cleared once the worker falls back to heartbeats."""
 
 
 class TaskControl(BaseModel):
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+# A checkpoint every this many lines bounds any line lookup to one short forward scan.
+LINE_INDEX_STRIDE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class OutputWindow:
+    """Decoded bytes `[offset, next_offset)` of an output log."""
+
+    offset: int
+    next_offset: int
+    text: str
+    total_size: int
+
+
+class OutputLog:
+    """
+    Reader for an append-only task output log.
+
+    Reads map the file and touch just the requested range; every range is widened or narrowed
+    to UTF-8 character boundaries, so no read splits a multi-byte sequence. Byte windows and
+    tails are read from the mapping directly. The line-addressed reads keep a sparse line index
+    (the byte offset of every `LINE_INDEX_STRIDE`-th line), built on their first use and then
+    extended over newly appended bytes only, since the log is written by the task process.
+    """
+
+    def __init__(self, path: Path, *, stride: int = LINE_INDEX_STRIDE) -> None:
+        self._path = path
+        self._stride = stride
+        self._inode: int | None = None
+        # `_checkpoints[k]` is the byte offset where line `k * stride` starts.
+        self._checkpoints: list[int] = [0]
+        # Bytes and complete lines covered by the index; always ends right after a newline.
+        self._indexed_size = 0
+        self._indexed_lines = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def line_count(self) -> int:
+        """Number of lines, counting a trailing line without newline."""
+        with self._map() as mm:
+            self._extend_index(mm)
+            return self._line_count(mm)
+
+    def read_since(self, offset: int, max_bytes: int) -> OutputWindow:
+        """Up to `max_bytes` from `offset`, never ending inside a UTF-8 sequence."""
+        with self._map() as mm:
+            size = len(mm)
+            start = _char_start(mm, min(max(offset, 0), size), forward=True)
+            end = min(start + max(max_bytes, 0), size)
+            if end < size:
+                end = _char_start(mm, end, forward=False)
+                if end <= start and start < size:
+                    # Always make progress, even if that means one character past `max_bytes`.
+                    end = _char_start(mm, start + 1, forward=True)
+            return OutputWindow(start, end, _decode(mm, start, end), size)
+
+    def read_lines(self, start: int, count: int) -> OutputWindow:
+        """Lines `[start, start + count)`, 0-based, each with its newline."""
+        with self._map() as mm:
+            self._extend_index(mm)
+            begin = self._line_offset(mm, start)
+            end = self._line_offset(mm, start + max(count, 0))
+            return OutputWindow(begin, end, _decode(mm, begin, end), len(mm))
+
+    def tail(self, max_lines: int, max_bytes: int) -> str:
+        """The last `max_lines` lines within the last `max_bytes` bytes."""
+        with self._map() as mm:
+            size = len(mm)
+            floor = max(0, size - max_bytes)
+            # Walk back over at most `max_lines` newlines, not counting one that ends the log.
+            start = size - 1 if size and mm[size - 1] == 0x0A else size
+            for _ in range(max(max_lines, 0)):
+                start = mm.rfind(b"\n", floor, start)
+                if start < 0:
+                    break
+            start = _char_start(mm, max(min(start + 1, size), floor), forward=True)
+            lines = _decode(mm, start, size).splitlines()
+        if len(lines) > max_lines:
+            lines = lines[-max_lines:]
+        return "\n".join(lines)
+
+    def _map(self) -> _Mapping:
+        try:
+            with self._path.open("rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_ino != self._inode or st.st_size < self._indexed_size:
+                    # Replaced or truncated: start the index over.
+                    self._inode = st.st_ino
+                    self._checkpoints = [0]
+                    self._indexed_size = 0
+                    self._indexed_lines = 0
+                if st.st_size == 0:
+                    return _Mapping(b"")
+                mm = mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return _Mapping(b"")
+        return _Mapping(mm)
+
+    def _extend_index(self, mm: _Buffer) -> None:
+        # Index complete lines only; a partial last line is picked up once it ends.
+        end = mm.rfind(b"\n", self._indexed_size) + 1
+        if end <= self._indexed_size:
+            return
+        pos = self._indexed_size
+        lines = self._indexed_lines
+        while pos < end:
+            pos = mm.find(b"\n", pos, end) + 1
+            lines += 1
+            if lines % self._stride == 0:
+                self._checkpoints.append(pos)
+        self._indexed_size = end
+        self._indexed_lines = lines
+
+    def _line_count(self, mm: _Buffer) -> int:
+        return self._indexed_lines + (1 if len(mm) > self._indexed_size else 0)
+
+    def _line_offset(self, mm: _Buffer, line: int) -> int:
+        """Byte offset where `line` starts, or the end of the log past the last line."""
+        if line >= self._indexed_lines:
+            return len(mm) if line > self._indexed_lines else self._indexed_size
+        checkpoint = min(line // self._stride, len(self._checkpoints) - 1)
+        pos = self._checkpoints[checkpoint]
+        for _ in range(line - checkpoint * self._stride):
+            pos = mm.find(b"\n", pos) + 1
+        return pos
+
+
+type _Buffer = mmap.mmap | bytes
+
+
+class _Mapping:
+    """Context manager that unmaps the file on exit."""
+
+    def __init__(self, buffer: _Buffer) -> None:
+        self._buffer = buffer
+
+    def __enter__(self) -> _Buffer:
+        return self._buffer
+
+    def __exit__(self, *_exc: object) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def _char_start(buffer: _Buffer, pos: int, *, forward: bool) -> int:
+    """Move `pos` off UTF-8 continuation bytes, by at most three bytes."""
+    size = len(buffer)
+    for _ in range(3):
+        if pos <= 0 or pos >= size or buffer[pos] & 0xC0 != 0x80:
+            break
+        pos += 1 if forward else -1
+    return pos
+
+
+def _decode(buffer: _Buffer, start: int, end: int) -> str:
+    return buffer[start:end].decode("utf-8", errors="replace")
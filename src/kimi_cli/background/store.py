@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import os
 import re
+import time
+from collections.abc import Callable, Container
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from pydantic import BaseModel, ValidationError
@@ -18,6 +20,7 @@ from .models import (
     TaskStatus,
     TaskView,
 )
+from .output import OutputLog
 
 _VALID_TASK_ID = re.compile(r"^[a-z0-9][a-z0-9\-]{1,24}$")
 
@@ -27,6 +30,35 @@ def _validate_task_id(task_id: str) -> None:
         raise ValueError(f"Invalid task_id: {task_id!r}")
 
 
+_RACY_WINDOW_NS = 2_000_000_000
+
+type _FileSignature = tuple[int, int, int]
+"""`(st_ino, st_mtime_ns, st_size)`; atomic writes replace the file, so the inode changes too."""
+
+
+def _file_signature(path: Path) -> _FileSignature | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+@dataclass(slots=True)
+class _CachedFile[T: BaseModel]:
+    signature: _FileSignature | None
+    model: T
+
+
+@dataclass(slots=True)
+class _TaskIndex:
+    """Parsed task files of one store, each valid for as long as its file signature holds."""
+
+    files: dict[Path, _CachedFile[BaseModel]] = field(default_factory=lambda: {})
+    root_signature: _FileSignature | None = None
+    task_ids: list[str] = field(default_factory=lambda: [])
+
+
 class BackgroundTaskStore:
     SPEC_FILE = "spec.json"
     RUNTIME_FILE = "runtime.json"
@@ -36,6 +68,10 @@ class BackgroundTaskStore:
 
     def __init__(self, root: Path):
         self._root = root
+        # Workers write the task files from other processes, so every cached entry is
+        # revalidated with a `stat` before use; only files that changed are read again.
+        self._index = _TaskIndex()
+        self._output_logs: dict[Path, OutputLog] = {}
 
     @property
     def root(self) -> Path:
@@ -73,75 +109,126 @@ class BackgroundTaskStore:
 
     def create_task(self, spec: TaskSpec) -> None:
         task_dir = self.task_dir(spec.id)
-        atomic_json_write(spec.model_dump(mode="json"), task_dir / self.SPEC_FILE)
-        atomic_json_write(TaskRuntime().model_dump(mode="json"), task_dir / self.RUNTIME_FILE)
-        atomic_json_write(TaskControl().model_dump(mode="json"), task_dir / self.CONTROL_FILE)
-        atomic_json_write(
-            TaskConsumerState().model_dump(mode="json"),
-            task_dir / self.CONSUMER_FILE,
-        )
+        self._write_model(task_dir / self.SPEC_FILE, spec)
+        self._write_model(task_dir / self.RUNTIME_FILE, TaskRuntime())
+        self._write_model(task_dir / self.CONTROL_FILE, TaskControl())
+        self._write_model(task_dir / self.CONSUMER_FILE, TaskConsumerState())
         self.output_path(spec.id).touch(exist_ok=True)
 
     def list_task_ids(self) -> list[str]:
-        if not self.root.exists():
+        root_signature = _file_signature(self.root)
+        if root_signature is None:
             return []
+        # Creating or removing a task directory changes the mtime of the root.
+        if root_signature == self._index.root_signature:
+            return list(self._index.task_ids)
         task_ids: list[str] = []
+        complete = True
         for path in sorted(self.root.iterdir()):
             if not path.is_dir():
                 continue
             if not (path / self.SPEC_FILE).exists():
+                # Possibly a task being created; its spec will not touch the root mtime.
+                complete = False
                 continue
             task_ids.append(path.name)
-        return task_ids
+        # Directory mtimes are only as fine as the kernel clock tick, so a listing taken right
+        # after a change may miss a sibling created within the same tick.
+        racy = time.time_ns() - root_signature[1] < _RACY_WINDOW_NS
+        self._index.root_signature = root_signature if complete and not racy else None
+        self._index.task_ids = task_ids
+        live = set(task_ids)
+        for path in [path for path in self._index.files if path.parent.name not in live]:
+            del self._index.files[path]
+        return list(task_ids)
 
     def write_spec(self, spec: TaskSpec) -> None:
-        atomic_json_write(spec.model_dump(mode="json"), self.spec_path(spec.id))
+        self._write_model(self.spec_path(spec.id), spec)
 
     def read_spec(self, task_id: str) -> TaskSpec:
-        return TaskSpec.model_validate_json(self.spec_path(task_id).read_text(encoding="utf-8"))
+        path = self.spec_path(task_id)
+        signature = _file_signature(path)
+        cached = self._cached(path, signature, TaskSpec)
+        if cached is not None:
+            return cached
+        spec = TaskSpec.model_validate_json(path.read_text(encoding="utf-8"))
+        self._index.files[path] = _CachedFile(signature, spec.model_copy(deep=True))
+        return spec
 
     def write_runtime(self, task_id: str, runtime: TaskRuntime) -> None:
-        atomic_json_write(runtime.model_dump(mode="json"), self.runtime_path(task_id))
+        self._write_model(self.runtime_path(task_id), runtime)
 
     def read_runtime(self, task_id: str) -> TaskRuntime:
-        path = self.runtime_path(task_id)
-        if not path.exists():
-            return TaskRuntime()
-        return _read_json_model(
-            path,
+        return self._read_cached(
+            self.runtime_path(task_id),
             TaskRuntime,
-            fallback=TaskRuntime(updated_at=0),
+            missing=TaskRuntime,
+            fallback=lambda: TaskRuntime(updated_at=0),
             artifact="task runtime",
         )
 
     def write_control(self, task_id: str, control: TaskControl) -> None:
-        atomic_json_write(control.model_dump(mode="json"), self.control_path(task_id))
+        self._write_model(self.control_path(task_id), control)
 
     def read_control(self, task_id: str) -> TaskControl:
-        path = self.control_path(task_id)
-        if not path.exists():
-            return TaskControl()
-        return _read_json_model(
-            path,
+        return self._read_cached(
+            self.control_path(task_id),
             TaskControl,
-            fallback=TaskControl(),
+            missing=TaskControl,
+            fallback=TaskControl,
             artifact="task control",
         )
 
     def write_consumer(self, task_id: str, consumer: TaskConsumerState) -> None:
-        atomic_json_write(consumer.model_dump(mode="json"), self.consumer_path(task_id))
+        self._write_model(self.consumer_path(task_id), consumer)
 
     def read_consumer(self, task_id: str) -> TaskConsumerState:
-        path = self.consumer_path(task_id)
-        if not path.exists():
-            return TaskConsumerState()
-        return _read_json_model(
-            path,
+        return self._read_cached(
+            self.consumer_path(task_id),
             TaskConsumerState,
-            fallback=TaskConsumerState(),
+            missing=TaskConsumerState,
+            fallback=TaskConsumerState,
             artifact="task consumer state",
         )
 
+    def _write_model(self, path: Path, model: BaseModel) -> None:
+        atomic_json_write(model.model_dump(mode="json"), path)
+        self._index.files[path] = _CachedFile(_file_signature(path), model.model_copy(deep=True))
+
+    def _cached[T: BaseModel](
+        self, path: Path, signature: _FileSignature | None, model: type[T]
+    ) -> T | None:
+        cached = self._index.files.get(path)
+        if (
+            signature is None
+            or cached is None
+            or cached.signature != signature
+            or not isinstance(cached.model, model)
+        ):
+            return None
+        # Callers routinely mutate what they read before writing it back.
+        return cached.model.model_copy(deep=True)
+
+    def _read_cached[T: BaseModel](
+        self,
+        path: Path,
+        model: type[T],
+        *,
+        missing: Callable[[], T],
+        fallback: Callable[[], T],
+        artifact: str,
+    ) -> T:
+        signature = _file_signature(path)
+        if signature is None:
+            self._index.files.pop(path, None)
+            return missing()
+        cached = self._cached(path, signature, model)
+        if cached is not None:
+            return cached
+        value = _read_json_model(path, model, fallback=fallback(), artifact=artifact)
+        self._index.files[path] = _CachedFile(signature, value.model_copy(deep=True))
+        return value
+
     def merged_view(self, task_id: str) -> TaskView:
         return TaskView(
             spec=self.read_spec(task_id),
@@ -150,9 +237,17 @@ class BackgroundTaskStore:
             consumer=self.read_consumer(task_id),
         )
 
-    def list_views(self) -> list[TaskView]:
+    def list_views(self, *, exclude: Container[str] = ()) -> list[TaskView]:
+        """
+        Merged views of all tasks, most recently updated first.
+
+        Task files are only read again when they changed on disk; tasks in `exclude` are not
+        looked at at all.
+        """
         views: list[TaskView] = []
         for task_id in self.list_task_ids():
+            if task_id in exclude:
+                continue
             try:
                 views.append(self.merged_view(task_id))
             except (OSError, ValidationError, ValueError, UnicodeDecodeError) as exc:
@@ -168,6 +263,13 @@ class BackgroundTaskStore:
         )
         return views
 
+    def output_log(self, task_id: str) -> OutputLog:
+        path = self.output_path(task_id)
+        log = self._output_logs.get(path)
+        if log is None:
+            log = self._output_logs[path] = OutputLog(path)
+        return log
+
     def read_output(
         self,
         task_id: str,
@@ -175,53 +277,38 @@ class BackgroundTaskStore:
         max_bytes: int,
         *,
         status: TaskStatus,
-        path_override: Path | None = None,
     ) -> TaskOutputChunk:
-        path = path_override if path_override is not None else self.output_path(task_id)
-        if not path.exists():
-            return TaskOutputChunk(
-                task_id=task_id,
-                offset=offset,
-                next_offset=offset,
-                text="",
-                eof=True,
-                status=status,
-            )
-
-        with path.open("rb") as f:
-            f.seek(0, os.SEEK_END)
-            total_size = f.tell()
-            bounded_offset = min(max(offset, 0), total_size)
-            f.seek(bounded_offset)
-            content = f.read(max_bytes)
-
-        next_offset = bounded_offset + len(content)
+        window = self.output_log(task_id).read_since(offset, max_bytes)
         return TaskOutputChunk(
             task_id=task_id,
-            offset=bounded_offset,
-            next_offset=next_offset,
-            text=content.decode("utf-8", errors="replace"),
-            eof=next_offset >= total_size,
+            offset=window.offset,
+            next_offset=window.next_offset,
+            text=window.text,
+            eof=window.next_offset >= window.total_size,
+            status=status,
+        )
+
+    def read_output_lines(
+        self,
+        task_id: str,
+        start: int,
+        count: int,
+        *,
+        status: TaskStatus,
+    ) -> TaskOutputChunk:
+        """Output lines `[start, start + count)`, 0-based."""
+        window = self.output_log(task_id).read_lines(start, count)
+        return TaskOutputChunk(
+            task_id=task_id,
+            offset=window.offset,
+            next_offset=window.next_offset,
+            text=window.text,
+            eof=window.next_offset >= window.total_size,
             status=status,
         )
 
     def tail_output(self, task_id: str, max_bytes: int, max_lines: int) -> str:
-        path = self.output_path(task_id)
-        if not path.exists():
-            return ""
-
-        with path.open("rb") as f:
-            f.seek(0, os.SEEK_END)
-            total_size = f.tell()
-            start = max(0, total_size - max_bytes)
-            f.seek(start)
-            content = f.read()
-
-        text = content.decode("utf-8", errors="replace")
-        lines = text.splitlines()
-        if len(lines) > max_lines:
-            lines = lines[-max_lines:]
-        return "\n".join(lines)
+        return self.output_log(task_id).tail(max_lines, max_bytes)
 
 
 def _read_json_model[T: BaseModel](path: Path, model: type[T], *, fallback: T, artifact: str) -> T:
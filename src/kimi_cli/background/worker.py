@@ -12,6 +12,7 @@ from typing import Any
 from kimi_cli.utils.logging import logger
 from kimi_cli.utils.subprocess_env import get_clean_env
 
+from .control import WorkerControlServer
 from .models import TaskControl
 from .store import BackgroundTaskStore
 
@@ -34,6 +35,37 @@ async def run_background_task_worker(
     heartbeat_interval_ms: int = 5000,
     control_poll_interval_ms: int = 500,
     kill_grace_period_ms: int = 2000,
+    control_socket: Path | None = None,
+) -> None:
+    kill_event = asyncio.Event()
+    control_server = (
+        await WorkerControlServer.start(control_socket, on_kill=kill_event.set)
+        if control_socket is not None
+        else None
+    )
+    try:
+        await _run_worker(
+            task_dir,
+            heartbeat_interval_ms=heartbeat_interval_ms,
+            control_poll_interval_ms=control_poll_interval_ms,
+            kill_grace_period_ms=kill_grace_period_ms,
+            control_server=control_server,
+            kill_event=kill_event,
+        )
+    finally:
+        # Closing the connections tells watching managers that the final runtime is written.
+        if control_server is not None:
+            await control_server.close()
+
+
+async def _run_worker(
+    task_dir: Path,
+    *,
+    heartbeat_interval_ms: int,
+    control_poll_interval_ms: int,
+    kill_grace_period_ms: int,
+    control_server: WorkerControlServer | None,
+    kill_event: asyncio.Event,
 ) -> None:
     task_dir = task_dir.expanduser().resolve()
     task_id = task_dir.name
@@ -46,6 +78,7 @@ async def run_background_task_worker(
     runtime.started_at = time.time()
     runtime.heartbeat_at = runtime.started_at
     runtime.updated_at = runtime.started_at
+    runtime.control_socket = str(control_server.path) if control_server is not None else None
     store.write_runtime(task_id, runtime)
 
     control = store.read_control(task_id)
@@ -74,6 +107,9 @@ async def run_background_task_worker(
     timed_out = False
     timeout_reason: str | None = None
 
+    # Whether managers can reach this worker over its control socket.
+    control_live = control_server is not None
+
     async def _heartbeat_loop() -> None:
         while not stop_event.is_set():
             await asyncio.sleep(heartbeat_interval_ms / 1000)
@@ -82,8 +118,27 @@ async def run_background_task_worker(
                 return
             current.heartbeat_at = time.time()
             current.updated_at = current.heartbeat_at
+            # Managers stop pinging the socket and go by the heartbeat instead.
+            current.control_socket = None
             store.write_runtime(task_id, current)
 
+    async def _control_socket_loop() -> None:
+        nonlocal control_live
+        # While the socket answers, managers ping it instead of reading heartbeats. If it
+        # stops answering, e.g. because a temp cleaner removed it, fall back to heartbeats.
+        assert control_server is not None
+        while not stop_event.is_set():
+            await asyncio.sleep(heartbeat_interval_ms / 1000)
+            if not await control_server.answers_ping():
+                logger.warning(
+                    "Background task control socket {path} stopped answering; "
+                    "writing heartbeats instead",
+                    path=control_server.path,
+                )
+                control_live = False
+                await _heartbeat_loop()
+                return
+
     async def _terminate_process(force: bool = False) -> None:
         nonlocal kill_sent_at
         if process is None or process.returncode is not None:
@@ -106,7 +161,17 @@ async def run_background_task_worker(
     async def _control_loop() -> None:
         nonlocal kill_sent_at
         while not stop_event.is_set():
-            await asyncio.sleep(control_poll_interval_ms / 1000)
+            # With a control socket, kill requests arrive as `kill_event`; `control.json` is
+            # still checked now and then for requests from managers that could not connect.
+            # Once a kill is underway, poll quickly to enforce the grace period.
+            interval_ms = (
+                heartbeat_interval_ms
+                if control_live and kill_sent_at is None
+                else control_poll_interval_ms
+            )
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(kill_event.wait(), timeout=interval_ms / 1000)
+            kill_event.clear()
             current_control: TaskControl = store.read_control(task_id)
             if current_control.kill_requested_at is not None:
                 await _terminate_process(force=current_control.force)
@@ -149,7 +214,9 @@ async def run_background_task_worker(
             store.write_runtime(task_id, runtime)
             last_known_runtime = runtime
 
-            heartbeat_task = asyncio.create_task(_heartbeat_loop())
+            heartbeat_task = asyncio.create_task(
+                _heartbeat_loop() if control_server is None else _control_socket_loop()
+            )
             control_task = asyncio.create_task(_control_loop())
             if spec.timeout_s is None:
                 returncode = await process.wait()
@@ -1028,6 +1028,7 @@ def background_task_worker(
     heartbeat_interval_ms: Annotated[int, typer.Option("--heartbeat-interval-ms")] = 5000,
     control_poll_interval_ms: Annotated[int, typer.Option("--control-poll-interval-ms")] = 500,
     kill_grace_period_ms: Annotated[int, typer.Option("--kill-grace-period-ms")] = 2000,
+    control_socket: Annotated[Path | None, typer.Option("--control-socket")] = None,
 ) -> None:
     """Run background task worker subprocess (internal)."""
     import asyncio
@@ -1046,6 +1047,7 @@ def background_task_worker(
             heartbeat_interval_ms=heartbeat_interval_ms,
             control_poll_interval_ms=control_poll_interval_ms,
             kill_grace_period_ms=kill_grace_period_ms,
+            control_socket=control_socket,
         )
     )
 
@@ -95,6 +95,14 @@ class LoopControl(BaseModel):
     """Context usage ratio threshold for auto-compaction. Default is 0.85 (85%).
     Auto-compaction triggers when context_tokens >= max_context_size * compaction_trigger_ratio
     or when context_tokens + reserved_context_size >= max_context_size."""
+    precompaction_trigger_ratio: float = Field(default=0.0, ge=0.0, le=0.99)
+    """Context usage ratio at which auto-compaction starts in the background, ahead of
+    compaction_trigger_ratio. The result is applied at the next step boundary unless the
+    history was reverted in the meantime. Default is 0 (disabled)."""
+    compaction_strategy: Literal["simple", "chunked"] = "simple"
+    """How context is compacted. "simple" summarizes the history in one LLM call; "chunked"
+    summarizes it in token-bounded chunks that are merged afterwards, for histories too large
+    for one call, and caps the preserved tail at 15% of the context size. Default is "simple"."""
 
 
 class BackgroundConfig(BaseModel):
@@ -127,6 +135,53 @@ class NotificationConfig(BaseModel):
     claim_stale_after_ms: int = Field(default=15_000, ge=1000)
 
 
+class ContextConfig(BaseModel):
+    """Context history (`context.jsonl`) persistence configuration."""
+
+    durability: Literal["flush", "fsync"] = "flush"
+    """How each group of context records (one per agent step) is committed: "flush" hands
+    it to the OS, "fsync" also waits for it to reach the disk."""
+
+
+class TokenizerConfig(BaseModel):
+    """Offline tokenizer used to estimate context usage between LLM calls."""
+
+    backend: Literal["heuristic", "tiktoken"] = "heuristic"
+    """"heuristic" estimates from character classes; "tiktoken" counts with a BPE vocabulary
+    and requires the `tiktoken` package. Falls back to "heuristic" if the vocabulary cannot be
+    loaded."""
+    encoding: str = "o200k_base"
+    """The tiktoken encoding to count with."""
+    cache_dir: str | None = None
+    """A directory with pre-downloaded tiktoken vocabulary files, for machines without network
+    access. Defaults to tiktoken's own cache."""
+
+
+class HttpConfig(BaseModel):
+    """Connection pools shared by the chat providers, one per API origin."""
+
+    max_connections: int = Field(default=100, ge=1)
+    """Maximum number of concurrent connections per origin."""
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    """Maximum number of idle connections kept open per origin."""
+    keepalive_expiry_ms: int = Field(default=30_000, ge=0)
+    """Close idle connections after this long."""
+    http2: bool = False
+    """Use HTTP/2 where the server supports it. Requires the `h2` package, ignored without it."""
+
+
+class WireConfig(BaseModel):
+    """Wire recording (`wire.jsonl`) configuration."""
+
+    record_flush_bytes: int = Field(default=64 * 1024, ge=0)
+    """Write buffered wire records once they reach this many bytes. 0 writes every record."""
+    record_flush_interval_ms: int = Field(default=1_000, ge=0)
+    """Write buffered wire records at most this long after the oldest one was recorded."""
+    record_fsync: Literal["never", "flush", "close"] = "never"
+    """When to fsync `wire.jsonl`: never, after every written batch, or once when the recording
+    is closed as a run ends. Records flushed at a `TurnEnd` are not fsynced in "close" mode."""
+
+
 class MoonshotSearchConfig(BaseModel):
     """Moonshot Search configuration."""
 
@@ -238,6 +293,16 @@ class Config(BaseModel):
     notifications: NotificationConfig = Field(
         default_factory=NotificationConfig, description="Notification configuration"
     )
+    context: ContextConfig = Field(
+        default_factory=ContextConfig, description="Context history persistence configuration"
+    )
+    http: HttpConfig = Field(
+        default_factory=HttpConfig, description="HTTP connection pool configuration"
+    )
+    tokenizer: TokenizerConfig = Field(
+        default_factory=TokenizerConfig, description="Offline tokenizer configuration"
+    )
+    wire: WireConfig = Field(default_factory=WireConfig, description="Wire recording configuration")
     services: Services = Field(default_factory=Services, description="Services configuration")
     mcp: MCPConfig = Field(default_factory=MCPConfig, description="MCP configuration")
     hooks: list[HookDef] = Field(default_factory=list, description="Hook definitions")  # pyright: ignore[reportUnknownVariableType]
@@ -10,6 +10,7 @@ from kosong.chat_provider import ChatProvider
 from pydantic import SecretStr
 
 from kimi_cli.constant import USER_AGENT
+from kimi_cli.utils.httpx import shared_http_client
 from kimi_cli.utils.logging import logger
 
 if TYPE_CHECKING:
@@ -133,6 +134,7 @@ def create_llm(
                 base_url=provider.base_url,
                 api_key=resolved_api_key,
                 default_headers=_kimi_default_headers(provider, oauth),
+                http_client=shared_http_client(provider.base_url),
             )
 
             gen_kwargs: Kimi.GenerationKwargs = {}
@@ -161,6 +163,7 @@ def create_llm(
                 api_key=resolved_api_key,
                 reasoning_key=reasoning_key,
                 default_headers=dict(provider.custom_headers) if provider.custom_headers else None,
+                http_client=shared_http_client(provider.base_url),
             )
             if provider.extra_body:
                 chat_provider = chat_provider.with_extra_body(provider.extra_body)
@@ -172,6 +175,7 @@ def create_llm(
                 base_url=provider.base_url,
                 api_key=resolved_api_key,
                 default_headers=dict(provider.custom_headers) if provider.custom_headers else None,
+                http_client=shared_http_client(provider.base_url),
             )
         case "anthropic":
             from kosong.contrib.chat_provider.anthropic import Anthropic
@@ -183,6 +187,7 @@ def create_llm(
                 default_max_tokens=50000,
                 metadata={"user_id": session_id} if session_id else None,
                 default_headers=dict(provider.custom_headers) if provider.custom_headers else None,
+                http_client=shared_http_client(provider.base_url),
             )
         case "google_genai" | "gemini":
             from kosong.contrib.chat_provider.google_genai import GoogleGenAI
@@ -192,6 +197,7 @@ def create_llm(
                 base_url=provider.base_url,
                 api_key=resolved_api_key,
                 default_headers=dict(provider.custom_headers) if provider.custom_headers else None,
+                http_client=shared_http_client(provider.base_url),
             )
         case "vertexai":
             from kosong.contrib.chat_provider.google_genai import GoogleGenAI
@@ -203,6 +209,7 @@ def create_llm(
                 api_key=resolved_api_key,
                 vertexai=True,
                 default_headers=dict(provider.custom_headers) if provider.custom_headers else None,
+                http_client=shared_http_client(provider.base_url),
             )
         case "_echo":
             from kosong.chat_provider.echo import EchoChatProvider
@@ -227,6 +234,7 @@ def create_llm(
                     base_url=provider.base_url,
                     api_key=resolved_api_key,
                     default_headers=_kimi_default_headers(provider, oauth),
+                    http_client=shared_http_client(provider.base_url),
                 ),
                 chaos_config=ChaosConfig(
                     error_probability=0.8,
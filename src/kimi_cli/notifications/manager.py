@@ -5,6 +5,8 @@ import uuid
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 
+from pydantic import ValidationError
+
 from kimi_cli.config import NotificationConfig
 from kimi_cli.utils.logging import logger
 
@@ -33,10 +35,21 @@ class NotificationManager:
         return NotificationDelivery(sinks={sink: NotificationSinkState() for sink in event.targets})
 
     def find_by_dedupe_key(self, dedupe_key: str) -> NotificationView | None:
-        for view in self._store.list_views():
-            if view.event.dedupe_key == dedupe_key:
-                return view
-        return None
+        notification_id = self._store.find_id_by_dedupe_key(dedupe_key)
+        if notification_id is None:
+            return None
+        return self._read_view(notification_id)
+
+    def _read_view(self, notification_id: str) -> NotificationView | None:
+        try:
+            return self._store.merged_view(notification_id)
+        except (OSError, ValidationError, ValueError, UnicodeDecodeError) as exc:
+            logger.warning(
+                "Skipping invalid notification {notification_id}: {error}",
+                notification_id=notification_id,
+                error=exc,
+            )
+            return None
 
     def publish(self, event: NotificationEvent) -> NotificationView:
         if event.dedupe_key:
@@ -50,7 +63,10 @@ class NotificationManager:
     def recover(self) -> None:
         now = time.time()
         stale_after = self._config.claim_stale_after_ms / 1000
-        for view in self._store.list_views():
+        for notification_id in self._store.ids_with_status("claimed"):
+            view = self._read_view(notification_id)
+            if view is None:
+                continue
             updated = False
             delivery = view.delivery.model_copy(deep=True)
             for sink_state in delivery.sinks.values():
@@ -66,21 +82,20 @@ class NotificationManager:
 
     def has_pending_for_sink(self, sink: str) -> bool:
         """Check whether any notification has a pending delivery for *sink*."""
-        for view in self._store.list_views():
-            sink_state = view.delivery.sinks.get(sink)
-            if sink_state is not None and sink_state.status == "pending":
-                return True
-        return False
+        return self._store.has_sink_status(sink, "pending")
 
     def claim_for_sink(self, sink: str, *, limit: int = 8) -> list[NotificationView]:
         self.recover()
         claimed: list[NotificationView] = []
         now = time.time()
-        for view in reversed(self._store.list_views()):
-            sink_state = view.delivery.sinks.get(sink)
-            if sink_state is None or sink_state.status == "acked":
+        for notification_id in self._store.ids_with_sink_status(sink, "pending"):
+            view = self._read_view(notification_id)
+            if view is None:
                 continue
-            if sink_state.status == "claimed":
+            sink_state = view.delivery.sinks.get(sink)
+            if sink_state is None or sink_state.status != "pending":
+                # The journal lags the delivery file (e.g. after a crash); bring it up to date.
+                self._store.write_delivery(notification_id, view.delivery)
                 continue
             delivery = view.delivery.model_copy(deep=True)
             target_state = delivery.sinks[sink]
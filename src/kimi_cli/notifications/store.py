@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import contextlib
+import os
 import re
+import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from kimi_cli.utils.io import atomic_json_write
 from kimi_cli.utils.logging import logger
 
-from .models import NotificationDelivery, NotificationEvent, NotificationView
+from .models import (
+    NotificationDelivery,
+    NotificationDeliveryStatus,
+    NotificationEvent,
+    NotificationSinkState,
+    NotificationView,
+)
 
 _VALID_NOTIFICATION_ID = re.compile(r"^[a-z0-9]{2,20}$")
 
@@ -18,12 +28,65 @@ def _validate_notification_id(notification_id: str) -> None:
         raise ValueError(f"Invalid notification_id: {notification_id!r}")
 
 
+# Rewrite the journal once it holds this many records and at least twice as many as the
+# notifications it still needs to describe.
+_JOURNAL_COMPACT_MIN_RECORDS = 256
+
+
+class _JournalRecord(BaseModel):
+    """Latest delivery state of one notification; later records replace earlier ones."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    created_at: float
+    dedupe_key: str | None = None
+    sinks: dict[str, NotificationSinkState] = Field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _NotificationIndex:
+    """Pending/claimed notifications per sink and all dedupe keys, replayed from the journal."""
+
+    records: dict[str, _JournalRecord] = field(default_factory=lambda: {})
+    by_dedupe_key: dict[str, str] = field(default_factory=lambda: {})
+    by_sink_status: dict[tuple[str, NotificationDeliveryStatus], set[str]] = field(
+        default_factory=lambda: {}
+    )
+    journal_records: int = 0
+    journal_inode: int | None = None
+    journal_offset: int = 0
+
+    def apply(self, record: _JournalRecord) -> None:
+        previous = self.records.get(record.id)
+        if previous is not None:
+            for sink, state in previous.sinks.items():
+                self.by_sink_status.get((sink, state.status), set()).discard(record.id)
+        self.journal_records += 1
+        if record.dedupe_key:
+            self.by_dedupe_key.setdefault(record.dedupe_key, record.id)
+        # Fully acked notifications only matter for deduplication from now on.
+        if all(state.status == "acked" for state in record.sinks.values()):
+            if not record.dedupe_key:
+                self.records.pop(record.id, None)
+                return
+            record = record.model_copy(update={"sinks": {}})
+        self.records[record.id] = record
+        for sink, state in record.sinks.items():
+            self.by_sink_status.setdefault((sink, state.status), set()).add(record.id)
+
+
 class NotificationStore:
     EVENT_FILE = "event.json"
     DELIVERY_FILE = "delivery.json"
+    JOURNAL_FILE = "journal.jsonl"
 
     def __init__(self, root: Path):
         self._root = root
+        # The event/delivery files stay the durable record of every notification. The journal
+        # next to them lets the hot paths (claiming, pending checks, dedupe lookups) answer from
+        # memory instead of reading every notification ever published in the session.
+        self._index: _NotificationIndex | None = None
 
     @property
     def root(self) -> Path:
@@ -50,14 +113,28 @@ class NotificationStore:
     def delivery_path(self, notification_id: str) -> Path:
         return self.notification_path(notification_id) / self.DELIVERY_FILE
 
+    @property
+    def journal_path(self) -> Path:
+        return self.root / self.JOURNAL_FILE
+
     def create_notification(
         self,
         event: NotificationEvent,
         delivery: NotificationDelivery,
     ) -> None:
+        index = self._sync_index()
         notification_dir = self.notification_dir(event.id)
         atomic_json_write(event.model_dump(mode="json"), notification_dir / self.EVENT_FILE)
         atomic_json_write(delivery.model_dump(mode="json"), notification_dir / self.DELIVERY_FILE)
+        self._append_journal(
+            index,
+            _JournalRecord(
+                id=event.id,
+                created_at=event.created_at,
+                dedupe_key=event.dedupe_key,
+                sinks=delivery.sinks,
+            ),
+        )
 
     def list_notification_ids(self) -> list[str]:
         if not self.root.exists():
@@ -94,7 +171,126 @@ class NotificationStore:
             return NotificationDelivery()
 
     def write_delivery(self, notification_id: str, delivery: NotificationDelivery) -> None:
+        index = self._sync_index()
         atomic_json_write(delivery.model_dump(mode="json"), self.delivery_path(notification_id))
+        previous = index.records.get(notification_id)
+        if previous is None:
+            try:
+                event = self.read_event(notification_id)
+            except (OSError, ValidationError, ValueError, UnicodeDecodeError):
+                return
+            previous = _JournalRecord(
+                id=event.id, created_at=event.created_at, dedupe_key=event.dedupe_key
+            )
+        self._append_journal(index, previous.model_copy(update={"sinks": delivery.sinks}))
+
+    def find_id_by_dedupe_key(self, dedupe_key: str) -> str | None:
+        return self._sync_index().by_dedupe_key.get(dedupe_key)
+
+    def ids_with_sink_status(self, sink: str, status: NotificationDeliveryStatus) -> list[str]:
+        """IDs of notifications whose delivery to `sink` is in `status`, oldest first."""
+        index = self._sync_index()
+        ids = index.by_sink_status.get((sink, status), set())
+        return sorted(ids, key=lambda notification_id: index.records[notification_id].created_at)
+
+    def has_sink_status(self, sink: str, status: NotificationDeliveryStatus) -> bool:
+        return bool(self._sync_index().by_sink_status.get((sink, status)))
+
+    def ids_with_status(self, status: NotificationDeliveryStatus) -> list[str]:
+        """IDs of notifications with at least one sink in `status`, oldest first."""
+        index = self._sync_index()
+        ids: set[str] = set()
+        for (_, sink_status), sink_ids in index.by_sink_status.items():
+            if sink_status == status:
+                ids.update(sink_ids)
+        return sorted(ids, key=lambda notification_id: index.records[notification_id].created_at)
+
+    def _sync_index(self) -> _NotificationIndex:
+        """Return the index, catching up with journal records appended by other writers."""
+        try:
+            st = self.journal_path.stat()
+        except FileNotFoundError:
+            st = None
+        index = self._index
+        if st is None:
+            # First use, or a session written before the journal existed: rebuild it once.
+            if index is None or index.journal_inode is not None:
+                index = self._rebuild_index()
+            return index
+        if index is None or st.st_ino != index.journal_inode or st.st_size < index.journal_offset:
+            index = _NotificationIndex(journal_inode=st.st_ino)
+            self._index = index
+        if st.st_size > index.journal_offset:
+            self._replay_journal(index)
+        return index
+
+    def _rebuild_index(self) -> _NotificationIndex:
+        index = _NotificationIndex()
+        for view in reversed(self.list_views()):
+            index.apply(
+                _JournalRecord(
+                    id=view.event.id,
+                    created_at=view.event.created_at,
+                    dedupe_key=view.event.dedupe_key,
+                    sinks=view.delivery.sinks,
+                )
+            )
+        self._index = index
+        if index.records:
+            self._compact_journal(index)
+        return index
+
+    def _replay_journal(self, index: _NotificationIndex) -> None:
+        with self.journal_path.open("rb") as f:
+            f.seek(index.journal_offset)
+            data = f.read()
+        # Leave a torn final line for the next replay; its writer has not finished it yet.
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                index.apply(_JournalRecord.model_validate_json(line))
+            except ValidationError as exc:
+                logger.warning(
+                    "Skipping invalid notification journal record in {path}: {error}",
+                    path=self.journal_path,
+                    error=exc,
+                )
+        index.journal_offset += end
+
+    def _append_journal(self, index: _NotificationIndex, record: _JournalRecord) -> None:
+        index.apply(record)
+        line = record.model_dump_json() + "\n"
+        with self.journal_path.open("a", encoding="utf-8") as f:
+            f.write(line)
+            end = f.tell()
+        if index.journal_inode is None:
+            index.journal_inode = self.journal_path.stat().st_ino
+        if end == index.journal_offset + len(line.encode("utf-8")):
+            index.journal_offset = end
+        live = len(index.records)
+        if index.journal_records >= max(_JOURNAL_COMPACT_MIN_RECORDS, 2 * live):
+            self._compact_journal(index)
+
+    def _compact_journal(self, index: _NotificationIndex) -> None:
+        """Rewrite the journal with one record per notification, dropping spent ones."""
+        records = sorted(index.records.values(), key=lambda record: record.created_at)
+        data = "".join(record.model_dump_json() + "\n" for record in records)
+        root = self._ensure_root()
+        fd, tmp_path = tempfile.mkstemp(dir=root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.journal_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+        st = self.journal_path.stat()
+        index.journal_records = len(records)
+        index.journal_inode = st.st_ino
+        index.journal_offset = st.st_size
 
     def merged_view(self, notification_id: str) -> NotificationView:
         return NotificationView(
@@ -4,3 +4,4 @@ from pathlib import Path
 
 INIT = (Path(__file__).parent / "init.md").read_text(encoding="utf-8")
 COMPACT = (Path(__file__).parent / "compact.md").read_text(encoding="utf-8")
+COMPACT_MERGE = (Path(__file__).parent / "compact_merge.md").read_text(encoding="utf-8")
@@ -12,11 +12,14 @@ from kaos.path import KaosPath
 from kosong.message import Message
 
 from kimi_cli.metadata import WorkDirMeta, load_metadata, save_metadata
+from kimi_cli.session_catalog import get_session_catalog
 from kimi_cli.session_state import SessionState, load_session_state, save_session_state
 from kimi_cli.utils.logging import logger
 from kimi_cli.utils.string import shorten
 from kimi_cli.wire.file import WireFile
-from kimi_cli.wire.types import TurnBegin
+from kimi_cli.wire.scan import scan_wire_file
+
+LIST_TITLE_WIDTH = 50
 
 
 @dataclass(slots=True, kw_only=True)
@@ -95,6 +98,7 @@ class Session:
         self.state.archived_at = fresh.archived_at
         self.state.auto_archive_exempt = fresh.auto_archive_exempt
         save_session_state(self.state, self.dir)
+        _update_catalog(self.dir)
 
     async def delete(self) -> None:
         """Delete the session directory."""
@@ -102,6 +106,7 @@ class Session:
         if not session_dir.exists():
             return
         await asyncio.to_thread(shutil.rmtree, session_dir, True)
+        await asyncio.to_thread(_update_catalog, session_dir)
 
     async def refresh(self) -> None:
         self.title = "Untitled"
@@ -112,14 +117,9 @@ class Session:
             return
 
         try:
-            async for record in self.wire_file.iter_records():
-                wire_msg = record.to_wire_message()
-                if isinstance(wire_msg, TurnBegin):
-                    self.title = shorten(
-                        Message(role="user", content=wire_msg.user_input).extract_text(" "),
-                        width=50,
-                    )
-                    return
+            text = await asyncio.to_thread(_first_input_text, self.wire_file.path)
+            if text is not None:
+                self.title = shorten(text, width=LIST_TITLE_WIDTH)
         except Exception:
             logger.exception(
                 "Failed to derive session title from wire file {file}:",
@@ -178,6 +178,7 @@ class Session:
             updated_at=0.0,
         )
         await session.refresh()
+        await asyncio.to_thread(_update_catalog, session_dir)
         return session
 
     @staticmethod
@@ -235,43 +236,32 @@ class Session:
             logger.debug("Work directory never been used")
             return []
 
-        session_ids = {
-            path.name if path.is_dir() else path.stem
-            for path in work_dir_meta.sessions_dir.iterdir()
-            if path.is_dir() or path.suffix == ".jsonl"
-        }
+        sessions_dir = work_dir_meta.sessions_dir
+        for path in sessions_dir.glob("*.jsonl"):
+            _migrate_session_context_file(work_dir_meta, path.stem)
+
+        catalog = get_session_catalog()
+        await asyncio.to_thread(catalog.sync, work_dir_hash=sessions_dir.name)
+        entries = await asyncio.to_thread(
+            catalog.list_sessions, work_dir_hash=sessions_dir.name, empty=False, has_context=True
+        )
 
         sessions: list[Session] = []
-        for session_id in session_ids:
-            _migrate_session_context_file(work_dir_meta, session_id)
-            session_dir = work_dir_meta.sessions_dir / session_id
-            if not session_dir.is_dir():
-                logger.debug("Session directory not found: {session_dir}", session_dir=session_dir)
+        for entry in entries:
+            if entry.is_legacy:
                 continue
-            context_file = session_dir / "context.jsonl"
-            if not context_file.exists():
-                logger.debug(
-                    "Session context file not found: {context_file}", context_file=context_file
+            sessions.append(
+                Session(
+                    id=entry.session_id,
+                    work_dir=work_dir,
+                    work_dir_meta=work_dir_meta,
+                    context_file=entry.context_file,
+                    wire_file=WireFile(path=entry.session_dir / "wire.jsonl"),
+                    state=entry.state(),
+                    title=entry.title(LIST_TITLE_WIDTH),
+                    updated_at=entry.updated_at,
                 )
-                continue
-            session = Session(
-                id=session_id,
-                work_dir=work_dir,
-                work_dir_meta=work_dir_meta,
-                context_file=context_file,
-                wire_file=WireFile(path=session_dir / "wire.jsonl"),
-                state=load_session_state(session_dir),
-                title="",
-                updated_at=0.0,
             )
-            if session.is_empty():
-                logger.debug(
-                    "Session context file is empty: {context_file}", context_file=context_file
-                )
-                continue
-            await session.refresh()
-            sessions.append(session)
-        sessions.sort(key=lambda session: session.updated_at, reverse=True)
         return sessions
 
     @classmethod
@@ -317,3 +307,22 @@ def _migrate_session_context_file(work_dir_meta: WorkDirMeta, session_id: str) -
             old=old_context_file,
             new=new_context_file,
         )
+
+
+def _first_input_text(wire_path: Path) -> str | None:
+    """The text of the first user input recorded in a wire file."""
+    for record in scan_wire_file(wire_path, types=("TurnBegin",)):
+        try:
+            user_input = record.payload()["user_input"]
+        except (ValueError, KeyError):
+            continue
+        return Message(role="user", content=user_input).extract_text(" ")
+    return None
+
+
+def _update_catalog(session_dir: Path) -> None:
+    """Bring the catalog row of a session up to date after writing or deleting it."""
+    try:
+        get_session_catalog().update(session_dir)
+    except Exception:
+        logger.exception("Failed to update session catalog for {dir}:", dir=session_dir)
@@ -0,0 +1,853 @@
+"""An on-disk catalog of the sessions in the share directory.
+
+Listing sessions used to mean walking every work directory, loading each ``state.json`` and
+reading each ``wire.jsonl`` to derive titles and turn counts. The catalog keeps what those
+listings need in SQLite (``sessions.db`` in the share directory), so that:
+
+1. **Reads are indexed queries**: paging, title / work directory search and archived filtering
+   run in SQLite.
+2. **Writes update it**: sessions created, saved or deleted through `Session` update their
+   row right away.
+3. **It is reconciled by mtime**: `SessionCatalog.sync` stats the session files and re-reads
+   only those whose mtime or size changed, and of an appended ``wire.jsonl`` only the tail.
+
+The catalog is only a cache of the session files, which stay the source of truth. It can be
+deleted at any time, and is rebuilt if it cannot be opened.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Collection, Iterator, Sequence
+from dataclasses import dataclass, field
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Literal, cast
+
+from kaos.local import local_kaos
+
+from kimi_cli.metadata import WorkDirMeta, load_metadata
+from kimi_cli.session_state import STATE_FILE_NAME, SessionState, load_session_state
+from kimi_cli.utils.logging import logger
+from kimi_cli.utils.string import shorten
+from kimi_cli.wire.scan import WireRecordView, iter_events, scan_wire_file
+
+CATALOG_FILE_NAME = "sessions.db"
+SCHEMA_VERSION = 2
+
+SEARCH_TITLE_WIDTH = 300
+"""Width of the titles matched by `SessionCatalog.list_sessions(query=...)`."""
+FIRST_INPUT_MAX_CHARS = 2000
+"""How much of the first user input is kept, enough for any title width in use."""
+RACY_WINDOW = 2.0
+"""Files modified this close to being indexed are indexed again, as mtimes are coarse."""
+CONNECT_ATTEMPTS = 3
+"""Attempts to open a catalog that another process holds locked before giving up."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_dir TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    work_dir_hash TEXT NOT NULL,
+    work_dir TEXT,
+    context_file TEXT NOT NULL,
+    context_mtime REAL,
+    context_size INTEGER,
+    wire_mtime REAL,
+    wire_size INTEGER,
+    state_mtime REAL,
+    state_size INTEGER,
+    subagents_mtime REAL,
+    wire_offset INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    first_input TEXT,
+    wire_has_messages INTEGER NOT NULL,
+    context_has_messages INTEGER NOT NULL,
+    state TEXT,
+    custom_title TEXT,
+    archived INTEGER NOT NULL,
+    empty INTEGER NOT NULL,
+    subagent_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    last_modified REAL NOT NULL,
+    search_text TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    all_turns INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    first_timestamp REAL,
+    last_timestamp REAL,
+    tool_usage TEXT NOT NULL,
+    pending_tools TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_work_dir ON sessions (work_dir_hash, updated_at DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_archived ON sessions (archived, updated_at DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_last_modified ON sessions (last_modified DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_session_id ON sessions (session_id);
+"""
+
+_COLUMNS = (
+    "session_dir",
+    "session_id",
+    "work_dir_hash",
+    "work_dir",
+    "context_file",
+    "context_mtime",
+    "context_size",
+    "wire_mtime",
+    "wire_size",
+    "state_mtime",
+    "state_size",
+    "subagents_mtime",
+    "wire_offset",
+    "turns",
+    "first_input",
+    "wire_has_messages",
+    "context_has_messages",
+    "state",
+    "custom_title",
+    "archived",
+    "empty",
+    "subagent_count",
+    "updated_at",
+    "last_modified",
+    "search_text",
+    "indexed_at",
+    "all_turns",
+    "input_tokens",
+    "output_tokens",
+    "first_timestamp",
+    "last_timestamp",
+    "tool_usage",
+    "pending_tools",
+)
+_INSERT = (
+    f"INSERT OR REPLACE INTO sessions ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+_SIGNATURE = (
+    "context_file, context_mtime, context_size, wire_mtime, wire_size, state_mtime, "
+    "state_size, subagents_mtime, work_dir, last_modified, indexed_at"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    """A session as recorded in the catalog."""
+
+    session_id: str
+    session_dir: Path
+    context_file: Path
+    """``context.jsonl`` of the session, or the ``<id>.jsonl`` of a legacy session."""
+    work_dir_hash: str
+    """The name of the directory of the work directory in the sessions directory."""
+    work_dir: str | None
+    """The work directory, None if it is not in the metadata."""
+    context_size: int | None
+    wire_size: int | None
+    state_size: int | None
+    """Sizes of the session files, None for those that do not exist."""
+    updated_at: float
+    """mtime of the context file, 0.0 if it does not exist."""
+    last_modified: float
+    """Latest mtime of the context, wire and state files."""
+    turns: int
+    first_input: str
+    """Text of the first user input, empty if there is no turn yet."""
+    custom_title: str | None
+    archived: bool
+    is_empty: bool
+    """Whether the session has no history and no custom title, as `Session.is_empty`."""
+    subagent_count: int
+    state_json: str | None
+
+    @property
+    def is_legacy(self) -> bool:
+        """Whether the context file predates session directories."""
+        return self.context_file.parent != self.session_dir
+
+    def title(self, width: int) -> str:
+        """The custom title, else the first user input shortened to *width*, else Untitled."""
+        if self.custom_title:
+            return self.custom_title
+        return shorten(self.first_input, width=width) or "Untitled"
+
+    def state(self) -> SessionState:
+        if self.state_json is None:
+            return SessionState()
+        return SessionState.model_validate_json(self.state_json)
+
+
+@dataclass(frozen=True, slots=True)
+class SessionStats:
+    """Usage of a session, aggregated from its wire file including the events of subagents."""
+
+    work_dir_hash: str
+    work_dir: str | None
+    turns: int
+    input_tokens: int
+    output_tokens: int
+    first_timestamp: float | None
+    last_timestamp: float | None
+    tool_usage: dict[str, list[int]]
+    """``[calls, errors]`` by tool name."""
+
+
+def get_catalog_file() -> Path:
+    from kimi_cli.share import get_share_dir
+
+    return get_share_dir() / CATALOG_FILE_NAME
+
+
+def work_dir_hash(wd: WorkDirMeta) -> str:
+    """The name of the directory of *wd* in the sessions directory, without creating it."""
+    path_md5 = md5(wd.path.encode(encoding="utf-8")).hexdigest()
+    return path_md5 if wd.kaos == local_kaos.name else f"{wd.kaos}_{path_md5}"
+
+
+_catalogs: dict[Path, SessionCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_session_catalog() -> SessionCatalog:
+    """
+    The catalog of the current share directory, opened once per process.
+
+    Raises:
+        sqlite3.OperationalError: If another process holds the catalog locked for too long.
+    """
+    path = get_catalog_file()
+    with _catalogs_lock:
+        catalog = _catalogs.get(path)
+        if catalog is None:
+            catalog = SessionCatalog(path, path.parent / "sessions")
+            _catalogs[path] = catalog
+        return catalog
+
+
+class SessionCatalog:
+    """
+    Session metadata in SQLite, kept in sync with the session files under `sessions_root`.
+
+    All methods are blocking and thread-safe; call them from a worker thread in async code.
+    """
+
+    def __init__(self, path: Path | str, sessions_root: Path) -> None:
+        self._path = path
+        self._sessions_root = sessions_root
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._synced_at: float | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database, rebuilding it if it is corrupted.
+
+        Raises:
+            sqlite3.OperationalError: If another process still holds the database locked after
+                `CONNECT_ATTEMPTS` attempts.
+        """
+        try:
+            try:
+                return self._open_retrying(self._path)
+            except sqlite3.OperationalError:
+                raise  # e.g. locked or read-only; another process may be using it
+            except sqlite3.DatabaseError:
+                logger.warning(
+                    "Session catalog {path} is corrupted, rebuilding it", path=self._path
+                )
+            if isinstance(self._path, Path):
+                for suffix in ("", "-wal", "-shm"):
+                    Path(f"{self._path}{suffix}").unlink(missing_ok=True)
+            return self._open_retrying(self._path)
+        except (OSError, sqlite3.Error) as e:
+            if isinstance(e, sqlite3.OperationalError) and _is_busy(e):
+                # A catalog in memory would stay in use for the rest of the process.
+                raise
+            logger.exception("Failed to open session catalog {path}:", path=self._path)
+        # Still serve queries, from a catalog that lasts as long as the process
+        self._path = ":memory:"
+        return self._open(self._path)
+
+    @classmethod
+    def _open_retrying(cls, path: Path | str) -> sqlite3.Connection:
+        """`_open`, retried while another process holds the database locked."""
+        attempt = 1
+        while True:
+            try:
+                return cls._open(path)
+            except sqlite3.OperationalError as e:
+                if attempt >= CONNECT_ATTEMPTS or not _is_busy(e):
+                    raise
+            time.sleep(0.1 * attempt)
+            attempt += 1
+
+    @staticmethod
+    def _open(path: Path | str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS sessions")
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    @property
+    def path(self) -> Path | str:
+        """The database file, or ``:memory:`` if it could not be opened."""
+        return self._path
+
+    @property
+    def synced_at(self) -> float | None:
+        """When the last `sync` of all work directories in this process started."""
+        return self._synced_at
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def sync(self, *, work_dir_hash: str | None = None) -> None:
+        """
+        Reconcile the catalog with the session files, of one work directory or of all.
+
+        Sessions whose files are unchanged since they were indexed are not read.
+        """
+        started_at = time.time()
+        work_dirs = _work_dirs_by_hash()
+        if work_dir_hash is None:
+            hash_dirs = [e.path for e in _scandir(self._sessions_root) if _is_dir(e)]
+            known_sql, params = f"SELECT session_dir, {_SIGNATURE} FROM sessions", ()
+        else:
+            hash_dirs = [os.path.join(self._sessions_root, work_dir_hash)]
+            known_sql = f"SELECT session_dir, {_SIGNATURE} FROM sessions WHERE work_dir_hash = ?"
+            params = (work_dir_hash,)
+        with self._lock:
+            known = {row["session_dir"]: row for row in self._conn.execute(known_sql, params)}
+
+        seen: set[str] = set()
+        changed: list[_Files] = []
+        for hash_dir in hash_dirs:
+            work_dir = work_dirs.get(os.path.basename(hash_dir))
+            for session_dir, context_file in _session_paths(hash_dir):
+                files = _Files.stat(session_dir, context_file, work_dir)
+                seen.add(session_dir)
+                row = known.get(session_dir)
+                if row is None or files.changed_since(row):
+                    changed.append(files)
+
+        removed = [key for key in known if key not in seen]
+        if changed or removed:
+            self._write([self._index(files) for files in changed], removed)
+        if work_dir_hash is None:
+            self._synced_at = started_at
+
+    def update(self, session_dir: Path) -> None:
+        """Re-index one session now, e.g. after it was written, or drop it if it is gone."""
+        files = _session_files(Path(session_dir), _work_dirs_by_hash())
+        if files is None:
+            self.remove(session_dir)
+        else:
+            self._write([self._index(files)], [])
+
+    def find(self, session_id: str) -> CatalogEntry | None:
+        """
+        The session with *session_id*, re-indexed first if its files changed.
+
+        A session that is not in the catalog yet, e.g. one just created by another process, is
+        looked up in the directories of the work directories in the metadata.
+        """
+        with self._lock:
+            known = {
+                row["session_dir"]: row
+                for row in self._conn.execute(
+                    f"SELECT session_dir, {_SIGNATURE} FROM sessions WHERE session_id = ?",
+                    (session_id,),
+                )
+            }
+        work_dirs = _work_dirs_by_hash()
+        session_dirs = list(known) or [
+            os.path.join(self._sessions_root, dir_name, session_id) for dir_name in work_dirs
+        ]
+        for session_dir in session_dirs:
+            files = _session_files(Path(session_dir), work_dirs)
+            row = known.get(session_dir)
+            if files is None:
+                if row is not None:
+                    self.remove(Path(session_dir))
+                continue
+            if row is None or files.changed_since(row):
+                self._write([self._index(files)], [])
+            return self.get(Path(session_dir))
+        return None
+
+    def remove(self, session_dir: Path) -> None:
+        self._write([], [str(session_dir)])
+
+    def get(self, session_dir: Path) -> CatalogEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM sessions WHERE session_dir = ?", (str(session_dir),)
+            ).fetchone()
+        return None if row is None else _entry(row)
+
+    def list_sessions(
+        self,
+        *,
+        work_dir_hash: str | None = None,
+        work_dir_hashes: Collection[str] | None = None,
+        archived: bool | None = None,
+        empty: bool | None = None,
+        has_context: bool | None = None,
+        known_work_dir: bool | None = None,
+        session_id_glob: str | None = None,
+        query: str | None = None,
+        order_by: Literal["updated_at", "last_modified"] = "updated_at",
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[CatalogEntry]:
+        """
+        Query the sessions, latest first. Filters left as None are not applied.
+
+        *work_dir_hashes* limits the sessions to those of any of these work directories, and
+        *session_id_glob* to those whose ID matches the SQLite ``GLOB`` pattern. *query*
+        matches, case-insensitively, a substring of the title shortened to `SEARCH_TITLE_WIDTH`
+        or of the work directory.
+        """
+        where: list[str] = []
+        params: list[Any] = []
+        if work_dir_hash is not None:
+            where.append("work_dir_hash = ?")
+            params.append(work_dir_hash)
+        if work_dir_hashes is not None:
+            where.append(f"work_dir_hash IN ({', '.join('?' for _ in work_dir_hashes)})")
+            params.extend(work_dir_hashes)
+        if archived is not None:
+            where.append("archived = ?")
+            params.append(int(archived))
+        if empty is not None:
+            where.append("empty = ?")
+            params.append(int(empty))
+        if has_context is not None:
+            where.append(f"context_size IS {'NOT ' if has_context else ''}NULL")
+        if known_work_dir is not None:
+            where.append(f"work_dir IS {'NOT ' if known_work_dir else ''}NULL")
+        if session_id_glob is not None:
+            where.append("session_id GLOB ?")
+            params.append(session_id_glob)
+        if query and (query_text := query.strip().lower()):
+            where.append("instr(search_text, ?) > 0")
+            params.append(query_text)
+        sql = "SELECT * FROM sessions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} DESC, session_id DESC"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, max(offset, 0)]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_entry(row) for row in rows]
+
+    def session_stats(self) -> list[SessionStats]:
+        """Usage of the sessions that have a wire file."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT work_dir_hash, work_dir, all_turns, input_tokens, output_tokens, "
+                "first_timestamp, last_timestamp, tool_usage FROM sessions "
+                "WHERE wire_size IS NOT NULL"
+            ).fetchall()
+        return [
+            SessionStats(
+                work_dir_hash=row["work_dir_hash"],
+                work_dir=row["work_dir"],
+                turns=row["all_turns"],
+                input_tokens=row["input_tokens"],
+                output_tokens=row["output_tokens"],
+                first_timestamp=row["first_timestamp"],
+                last_timestamp=row["last_timestamp"],
+                tool_usage=json.loads(row["tool_usage"]),
+            )
+            for row in rows
+        ]
+
+    def _write(self, rows: Sequence[tuple[Any, ...]], removed: Sequence[str]) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(_INSERT, rows)
+                    self._conn.executemany(
+                        "DELETE FROM sessions WHERE session_dir = ?", [(key,) for key in removed]
+                    )
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            # Another process holding the database too long; the next sync catches up.
+            logger.exception("Failed to update session catalog {path}:", path=self._path)
+
+    def _index(self, files: _Files) -> tuple[Any, ...]:
+        """Read what changed in the files of a session and return its new row."""
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT * FROM sessions WHERE session_dir = ?", (files.session_dir,)
+            ).fetchone()
+        indexed_at = time.time()
+        session_dir = Path(files.session_dir)
+
+        if old is not None and (old["state_mtime"], old["state_size"]) == files.state:
+            state_json: str | None = old["state"]
+            custom_title: str | None = old["custom_title"]
+            archived = bool(old["archived"])
+        elif session_dir.is_dir():
+            state = load_session_state(session_dir)
+            state_json = state.model_dump_json()
+            custom_title = state.custom_title
+            archived = state.archived
+        else:
+            state_json, custom_title, archived = None, None, False
+
+        wire = _WireScan() if old is None else _WireScan.from_row(old)
+        if files.wire[1] is None:
+            wire = _WireScan()
+        elif old is None or (old["wire_mtime"], old["wire_size"]) != files.wire:
+            wire = wire.scan(session_dir / "wire.jsonl", files.wire[1])
+
+        if old is not None and (old["context_mtime"], old["context_size"]) == files.context:
+            context_has_messages = bool(old["context_has_messages"])
+        else:
+            context_has_messages = files.context[1] is not None and _has_context_messages(
+                Path(files.context_file)
+            )
+
+        if old is not None and old["subagents_mtime"] == files.subagents_mtime:
+            subagent_count: int = old["subagent_count"]
+        else:
+            subagent_count = _count_subagents(session_dir / "subagents")
+
+        title = custom_title or shorten(wire.first_input or "", width=SEARCH_TITLE_WIDTH)
+        return (
+            files.session_dir,
+            session_dir.name,
+            session_dir.parent.name,
+            files.work_dir,
+            files.context_file,
+            *files.context,
+            *files.wire,
+            *files.state,
+            files.subagents_mtime,
+            wire.offset,
+            wire.turns,
+            wire.first_input,
+            int(wire.has_messages),
+            int(context_has_messages),
+            state_json,
+            custom_title,
+            int(archived),
+            int(not custom_title and not wire.has_messages and not context_has_messages),
+            subagent_count,
+            files.context[0] or 0.0,
+            files.last_modified,
+            f"{title}\n{files.work_dir or ''}".lower(),
+            indexed_at,
+            wire.all_turns,
+            wire.input_tokens,
+            wire.output_tokens,
+            wire.first_timestamp,
+            wire.last_timestamp,
+            json.dumps(wire.tool_usage),
+            json.dumps(wire.pending_tools),
+        )
+
+
+@dataclass(slots=True)
+class _Files:
+    """The stat of the files of a session, compared with the catalog to find changes.
+
+    Paths are strings, as pathlib is most of the cost of stating thousands of sessions.
+    """
+
+    session_dir: str
+    context_file: str
+    work_dir: str | None
+    context: tuple[float | None, int | None]
+    wire: tuple[float | None, int | None]
+    state: tuple[float | None, int | None]
+    subagents_mtime: float | None
+
+    @property
+    def last_modified(self) -> float:
+        mtimes = [m for m, _ in (self.context, self.wire, self.state) if m is not None]
+        return max(mtimes, default=0.0)
+
+    @classmethod
+    def stat(cls, session_dir: str, context_file: str, work_dir: str | None) -> _Files:
+        return cls(
+            session_dir=session_dir,
+            context_file=context_file,
+            work_dir=work_dir,
+            context=_stat(context_file),
+            wire=_stat(os.path.join(session_dir, "wire.jsonl")),
+            state=_stat(os.path.join(session_dir, STATE_FILE_NAME)),
+            subagents_mtime=_stat(os.path.join(session_dir, "subagents"))[0],
+        )
+
+    def changed_since(self, row: sqlite3.Row) -> bool:
+        return (
+            (row["context_mtime"], row["context_size"]) != self.context
+            or (row["wire_mtime"], row["wire_size"]) != self.wire
+            or (row["state_mtime"], row["state_size"]) != self.state
+            or row["subagents_mtime"] != self.subagents_mtime
+            or row["context_file"] != self.context_file
+            or row["work_dir"] != self.work_dir
+            # A file written again within its mtime granularity may keep mtime and size
+            or row["last_modified"] >= row["indexed_at"] - RACY_WINDOW
+        )
+
+
+@dataclass(slots=True)
+class _WireScan:
+    """What the catalog reads from a wire file, updated incrementally as the file grows."""
+
+    offset: int = 0
+    """End of the last complete line scanned."""
+    turns: int = 0
+    first_input: str | None = None
+    has_messages: bool = False
+    all_turns: int = 0
+    """Turns including those of subagents."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    first_timestamp: float | None = None
+    last_timestamp: float | None = None
+    tool_usage: dict[str, list[int]] = field(default_factory=dict[str, list[int]])
+    """``[calls, errors]`` by tool name, including the tool calls of subagents."""
+    pending_tools: dict[str, str] = field(default_factory=dict[str, str])
+    """Names of the tool calls that have no result yet by ID, to attribute errors to."""
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> _WireScan:
+        return cls(
+            offset=row["wire_offset"],
+            turns=row["turns"],
+            first_input=row["first_input"],
+            has_messages=bool(row["wire_has_messages"]),
+            all_turns=row["all_turns"],
+            input_tokens=row["input_tokens"],
+            output_tokens=row["output_tokens"],
+            first_timestamp=row["first_timestamp"],
+            last_timestamp=row["last_timestamp"],
+            tool_usage=json.loads(row["tool_usage"]),
+            pending_tools=json.loads(row["pending_tools"]),
+        )
+
+    def scan(self, path: Path, size: int) -> _WireScan:
+        """Scan the lines appended since the last scan, or all of them if the file was rewritten."""
+        try:
+            with path.open("rb") as f:
+                scan = self if self._can_resume(f, size) else _WireScan()
+        except OSError:
+            logger.exception("Failed to read wire file {file}:", file=path)
+            return self
+        # A last line without a newline is being written; it is scanned once it is complete.
+        for record in scan_wire_file(path, start=scan.offset, partial=False):
+            scan.offset = record.end
+            scan._scan_record(record)
+        return scan
+
+    def _can_resume(self, f: Any, size: int) -> bool:
+        if self.offset == 0:
+            return True
+        if self.offset > size:
+            return False  # Truncated or rewritten
+        f.seek(self.offset - 1)
+        return f.read(1) == b"\n"
+
+    def _scan_record(self, record: WireRecordView) -> None:
+        if not self.has_messages:
+            self.has_messages = True
+            self.first_timestamp = record.timestamp
+        self.last_timestamp = record.timestamp
+        if record.type not in _COUNTED_TYPES:
+            return  # Mostly streamed deltas, which are skipped without decoding them
+        if record.type == "TurnBegin" and self.first_input is not None:
+            # Only the input of the first turn is read
+            self.turns += 1
+            self.all_turns += 1
+            return
+        try:
+            payload = record.payload()
+        except ValueError:
+            return
+        if record.type == "TurnBegin":
+            self.turns += 1
+            if self.first_input is None:
+                self.first_input = _input_text(payload.get("user_input"))[:FIRST_INPUT_MAX_CHARS]
+        for event_type, event_payload in iter_events(record.type, payload):
+            with contextlib.suppress(ValueError, TypeError, AttributeError):
+                self._count(event_type, event_payload)
+
+    def _count(self, event_type: str, payload: dict[str, Any]) -> None:
+        if event_type == "TurnBegin":
+            self.all_turns += 1
+        elif event_type == "ToolCall":
+            function = payload.get("function")
+            if isinstance(function, dict):
+                name = str(cast(dict[str, Any], function).get("name", "unknown"))
+                self.tool_usage.setdefault(name, [0, 0])[0] += 1
+                if tool_call_id := payload.get("id"):
+                    self.pending_tools[str(tool_call_id)] = name
+        elif event_type == "ToolResult":
+            name = self.pending_tools.pop(str(payload.get("tool_call_id", "")), None)
+            return_value = payload.get("return_value")
+            if (
+                name is not None
+                and isinstance(return_value, dict)
+                and cast(dict[str, Any], return_value).get("is_error")
+            ):
+                self.tool_usage.setdefault(name, [0, 0])[1] += 1
+        elif event_type == "StatusUpdate":
+            token_usage = payload.get("token_usage")
+            if isinstance(token_usage, dict):
+                usage = cast(dict[str, Any], token_usage)
+                self.input_tokens += (
+                    int(usage.get("input_other", 0))
+                    + int(usage.get("input_cache_read", 0))
+                    + int(usage.get("input_cache_creation", 0))
+                )
+                self.output_tokens += int(usage.get("output", 0))
+
+
+_COUNTED_TYPES = frozenset({"TurnBegin", "ToolCall", "ToolResult", "StatusUpdate", "SubagentEvent"})
+
+
+def _input_text(user_input: Any) -> str:
+    from kosong.message import Message
+
+    try:
+        return Message(role="user", content=user_input).extract_text(" ")
+    except ValueError:
+        return ""
+
+
+def _has_context_messages(context_file: Path) -> bool:
+    """Whether the context has a message that is not a metadata record, as `Session.is_empty`."""
+    try:
+        with context_file.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                role = json.loads(line, strict=False).get("role")
+                if isinstance(role, str) and not role.startswith("_"):
+                    return True
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError, TypeError, AttributeError):
+        return True
+    return False
+
+
+def _count_subagents(subagents_dir: Path) -> int:
+    return sum(1 for entry in _scandir(subagents_dir) if _is_dir(entry))
+
+
+def _session_files(session_dir: Path, work_dirs: dict[str, str]) -> _Files | None:
+    """Stat the files of one session, None if it does not exist."""
+    context_file = session_dir / "context.jsonl"
+    if not context_file.exists():
+        legacy_context_file = session_dir.parent / f"{session_dir.name}.jsonl"
+        if legacy_context_file.exists():
+            context_file = legacy_context_file
+        elif not session_dir.is_dir():
+            return None
+    work_dir = work_dirs.get(session_dir.parent.name)
+    return _Files.stat(str(session_dir), str(context_file), work_dir)
+
+
+def _session_paths(hash_dir: str) -> Iterator[tuple[str, str]]:
+    """The session directories in a work directory's directory, with their context files."""
+    entries = list(_scandir(hash_dir))
+    names = {entry.name for entry in entries}
+    for entry in entries:
+        if _is_dir(entry):
+            yield entry.path, os.path.join(entry.path, "context.jsonl")
+        elif entry.name.endswith(".jsonl"):
+            # Legacy session, until `Session` migrates its context into a directory
+            session_id = entry.name.removesuffix(".jsonl")
+            session_dir = os.path.join(hash_dir, session_id)
+            if session_id not in names or not os.path.exists(
+                os.path.join(session_dir, "context.jsonl")
+            ):
+                yield session_dir, entry.path
+
+
+def _work_dirs_by_hash() -> dict[str, str]:
+    try:
+        return {work_dir_hash(wd): wd.path for wd in load_metadata().work_dirs}
+    except (OSError, ValueError):
+        logger.exception("Failed to load metadata:")
+        return {}
+
+
+def _scandir(path: str | Path) -> Iterator[os.DirEntry[str]]:
+    try:
+        with os.scandir(path) as it:
+            yield from it
+    except OSError:
+        return
+
+
+def _is_dir(entry: os.DirEntry[str]) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """Whether *error* means that another connection holds the database locked."""
+    return (error.sqlite_errorcode & 0xFF) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+def _stat(path: str) -> tuple[float | None, int | None]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, None
+    return st.st_mtime, st.st_size
+
+
+def _entry(row: sqlite3.Row) -> CatalogEntry:
+    return CatalogEntry(
+        session_id=row["session_id"],
+        session_dir=Path(row["session_dir"]),
+        context_file=Path(row["context_file"]),
+        work_dir_hash=row["work_dir_hash"],
+        work_dir=row["work_dir"],
+        context_size=row["context_size"],
+        wire_size=row["wire_size"],
+        state_size=row["state_size"],
+        updated_at=row["updated_at"],
+        last_modified=row["last_modified"],
+        turns=row["turns"],
+        first_input=row["first_input"] or "",
+        custom_title=row["custom_title"],
+        archived=bool(row["archived"]),
+        is_empty=bool(row["empty"]),
+        subagent_count=row["subagent_count"],
+        state_json=row["state"],
+    )
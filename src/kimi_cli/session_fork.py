@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Any, cast
 
 from kimi_cli.session_state import load_session_state, save_session_state
+from kimi_cli.wire.scan import scan_wire_file
 
 CHECKPOINT_USER_PATTERN = re.compile(r"^<system>CHECKPOINT \d+</system>$")
 
@@ -40,35 +41,13 @@ def enumerate_turns(wire_path: Path) -> list[TurnInfo]:
     Each turn is identified by a ``TurnBegin`` record, whose ``user_input``
     field provides the user message text.
     """
-    if not wire_path.exists():
-        return []
-
     turns: list[TurnInfo] = []
-    current_turn = -1
-
-    with open(wire_path, encoding="utf-8") as f:
-        for line in f:
-            stripped = line.strip()
-            if not stripped:
-                continue
-
-            try:
-                record: dict[str, Any] = json.loads(stripped)
-            except json.JSONDecodeError:
-                continue
-
-            if record.get("type") == "metadata":
-                continue
-
-            message: dict[str, Any] = record.get("message", {})
-            msg_type: str | None = message.get("type")
-
-            if msg_type == "TurnBegin":
-                current_turn += 1
-                user_input = message.get("payload", {}).get("user_input", "")
-                text = _extract_user_text(user_input)
-                turns.append(TurnInfo(index=current_turn, user_text=text))
-
+    for record in scan_wire_file(wire_path, types=("TurnBegin",)):
+        try:
+            user_input = record.payload().get("user_input", "")
+        except ValueError:
+            continue
+        turns.append(TurnInfo(index=len(turns), user_text=_extract_user_text(user_input)))
     return turns
 
 
@@ -199,7 +199,10 @@ async def run_soul(
         MaxStepsReached: When the maximum number of steps is reached.
         RunCancelled: When the run is cancelled by the cancel event.
     """
-    wire = Wire(file_backend=wire_file)
+    wire = Wire(
+        file_backend=wire_file,
+        record_config=runtime.config.wire if runtime is not None else None,
+    )
     wire_token = _current_wire.set(wire)
 
     logger.debug("Starting UI loop with function: {ui_loop_fn}", ui_loop_fn=ui_loop_fn)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, NamedTuple, Protocol, runtime_checkable
+import asyncio
+from collections.abc import Callable, Coroutine, Iterable, Sequence
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol, runtime_checkable
 
 import kosong
+from kosong import StepResult
 from kosong.chat_provider import TokenUsage
 from kosong.message import Message
 from kosong.tooling.empty import EmptyToolset
@@ -12,6 +15,7 @@ import kimi_cli.prompts as prompts
 from kimi_cli.llm import LLM
 from kimi_cli.soul.message import system
 from kimi_cli.utils.logging import logger
+from kimi_cli.utils.tokenizer import count_message_tokens, count_messages_tokens, count_tokens
 from kimi_cli.wire.types import ContentPart, TextPart, ThinkPart
 
 
@@ -42,15 +46,12 @@ class CompactionResult(NamedTuple):
 
 
 def estimate_text_tokens(messages: Sequence[Message]) -> int:
-    """Estimate tokens from message text content using a character-based heuristic."""
-    total_chars = 0
-    for msg in messages:
-        for part in msg.content:
-            if isinstance(part, TextPart):
-                total_chars += len(part.text)
-    # ~4 chars per token for English; somewhat underestimates for CJK text,
-    # but this is a temporary estimate that gets corrected on the next LLM call.
-    return total_chars // 4
+    """Estimate tokens from message text content and tool calls.
+
+    Uses the configured offline tokenizer (see `kimi_cli.utils.tokenizer`); this is a
+    temporary estimate that gets corrected on the next LLM call.
+    """
+    return count_messages_tokens(messages)
 
 
 def should_auto_compact(
@@ -96,13 +97,27 @@ class Compaction(Protocol):
 
 if TYPE_CHECKING:
 
-    def type_check(simple: SimpleCompaction):
+    def type_check(simple: SimpleCompaction, chunked: ChunkedCompaction):
         _: Compaction = simple
+        _: Compaction = chunked
 
 
 class SimpleCompaction:
-    def __init__(self, max_preserved_messages: int = 2) -> None:
+    """
+    Summarize everything but the most recent messages with one LLM call.
+
+    Args:
+        max_preserved_messages: How many of the latest user and assistant messages are kept
+            verbatim, together with the tool messages around them.
+        max_preserved_tokens: If set, fewer messages are kept when the kept tail would exceed
+            this many tokens, so that one oversized turn cannot defeat the compaction.
+    """
+
+    def __init__(
+        self, max_preserved_messages: int = 2, *, max_preserved_tokens: int | None = None
+    ) -> None:
         self.max_preserved_messages = max_preserved_messages
+        self.max_preserved_tokens = max_preserved_tokens
 
     async def compact(
         self, messages: Sequence[Message], llm: LLM, *, custom_instruction: str = ""
@@ -114,29 +129,8 @@ class SimpleCompaction:
         # Call kosong.step to get the compacted context
         # TODO: set max completion tokens
         logger.debug("Compacting context...")
-        result = await kosong.step(
-            chat_provider=llm.chat_provider,
-            system_prompt="You are a helpful assistant that compacts conversation context.",
-            toolset=EmptyToolset(),
-            history=[compact_message],
-        )
-        if result.usage:
-            logger.debug(
-                "Compaction used {input} input tokens and {output} output tokens",
-                input=result.usage.input,
-                output=result.usage.output,
-            )
-
-        content: list[ContentPart] = [
-            system("Previous context has been compacted. Here is the compaction output:")
-        ]
-        compacted_msg = result.message
-
-        # drop thinking parts if any
-        content.extend(part for part in compacted_msg.content if not isinstance(part, ThinkPart))
-        compacted_messages: list[Message] = [Message(role="user", content=content)]
-        compacted_messages.extend(to_preserve)
-        return CompactionResult(messages=compacted_messages, usage=result.usage)
+        result = await _summarize(llm, compact_message)
+        return _compaction_result(result, to_preserve)
 
     class PrepareResult(NamedTuple):
         compact_message: Message | None
@@ -145,45 +139,261 @@ class SimpleCompaction:
     def prepare(
         self, messages: Sequence[Message], *, custom_instruction: str = ""
     ) -> PrepareResult:
+        to_compact, to_preserve = self.split(
+            messages, max_preserved_tokens=self.max_preserved_tokens
+        )
+        if not to_compact:
+            return self.PrepareResult(compact_message=None, to_preserve=to_preserve)
+
+        # Create input message for compaction
+        compact_message = Message(role="user", content=[])
+        for i, msg in enumerate(to_compact):
+            compact_message.content.append(
+                TextPart(text=f"## Message {i + 1}\nRole: {msg.role}\nContent:\n")
+            )
+            compact_message.content.extend(
+                part for part in msg.content if isinstance(part, TextPart)
+            )
+        compact_message.content.append(
+            TextPart(text=_with_custom_instruction("\n" + prompts.COMPACT, custom_instruction))
+        )
+        return self.PrepareResult(compact_message=compact_message, to_preserve=to_preserve)
+
+    def split(
+        self, messages: Sequence[Message], *, max_preserved_tokens: int | None
+    ) -> tuple[list[Message], Sequence[Message]]:
+        """
+        Split `messages` into the messages to compact and the tail to preserve.
+
+        The messages to compact are empty when there is nothing worth compacting.
+        """
         if not messages or self.max_preserved_messages <= 0:
-            return self.PrepareResult(compact_message=None, to_preserve=messages)
+            return [], messages
 
         history = list(messages)
         preserve_start_index = len(history)
         n_preserved = 0
+        preserved_tokens = 0
+        over_budget = False
         for index in range(len(history) - 1, -1, -1):
-            if history[index].role in {"user", "assistant"}:
-                n_preserved += 1
-                if n_preserved == self.max_preserved_messages:
-                    preserve_start_index = index
-                    break
+            if max_preserved_tokens is not None:
+                preserved_tokens += count_message_tokens(history[index])
+            if history[index].role not in {"user", "assistant"}:
+                continue
+            if max_preserved_tokens is not None and preserved_tokens > max_preserved_tokens:
+                over_budget = True
+                break
+            n_preserved += 1
+            preserve_start_index = index
+            if n_preserved == self.max_preserved_messages:
+                break
+
+        if n_preserved < self.max_preserved_messages and not over_budget:
+            return [], messages
+
+        # With nothing to compact, let's hope the tail won't exceed the context size limit
+        return history[:preserve_start_index], history[preserve_start_index:]
+
+
+class ChunkedCompaction(SimpleCompaction):
+    """
+    Map-reduce compaction for histories too large to summarize in one LLM call.
+
+    The messages to compact are split into chunks of at most ``chunk_ratio`` of the model's
+    context size. Each chunk is summarized on its own, at most ``max_concurrency`` at a time,
+    and the summaries are then merged, in several rounds if they do not fit into one chunk
+    either. A history that fits into one chunk is summarized with a single call. The preserved
+    tail is capped at ``preserved_ratio`` of the context size.
+
+    Unlike `SimpleCompaction`, tool calls and placeholders for media parts are included in the
+    compaction input, so that the summary knows what the agent did.
 
-        if n_preserved < self.max_preserved_messages:
-            return self.PrepareResult(compact_message=None, to_preserve=messages)
+    The returned usage is the one of the final call, whose output is the summary.
+    """
 
-        to_compact = history[:preserve_start_index]
-        to_preserve = history[preserve_start_index:]
+    def __init__(
+        self,
+        max_preserved_messages: int = 2,
+        *,
+        chunk_ratio: float = 0.3,
+        preserved_ratio: float = 0.15,
+        max_concurrency: int = 4,
+    ) -> None:
+        super().__init__(max_preserved_messages)
+        self.chunk_ratio = chunk_ratio
+        self.preserved_ratio = preserved_ratio
+        self.max_concurrency = max_concurrency
 
+    async def compact(
+        self, messages: Sequence[Message], llm: LLM, *, custom_instruction: str = ""
+    ) -> CompactionResult:
+        to_compact, to_preserve = self.split(
+            messages, max_preserved_tokens=int(llm.max_context_size * self.preserved_ratio)
+        )
         if not to_compact:
-            # Let's hope this won't exceed the context size limit
-            return self.PrepareResult(compact_message=None, to_preserve=to_preserve)
+            return CompactionResult(messages=to_preserve, usage=None)
 
-        # Create input message for compaction
-        compact_message = Message(role="user", content=[])
-        for i, msg in enumerate(to_compact):
-            compact_message.content.append(
-                TextPart(text=f"## Message {i + 1}\nRole: {msg.role}\nContent:\n")
+        chunk_tokens = max(int(llm.max_context_size * self.chunk_ratio), 1)
+        chunks = _group_by_tokens(to_compact, count_message_tokens, chunk_tokens)
+        logger.debug("Compacting context in {n} chunk(s)...", n=len(chunks))
+        if len(chunks) == 1:
+            result = await _summarize(
+                llm, _chunk_message(chunks[0], first_index=1, custom_instruction=custom_instruction)
             )
-            compact_message.content.extend(
-                part for part in msg.content if isinstance(part, TextPart)
+            return _compaction_result(result, to_preserve)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def summarize_text(message: Message) -> str:
+            async with semaphore:
+                return (await _summarize(llm, message)).message.extract_text()
+
+        first_indices = list(accumulate((len(chunk) for chunk in chunks[:-1]), initial=1))
+        summaries = await _gather(
+            summarize_text(
+                _chunk_message(
+                    chunk,
+                    first_index=first_index,
+                    part=(i + 1, len(chunks)),
+                    custom_instruction=custom_instruction,
+                )
             )
-        prompt_text = "\n" + prompts.COMPACT
-        if custom_instruction:
-            prompt_text += (
-                "\n\n**User's Custom Compaction Instruction:**\n"
-                "The user has specifically requested the following focus during compaction. "
-                "You MUST prioritize this instruction above the default compression priorities:\n"
-                f"{custom_instruction}"
+            for i, (chunk, first_index) in enumerate(zip(chunks, first_indices, strict=True))
+        )
+        while True:
+            # groups of two or more, so that every round makes progress
+            groups = _group_by_tokens(summaries, count_tokens, chunk_tokens, min_group_size=2)
+            if len(groups) == 1:
+                break
+            logger.debug("Merging {n} summaries in {m} groups...", n=len(summaries), m=len(groups))
+            merged = iter(
+                await _gather(
+                    summarize_text(_merge_message(group, custom_instruction))
+                    for group in groups
+                    if len(group) > 1
+                )
             )
-        compact_message.content.append(TextPart(text=prompt_text))
-        return self.PrepareResult(compact_message=compact_message, to_preserve=to_preserve)
+            # A lone leftover summary goes on to the next round as it is.
+            summaries = [group[0] if len(group) == 1 else next(merged) for group in groups]
+        result = await _summarize(llm, _merge_message(summaries, custom_instruction))
+        return _compaction_result(result, to_preserve)
+
+
+async def _gather(coros: Iterable[Coroutine[Any, Any, str]]) -> list[str]:
+    """Run `coros` concurrently; if one fails, cancel the others and raise its error."""
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(coro) for coro in coros]
+    except BaseExceptionGroup as group:
+        # Raise the error itself so that the retry logic of the caller sees it.
+        raise group.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
+async def _summarize(llm: LLM, compact_message: Message) -> StepResult:
+    result = await kosong.step(
+        chat_provider=llm.chat_provider,
+        system_prompt="You are a helpful assistant that compacts conversation context.",
+        toolset=EmptyToolset(),
+        history=[compact_message],
+    )
+    if result.usage:
+        logger.debug(
+            "Compaction used {input} input tokens and {output} output tokens",
+            input=result.usage.input,
+            output=result.usage.output,
+        )
+    return result
+
+
+def _compaction_result(result: StepResult, to_preserve: Sequence[Message]) -> CompactionResult:
+    content: list[ContentPart] = [
+        system("Previous context has been compacted. Here is the compaction output:")
+    ]
+    # drop thinking parts if any
+    content.extend(part for part in result.message.content if not isinstance(part, ThinkPart))
+    compacted_messages: list[Message] = [Message(role="user", content=content)]
+    compacted_messages.extend(to_preserve)
+    return CompactionResult(messages=compacted_messages, usage=result.usage)
+
+
+def _with_custom_instruction(prompt_text: str, custom_instruction: str) -> str:
+    if custom_instruction:
+        prompt_text += (
+            "\n\n**User's Custom Compaction Instruction:**\n"
+            "The user has specifically requested the following focus during compaction. "
+            "You MUST prioritize this instruction above the default compression priorities:\n"
+            f"{custom_instruction}"
+        )
+    return prompt_text
+
+
+def _group_by_tokens[T](
+    items: Sequence[T], count: Callable[[T], int], budget: int, *, min_group_size: int = 1
+) -> list[list[T]]:
+    """
+    Split `items` into consecutive groups of at most `budget` tokens.
+
+    A group is only closed once it holds `min_group_size` items, so a single item larger than
+    the budget still gets a group of its own.
+    """
+    groups: list[list[T]] = []
+    group: list[T] = []
+    group_tokens = 0
+    for item in items:
+        tokens = count(item)
+        if len(group) >= min_group_size and group_tokens + tokens > budget:
+            groups.append(group)
+            group, group_tokens = [], 0
+        group.append(item)
+        group_tokens += tokens
+    if group:
+        groups.append(group)
+    return groups
+
+
+def _chunk_message(
+    chunk: Sequence[Message],
+    *,
+    first_index: int,
+    part: tuple[int, int] | None = None,
+    custom_instruction: str,
+) -> Message:
+    content: list[ContentPart] = []
+    if part is not None:
+        content.append(
+            TextPart(
+                text=f"The following is part {part[0]} of {part[1]} of an agent conversation.\n\n"
+            )
+        )
+    for i, msg in enumerate(chunk, start=first_index):
+        content.append(TextPart(text=f"## Message {i}\nRole: {msg.role}\nContent:\n"))
+        for msg_part in msg.content:
+            match msg_part:
+                case TextPart():
+                    content.append(msg_part)
+                case ThinkPart():
+                    pass
+                case _:
+                    content.append(TextPart(text=f"[{msg_part.type} omitted]\n"))
+        for tool_call in msg.tool_calls or []:
+            content.append(
+                TextPart(
+                    text=f"\n[Tool call {tool_call.function.name}: "
+                    f"{tool_call.function.arguments or ''}]\n"
+                )
+            )
+    content.append(
+        TextPart(text=_with_custom_instruction("\n" + prompts.COMPACT, custom_instruction))
+    )
+    return Message(role="user", content=content)
+
+
+def _merge_message(summaries: Sequence[str], custom_instruction: str) -> Message:
+    content: list[ContentPart] = []
+    for i, summary in enumerate(summaries, start=1):
+        content.append(TextPart(text=f"## Summary {i}\n{summary}\n\n"))
+    content.append(
+        TextPart(text=_with_custom_instruction(prompts.COMPACT_MERGE, custom_instruction))
+    )
+    return Message(role="user", content=content)
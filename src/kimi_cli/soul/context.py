@@ -2,30 +2,60 @@ from __future__ import annotations
 
 import asyncio
 import json
-from collections.abc import Sequence
+import shutil
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import ExitStack, asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Literal, cast
 
 import aiofiles
 import aiofiles.os
 from kosong.message import Message
 from pydantic import ValidationError
 
-from kimi_cli.soul.compaction import estimate_text_tokens
 from kimi_cli.soul.message import system
+from kimi_cli.utils.io import AppendWriter
 from kimi_cli.utils.logging import logger
 from kimi_cli.utils.path import next_available_rotation
+from kimi_cli.utils.tokenizer import count_message_tokens
+
+type ContextDurability = Literal["flush", "fsync"]
+"""How committed context records are persisted: handed to the OS, or also fsynced."""
+
+
+@dataclass(frozen=True, slots=True)
+class _CheckpointMark:
+    """Where a checkpoint record sits in the context file and the state right before it."""
+
+    offset: int
+    """Byte offset of the checkpoint line in the context file."""
+    n_messages: int
+    token_count: int
+    n_messages_at_usage: int
 
 
 class Context:
-    def __init__(self, file_backend: Path):
+    def __init__(self, file_backend: Path, *, durability: ContextDurability = "flush"):
         self._file_backend = file_backend
+        self._durability: ContextDurability = durability
+        self._writer: AppendWriter | None = None
+        self._batch_depth = 0
         self._history: list[Message] = []
         self._token_count: int = 0
-        self._pending_token_estimate: int = 0
+        self._token_prefix: list[int] = [0]
+        """Running sums of the per-message token estimates: entry i covers the first i messages."""
+        self._n_messages_at_usage: int = 0
+        """Number of messages covered by `_token_count`, the last reported token count."""
         self._next_checkpoint_id: int = 0
         """The ID of the next checkpoint, starting from 0, incremented after each checkpoint."""
         self._system_prompt: str | None = None
+        self._checkpoint_marks: dict[int, _CheckpointMark] = {}
+        """Index of the checkpoints in the current file, used to revert without re-parsing."""
+        self._end_offset: int | None = None
+        """Size of the context file including buffered records, or None if not known yet."""
+        self._first_skipped_offset: int | None = None
+        """Offset of the first line `restore` skipped; reverting before it can copy bytes."""
 
     async def restore(self) -> bool:
         logger.debug("Restoring context from file: {file_backend}", file_backend=self._file_backend)
@@ -39,29 +69,8 @@ class Context:
             logger.debug("Empty context file, skipping restoration")
             return False
 
-        messages_after_last_usage: list[Message] = []
-        async with aiofiles.open(self._file_backend, encoding="utf-8", errors="replace") as f:
-            line_no = 0
-            async for line in f:
-                line_no += 1
-                if not line.strip():
-                    continue
-                line_json = self._parse_context_line(
-                    line,
-                    file_backend=self._file_backend,
-                    line_no=line_no,
-                )
-                if line_json is None:
-                    continue
-                self._apply_context_record(
-                    line_json,
-                    history=self._history,
-                    messages_after_last_usage=messages_after_last_usage,
-                    file_backend=self._file_backend,
-                    line_no=line_no,
-                )
-
-        self._pending_token_estimate = estimate_text_tokens(messages_after_last_usage)
+        # Parse in one worker thread rather than hopping to a thread for every line.
+        await asyncio.to_thread(self._load_sync, self._file_backend)
         return True
 
     @property
@@ -74,7 +83,16 @@ class Context:
 
     @property
     def token_count_with_pending(self) -> int:
-        return self._token_count + self._pending_token_estimate
+        return self._token_count + self.estimate_tokens(self._n_messages_at_usage)
+
+    def estimate_tokens(self, start: int = 0, end: int | None = None) -> int:
+        """
+        Estimate the tokens of ``history[start:end]`` with the offline tokenizer.
+
+        Per-message estimates are kept as running sums, so this takes constant time.
+        """
+        start, end, _ = slice(start, end).indices(len(self._history))
+        return self._token_prefix[max(end, start)] - self._token_prefix[start]
 
     @property
     def n_checkpoints(self) -> int:
@@ -97,6 +115,8 @@ class Context:
         into memory.
         """
         prompt_line = json.dumps({"role": "_system_prompt", "content": prompt}) + "\n"
+        # The file is rewritten below, so pending records must land in the old one first.
+        await self._close_writer()
 
         def _write_system_prompt_sync() -> None:
             if not self._file_backend.exists() or self._file_backend.stat().st_size == 0:
@@ -119,24 +139,49 @@ class Context:
         await asyncio.to_thread(_write_system_prompt_sync)
 
         self._system_prompt = prompt
+        # Existing records moved down by the prepended line.
+        shift = len(prompt_line.encode("utf-8"))
+        self._checkpoint_marks = {
+            checkpoint_id: _CheckpointMark(
+                offset=mark.offset + shift,
+                n_messages=mark.n_messages,
+                token_count=mark.token_count,
+                n_messages_at_usage=mark.n_messages_at_usage,
+            )
+            for checkpoint_id, mark in self._checkpoint_marks.items()
+        }
+        if self._first_skipped_offset is not None:
+            self._first_skipped_offset += shift
+        self._end_offset = None
 
     async def checkpoint(self, add_user_message: bool):
         checkpoint_id = self._next_checkpoint_id
         self._next_checkpoint_id += 1
         logger.debug("Checkpointing, ID: {id}", id=checkpoint_id)
 
-        async with aiofiles.open(self._file_backend, "a", encoding="utf-8") as f:
-            await f.write(json.dumps({"role": "_checkpoint", "id": checkpoint_id}) + "\n")
+        self._checkpoint_marks[checkpoint_id] = _CheckpointMark(
+            offset=self._current_offset(),
+            n_messages=len(self._history),
+            token_count=self._token_count,
+            n_messages_at_usage=self._n_messages_at_usage,
+        )
+        self._append_line(json.dumps({"role": "_checkpoint", "id": checkpoint_id}) + "\n")
         if add_user_message:
             await self.append_message(
                 Message(role="user", content=[system(f"CHECKPOINT {checkpoint_id}")])
             )
+        else:
+            await self._commit_unless_batched()
 
     async def revert_to(self, checkpoint_id: int):
         """
         Revert the context to the specified checkpoint.
         After this, the specified checkpoint and all subsequent content will be
-        removed from the context. File backend will be rotated.
+        removed from the context.
+
+        With the checkpoint index, the file backend is truncated in place at the checkpoint
+        and the removed records are moved to a rotation file. Otherwise the file backend is
+        rotated and rewritten up to the checkpoint.
 
         Args:
             checkpoint_id (int): The ID of the checkpoint to revert to. 0 is the first checkpoint.
@@ -151,53 +196,55 @@ class Context:
             logger.error("Checkpoint {checkpoint_id} does not exist", checkpoint_id=checkpoint_id)
             raise ValueError(f"Checkpoint {checkpoint_id} does not exist")
 
-        # rotate the context file
+        await self._close_writer()
         rotated_file_path = await next_available_rotation(self._file_backend)
         if rotated_file_path is None:
             logger.error("No available rotation path found")
             raise RuntimeError("No available rotation path found")
+
+        mark = self._checkpoint_marks.get(checkpoint_id)
+        skipped = self._first_skipped_offset
+        if (
+            mark is not None
+            and (skipped is None or skipped >= mark.offset)
+            and await asyncio.to_thread(
+                _is_checkpoint_at, self._file_backend, mark.offset, checkpoint_id
+            )
+        ):
+            # Everything before the checkpoint line is kept verbatim, so cut the file there
+            # instead of re-parsing and re-serializing the history.
+            await asyncio.to_thread(_move_tail, self._file_backend, rotated_file_path, mark.offset)
+            logger.debug(
+                "Moved reverted context records to: {rotated_file_path}",
+                rotated_file_path=rotated_file_path,
+            )
+            del self._history[mark.n_messages :]
+            del self._token_prefix[mark.n_messages + 1 :]
+            self._token_count = mark.token_count
+            self._n_messages_at_usage = mark.n_messages_at_usage
+            self._next_checkpoint_id = checkpoint_id
+            self._checkpoint_marks = {
+                cid: m for cid, m in self._checkpoint_marks.items() if cid < checkpoint_id
+            }
+            self._end_offset = mark.offset
+            self._first_skipped_offset = None
+            return
+
+        # rotate the context file
         await aiofiles.os.replace(self._file_backend, rotated_file_path)
         logger.debug(
             "Rotated context file: {rotated_file_path}", rotated_file_path=rotated_file_path
         )
-
         # restore the context until the specified checkpoint
-        self._history.clear()
-        self._token_count = 0
+        self._reset_history()
         self._next_checkpoint_id = 0
         self._system_prompt = None
-        messages_after_last_usage: list[Message] = []
-        async with (
-            aiofiles.open(rotated_file_path, encoding="utf-8", errors="replace") as old_file,
-            aiofiles.open(self._file_backend, "w", encoding="utf-8") as new_file,
-        ):
-            line_no = 0
-            async for line in old_file:
-                line_no += 1
-                if not line.strip():
-                    continue
-
-                line_json = self._parse_context_line(
-                    line,
-                    file_backend=rotated_file_path,
-                    line_no=line_no,
-                )
-                if line_json is None:
-                    continue
-                if line_json.get("role") == "_checkpoint" and line_json.get("id") == checkpoint_id:
-                    break
-
-                keep_line = self._apply_context_record(
-                    line_json,
-                    history=self._history,
-                    messages_after_last_usage=messages_after_last_usage,
-                    file_backend=rotated_file_path,
-                    line_no=line_no,
-                )
-                if keep_line:
-                    await new_file.write(line)
-
-        self._pending_token_estimate = estimate_text_tokens(messages_after_last_usage)
+        await asyncio.to_thread(
+            self._load_sync,
+            rotated_file_path,
+            until_checkpoint=checkpoint_id,
+            rewrite_to=self._file_backend,
+        )
 
     async def clear(self):
         """
@@ -212,6 +259,7 @@ class Context:
 
         logger.debug("Clearing context")
 
+        await self._close_writer()
         # rotate the context file
         rotated_file_path = await next_available_rotation(self._file_backend)
         if rotated_file_path is None:
@@ -223,29 +271,156 @@ class Context:
             "Rotated context file: {rotated_file_path}", rotated_file_path=rotated_file_path
         )
 
-        self._history.clear()
-        self._token_count = 0
-        self._pending_token_estimate = 0
+        self._reset_history()
         self._next_checkpoint_id = 0
         self._system_prompt = None
+        self._checkpoint_marks.clear()
+        self._end_offset = 0
+        self._first_skipped_offset = None
 
     async def append_message(self, message: Message | Sequence[Message]):
         logger.debug("Appending message(s) to context: {message}", message=message)
         messages = [message] if isinstance(message, Message) else message
-        self._history.extend(messages)
-        self._pending_token_estimate += estimate_text_tokens(messages)
+        self._extend_history(messages)
 
-        async with aiofiles.open(self._file_backend, "a", encoding="utf-8") as f:
-            for message in messages:
-                await f.write(message.model_dump_json(exclude_none=True) + "\n")
+        for message in messages:
+            self._append_line(message.model_dump_json(exclude_none=True) + "\n")
+        await self._commit_unless_batched()
 
     async def update_token_count(self, token_count: int):
         logger.debug("Updating token count in context: {token_count}", token_count=token_count)
         self._token_count = token_count
-        self._pending_token_estimate = 0
+        self._n_messages_at_usage = len(self._history)
+
+        self._append_line(json.dumps({"role": "_usage", "token_count": token_count}) + "\n")
+        await self._commit_unless_batched()
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncGenerator[None]:
+        """
+        Group-commit the records appended inside the block.
+
+        Records appended by `append_message`, `checkpoint` and `update_token_count`
+        are buffered and written to the file with a single write when the outermost
+        block exits, including when it exits with an exception. Use `commit` to
+        write them earlier.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                await self.commit()
+
+    async def commit(self) -> None:
+        """Write all buffered records to the context file."""
+        if self._writer is not None:
+            await self._writer.flush()
+
+    async def close(self) -> None:
+        """Commit buffered records and release the file handle.
+
+        The context stays usable; the file is reopened on the next write.
+        """
+        await self._close_writer()
+
+    def _extend_history(self, messages: Sequence[Message]) -> None:
+        total = self._token_prefix[-1]
+        for message in messages:
+            self._history.append(message)
+            total += count_message_tokens(message)
+            self._token_prefix.append(total)
 
-        async with aiofiles.open(self._file_backend, "a", encoding="utf-8") as f:
-            await f.write(json.dumps({"role": "_usage", "token_count": token_count}) + "\n")
+    def _reset_history(self) -> None:
+        self._history.clear()
+        self._token_prefix = [0]
+        self._token_count = 0
+        self._n_messages_at_usage = 0
+
+    def _append_line(self, line: str) -> None:
+        offset = self._current_offset()
+        if self._writer is None:
+            self._writer = AppendWriter(
+                self._file_backend,
+                fsync="flush" if self._durability == "fsync" else "never",
+            )
+        data = line.encode("utf-8")
+        self._writer.buffer(data)
+        self._end_offset = offset + len(data)
+
+    def _current_offset(self) -> int:
+        if self._end_offset is None:
+            try:
+                size = self._file_backend.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            pending = self._writer.pending_bytes if self._writer is not None else 0
+            self._end_offset = size + pending
+        return self._end_offset
+
+    def _load_sync(
+        self,
+        source: Path,
+        *,
+        until_checkpoint: int | None = None,
+        rewrite_to: Path | None = None,
+    ) -> None:
+        """
+        Apply the records of `source` to this context and rebuild the checkpoint index.
+
+        Stops before the checkpoint `until_checkpoint` if given. If `rewrite_to` is given,
+        the applied records are also written to that file, and the index refers to it.
+        """
+        self._checkpoint_marks.clear()
+        self._first_skipped_offset = None
+        offset = 0
+        with ExitStack() as stack:
+            src = stack.enter_context(source.open("rb"))
+            dst = stack.enter_context(rewrite_to.open("wb")) if rewrite_to is not None else None
+            for line_no, raw_line in enumerate(src, start=1):
+                line = raw_line.decode("utf-8", errors="replace")
+                line_json = (
+                    self._parse_context_line(line, file_backend=source, line_no=line_no)
+                    if line.strip()
+                    else None
+                )
+                if line_json is not None and line_json.get("role") == "_checkpoint":
+                    checkpoint_id = line_json.get("id")
+                    if checkpoint_id == until_checkpoint:
+                        break
+                    if isinstance(checkpoint_id, int):
+                        self._checkpoint_marks[checkpoint_id] = _CheckpointMark(
+                            offset=offset,
+                            n_messages=len(self._history),
+                            token_count=self._token_count,
+                            n_messages_at_usage=self._n_messages_at_usage,
+                        )
+                keep_line = line_json is not None and self._apply_context_record(
+                    line_json,
+                    file_backend=source,
+                    line_no=line_no,
+                )
+                if dst is not None:
+                    # skipped lines are dropped from the rewritten file
+                    if keep_line:
+                        data = line.encode("utf-8")
+                        dst.write(data)
+                        offset += len(data)
+                    continue
+                if not keep_line and self._first_skipped_offset is None:
+                    self._first_skipped_offset = offset
+                offset += len(raw_line)
+        self._end_offset = offset
+
+    async def _commit_unless_batched(self) -> None:
+        if self._batch_depth == 0:
+            await self.commit()
+
+    async def _close_writer(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            await writer.close()
 
     def _parse_context_line(
         self,
@@ -277,8 +452,6 @@ class Context:
         self,
         line_json: dict[str, Any],
         *,
-        history: list[Message],
-        messages_after_last_usage: list[Message],
         file_backend: Path,
         line_no: int,
     ) -> bool:
@@ -311,7 +484,7 @@ class Context:
                 )
                 return False
             self._token_count = token_count
-            messages_after_last_usage.clear()
+            self._n_messages_at_usage = len(self._history)
             return True
         if role == "_checkpoint":
             checkpoint_id = line_json.get("id")
@@ -334,6 +507,27 @@ class Context:
                 error=exc,
             )
             return False
-        history.append(message)
-        messages_after_last_usage.append(message)
+        self._extend_history([message])
         return True
+
+
+def _is_checkpoint_at(path: Path, offset: int, checkpoint_id: int) -> bool:
+    """Check that the line at `offset` in `path` is the given checkpoint record."""
+    try:
+        with path.open("rb") as f:
+            f.seek(offset)
+            line_json = json.loads(f.readline())
+    except (OSError, ValueError):
+        return False
+    if not isinstance(line_json, dict):
+        return False
+    record = cast(dict[str, Any], line_json)
+    return record.get("role") == "_checkpoint" and record.get("id") == checkpoint_id
+
+
+def _move_tail(source: Path, target: Path, offset: int) -> None:
+    """Copy the bytes of `source` from `offset` on to `target`, then truncate `source` there."""
+    with source.open("r+b") as src, target.open("wb") as dst:
+        src.seek(offset)
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+        src.truncate(offset)
@@ -65,20 +65,62 @@ def normalize_history(history: Sequence[Message]) -> list[Message]:
     are never merged because their ``tool_calls`` / ``tool_call_id``
     fields form linked pairs that must stay intact.
     """
-    if not history:
-        return []
-
     result: list[Message] = []
     for msg in history:
-        if (
-            result
-            and result[-1].role == msg.role
-            and msg.role == "user"
-            and not is_notification_message(result[-1])
-            and not is_notification_message(msg)
-        ):
-            merged_content = list(result[-1].content) + list(msg.content)
-            result[-1] = Message(role="user", content=merged_content)
-        else:
-            result.append(msg)
+        _append_normalized(result, msg)
     return result
+
+
+class HistoryNormalizer:
+    """Incremental :func:`normalize_history` for a history that grows between calls.
+
+    Only messages appended since the previous call are normalized; the longest
+    prefix of messages (compared by identity) shared with the previous call is
+    reused as is. Unchanged merged messages are therefore the same objects on
+    every call, which lets the chat provider reuse their converted payloads.
+    Compaction and revert are detected by the identity comparison, so no
+    explicit invalidation is needed.
+    """
+
+    def __init__(self) -> None:
+        self._source: list[Message] = []
+        self._result: list[Message] = []
+        # For each source message: the result length and last result message after it
+        self._result_lens: list[int] = []
+        self._result_tails: list[Message] = []
+
+    def normalize(self, history: Sequence[Message]) -> list[Message]:
+        n_common = 0
+        limit = min(len(self._source), len(history))
+        while n_common < limit and self._source[n_common] is history[n_common]:
+            n_common += 1
+
+        del self._source[n_common:]
+        del self._result_lens[n_common:]
+        del self._result_tails[n_common:]
+        if n_common:
+            del self._result[self._result_lens[-1] :]
+            self._result[-1] = self._result_tails[-1]
+        else:
+            self._result.clear()
+
+        for msg in history[n_common:]:
+            _append_normalized(self._result, msg)
+            self._source.append(msg)
+            self._result_lens.append(len(self._result))
+            self._result_tails.append(self._result[-1])
+        return list(self._result)
+
+
+def _append_normalized(result: list[Message], msg: Message) -> None:
+    if (
+        result
+        and result[-1].role == msg.role
+        and msg.role == "user"
+        and not is_notification_message(result[-1])
+        and not is_notification_message(msg)
+    ):
+        merged_content = list(result[-1].content) + list(msg.content)
+        result[-1] = Message(role="user", content=merged_content)
+    else:
+        result.append(msg)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import time
 import uuid
 from collections.abc import Awaitable, Callable, Sequence
@@ -47,16 +48,17 @@ from kimi_cli.soul import (
 )
 from kimi_cli.soul.agent import Agent, Runtime
 from kimi_cli.soul.compaction import (
+    ChunkedCompaction,
+    Compaction,
     CompactionResult,
     SimpleCompaction,
-    estimate_text_tokens,
     should_auto_compact,
 )
 from kimi_cli.soul.context import Context
 from kimi_cli.soul.dynamic_injection import (
     DynamicInjection,
     DynamicInjectionProvider,
-    normalize_history,
+    HistoryNormalizer,
 )
 from kimi_cli.soul.dynamic_injections.afk_mode import AfkModeInjectionProvider
 from kimi_cli.soul.dynamic_injections.plan_mode import PlanModeInjectionProvider
@@ -155,6 +157,19 @@ class TurnOutcome:
     step_count: int
 
 
+@dataclass(frozen=True, slots=True)
+class _Precompaction:
+    """An auto-compaction running in the background ahead of the blocking threshold."""
+
+    task: asyncio.Task[tuple[CompactionResult, int]]
+    """Resolves to the compaction result and the number of retries it took."""
+    history: list[Message]
+    """The history being compacted; the result only applies while it is still a prefix."""
+    n_checkpoints: int
+    """Checkpoints in the context when the compaction started; a revert below them voids it."""
+    start_time: float
+
+
 class KimiSoul:
     """The soul of Kimi Code CLI."""
 
@@ -177,7 +192,13 @@ class KimiSoul:
         self._approval = agent.runtime.approval
         self._context = context
         self._loop_control = agent.runtime.config.loop_control
-        self._compaction = SimpleCompaction()  # TODO: maybe configurable and composable
+        self._compaction: Compaction = (
+            ChunkedCompaction()
+            if self._loop_control.compaction_strategy == "chunked"
+            else SimpleCompaction()
+        )
+        self._history_normalizer = HistoryNormalizer()
+        self._precompaction: _Precompaction | None = None
 
         for tool in agent.toolset.tools:
             if tool.name == SendDMail_NAME:
@@ -868,7 +889,8 @@ class KimiSoul:
                 ):
                     logger.info("Context too long, compacting...")
                     try:
-                        await self.compact_context()
+                        if not await self._apply_precompaction(wait=True):
+                            await self.compact_context()
                     except Exception as compact_err:
                         logger.error(
                             "Context compaction failed at step {step_no}: {error_type}: {error}",
@@ -877,11 +899,15 @@ class KimiSoul:
                             error=compact_err,
                         )
                         raise
+                else:
+                    await self._precompact_if_needed()
 
                 logger.debug("Beginning step {step_no}", step_no=step_no)
-                await self._checkpoint()
-                self._denwa_renji.set_n_checkpoints(self._context.n_checkpoints)
-                step_outcome = await self._step()
+                # group-commit the context records produced by this step
+                async with self._context.batch():
+                    await self._checkpoint()
+                    self._denwa_renji.set_n_checkpoints(self._context.n_checkpoints)
+                    step_outcome = await self._step()
             except BackToTheFuture as e:
                 back_to_the_future = e
             except Exception as e:
@@ -946,9 +972,11 @@ class KimiSoul:
                 )
 
             if back_to_the_future is not None:
+                await self.cancel_precompaction()
                 await self._context.revert_to(back_to_the_future.checkpoint_id)
-                await self._checkpoint()
-                await self._context.append_message(back_to_the_future.messages)
+                async with self._context.batch():
+                    await self._checkpoint()
+                    await self._context.append_message(back_to_the_future.messages)
 
             # Consume any pending steers between steps
             await self._consume_pending_steers()
@@ -1001,8 +1029,11 @@ class KimiSoul:
                 )
             )
 
+        # Persist the request side of the step before waiting on the LLM
+        await self._context.commit()
+
         # Normalize: merge adjacent user messages for clean API input
-        effective_history = normalize_history(self._context.history)
+        effective_history = self._history_normalizer.normalize(self._context.history)
 
         async def _run_step_once() -> StepResult:
             # run an LLM step (may be interrupted)
@@ -1166,36 +1197,15 @@ class KimiSoul:
             ChatProviderError: When the chat provider returns an error.
         """
 
-        chat_provider = self._runtime.llm.chat_provider if self._runtime.llm is not None else None
-
-        async def _run_compaction_once() -> CompactionResult:
-            if self._runtime.llm is None:
-                raise LLMNotSet()
-            return await self._compaction.compact(
-                self._context.history, self._runtime.llm, custom_instruction=custom_instruction
-            )
+        # The background compaction would be superseded by this one.
+        await self.cancel_precompaction()
 
         start_time = time.monotonic()
         retry_count = 0
 
-        def _retry_log_compaction(retry_state: RetryCallState) -> None:
+        def _on_retry(attempt_number: int) -> None:
             nonlocal retry_count
-            retry_count = retry_state.attempt_number
-            self._retry_log("compaction", retry_state)
-
-        @tenacity.retry(
-            retry=retry_if_exception(self._is_retryable_error),
-            before_sleep=_retry_log_compaction,
-            wait=wait_exponential_jitter(initial=0.3, max=5, jitter=0.5),
-            stop=stop_after_attempt(self._loop_control.max_retries_per_step),
-            reraise=True,
-        )
-        async def _compact_with_retry() -> CompactionResult:
-            return await self._run_with_connection_recovery(
-                "compaction",
-                _run_compaction_once,
-                chat_provider=chat_provider,
-            )
+            retry_count = attempt_number
 
         if not manual:
             trigger_reason = "auto"
@@ -1219,7 +1229,9 @@ class KimiSoul:
 
         wire_send(CompactionBegin())
         try:
-            compaction_result = await _compact_with_retry()
+            compaction_result, retry_count = await self._run_compaction(
+                self._context.history, custom_instruction=custom_instruction, on_retry=_on_retry
+            )
         except Exception as _compact_exc:
             from kimi_cli.telemetry import track
 
@@ -1232,30 +1244,215 @@ class KimiSoul:
                 error_type=type(_compact_exc).__name__,
             )
             raise
+        await self._apply_compaction_result(
+            compaction_result,
+            trigger_reason=trigger_reason,
+            before_tokens=before_tokens,
+            start_time=start_time,
+            retry_count=retry_count,
+        )
+
+    async def _run_compaction(
+        self,
+        history: Sequence[Message],
+        *,
+        custom_instruction: str = "",
+        on_retry: Callable[[int], None] | None = None,
+        recover_connection: bool = True,
+    ) -> tuple[CompactionResult, int]:
+        """
+        Compact `history` with retries; returns the result and the number of retries.
+
+        Args:
+            recover_connection: Whether a connection error may make the chat provider recover
+                its client. A compaction running next to a step must not, since the step uses
+                the same client.
+        """
+        chat_provider = (
+            self._runtime.llm.chat_provider
+            if self._runtime.llm is not None and recover_connection
+            else None
+        )
+        retry_count = 0
+
+        async def _run_compaction_once() -> CompactionResult:
+            if self._runtime.llm is None:
+                raise LLMNotSet()
+            return await self._compaction.compact(
+                history, self._runtime.llm, custom_instruction=custom_instruction
+            )
+
+        def _retry_log_compaction(retry_state: RetryCallState) -> None:
+            nonlocal retry_count
+            retry_count = retry_state.attempt_number
+            if on_retry is not None:
+                on_retry(retry_count)
+            self._retry_log("compaction", retry_state)
+
+        @tenacity.retry(
+            retry=retry_if_exception(self._is_retryable_error),
+            before_sleep=_retry_log_compaction,
+            wait=wait_exponential_jitter(initial=0.3, max=5, jitter=0.5),
+            stop=stop_after_attempt(self._loop_control.max_retries_per_step),
+            reraise=True,
+        )
+        async def _compact_with_retry() -> CompactionResult:
+            return await self._run_with_connection_recovery(
+                "compaction",
+                _run_compaction_once,
+                chat_provider=chat_provider,
+            )
+
+        return await _compact_with_retry(), retry_count
+
+    async def _precompact_if_needed(self) -> None:
+        """
+        Start compacting in the background once the context usage crosses
+        ``precompaction_trigger_ratio``, and apply a finished background compaction.
+        """
+        if self._precompaction is not None:
+            await self._apply_precompaction(wait=False)
+            return
+        ratio = self._loop_control.precompaction_trigger_ratio
+        if (
+            ratio <= 0
+            or self._runtime.llm is None
+            or self._context.token_count_with_pending < self._runtime.llm.max_context_size * ratio
+        ):
+            return
+
+        logger.info("Context getting long, compacting in the background...")
+        history = list(self._context.history)
+        self._precompaction = _Precompaction(
+            task=asyncio.create_task(self._run_compaction(history, recover_connection=False)),
+            history=history,
+            n_checkpoints=self._context.n_checkpoints,
+            start_time=time.monotonic(),
+        )
+
+    async def cancel_precompaction(self) -> None:
+        """Cancel the background compaction, if any, before the context is rewritten."""
+        precompaction, self._precompaction = self._precompaction, None
+        if precompaction is None:
+            return
+        precompaction.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await precompaction.task
+
+    async def _apply_precompaction(self, *, wait: bool) -> bool:
+        """
+        Swap in the result of the background compaction, if there is one.
+
+        The messages appended since the compaction started are kept after the compacted
+        ones. The compaction is dropped, without waiting for it, once the history has been
+        reverted or replaced in the meantime, and its result is discarded if it failed, so
+        that the caller can fall back to `compact_context`.
+
+        Args:
+            wait: Whether to wait for a compaction that is still running.
+
+        Returns:
+            Whether the context has been compacted.
+        """
+        precompaction = self._precompaction
+        if precompaction is None:
+            return False
+        if not self._precompaction_applies(precompaction):
+            logger.info("History changed during background compaction, discarding it")
+            await self.cancel_precompaction()
+            return False
+        if not wait and not precompaction.task.done():
+            return False
+        self._precompaction = None
+        try:
+            compaction_result, retry_count = await precompaction.task
+        except Exception as e:
+            logger.warning(
+                "Background compaction failed: {error_type}: {error}",
+                error_type=type(e).__name__,
+                error=e,
+            )
+            return False
+        if not self._precompaction_applies(precompaction):
+            logger.info("History changed during background compaction, discarding the result")
+            return False
+
+        from kimi_cli.hooks import events
+
+        before_tokens = self._context.token_count
+        await self._hook_engine.trigger(
+            "PreCompact",
+            matcher_value="auto",
+            input_data=events.pre_compact(
+                session_id=self._runtime.session.id,
+                cwd=str(Path.cwd()),
+                trigger="auto",
+                token_count=before_tokens,
+            ),
+        )
+        history = self._context.history
+        n_compacted = len(precompaction.history)
+        wire_send(CompactionBegin())
+        await self._apply_compaction_result(
+            compaction_result,
+            appended=history[n_compacted:],
+            trigger_reason="auto",
+            before_tokens=before_tokens,
+            start_time=precompaction.start_time,
+            retry_count=retry_count,
+        )
+        return True
+
+    def _precompaction_applies(self, precompaction: _Precompaction) -> bool:
+        """Whether the history compacted in the background is still a prefix of the context."""
+        history = self._context.history
+        if self._context.n_checkpoints < precompaction.n_checkpoints:
+            return False
+        if len(history) < len(precompaction.history):
+            return False
+        return all(old is new for old, new in zip(precompaction.history, history, strict=False))
+
+    async def _apply_compaction_result(
+        self,
+        compaction_result: CompactionResult,
+        *,
+        appended: Sequence[Message] = (),
+        trigger_reason: str,
+        before_tokens: int,
+        start_time: float,
+        retry_count: int,
+    ) -> None:
+        """Replace the history with the compacted messages followed by `appended`."""
+        from kimi_cli.hooks import events
+
         await self._context.clear()
         await self._context.write_system_prompt(self._agent.system_prompt)
-        await self._checkpoint()
-        await self._context.append_message(compaction_result.messages)
-        estimated_token_count = compaction_result.estimated_token_count
-
-        if self.is_root:
-            active_task_snapshot = build_active_task_snapshot(self._runtime.background_tasks)
-            if active_task_snapshot is not None:
-                active_task_message = Message(
-                    role="user",
-                    content=[
-                        system(
-                            "The following background tasks are still active after compaction. "
-                            "Use TaskList if you need to re-enumerate them later."
-                        ),
-                        TextPart(text=active_task_snapshot),
-                    ],
-                )
-                await self._context.append_message(active_task_message)
-                estimated_token_count += estimate_text_tokens([active_task_message])
+        async with self._context.batch():
+            await self._checkpoint()
+            await self._context.append_message(compaction_result.messages)
+            estimated_token_count = compaction_result.estimated_token_count
+            if appended:
+                await self._context.append_message(appended)
+                estimated_token_count += self._context.estimate_tokens(-len(appended))
+
+            if self.is_root:
+                active_task_snapshot = build_active_task_snapshot(self._runtime.background_tasks)
+                if active_task_snapshot is not None:
+                    active_task_message = Message(
+                        role="user",
+                        content=[
+                            system(
+                                "The following background tasks are still active after "
+                                "compaction. Use TaskList if you need to re-enumerate them later."
+                            ),
+                            TextPart(text=active_task_snapshot),
+                        ],
+                    )
+                    await self._context.append_message(active_task_message)
+                    estimated_token_count += self._context.estimate_tokens(-1)
 
-        # Estimate token count so context_usage is not reported as 0%
-        await self._context.update_token_count(estimated_token_count)
+            # Estimate token count so context_usage is not reported as 0%
+            await self._context.update_token_count(estimated_token_count)
 
         # Notify dynamic injection providers that history has been rebuilt so
         # they can reset any one-shot throttling state. Failures are isolated
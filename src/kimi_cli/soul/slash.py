@@ -42,7 +42,10 @@ async def init(soul: KimiSoul, args: str):
     with tempfile.TemporaryDirectory() as temp_dir:
         tmp_context = Context(file_backend=Path(temp_dir) / "context.jsonl")
         tmp_soul = KimiSoul(soul.agent, context=tmp_context)
-        await tmp_soul.run(prompts.INIT)
+        try:
+            await tmp_soul.run(prompts.INIT)
+        finally:
+            await tmp_soul.cancel_precompaction()
 
     agents_md = await load_agents_md(soul.runtime.builtin_args.KIMI_WORK_DIR)
     system_message = system(
@@ -81,6 +84,7 @@ async def compact(soul: KimiSoul, args: str):
 async def clear(soul: KimiSoul, args: str):
     """Clear the context"""
     logger.info("Running `/clear`")
+    await soul.cancel_precompaction()
     await soul.context.clear()
     await soul.context.write_system_prompt(soul.agent.system_prompt)
     wire_send(TextPart(text="The context has been cleared."))
@@ -56,7 +56,10 @@ async def prepare_soul(
         on_stage("agent_built")
 
     # 2. Restore conversation context
-    context = Context(store.context_path(spec.agent_id))
+    context = Context(
+        store.context_path(spec.agent_id),
+        durability=runtime.config.context.durability,
+    )
     await context.restore()
     if on_stage:
         on_stage("context_restored")
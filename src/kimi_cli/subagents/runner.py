@@ -151,26 +151,31 @@ async def run_with_summary_continuation(
     ``None`` and ``final_response`` contains the agent's output text.
     On failure ``final_response`` is ``None``.
     """
-    failure = await run_soul_checked(soul, prompt, ui_loop_fn, wire_path, "running agent")
-    if failure is not None:
-        return None, failure
-
-    final_response = soul.context.history[-1].extract_text(sep="\n")
-    remaining = SUMMARY_CONTINUATION_ATTEMPTS
-    while remaining > 0 and len(final_response) < SUMMARY_MIN_LENGTH:
-        remaining -= 1
-        failure = await run_soul_checked(
-            soul,
-            SUMMARY_CONTINUATION_PROMPT,
-            ui_loop_fn,
-            wire_path,
-            "continuing the agent summary",
-        )
+    try:
+        failure = await run_soul_checked(soul, prompt, ui_loop_fn, wire_path, "running agent")
         if failure is not None:
             return None, failure
-        final_response = soul.context.history[-1].extract_text(sep="\n")
 
-    return final_response, None
+        final_response = soul.context.history[-1].extract_text(sep="\n")
+        remaining = SUMMARY_CONTINUATION_ATTEMPTS
+        while remaining > 0 and len(final_response) < SUMMARY_MIN_LENGTH:
+            remaining -= 1
+            failure = await run_soul_checked(
+                soul,
+                SUMMARY_CONTINUATION_PROMPT,
+                ui_loop_fn,
+                wire_path,
+                "continuing the agent summary",
+            )
+            if failure is not None:
+                return None, failure
+            final_response = soul.context.history[-1].extract_text(sep="\n")
+
+        return final_response, None
+    finally:
+        # Subagent contexts are re-created on resume, so release the file handle now.
+        await soul.cancel_precompaction()
+        await soul.context.close()
 
 
 # ---------------------------------------------------------------------------
@@ -44,6 +44,7 @@ def _format_task_output(
     output_size_bytes: int,
     output_preview_bytes: int,
     output_truncated: bool,
+    next_line_offset: int | None = None,
 ) -> str:
     terminal_reason = "timed_out" if view.runtime.timed_out else view.runtime.status
     output_path_str = str(output_path.resolve())
@@ -75,9 +76,9 @@ def _format_task_output(
     full_output_hint = (
         (
             "full_output_hint: "
-            f'Use ReadFile(path="{output_path_str}", line_offset=1, '
+            f'Use TaskOutput(task_id="{view.spec.id}", line_offset=1, '
             f"n_lines={TASK_OUTPUT_READ_HINT_LINES}) to inspect the full log. "
-            "Increase line_offset to continue paging through the file."
+            "Increase line_offset to continue paging through the log."
         )
         if full_output_available
         else "full_output_hint: No output file is currently available for this task."
@@ -89,9 +90,15 @@ def _format_task_output(
             f"output_size_bytes: {output_size_bytes}",
             f"output_preview_bytes: {output_preview_bytes}",
             f"output_truncated: {str(output_truncated).lower()}",
+        ]
+    )
+    if next_line_offset is not None:
+        lines.append(f"next_line_offset: {next_line_offset}")
+    lines.extend(
+        [
             "",
             f"full_output_available: {str(full_output_available).lower()}",
-            "full_output_tool: ReadFile",
+            "full_output_tool: TaskOutput",
             full_output_hint,
         ]
     )
@@ -120,6 +127,21 @@ class TaskOutputParams(BaseModel):
         le=3600,
         description="Maximum number of seconds to wait when block=true.",
     )
+    line_offset: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Optional: The 1-indexed line of the output log to start reading from. "
+            "By default, a preview of the end of the log is returned. "
+            "Use with `n_lines` to page through the full log."
+        ),
+    )
+    n_lines: int = Field(
+        default=TASK_OUTPUT_READ_HINT_LINES,
+        ge=1,
+        le=1000,
+        description="Maximum number of log lines to read when `line_offset` is set.",
+    )
 
 
 class TaskStopParams(BaseModel):
@@ -210,6 +232,39 @@ class TaskOutput(CallableTool2[TaskOutputParams]):
             output_path,
         )
 
+    def _render_output_page(
+        self, task_id: str, line_offset: int, n_lines: int
+    ) -> tuple[str, bool, int, int, bool, Path, int | None]:
+        manager = self._runtime.background_tasks
+        output_path = manager.resolve_output_path(task_id)
+        chunk = manager.read_output_lines(task_id, start=line_offset - 1, count=n_lines)
+        text, n_read = chunk.text, n_lines
+        truncated = chunk.next_offset - chunk.offset > TASK_OUTPUT_PREVIEW_BYTES
+        if truncated:
+            # Long lines: cut the page at the preview size, after the last whole line if any.
+            chunk = manager.read_output(
+                task_id, offset=chunk.offset, max_bytes=TASK_OUTPUT_PREVIEW_BYTES
+            )
+            text = chunk.text
+            if "\n" in text:
+                text = text[: text.rfind("\n") + 1]
+            n_read = text.count("\n") or 1
+        page_bytes = len(text.encode("utf-8"))
+        try:
+            output_size = output_path.stat().st_size if output_path.exists() else 0
+        except OSError:
+            output_size = 0
+        more = chunk.offset + page_bytes < output_size
+        return (
+            text.rstrip("\n"),
+            output_size > 0,
+            output_size,
+            page_bytes,
+            truncated,
+            output_path,
+            line_offset + n_read if more else None,
+        )
+
     @override
     async def __call__(self, params: TaskOutputParams) -> ToolReturnValue:
         if err := _ensure_root(self._runtime):
@@ -236,14 +291,26 @@ class TaskOutput(CallableTool2[TaskOutputParams]):
                 else "not_ready"
             )
 
-        (
-            output,
-            full_output_available,
-            output_size,
-            output_preview_bytes,
-            output_truncated,
-            output_path,
-        ) = self._render_output_preview(params.task_id)
+        next_line_offset: int | None = None
+        if params.line_offset is not None:
+            (
+                output,
+                full_output_available,
+                output_size,
+                output_preview_bytes,
+                output_truncated,
+                output_path,
+                next_line_offset,
+            ) = self._render_output_page(params.task_id, params.line_offset, params.n_lines)
+        else:
+            (
+                output,
+                full_output_available,
+                output_size,
+                output_preview_bytes,
+                output_truncated,
+                output_path,
+            ) = self._render_output_preview(params.task_id)
         consumer = view.consumer.model_copy(
             update={
                 "last_seen_output_size": output_size,
@@ -263,6 +330,7 @@ class TaskOutput(CallableTool2[TaskOutputParams]):
                 output_size_bytes=output_size,
                 output_preview_bytes=output_preview_bytes,
                 output_truncated=output_truncated,
+                next_line_offset=next_line_offset,
             ),
             message=(
                 "Task snapshot retrieved."
@@ -1,20 +1,24 @@
 """FindFiles tool implementation."""
 
+import asyncio
+import stat
 from pathlib import Path
 from typing import override
 
+from kaos import get_current_kaos
+from kaos.local import local_kaos
 from kaos.path import KaosPath
 from kosong.tooling import CallableTool2, ToolError, ToolOk, ToolReturnValue
 from pydantic import BaseModel, Field
 
 from kimi_cli.soul.agent import Runtime
 from kimi_cli.tools.utils import load_desc
+from kimi_cli.utils.file_index import shared_file_index
 from kimi_cli.utils.logging import logger
 from kimi_cli.utils.path import (
     is_within_directory,
     is_within_workspace,
     kaos_path_from_user_input,
-    list_directory,
 )
 
 MAX_MATCHES = 1000
@@ -39,7 +43,15 @@ def _description_for_os(os_kind: str) -> str:
 
 
 class Params(BaseModel):
-    pattern: str = Field(description=("Efficiently finds files matching specific glob patterns (i.e. `src/**/*.ts`, `**.md`), returning paths sorted by modification time (newest first). Returns relative paths for files within the working directory, or absolute paths for files outside. Ideal for quickly locating files based on their name or path structure, especially in large codebases."))
+    pattern: str = Field(
+        description=(
+            "Efficiently finds files matching specific glob patterns (i.e. `src/**/*.ts`, "
+            "`**.md`), returning paths sorted by modification time (newest first). Returns "
+            "relative paths for files within the working directory, or absolute paths for "
+            "files outside. Ideal for quickly locating files based on their name or path "
+            "structure, especially in large codebases."
+        )
+    )
     directory: str | None = Field(
         description=(
             "Optional: Absolute path to the directory to search in. Defaults to working directory."
@@ -53,18 +65,8 @@ class Params(BaseModel):
 
 
 class Glob(CallableTool2[Params]):
-<<<<<<< HEAD
     name: str = "FindFiles"
-    description: str = load_desc(
-        Path(__file__).parent / "glob.md",
-        {
-            "MAX_MATCHES": str(MAX_MATCHES),
-        },
-    )
-=======
-    name: str = "Glob"
     description: str = _description_for_os("")
->>>>>>> ee850e16b47c936f9e05764437eb9dd970651ff8
     params: type[Params] = Params
 
     def __init__(self, runtime: Runtime) -> None:
@@ -94,6 +96,50 @@ class Glob(CallableTool2[Params]):
             brief="Directory outside workspace",
         )
 
+    async def _glob_kaos(self, dir_path: KaosPath, params: Params) -> list[tuple[KaosPath, float]]:
+        # Perform the glob search - users can use ** directly in pattern
+        entries = await dir_path.globstat(params.pattern)
+
+        # Filter out directories if not requested
+        if not params.include_dirs:
+            entries = [e for e in entries if e.is_file()]
+
+        # If stat failed, use epoch time (will sort to beginning)
+        return [(e.path, e.stat.st_mtime if e.stat else 0.0) for e in entries]
+
+    async def _glob_indexed(
+        self, dir_path: KaosPath, params: Params
+    ) -> list[tuple[KaosPath, float]] | None:
+        """Match against the shared workspace index; None if only the filesystem can tell."""
+        if get_current_kaos().name not in (local_kaos.name, "acp"):
+            return None
+        local_dir = dir_path.unsafe_to_local_path()
+        work_dir = self._work_dir.unsafe_to_local_path()
+        root = work_dir if local_dir.is_relative_to(work_dir) else local_dir
+        rel = local_dir.relative_to(root).as_posix()
+        index = shared_file_index(root)
+
+        def _match() -> list[tuple[KaosPath, float]] | None:
+            found = index.glob(params.pattern, rel)
+            if found is None:
+                return None
+            results: list[tuple[KaosPath, float]] = []
+            for path, _ in found:
+                local_path = root / path if path else root
+                # The index may lag on in-place edits, so take mtimes from the files.
+                try:
+                    st = local_path.stat()
+                except OSError:
+                    if params.include_dirs:
+                        results.append((KaosPath.unsafe_from_local_path(local_path), 0.0))
+                    continue
+                if not params.include_dirs and not stat.S_ISREG(st.st_mode):
+                    continue
+                results.append((KaosPath.unsafe_from_local_path(local_path), st.st_mtime))
+            return results
+
+        return await asyncio.to_thread(_match)
+
     @override
     async def __call__(self, params: Params) -> ToolReturnValue:
         try:
@@ -126,24 +172,10 @@ class Glob(CallableTool2[Params]):
                     brief="Invalid directory",
                 )
 
-            # Perform the glob search - users can use ** directly in pattern
-            matches: list[KaosPath] = []
-            async for match in dir_path.glob(params.pattern):
-                matches.append(match)
-
-            # Filter out directories if not requested
-            if not params.include_dirs:
-                matches = [p for p in matches if await p.is_file()]
-
+            matches_with_mtime = await self._glob_indexed(dir_path, params)
+            if matches_with_mtime is None:
+                matches_with_mtime = await self._glob_kaos(dir_path, params)
             # Sort by modification time (newest first)
-            matches_with_mtime: list[tuple[KaosPath, float]] = []
-            for p in matches:
-                try:
-                    stat_result = await p.stat()
-                    matches_with_mtime.append((p, stat_result.st_mtime))
-                except OSError:
-                    # If stat fails, use epoch time (will sort to beginning)
-                    matches_with_mtime.append((p, 0.0))
             matches_with_mtime.sort(key=lambda x: x[1], reverse=True)
             matches = [p for p, _ in matches_with_mtime]
 
@@ -4,6 +4,9 @@ Be cautious that `KaosPath` is not used in this implementation.
 """
 
 import asyncio
+import base64
+import contextlib
+import json
 import os
 import platform
 import re
@@ -11,9 +14,13 @@ import shutil
 import stat
 import tarfile
 import tempfile
+import time
 import zipfile
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import override
+from typing import Any, override
 
 import aiohttp
 from kosong.tooling import CallableTool2, ToolError, ToolReturnValue
@@ -23,9 +30,11 @@ import kimi_cli
 from kimi_cli.share import get_share_dir
 from kimi_cli.tools.utils import ToolResultBuilder, load_desc
 from kimi_cli.utils.aiohttp import new_client_session
+from kimi_cli.utils.file_index import WorkspaceFileIndex, find_file_index, shared_file_index
 from kimi_cli.utils.logging import logger
 from kimi_cli.utils.path import normalize_user_path
 from kimi_cli.utils.sensitive import is_sensitive_file, sensitive_file_warning
+from kimi_cli.utils.text_search import SearchOptions, list_files, path_filter, search_files
 
 
 class Params(BaseModel):
@@ -141,6 +150,7 @@ RG_BASE_URL = "http://cdn.kimi.com/binaries/kimi-cli/rg"
 RG_TIMEOUT = 20  # seconds
 RG_MAX_BUFFER = 20_000_000  # 20MB stdout/stderr buffer limit
 RG_KILL_GRACE = 5  # seconds: SIGTERM → SIGKILL
+RG_RETRY_INTERVAL = 600  # seconds between attempts to download ripgrep after one failed
 _RG_DOWNLOAD_LOCK = asyncio.Lock()
 
 
@@ -268,6 +278,27 @@ async def _ensure_rg_path() -> str:
         return str(downloaded)
 
 
+_rg_unavailable_since: float | None = None
+
+
+async def _find_rg() -> str | None:
+    """The ripgrep binary, or None if it is missing and cannot be downloaded right now."""
+    global _rg_unavailable_since
+    if (
+        _rg_unavailable_since is not None
+        and time.monotonic() - _rg_unavailable_since < RG_RETRY_INTERVAL
+    ):
+        return None
+    try:
+        rg_path = await _ensure_rg_path()
+    except (RuntimeError, OSError, aiohttp.ClientError, TimeoutError) as e:
+        logger.warning("ripgrep is unavailable, using the built-in search: {error}", error=e)
+        _rg_unavailable_since = time.monotonic()
+        return None
+    _rg_unavailable_since = None
+    return rg_path
+
+
 def _build_rg_args(rg_path: str, params: Params, *, single_threaded: bool = False) -> list[str]:
     """Build ripgrep command-line arguments from Params."""
     args: list[str] = [rg_path]
@@ -290,16 +321,16 @@ def _build_rg_args(rg_path: str, params: Params, *, single_threaded: bool = Fals
     if params.multiline:
         args.extend(["--multiline", "--multiline-dotall"])
 
-    # Content display options (only for content mode)
+    # Content display options (only for content mode). Content is streamed as JSON so the
+    # search can stop once enough lines are in; the line numbers place `--` separators.
     if params.output_mode == "content":
+        args.extend(["--json", "--line-number"])
         if params.before_context is not None:
             args.extend(["--before-context", str(params.before_context)])
         if params.after_context is not None:
             args.extend(["--after-context", str(params.after_context)])
         if params.context is not None:
             args.extend(["--context", str(params.context)])
-        if params.line_number:
-            args.append("--line-number")
 
     # File filtering options
     if params.glob:
@@ -381,216 +412,571 @@ def _strip_path_prefix(output: str, search_base: str) -> str:
     )
 
 
+def _json_text(data: dict[str, Any]) -> str:
+    """Text of an rg `--json` string value, which holds base64 `bytes` if not valid UTF-8."""
+    if "text" in data:
+        return data["text"]
+    return base64.b64decode(data.get("bytes", "")).decode("utf-8", errors="replace")
+
+
+class _ContentFormatter:
+    """Format match and context lines from `rg --json` the way rg prints them by default."""
+
+    def __init__(self, *, with_filename: bool, line_number: bool, context: bool) -> None:
+        self._with_filename = with_filename
+        self._line_number = line_number
+        self._context = context
+        self._last: tuple[str, int] | None = None
+
+    def format(self, path: str, line_number: int, text: str, *, is_match: bool) -> list[str]:
+        lines: list[str] = []
+        # With context, rg separates groups of lines that are not adjacent, even across files.
+        if self._context and self._last is not None:
+            last_path, last_line = self._last
+            if path != last_path or line_number > last_line + 1:
+                lines.append("--")
+        separator = ":" if is_match else "-"
+        # A multiline match spans several lines, which rg prints one by one.
+        text_lines = text.removesuffix("\n").split("\n")
+        for i, text_line in enumerate(text_lines):
+            parts: list[str] = []
+            if self._with_filename:
+                parts.append(path)
+            if self._line_number:
+                parts.append(str(line_number + i))
+            parts.append(text_line)
+            lines.append(separator.join(parts))
+        self._last = (path, line_number + len(text_lines) - 1)
+        return lines
+
+
+@dataclass(slots=True)
+class _Search:
+    """Post-processed results of one ripgrep run, before pagination."""
+
+    lines: list[str]
+    notes: list[str] = field(default_factory=list[str])
+    """Messages about the results as a whole, such as the sensitive file warning."""
+    complete: bool = True
+    """False if ripgrep was stopped once enough content lines were collected."""
+    buffer_truncated: bool = False
+    timed_out: bool = False
+    generation: int = 0
+    """Generation of the workspace file index when ripgrep was started."""
+    searched_at: float = 0.0
+    """`time.monotonic()` when ripgrep was started."""
+
+    def covers(self, params: Params) -> bool:
+        """Whether the page `params` asks for can be served from these results."""
+        if self.complete:
+            return True
+        return bool(params.head_limit) and len(self.lines) > params.offset + (
+            params.head_limit or 0
+        )
+
+    def size(self) -> int:
+        """Approximate bytes held by the results."""
+        return sum(len(line) + 1 for line in self.lines) + sum(len(note) for note in self.notes)
+
+
+_MAX_CACHED_BYTES = 16 * 1024 * 1024
+"""Total size of the search results kept for follow-up pages."""
+_PAGES_AHEAD = 4
+"""Pages of content results collected past the requested one, for follow-up calls."""
+_search_cache: OrderedDict[tuple[object, ...], tuple[_Search, int]] = OrderedDict()
+_search_cache_bytes = 0
+
+
+def _cache_key(params: Params, search_path: str) -> tuple[object, ...] | None:
+    # Searches into ignored trees are not cached: the file index does not watch them.
+    if params.include_ignored:
+        return None
+    fields = params.model_dump(exclude={"path", "offset", "head_limit"})
+    return (search_path, *sorted(fields.items()))
+
+
+def _cache_search(key: tuple[object, ...], search: _Search) -> None:
+    global _search_cache_bytes
+    size = search.size()
+    if size > _MAX_CACHED_BYTES:
+        return
+    previous = _search_cache.pop(key, None)
+    if previous is not None:
+        _search_cache_bytes -= previous[1]
+    _search_cache[key] = (search, size)
+    _search_cache_bytes += size
+    while _search_cache_bytes > _MAX_CACHED_BYTES:
+        _, (_, evicted) = _search_cache.popitem(last=False)
+        _search_cache_bytes -= evicted
+
+
+def _workspace_index(search_dir: Path) -> WorkspaceFileIndex | None:
+    """
+    The shared file index covering `search_dir`, whose generation tells when files were added,
+    removed or renamed there.
+
+    Returns None while no fully walked index covers it; one is then built in the background.
+    """
+    index = find_file_index(search_dir)
+    if index is None:
+        cwd = Path.cwd().resolve()
+        if not search_dir.is_relative_to(cwd):
+            return None
+        index = shared_file_index(cwd)
+    if index.refreshed_at is None:
+        index.refresh_in_background()
+        return None
+    return index
+
+
 class Grep(CallableTool2[Params]):
     name: str = "SearchText"
     description: str = load_desc(Path(__file__).parent / "grep.md")
     params: type[Params] = Params
 
     @override
-    async def __call__(self, params: Params, *, _retry: bool = False) -> ToolReturnValue:
+    async def __call__(self, params: Params) -> ToolReturnValue:
         try:
-            builder = ToolResultBuilder()
-            message = ""
+            search_path = os.path.abspath(os.path.expanduser(normalize_user_path(params.path)))
+            key = _cache_key(params, search_path)
+            index: WorkspaceFileIndex | None = None
+            if key is not None:
+                search_dir = Path(search_path)
+                if not search_dir.is_dir():
+                    search_dir = search_dir.parent
+                index = _workspace_index(search_dir.resolve())
+
+            # Follow-up pages reuse the results of the first one while the file index, once
+            # refreshed past the search, shows no file added, removed or renamed since. A new
+            # search (offset 0) always runs rg, so it sees edits.
+            search: _Search | None = None
+            if index is not None and key is not None and params.offset > 0:
+                cached = _search_cache.get(key)
+                if cached is not None:
+                    found = cached[0]
+                    refreshed_at = index.refreshed_at or 0.0
+                    if (
+                        found.covers(params)
+                        and found.generation == index.generation
+                        and refreshed_at >= found.searched_at
+                    ):
+                        _search_cache.move_to_end(key)
+                        search = found
+
+            if search is None:
+                generation = index.generation if index is not None else 0
+                searched_at = time.monotonic()
+                result = await self._search(params, search_path)
+                if isinstance(result, ToolError):
+                    return result
+                search = result
+                if index is not None and key is not None and not search.timed_out:
+                    search.generation, search.searched_at = generation, searched_at
+                    _cache_search(key, search)
+                    # Lets the follow-up pages tell whether files changed after this search.
+                    index.refresh_in_background()
+
+            return self._page(search, params)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "Grep failed: pattern={pattern}, path={path}: {error}",
+                pattern=params.pattern,
+                path=params.path,
+                error=e,
+            )
+            return ToolError(
+                message=f"Failed to grep. Error: {str(e)}",
+                brief="Failed to grep",
+            )
+
+    async def _search(
+        self, params: Params, search_path: str, *, _retry: bool = False
+    ) -> _Search | ToolError:
+        search_base = search_path
+        if os.path.isfile(search_base):
+            search_base = os.path.dirname(search_base)
 
+        if params.output_mode == "content":
+            search = _ContentSearch(params, search_path, search_base)
+        else:
+            search = _TextSearch(params, search_base)
+
+        rg_path = await _find_rg()
+        if rg_path is None:
+            error, timed_out = await _run_builtin(params, search_path, search)
+            if error is not None:
+                return ToolError(message=f"Failed to grep. Error: {error}", brief="Failed to grep")
+            returncode, stderr_str = 0, ""
+        else:
             # Build rg command
-            rg_path = await _ensure_rg_path()
             logger.debug("Using ripgrep binary: {rg_bin}", rg_bin=rg_path)
             args = _build_rg_args(rg_path, params, single_threaded=_retry)
+            returncode, stderr_str, timed_out = await _run_rg(args, search.read)
 
-            # Execute search as async subprocess (non-blocking, cancellable)
-            process = await asyncio.create_subprocess_exec(
-                *args,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+        # Timeout: return partial results if available, otherwise error
+        if timed_out and not search.has_output():
+            return ToolError(
+                message=(
+                    f"SearchText timed out after {RG_TIMEOUT}s. "
+                    "Try a more specific path or pattern."
+                ),
+                brief="SearchText timed out",
             )
 
-            # Stream stdout/stderr incrementally with buffer limit
-            stdout_buf = bytearray()
-            stderr_buf = bytearray()
-            timed_out = False
-            stdout_truncated_flag: list[bool] = [False]
-
-            try:
-                assert process.stdout is not None
-                assert process.stderr is not None
-                await asyncio.wait_for(
-                    asyncio.gather(
-                        _read_stream(
-                            process.stdout, stdout_buf, RG_MAX_BUFFER, stdout_truncated_flag
-                        ),
-                        _read_stream(process.stderr, stderr_buf, RG_MAX_BUFFER),
-                    ),
-                    timeout=RG_TIMEOUT,
-                )
-                await process.wait()
-            except asyncio.CancelledError:
-                await _kill_process(process)
-                raise
-            except TimeoutError:
-                await _kill_process(process)
-                timed_out = True
-
-            output = stdout_buf.decode("utf-8", errors="replace")
-            stderr_str = stderr_buf.decode("utf-8", errors="replace")
-
-            # truncated_flag is set synchronously inside _read_stream at
-            # the moment of truncation, so it's available even after timeout.
-            buffer_truncated = stdout_truncated_flag[0]
-
-            # Drop last incomplete line if buffer was truncated
-            if buffer_truncated:
-                last_nl = output.rfind("\n")
-                output = output[:last_nl] if last_nl >= 0 else ""
-                message = "Output exceeded buffer limit. Some results omitted."
-
-            # Timeout: return partial results if available, otherwise error
-            if timed_out:
-                if not output.strip():
-                    return ToolError(
-                        message=(
-                            f"SearchText timed out after {RG_TIMEOUT}s. "
-                            "Try a more specific path or pattern."
-                        ),
-                        brief="SearchText timed out",
-                    )
-                timeout_msg = f"SearchText timed out after {RG_TIMEOUT}s. Partial results returned."
-                message = f"{message} {timeout_msg}" if message else timeout_msg
-
-            # rg exit codes: 0=matches found, 1=no matches, 2+=error
-            if not timed_out and process.returncode not in (0, 1):
-                # EAGAIN: retry once with single-threaded mode
-                if not _retry and _is_eagain(stderr_str):
-                    logger.warning("rg EAGAIN error, retrying with -j 1")
-                    return await self.__call__(params, _retry=True)
-                return ToolError(
-                    message=f"Failed to grep. Error: {stderr_str}",
-                    brief="Failed to grep",
-                )
-
-            # --- Post-processing pipeline ---
-
-            # Step 1: mtime sorting (files_with_matches only, skip on timeout)
-            if not timed_out and params.output_mode == "files_with_matches":
-                lines = [x for x in output.split("\n") if x.strip()]
-                lines.sort(
-                    key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0,
-                    reverse=True,
-                )
-                output = "\n".join(lines)
-
-            # Step 2: shorten paths to relative (prefix stripping)
-            search_base = os.path.abspath(os.path.expanduser(normalize_user_path(params.path)))
-            if os.path.isfile(search_base):
-                search_base = os.path.dirname(search_base)
-            output = _strip_path_prefix(output, search_base)
-
-            # Step 3: filter sensitive files from output
-            # Regex for ripgrep content lines: path:linenum:text (match) or
-            # path-linenum-text (context). The separator is `:` or `-` followed
-            # by digits then the same separator again.
-            _RG_LINE_RE = re.compile(r"^(.*?)([:\-])(\d+)\2")
-
-            out_lines = output.split("\n")
-            filtered_paths: list[str] = []
-            kept_lines: list[str] = []
-            sensitive_path_set: set[str] = set()
-            for line in out_lines:
-                if params.output_mode == "content":
-                    # Match lines: "file.py:10:matched text"
-                    # Context lines: "file.py-10-context text"
-                    # Separator: "--"
-                    if line == "--":
-                        kept_lines.append(line)
-                        continue
-                    m = _RG_LINE_RE.match(line)
-                    file_path = m.group(1) if m else line
-                elif params.output_mode == "count_matches":
-                    # Count lines: "file.py:42"
-                    idx = line.rfind(":")
-                    file_path = line[:idx] if idx > 0 else line
-                else:
-                    # files_with_matches: pure path per line
-                    file_path = line
+        # rg exit codes: 0=matches found, 1=no matches, 2+=error. Stopping it early is fine.
+        if not timed_out and not search.stopped and returncode not in (0, 1):
+            # EAGAIN: retry once with single-threaded mode
+            if not _retry and _is_eagain(stderr_str):
+                logger.warning("rg EAGAIN error, retrying with -j 1")
+                return await self._search(params, search_path, _retry=True)
+            return ToolError(
+                message=f"Failed to grep. Error: {stderr_str}",
+                brief="Failed to grep",
+            )
 
-                if file_path and is_sensitive_file(file_path):
-                    if file_path not in sensitive_path_set:
-                        sensitive_path_set.add(file_path)
-                        filtered_paths.append(file_path)
-                else:
-                    kept_lines.append(line)
+        return search.result(timed_out=timed_out)
 
-            if filtered_paths:
-                # Remove trailing "--" separators left after filtering
-                while kept_lines and kept_lines[-1] == "--":
-                    kept_lines.pop()
-                output = "\n".join(kept_lines)
-                warning = sensitive_file_warning(filtered_paths)
-                message = f"{message} {warning}" if message else warning
+    def _page(self, search: _Search, params: Params) -> ToolReturnValue:
+        builder = ToolResultBuilder()
+        message = " ".join(search.notes)
 
-            # Step 4: count_matches summary (before pagination, on full results)
-            lines = output.split("\n")
-            if lines and lines[-1] == "":
-                lines = lines[:-1]
+        # offset + head_limit pagination
+        lines = search.lines
+        if params.offset > 0:
+            lines = lines[params.offset :]
 
-            if params.output_mode == "count_matches":
-                total_matches = 0
-                total_files = 0
-                for line in lines:
-                    idx = line.rfind(":")
-                    if idx > 0:
-                        try:
-                            total_matches += int(line[idx + 1 :])
-                            total_files += 1
-                        except ValueError:
-                            pass
-                count_summary = (
-                    f"Found {total_matches} total occurrences across {total_files} files."
-                )
-                message = f"{message} {count_summary}" if message else count_summary
-
-            # Step 5: offset + head_limit pagination
-            if params.offset > 0:
-                lines = lines[params.offset :]
-
-            effective_limit = params.head_limit
-            if effective_limit and len(lines) > effective_limit:
-                total = len(lines) + params.offset
-                lines = lines[:effective_limit]
-                output = "\n".join(lines)
-                truncation_msg = (
-                    f"Results truncated to {effective_limit} lines (total: {total}). "
-                    f"Use offset={params.offset + effective_limit} to see more."
-                )
-                message = f"{message} {truncation_msg}" if message else truncation_msg
+        effective_limit = params.head_limit
+        if effective_limit and len(lines) > effective_limit:
+            lines = lines[:effective_limit]
+            output = "\n".join(lines)
+            if search.complete:
+                total = len(search.lines)
+                truncation_msg = f"Results truncated to {effective_limit} lines (total: {total}). "
             else:
-                output = "\n".join(lines)
+                truncation_msg = f"Results truncated to {effective_limit} lines. "
+            truncation_msg += f"Use offset={params.offset + effective_limit} to see more."
+            message = f"{message} {truncation_msg}" if message else truncation_msg
+        else:
+            output = "\n".join(lines)
 
-            if not output and not buffer_truncated:
-                no_match_msg = "No matches found"
-                if message:
-                    no_match_msg = f"{no_match_msg}. {message}"
-                return builder.ok(message=no_match_msg)
+        if not output and not search.buffer_truncated:
+            no_match_msg = "No matches found"
+            if message:
+                no_match_msg = f"{no_match_msg}. {message}"
+            return builder.ok(message=no_match_msg)
 
-            builder.write(output)
+        builder.write(output)
 
-            # Build brief: first ~5 lines of results as a preview
-            brief_lines = lines[:5]
-            brief = "\n".join(brief_lines)
-            if len(lines) > 5:
-                brief += f"\n... ({len(lines)} results)"
+        # Build brief: first ~5 lines of results as a preview
+        brief_lines = lines[:5]
+        brief = "\n".join(brief_lines)
+        if len(lines) > 5:
+            brief += f"\n... ({len(lines)} results)"
 
-            return builder.ok(message=message, brief=brief)
+        return builder.ok(message=message, brief=brief)
 
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.warning(
-                "Grep failed: pattern={pattern}, path={path}: {error}",
-                pattern=params.pattern,
-                path=params.path,
-                error=e,
+
+async def _run_rg(
+    args: list[str], read_stdout: Callable[[asyncio.StreamReader], Awaitable[bool]]
+) -> tuple[int | None, str, bool]:
+    """
+    Run rg, feeding its stdout to `read_stdout`, which returns True to stop rg early.
+
+    Returns the exit code, stderr and whether the search timed out.
+    """
+    # Execute search as async subprocess (non-blocking, cancellable)
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=RG_MAX_BUFFER,
+    )
+    stderr_buf = bytearray()
+    timed_out = False
+
+    async def _read_stdout(stdout: asyncio.StreamReader) -> None:
+        if await read_stdout(stdout) and process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                await _kill_process(process)
+
+    try:
+        assert process.stdout is not None
+        assert process.stderr is not None
+        await asyncio.wait_for(
+            asyncio.gather(
+                _read_stdout(process.stdout),
+                _read_stream(process.stderr, stderr_buf, RG_MAX_BUFFER),
+            ),
+            timeout=RG_TIMEOUT,
+        )
+        await process.wait()
+    except asyncio.CancelledError:
+        await _kill_process(process)
+        raise
+    except TimeoutError:
+        await _kill_process(process)
+        timed_out = True
+
+    return process.returncode, stderr_buf.decode("utf-8", errors="replace"), timed_out
+
+
+class _ContentSearch:
+    """Collects `content` results from `rg --json`, stopping rg once enough are in."""
+
+    def __init__(self, params: Params, search_path: str, search_base: str) -> None:
+        self._search_base = search_base
+        self._formatter = _ContentFormatter(
+            # Like rg, name the file only when searching a directory.
+            with_filename=not os.path.isfile(search_path),
+            line_number=params.line_number,
+            context=any(
+                n is not None and n > 0
+                for n in (params.before_context, params.after_context, params.context)
+            ),
+        )
+        self.target = (
+            params.offset + params.head_limit * (1 + _PAGES_AHEAD) + 1
+            if params.head_limit
+            else None
+        )
+        self._lines: list[str] = []
+        self._size = 0
+        self._filtered_paths: list[str] = []
+        self._buffer_truncated = False
+        self.stopped = False
+
+    async def read(self, stdout: asyncio.StreamReader) -> bool:
+        self.stopped = await self._read(stdout)
+        return self.stopped
+
+    async def _read(self, stdout: asyncio.StreamReader) -> bool:
+        while True:
+            try:
+                raw = await stdout.readline()
+            except ValueError:
+                # A single line larger than the buffer limit
+                self._buffer_truncated = True
+                return True
+            if not raw:
+                return False
+            event = json.loads(raw)
+            kind = event.get("type")
+            if kind not in ("match", "context"):
+                continue
+            data = event["data"]
+            if self.add(
+                _json_text(data["path"]),
+                data["line_number"],
+                _json_text(data["lines"]),
+                is_match=kind == "match",
+            ):
+                return True
+
+    def add(self, path: str, line_number: int, text: str, *, is_match: bool) -> bool:
+        """Add a line of `path` as rg names it; returns True once enough lines are in."""
+        path = _strip_path_prefix(path, self._search_base)
+        if is_sensitive_file(path):
+            if path not in self._filtered_paths:
+                self._filtered_paths.append(path)
+            return False
+        lines = self._formatter.format(path, line_number, text, is_match=is_match)
+        self._size += sum(len(line) + 1 for line in lines)
+        if self._size > RG_MAX_BUFFER:
+            self._buffer_truncated = True
+            return True
+        self._lines.extend(lines)
+        return self.target is not None and len(self._lines) >= self.target
+
+    def has_output(self) -> bool:
+        return bool(self._lines)
+
+    def result(self, *, timed_out: bool) -> _Search:
+        notes: list[str] = []
+        if self._buffer_truncated:
+            notes.append("Output exceeded buffer limit. Some results omitted.")
+        if timed_out:
+            notes.append(f"SearchText timed out after {RG_TIMEOUT}s. Partial results returned.")
+        if self._filtered_paths:
+            notes.append(sensitive_file_warning(self._filtered_paths))
+        return _Search(
+            self._lines,
+            notes,
+            complete=not self.stopped or self._buffer_truncated,
+            buffer_truncated=self._buffer_truncated,
+            timed_out=timed_out,
+        )
+
+
+class _TextSearch:
+    """Collects `files_with_matches` and `count_matches` results, which need all of rg's output."""
+
+    def __init__(self, params: Params, search_base: str) -> None:
+        self._params = params
+        self._search_base = search_base
+        self._stdout_buf = bytearray()
+        # Set synchronously inside _read_stream at the moment of truncation, so it is
+        # available even after a timeout.
+        self._truncated_flag: list[bool] = [False]
+        self.stopped = False
+
+    async def read(self, stdout: asyncio.StreamReader) -> bool:
+        await _read_stream(stdout, self._stdout_buf, RG_MAX_BUFFER, self._truncated_flag)
+        return False
+
+    def add_line(self, line: str) -> None:
+        """Add a line of output as rg would print it."""
+        data = (line + "\n").encode()
+        needed = RG_MAX_BUFFER - len(self._stdout_buf)
+        self._stdout_buf.extend(data[: max(needed, 0)])
+        if len(data) > needed:
+            self._truncated_flag[0] = True
+
+    def has_output(self) -> bool:
+        return bool(self._stdout_buf.decode("utf-8", errors="replace").strip())
+
+    def result(self, *, timed_out: bool) -> _Search:
+        params = self._params
+        notes: list[str] = []
+        output = self._stdout_buf.decode("utf-8", errors="replace")
+
+        # Drop last incomplete line if buffer was truncated
+        buffer_truncated = self._truncated_flag[0]
+        if buffer_truncated:
+            last_nl = output.rfind("\n")
+            output = output[:last_nl] if last_nl >= 0 else ""
+            notes.append("Output exceeded buffer limit. Some results omitted.")
+        if timed_out:
+            notes.append(f"SearchText timed out after {RG_TIMEOUT}s. Partial results returned.")
+
+        # --- Post-processing pipeline ---
+
+        # Step 1: mtime sorting (files_with_matches only, skip on timeout)
+        if not timed_out and params.output_mode == "files_with_matches":
+            lines = [x for x in output.split("\n") if x.strip()]
+            lines.sort(
+                key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0,
+                reverse=True,
             )
-            return ToolError(
-                message=f"Failed to grep. Error: {str(e)}",
-                brief="Failed to grep",
+            output = "\n".join(lines)
+
+        # Step 2: shorten paths to relative (prefix stripping)
+        output = _strip_path_prefix(output, self._search_base)
+
+        # Step 3: filter sensitive files from output
+        filtered_paths: list[str] = []
+        kept_lines: list[str] = []
+        sensitive_path_set: set[str] = set()
+        for line in output.split("\n"):
+            if params.output_mode == "count_matches":
+                # Count lines: "file.py:42"
+                idx = line.rfind(":")
+                file_path = line[:idx] if idx > 0 else line
+            else:
+                # files_with_matches: pure path per line
+                file_path = line
+
+            if file_path and is_sensitive_file(file_path):
+                if file_path not in sensitive_path_set:
+                    sensitive_path_set.add(file_path)
+                    filtered_paths.append(file_path)
+            else:
+                kept_lines.append(line)
+
+        if filtered_paths:
+            output = "\n".join(kept_lines)
+            notes.append(sensitive_file_warning(filtered_paths))
+
+        # Step 4: count_matches summary (before pagination, on full results)
+        lines = output.split("\n")
+        if lines and lines[-1] == "":
+            lines = lines[:-1]
+
+        if params.output_mode == "count_matches":
+            total_matches = 0
+            total_files = 0
+            for line in lines:
+                idx = line.rfind(":")
+                if idx > 0:
+                    try:
+                        total_matches += int(line[idx + 1 :])
+                        total_files += 1
+                    except ValueError:
+                        pass
+            notes.append(f"Found {total_matches} total occurrences across {total_files} files.")
+
+        return _Search(lines, notes, buffer_truncated=buffer_truncated, timed_out=timed_out)
+
+
+async def _run_builtin(
+    params: Params, search_path: str, search: _ContentSearch | _TextSearch
+) -> tuple[str | None, bool]:
+    """
+    Search with `kimi_cli.utils.text_search`, feeding results to `search` as rg would.
+
+    Returns an error message like rg's, if any, and whether the search timed out.
+    """
+    # The path as rg is given it, which is how it prints the files it finds.
+    rg_path = os.path.expanduser(normalize_user_path(params.path))
+    is_file = os.path.isfile(search_path)
+    if not is_file and not os.path.isdir(search_path):
+        return f"{rg_path}: No such file or directory", False
+
+    if params.output_mode == "content":
+        before = next((n for n in (params.before_context, params.context) if n is not None), 0)
+        after = next((n for n in (params.after_context, params.context) if n is not None), 0)
+    else:
+        before = after = 0
+    options = SearchOptions(
+        pattern=params.pattern,
+        mode="content"
+        if params.output_mode == "content"
+        else "count_matches"
+        if params.output_mode == "count_matches"
+        else "files_with_matches",
+        ignore_case=params.ignore_case,
+        multiline=params.multiline,
+        before_context=before,
+        after_context=after,
+        max_lines=search.target if isinstance(search, _ContentSearch) else None,
+    )
+    try:
+        re.compile(params.pattern)
+        accept = path_filter([params.glob] if params.glob else [], params.type)
+    except (re.error, ValueError) as e:
+        return str(e), False
+
+    async def _search() -> None:
+        if is_file:
+            paths = [(rg_path, search_path)]
+        else:
+            files = await asyncio.to_thread(
+                list_files, Path(search_path), include_ignored=params.include_ignored
             )
+            paths = [
+                (os.path.join(rg_path, *file.split("/")), os.path.join(search_path, file))
+                for file in files
+                if accept(file)
+            ]
+        shown = {path: shown for shown, path in paths}
+        async with contextlib.aclosing(search_files(list(shown), options)) as results:
+            async for path, result in results:
+                if isinstance(search, _ContentSearch):
+                    assert not isinstance(result, int)
+                    for line_number, text, is_match in result:
+                        if search.add(shown[path], line_number, text, is_match=is_match):
+                            search.stopped = True
+                            return
+                elif params.output_mode == "count_matches":
+                    # Like rg, name the file only when searching a directory.
+                    search.add_line(str(result) if is_file else f"{shown[path]}:{result}")
+                else:
+                    search.add_line(shown[path])
+
+    try:
+        await asyncio.wait_for(_search(), timeout=RG_TIMEOUT)
+    except TimeoutError:
+        return None, True
+    return None, False
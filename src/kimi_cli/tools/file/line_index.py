@@ -0,0 +1,113 @@
+"""Byte offsets of lines in text files, so ReadFile can page through large files."""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
+from kaos import get_current_kaos
+from kaos.path import KaosPath
+
+CHUNK_SIZE = 256 << 10  # 256KiB
+_MAX_CACHED_FILES = 64
+
+
+@dataclass(frozen=True, slots=True)
+class LineIndex:
+    """
+    Line count of a file and where its lines start, valid while mtime and size are unchanged.
+
+    Lines end at `\\n`. One checkpoint is kept per chunk read while indexing, so finding a line
+    reads at most one chunk that precedes it.
+    """
+
+    mtime: float
+    size: int
+    total_lines: int
+    checkpoint_lines: list[int]
+    """0-based line numbers of the checkpoints, ascending, starting with line 0."""
+    checkpoint_offsets: list[int]
+    """Byte offsets at which the checkpoint lines start."""
+
+    def checkpoint(self, line: int) -> tuple[int, int]:
+        """The last checkpoint at or before the 0-based `line`, as `(line, offset)`."""
+        i = bisect.bisect_right(self.checkpoint_lines, line) - 1
+        return self.checkpoint_lines[i], self.checkpoint_offsets[i]
+
+
+# Keyed by the kaos backend too, as the same path can name different files on different hosts
+_cache: OrderedDict[tuple[str, str], LineIndex] = OrderedDict()
+
+
+async def get_line_index(path: KaosPath) -> LineIndex:
+    """Return the index of `path`, scanning the file only if it changed since the last call."""
+    st = await path.stat()
+    key = (get_current_kaos().name, str(path))
+    index = _cache.get(key)
+    if index is None or index.mtime != st.st_mtime or index.size != st.st_size:
+        index = await _build(path, st.st_mtime, st.st_size)
+        _cache[key] = index
+        if len(_cache) > _MAX_CACHED_FILES:
+            _cache.popitem(last=False)
+    _cache.move_to_end(key)
+    return index
+
+
+async def _build(path: KaosPath, mtime: float, size: int) -> LineIndex:
+    lines = [0]
+    offsets = [0]
+    newlines = 0
+    offset = 0
+    last_byte = b""
+    async with contextlib.aclosing(path.read_chunks(chunk_size=CHUNK_SIZE)) as chunks:
+        async for chunk in chunks:
+            # Lines appended since the stat are left to the next index.
+            data = chunk[: size - offset]
+            first = data.find(b"\n")
+            if first != -1 and offset + first + 1 < size:
+                lines.append(newlines + 1)
+                offsets.append(offset + first + 1)
+            newlines += data.count(b"\n")
+            offset += len(data)
+            last_byte = data[-1:] or last_byte
+            if offset >= size:
+                break
+    total = newlines + (1 if offset and last_byte != b"\n" else 0)
+    return LineIndex(mtime, size, total, lines, offsets)
+
+
+async def iter_lines_from(
+    path: KaosPath, index: LineIndex, start: int
+) -> AsyncGenerator[tuple[int, str]]:
+    """
+    Yield `(line_no, line)` from the 1-based line `start` on, decoded as UTF-8 with replacement.
+
+    Lines keep their `\\n` (`\\r\\n` becomes `\\n`). The file is read in chunks from the nearest
+    checkpoint, and no further than the consumer asks for.
+    """
+    line_no, offset = index.checkpoint(max(start - 1, 0))
+    line_no += 1
+    pending = b""
+    async with contextlib.aclosing(
+        path.read_chunks(offset=offset, chunk_size=CHUNK_SIZE)
+    ) as chunks:
+        async for chunk in chunks:
+            data = chunk[: index.size - offset]
+            offset += len(data)
+            parts = (pending + data).split(b"\n")
+            pending = parts.pop()
+            for part in parts:
+                if line_no >= start:
+                    yield line_no, _decode(part) + "\n"
+                line_no += 1
+            if offset >= index.size:
+                break
+    if pending and line_no >= start:
+        yield line_no, _decode(pending)
+
+
+def _decode(data: bytes) -> str:
+    return data.removesuffix(b"\r").decode("utf-8", errors="replace")
@@ -15,6 +15,7 @@ except ImportError:
     grp = None
 
 import aiofiles
+from kaos.local import local_kaos
 from kosong.tooling import CallableTool2, ToolError, ToolOk, ToolReturnValue
 from pydantic import BaseModel, Field
 
@@ -97,7 +98,8 @@ class ReadDirectory(CallableTool2[Params]):
 
             assert params.n_lines >= 1
             try:
-                entries = sorted(os.listdir(p))
+                # One batch for all entries instead of a stat call per entry
+                entries = sorted(await local_kaos.scandir(str(p)), key=lambda e: e.name)
             except PermissionError:
                 return ToolError(
                     message=f"Encountered a permission error while trying to read `{params.path}`.",
@@ -111,14 +113,11 @@ class ReadDirectory(CallableTool2[Params]):
                     max_fd_reached = True
                     break
 
-                full_path = os.path.join(p, entry)
+                full_path = os.path.join(p, entry.name)
                 entry_p = Path(full_path)
 
-                try:
-                    # On Windows, we might want lstat to avoid following symlinks for size/mode
-                    # but keeping stat for consistency with original code logic unless it fails
-                    stats = entry_p.stat()
-                except:
+                stats = entry.stat
+                if stats is None:
                     continue
 
                 mode = stats.st_mode
@@ -126,10 +125,10 @@ class ReadDirectory(CallableTool2[Params]):
                 mtime = datetime.fromtimestamp(stats.st_mtime)
                 time_str = mtime.strftime('%b %d %H:%M')
 
-                name = entry
-                if entry_p.is_dir():
+                name = entry.name
+                if entry.is_dir():
                     name += "/"
-                elif entry_p.is_symlink():
+                elif entry.is_symlink():
                     try:
                         target = os.readlink(full_path)
                         name += " -> " + target
@@ -148,9 +147,9 @@ class ReadDirectory(CallableTool2[Params]):
                     # Windows Format: <DIR/TYPE> [Size] [Time] [Name]
                     # Mimics 'dir' content but 'ls' layout
                     type_str = ""
-                    if entry_p.is_dir():
+                    if entry.is_dir():
                         type_str = "<DIR>"
-                    elif entry_p.is_symlink():
+                    elif entry.is_symlink():
                         type_str = "<LNK>"
 
                     output_entries.append(
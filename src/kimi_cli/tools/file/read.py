@@ -1,12 +1,16 @@
 from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
 from pathlib import Path
 from typing import override
 
+from kaos import get_current_kaos
 from kaos.path import KaosPath
 from kosong.tooling import CallableTool2, ToolError, ToolOk, ToolReturnValue
 from pydantic import BaseModel, Field, model_validator
 
 from kimi_cli.soul.agent import Runtime
+from kimi_cli.tools.file.line_index import LineIndex, get_line_index, iter_lines_from
 from kimi_cli.tools.file.utils import MEDIA_SNIFF_BYTES, detect_file_type
 from kimi_cli.tools.utils import load_desc, truncate_line
 from kimi_cli.utils.logging import logger
@@ -170,6 +174,13 @@ class ReadFile(CallableTool2[Params]):
                 brief="Failed to read file",
             )
 
+    async def _line_index(self, p: KaosPath) -> LineIndex | None:
+        # ACP clients may serve unsaved editor contents through `read_lines`, which an index
+        # of the file on disk would not match.
+        if get_current_kaos().name == "acp":
+            return None
+        return await get_line_index(p)
+
     async def _read_forward(self, p: KaosPath, params: Params) -> ToolReturnValue:
         """Read file from a positive line_offset, counting total lines."""
         lines: list[str] = []
@@ -179,27 +190,36 @@ class ReadFile(CallableTool2[Params]):
         max_bytes_reached = False
         collecting = True  # False once we've collected enough lines
         current_line_no = 0
-        async for line in p.read_lines(errors="replace"):
-            current_line_no += 1
-            if not collecting:
-                continue
-            if current_line_no < params.line_offset:
-                continue
-            truncated = truncate_line(line, MAX_LINE_LENGTH)
-            if truncated != line:
-                truncated_line_numbers.append(current_line_no)
-            lines.append(truncated)
-            n_bytes += len(truncated.encode("utf-8"))
-            if len(lines) >= params.n_lines:
-                collecting = False
-            elif len(lines) >= MAX_LINES:
-                max_lines_reached = True
-                collecting = False
-            elif n_bytes >= MAX_BYTES:
-                max_bytes_reached = True
-                collecting = False
-
-        total_lines = current_line_no
+        # With an index, reading starts near `line_offset` and the total comes from the index.
+        index = await self._line_index(p)
+        numbered_lines = (
+            _numbered(p.read_lines(errors="replace"))
+            if index is None
+            else iter_lines_from(p, index, params.line_offset)
+        )
+        async with aclosing(numbered_lines) as numbered:
+            async for current_line_no, line in numbered:
+                if not collecting:
+                    if index is not None:
+                        break
+                    continue
+                if current_line_no < params.line_offset:
+                    continue
+                truncated = truncate_line(line, MAX_LINE_LENGTH)
+                if truncated != line:
+                    truncated_line_numbers.append(current_line_no)
+                lines.append(truncated)
+                n_bytes += len(truncated.encode("utf-8"))
+                if len(lines) >= params.n_lines:
+                    collecting = False
+                elif len(lines) >= MAX_LINES:
+                    max_lines_reached = True
+                    collecting = False
+                elif n_bytes >= MAX_BYTES:
+                    max_bytes_reached = True
+                    collecting = False
+
+        total_lines = current_line_no if index is None else index.total_lines
 
         # Format output with line numbers like `cat -n`
         start_line = params.line_offset
@@ -233,13 +253,25 @@ class ReadFile(CallableTool2[Params]):
         # Use a deque to keep the last `tail_count` lines with their line numbers
         # Each entry: (line_no, truncated_line, was_truncated)
         tail_buf: deque[tuple[int, str, bool]] = deque(maxlen=tail_count)
-        current_line_no = 0
-        async for line in p.read_lines(errors="replace"):
-            current_line_no += 1
-            truncated = truncate_line(line, MAX_LINE_LENGTH)
-            tail_buf.append((current_line_no, truncated, truncated != line))
-
-        total_lines = current_line_no
+        index = await self._line_index(p)
+        if index is not None:
+            # Read backwards from the end; line numbers count down from the indexed total.
+            total_lines = index.total_lines
+            current_line_no = total_lines
+            async with aclosing(p.read_lines_reverse(errors="replace")) as reversed_lines:
+                async for line in reversed_lines:
+                    if len(tail_buf) >= tail_count or current_line_no < 1:
+                        break
+                    truncated = truncate_line(line, MAX_LINE_LENGTH)
+                    tail_buf.appendleft((current_line_no, truncated, truncated != line))
+                    current_line_no -= 1
+        else:
+            current_line_no = 0
+            async for line in p.read_lines(errors="replace"):
+                current_line_no += 1
+                truncated = truncate_line(line, MAX_LINE_LENGTH)
+                tail_buf.append((current_line_no, truncated, truncated != line))
+            total_lines = current_line_no
 
         # Step 1: Apply n_lines / MAX_LINES from head of tail_buf.
         # This preserves the user's requested start position.
@@ -299,3 +331,11 @@ class ReadFile(CallableTool2[Params]):
             output="".join(lines_with_no),
             message=message,
         )
+
+
+async def _numbered(lines: AsyncGenerator[str]) -> AsyncGenerator[tuple[int, str]]:
+    line_no = 0
+    async with aclosing(lines):
+        async for line in lines:
+            line_no += 1
+            yield line_no, line
@@ -27,8 +27,9 @@ class Printer(Protocol):
 
 
 def _merge_content(buffer: list[ContentPart], part: ContentPart) -> None:
+    # Wire messages are shared with other subscribers, so merge into a private copy.
     if not buffer or not buffer[-1].merge_in_place(part):
-        buffer.append(part)
+        buffer.append(part.model_copy(deep=True))
 
 
 class TextPrinter(Printer):
@@ -67,6 +68,7 @@ class JsonPrinter(Printer):
                 # merge with previous parts as much as possible
                 _merge_content(self._content_buffer, part)
             case ToolCall() as call:
+                call = call.model_copy(deep=True)
                 self._tool_call_buffer.append(call)
                 self._last_tool_call = call
             case ToolCallPart() as part:
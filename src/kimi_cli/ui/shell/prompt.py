@@ -68,6 +68,7 @@ from kimi_cli.utils.clipboard import (
     is_clipboard_available,
     is_media_clipboard_available,
 )
+from kimi_cli.utils.file_index import shared_file_index
 from kimi_cli.utils.logging import logger
 from kimi_cli.utils.slashcmd import SlashCommand
 from kimi_cli.wire.types import ContentPart
@@ -637,14 +638,12 @@ class LocalFileMentionCompleter(Completer):
         self._root = root
         self._refresh_interval = refresh_interval
         self._limit = limit
-        self._cache_time: float = 0.0
-        self._cached_paths: list[str] = []
-        self._cache_scope: str | None = None
+        self._index = shared_file_index(root)
+        # Build the index while the user is still typing the first prompt.
+        self._index.refresh_in_background(max_age=refresh_interval)
         self._top_cache_time: float = 0.0
         self._top_cached_paths: list[str] = []
         self._fragment_hint: str | None = None
-        self._is_git: bool | None = None  # lazily detected
-        self._git_index_mtime: float | None = None
 
         self._word_completer = WordCompleter(
             self._get_paths,
@@ -671,64 +670,33 @@ class LocalFileMentionCompleter(Completer):
         if now - self._top_cache_time <= self._refresh_interval:
             return self._top_cached_paths
 
-        entries: list[str] = []
-        try:
-            for entry in sorted(self._root.iterdir(), key=lambda p: p.name):
-                name = entry.name
-                if is_ignored(name):
-                    continue
-                entries.append(f"{name}/" if entry.is_dir() else name)
-                if len(entries) >= self._limit:
-                    break
-        except OSError:
+        listing = self._index.listdir()
+        if listing is None:
             return self._top_cached_paths
+        entries: list[str] = []
+        for entry in sorted(listing, key=lambda e: e.name):
+            name = entry.name
+            if is_ignored(name):
+                continue
+            entries.append(f"{name}/" if entry.is_dir else name)
+            if len(entries) >= self._limit:
+                break
 
         self._top_cached_paths = entries
         self._top_cache_time = now
         return self._top_cached_paths
 
     def _get_deep_paths(self) -> list[str]:
-        from kimi_cli.utils.file_filter import (
-            detect_git,
-            git_index_mtime,
-            list_files_git,
-            list_files_walk,
-        )
-
         fragment = self._fragment_hint or ""
 
         scope: str | None = None
         if "/" in fragment:
             scope = fragment.rsplit("/", 1)[0]
 
-        now = time.monotonic()
-        cache_valid = (
-            now - self._cache_time <= self._refresh_interval and self._cache_scope == scope
-        )
-
-        # Invalidate on .git/index mtime change (like Claude Code).
-        if cache_valid and self._is_git:
-            mtime = git_index_mtime(self._root)
-            if mtime != self._git_index_mtime:
-                cache_valid = False
-
-        if cache_valid:
-            return self._cached_paths
-
-        if self._is_git is None:
-            self._is_git = detect_git(self._root)
-
-        paths: list[str] | None = None
-        if self._is_git:
-            paths = list_files_git(self._root, scope)
-            self._git_index_mtime = git_index_mtime(self._root)
-        if paths is None:
-            paths = list_files_walk(self._root, scope, limit=self._limit)
-
-        self._cached_paths = paths
-        self._cache_scope = scope
-        self._cache_time = now
-        return self._cached_paths
+        # The shared index serves the last listing and recomputes it in the background once
+        # the workspace or the git index changed.
+        self._index.refresh_in_background(max_age=self._refresh_interval)
+        return self._index.mention_paths(scope, limit=self._limit)
 
     @staticmethod
     def _extract_fragment(text: str) -> str | None:
@@ -1477,12 +1445,7 @@ class CustomPromptSession:
         def _(event: KeyPressEvent) -> None:
             self._handle_bracketed_paste(event)
 
-<<<<<<< HEAD
-        if is_clipboard_available():
-            system_clipboard = PyperclipClipboard()
-=======
         if clipboard_available or media_clipboard_available:
->>>>>>> ee850e16b47c936f9e05764437eb9dd970651ff8
 
             @_kb.add("c-v", eager=True)
             def _(event: KeyPressEvent) -> None:
@@ -1491,15 +1454,6 @@ class CustomPromptSession:
                 track("shortcut_paste")
                 if self._try_paste_media(event):
                     return
-<<<<<<< HEAD
-                # Explicitly read from system clipboard for paste
-                clipboard_data = system_clipboard.get_data()
-                if clipboard_data is None:  # type: ignore[reportUnnecessaryComparison]
-                    return
-                event.current_buffer.paste_clipboard_data(clipboard_data)
-        else:
-            pass
-=======
                 if clipboard_available:
                     try:
                         clipboard_data = event.app.clipboard.get_data()
@@ -1515,7 +1469,6 @@ class CustomPromptSession:
         # use clipboard without error handling, so a broken clipboard
         # object would crash the UI.
         clipboard = PyperclipClipboard() if clipboard_available else None
->>>>>>> ee850e16b47c936f9e05764437eb9dd970651ff8
 
         self._session = PromptSession[str](
             message=self._render_message,
@@ -1524,6 +1477,7 @@ class CustomPromptSession:
             complete_while_typing=True,
             reserve_space_for_menu=6,
             key_bindings=_kb,
+            clipboard=clipboard,
             history=history,
             bottom_toolbar=self._render_bottom_toolbar,
             style=get_prompt_style(),
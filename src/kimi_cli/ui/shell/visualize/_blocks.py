@@ -32,6 +32,7 @@ from kimi_cli.utils.rich.diff_render import (
     render_diff_summary_panel,
 )
 from kimi_cli.utils.rich.markdown import Markdown
+from kimi_cli.utils.tokenizer import estimate_tokens
 from kimi_cli.wire.types import (
     BackgroundTaskDisplayBlock,
     BriefDisplayBlock,
@@ -98,31 +99,12 @@ def _get_md_parser() -> MarkdownIt:
 
 
 def _estimate_tokens(text: str) -> float:
-    """Estimate token count for mixed CJK/Latin text.
+    """Estimate the token count of a streamed chunk with the configured tokenizer.
 
     Returns a **float** so that callers can accumulate across small chunks
-    without per-chunk floor truncation (e.g. a 3-char ASCII chunk would
-    yield 0 if truncated to int immediately, but 0.75 as float).
-
-    Heuristics based on common BPE tokenizers (cl100k, o200k):
-    - CJK ideographs: ~1.5 tokens per character (often split into 2-byte pieces)
-    - Latin / ASCII: ~1 token per 4 characters (words average ~4 chars)
+    without per-chunk floor truncation, see `estimate_tokens`.
     """
-    cjk = 0
-    other = 0
-    for ch in text:
-        cp = ord(ch)
-        if (
-            0x4E00 <= cp <= 0x9FFF  # CJK Unified Ideographs
-            or 0x3400 <= cp <= 0x4DBF  # CJK Extension A
-            or 0xF900 <= cp <= 0xFAFF  # CJK Compatibility Ideographs
-            or 0x3000 <= cp <= 0x303F  # CJK Symbols and Punctuation
-            or 0xFF00 <= cp <= 0xFFEF  # Fullwidth Forms
-        ):
-            cjk += 1
-        else:
-            other += 1
-    return cjk * 1.5 + other / 4
+    return estimate_tokens(text)
 
 
 def _find_committed_boundary(text: str) -> int | None:
@@ -413,6 +395,8 @@ class _ToolCallBlock:
         self._renderable = self._compose()
 
     def append_sub_tool_call(self, tool_call: ToolCall):
+        # copy: the arguments are extended in place by later tool call parts
+        tool_call = tool_call.model_copy(deep=True)
         self._ongoing_subagent_tool_calls[tool_call.id] = tool_call
         self._last_subagent_tool_call = tool_call
 
@@ -124,8 +124,11 @@ def detect_git(root: Path) -> bool:
         return False
 
 
-def git_index_mtime(root: Path) -> float | None:
-    """Return the mtime of ``.git/index``, or *None* if unavailable."""
+def git_index_path(root: Path) -> Path | None:
+    """Return the path of the git index for *root*, or *None* outside a work tree.
+
+    The index file itself may not exist yet in a fresh repository.
+    """
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--git-dir"],
@@ -139,12 +142,22 @@ def git_index_mtime(root: Path) -> float | None:
         git_dir = Path(result.stdout.strip())
         if not git_dir.is_absolute():
             git_dir = root / git_dir
-        index = git_dir / "index"
-        return index.stat().st_mtime
+        return git_dir / "index"
     except Exception:
         return None
 
 
+def git_index_mtime(root: Path) -> float | None:
+    """Return the mtime of ``.git/index``, or *None* if unavailable."""
+    index = git_index_path(root)
+    if index is None:
+        return None
+    try:
+        return index.stat().st_mtime
+    except OSError:
+        return None
+
+
 def _parse_ls_files_output(stdout: str, *, filter_ignored: bool = True) -> list[str]:
     """Parse NUL-delimited ``git ls-files -z`` output into paths with synthesised dirs.
 
@@ -0,0 +1,361 @@
+"""Shared, incrementally refreshed index of the files in a local workspace."""
+
+from __future__ import annotations
+
+import glob as globlib
+import os
+import re
+import stat
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from kimi_cli.utils.logging import logger
+
+# Directory mtimes are only as fine as the kernel clock tick, so a directory scanned within
+# this window of its last change is scanned again next time.
+_RACY_WINDOW_NS = 2_000_000_000
+_MAGIC = re.compile(r"[*?\[]")
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedEntry:
+    name: str
+    is_dir: bool
+    is_symlink: bool
+    size: int
+    mtime: float
+
+
+@dataclass(slots=True)
+class _IndexedDir:
+    mtime_ns: int
+    """mtime of the directory when it was scanned; -1 forces a rescan."""
+    entries: dict[str, IndexedEntry]
+
+
+class WorkspaceFileIndex:
+    """
+    Paths, types, sizes and mtimes of everything under a workspace root.
+
+    A refresh stats each indexed directory and rescans only those whose mtime changed, since
+    adding, removing or renaming an entry always touches its parent. In-place edits do not, so
+    sizes and mtimes of unchanged directories may lag; callers that order by mtime re-stat
+    their results. Symlinked directories are recorded but not descended into.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._dirs: dict[str, _IndexedDir] = {}
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._refreshed_at: float | None = None
+        self._refresh_thread: threading.Thread | None = None
+        self._git_index: Path | None = None
+        self._git_checked = False
+        self._mentions: dict[str | None, tuple[tuple[int, int | None], list[str]]] = {}
+        self._mention_limit = 1000
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def generation(self) -> int:
+        """Incremented whenever a refresh finds a directory whose entries changed."""
+        return self._generation
+
+    @property
+    def refreshed_at(self) -> float | None:
+        """
+        `time.monotonic()` when the last full refresh started, or None if the tree was never
+        walked. Every change made before then is reflected in `generation`.
+        """
+        return self._refreshed_at
+
+    def refresh(
+        self,
+        rel: str = "",
+        *,
+        max_depth: int | None = None,
+        skip: Callable[[str], bool] | None = None,
+    ) -> None:
+        """
+        Bring the subtree at `rel` up to date, `max_depth` levels deep if given.
+
+        Directories whose name `skip` accepts are listed but not descended into, and what is
+        already indexed below them is kept as is.
+        """
+        rel = _normalize(rel)
+        started_at = time.monotonic()
+        seen: set[str] = set()
+        stack: list[tuple[str, int]] = [(rel, 0)]
+        while stack:
+            current, depth = stack.pop()
+            # Lock per directory so a long walk does not hold up `listdir` calls.
+            with self._lock:
+                indexed = self._refresh_dir(current)
+            if indexed is None:
+                continue
+            seen.add(current)
+            if max_depth is not None and depth + 1 >= max_depth:
+                continue
+            for entry in indexed.entries.values():
+                if entry.is_dir and not entry.is_symlink and not (skip and skip(entry.name)):
+                    stack.append((_join(current, entry.name), depth + 1))
+        with self._lock:
+            # Directories the walk should have reached but did not are gone.
+            stale = [
+                key
+                for key in self._dirs
+                if key not in seen
+                and _is_within(key, rel)
+                and (max_depth is None or _depth(key, rel) < max_depth)
+                and not (skip and any(skip(part) for part in key.split("/")))
+            ]
+            for key in stale:
+                del self._dirs[key]
+        if rel == "" and max_depth is None and skip is None:
+            self._refreshed_at = started_at
+
+    def refresh_in_background(self, *, max_age: float = 0.0) -> None:
+        """Refresh the whole index in a thread unless that happened within `max_age` seconds."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < max_age:
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._background_refresh, name="workspace-file-index", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _background_refresh(self) -> None:
+        from kimi_cli.utils.file_filter import is_ignored
+
+        try:
+            started_at = time.monotonic()
+            # Dependency and build trees are left to targeted refreshes, such as a glob into them.
+            self.refresh(skip=is_ignored)
+            self._refreshed_at = started_at
+            # Recompute mention lists that went stale, off the prompt's thread.
+            for scope in list(self._mentions):
+                self._mention_paths(scope)
+        except Exception:
+            logger.exception(
+                "Failed to refresh the workspace file index for {root}", root=self._root
+            )
+
+    def listdir(self, rel: str = "") -> list[IndexedEntry] | None:
+        """
+        The entries of one directory, or None if `rel` is not a directory.
+
+        The directory is always rescanned, so sizes and mtimes are current.
+        """
+        with self._lock:
+            indexed = self._refresh_dir(_normalize(rel), force=True)
+            return None if indexed is None else list(indexed.entries.values())
+
+    def walk(self, rel: str = "") -> Iterator[tuple[str, IndexedEntry]]:
+        """All indexed entries below `rel` as of the last refresh, with paths from the root."""
+        with self._lock:
+            dirs = [(key, list(d.entries.values())) for key, d in self._dirs.items()]
+        for key, entries in dirs:
+            if not _is_within(key, rel):
+                continue
+            for entry in entries:
+                yield _join(key, entry.name), entry
+
+    def glob(self, pattern: str, rel: str = "") -> list[tuple[str, IndexedEntry | None]] | None:
+        """
+        Match `pattern` like `Path.glob` on the directory at `rel`.
+
+        Returns paths from the root and their entries (None for `rel` itself, which a trailing
+        `**` matches), or None when the pattern needs the filesystem itself: `..` segments,
+        absolute patterns, symlinked directories below `rel`, or Python older than 3.13.
+        """
+        translate = getattr(globlib, "translate", None)
+        if translate is None or not pattern:
+            return None
+        if os.sep == "\\":
+            pattern = pattern.replace("\\", "/")
+        dirs_only = pattern.endswith("/")
+        segments = [segment for segment in pattern.split("/") if segment]
+        if (
+            not segments
+            or pattern.startswith("/")
+            or ":" in segments[0]
+            or "." in segments
+            or ".." in segments
+        ):
+            return None
+
+        # Walk only below the literal leading segments, and only as deep as the pattern.
+        rel = _normalize(rel)
+        base = rel
+        while len(segments) > 1 and not _MAGIC.search(segments[0]) and segments[0] != "**":
+            base = _join(base, segments.pop(0))
+        max_depth = None if "**" in segments else len(segments)
+        regex = re.compile(
+            translate("/".join(segments), recursive=True, include_hidden=True, seps="/")
+        )
+        # Hold the lock so a background refresh cannot prune what this one just indexed.
+        with self._lock:
+            self.refresh(base, max_depth=max_depth)
+            if base not in self._dirs:
+                return []
+            found = list(self.walk(base))
+            base_entry = self._entry(base)
+
+        matches: list[tuple[str, IndexedEntry | None]] = []
+        if segments == ["**"]:
+            # `Path.glob` yields the directory a trailing `**` starts from as well.
+            matches.append((base, None if base == rel else base_entry))
+        for path, entry in found:
+            relative = path[len(base) + 1 :] if base else path
+            if max_depth is not None and relative.count("/") >= max_depth:
+                continue
+            if entry.is_symlink and entry.is_dir:
+                return None
+            if dirs_only and not entry.is_dir:
+                continue
+            if regex.fullmatch(relative) or (
+                segments[-1] == "**"
+                and entry.is_dir
+                and len(segments) > 1
+                and regex.fullmatch(relative + "/")
+            ):
+                matches.append((path, entry))
+        return matches
+
+    def mention_paths(self, scope: str | None, *, limit: int) -> list[str]:
+        """
+        Candidates for `@` completion under `scope`, in the `file_filter` listing format.
+
+        Lists are kept until the workspace or the git index changes. Recomputing happens in
+        `refresh_in_background` once a list exists, so typing never waits on `git`.
+        """
+        cached = self._mentions.get(scope)
+        if cached is not None:
+            return cached[1]
+        self._mention_limit = limit
+        return self._mention_paths(scope)
+
+    def _mention_paths(self, scope: str | None) -> list[str]:
+        from kimi_cli.utils.file_filter import list_files_git, list_files_walk
+
+        key = (self._generation, self._git_index_mtime_ns())
+        cached = self._mentions.get(scope)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        paths: list[str] | None = None
+        if self._git_index_path() is not None:
+            paths = list_files_git(self._root, scope)
+        if paths is None:
+            paths = list_files_walk(self._root, scope, limit=self._mention_limit)
+        self._mentions[scope] = (key, paths)
+        return paths
+
+    def _git_index_path(self) -> Path | None:
+        if not self._git_checked:
+            from kimi_cli.utils.file_filter import git_index_path
+
+            self._git_index = git_index_path(self._root)
+            self._git_checked = True
+        return self._git_index
+
+    def _git_index_mtime_ns(self) -> int | None:
+        path = self._git_index_path()
+        if path is None:
+            return None
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _entry(self, path: str) -> IndexedEntry | None:
+        parent, _, name = path.rpartition("/")
+        indexed = self._dirs.get(parent)
+        return None if indexed is None else indexed.entries.get(name)
+
+    def _refresh_dir(self, rel: str, *, force: bool = False) -> _IndexedDir | None:
+        path = self._root / rel if rel else self._root
+        try:
+            st = path.stat()
+        except OSError:
+            self._dirs.pop(rel, None)
+            return None
+        if not stat.S_ISDIR(st.st_mode):
+            self._dirs.pop(rel, None)
+            return None
+        indexed = self._dirs.get(rel)
+        if indexed is not None and indexed.mtime_ns == st.st_mtime_ns and not force:
+            return indexed
+        entries: dict[str, IndexedEntry] = {}
+        try:
+            with os.scandir(path) as it:
+                for dir_entry in it:
+                    entries[dir_entry.name] = _indexed_entry(dir_entry)
+        except OSError:
+            self._dirs.pop(rel, None)
+            return None
+        racy = time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS
+        if indexed is None or indexed.entries != entries:
+            self._generation += 1
+        indexed = _IndexedDir(-1 if racy else st.st_mtime_ns, entries)
+        self._dirs[rel] = indexed
+        return indexed
+
+
+def _indexed_entry(dir_entry: os.DirEntry[str]) -> IndexedEntry:
+    is_symlink = dir_entry.is_symlink()
+    try:
+        st = dir_entry.stat()
+        is_dir = stat.S_ISDIR(st.st_mode)
+        return IndexedEntry(dir_entry.name, is_dir, is_symlink, st.st_size, st.st_mtime)
+    except OSError:
+        # Broken symlink
+        return IndexedEntry(dir_entry.name, False, is_symlink, 0, 0.0)
+
+
+def _normalize(rel: str) -> str:
+    return "" if rel == "." else rel.strip("/")
+
+
+def _join(rel: str, name: str) -> str:
+    return f"{rel}/{name}" if rel else name
+
+
+def _is_within(path: str, rel: str) -> bool:
+    return not rel or path == rel or path.startswith(rel + "/")
+
+
+def _depth(path: str, rel: str) -> int:
+    """How many levels `path` is below `rel`, which must contain it."""
+    if path == rel:
+        return 0
+    relative = path[len(rel) + 1 :] if rel else path
+    return relative.count("/") + 1
+
+
+_indexes: dict[Path, WorkspaceFileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def shared_file_index(root: Path) -> WorkspaceFileIndex:
+    """The index for `root`, shared by the Glob tool, `@` completion and the web file API."""
+    root = root.resolve()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = WorkspaceFileIndex(root)
+        return index
+
+
+def find_file_index(path: Path) -> WorkspaceFileIndex | None:
+    """The innermost shared index whose root contains `path`, without creating one."""
+    path = path.resolve()
+    with _indexes_lock:
+        roots = [root for root in _indexes if path.is_relative_to(root)]
+        return _indexes[max(roots, key=lambda root: len(root.parts))] if roots else None
@@ -0,0 +1,64 @@
+"""Process-wide HTTP connection pools shared by the chat providers."""
+
+from __future__ import annotations
+
+import importlib.util
+import threading
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import httpx
+
+if TYPE_CHECKING:
+    from kimi_cli.config import HttpConfig
+
+# Same as the OpenAI and Anthropic SDKs; they override it per request anyway.
+_DEFAULT_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+_limits = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+_http2 = False
+_clients: dict[str, httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+
+
+def configure_http_clients(config: HttpConfig) -> None:
+    """Set the pool limits and protocol used by clients created afterwards."""
+    global _limits, _http2
+    _limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry_ms / 1000,
+    )
+    # HTTP/2 needs the optional `h2` package
+    _http2 = config.http2 and importlib.util.find_spec("h2") is not None
+
+
+def shared_http_client(base_url: str | None) -> httpx.AsyncClient:
+    """
+    Get the shared client for the origin of `base_url`.
+
+    All chat providers talking to the same origin, including subagents and compaction, use one
+    connection pool, so they reuse warm connections instead of paying a TLS handshake per
+    provider instance. A connection that fails is dropped from the pool by httpx, so recovering
+    from an error only needs a new SDK client around the same pool. The shared clients must not
+    be closed by their users.
+    """
+    origin = _origin(base_url)
+    with _clients_lock:
+        client = _clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=_limits,
+                timeout=_DEFAULT_TIMEOUT,
+                http2=_http2,
+                follow_redirects=True,
+            )
+            _clients[origin] = client
+        return client
+
+
+def _origin(base_url: str | None) -> str:
+    if not base_url:
+        return ""
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
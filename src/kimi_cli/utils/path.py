@@ -5,7 +5,6 @@ import os
 import re
 from collections.abc import Sequence
 from pathlib import Path, PurePath
-from stat import S_ISDIR
 
 import aiofiles.os
 from kaos.path import KaosPath
@@ -72,14 +71,7 @@ async def _collect_entries(
     and truncated to *max_width* so the returned subset is deterministic
     regardless of filesystem enumeration order.
     """
-    all_entries: list[tuple[str, bool]] = []
-    async for entry in dir_path.iterdir():
-        try:
-            st = await entry.stat()
-            is_dir = S_ISDIR(st.st_mode)
-        except OSError:
-            is_dir = False
-        all_entries.append((entry.name, is_dir))
+    all_entries = [(entry.name, entry.is_dir()) for entry in await dir_path.scandir()]
     all_entries.sort(key=lambda e: (not e[1], e[0]))
     return all_entries[:max_width], len(all_entries)
 
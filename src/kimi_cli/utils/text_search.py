@@ -0,0 +1,440 @@
+"""
+Pure-Python text search over a directory tree, used by the Grep tool when ripgrep is missing.
+
+Files are memory-mapped, binary files (those containing a NUL byte) are skipped like ripgrep
+does, and large searches are spread over a pool of worker processes. This module is kept light
+on imports because every worker process imports it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import mmap
+import multiprocessing
+import os
+import re
+import sys
+import threading
+from collections import deque
+from collections.abc import AsyncGenerator, Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from kimi_cli.utils.logging import logger
+
+type OutputMode = Literal["content", "files_with_matches", "count_matches"]
+type ContentLine = tuple[int, str, bool]
+"""A 1-based line number, the line without its newline, and whether it matched."""
+type FileResult = list[ContentLine] | int
+"""Lines to show in `content` mode, otherwise the number of matches."""
+
+VCS_DIRS = frozenset((".git", ".svn", ".hg", ".bzr", ".jj", ".sl"))
+
+# The common part of ripgrep's built-in `--type` definitions, matched against file names.
+FILE_TYPES: dict[str, tuple[str, ...]] = {
+    "c": ("*.[chH]", "*.[chH].in", "*.cats"),
+    "clojure": ("*.clj", "*.cljc", "*.cljs", "*.cljx"),
+    "cmake": ("*.cmake", "CMakeLists.txt"),
+    "cpp": ("*.[ChH]", "*.cc", "*.[ch]pp", "*.[ch]xx", "*.hh", "*.inl", "*.[ChH].in"),
+    "cs": ("*.cs",),
+    "css": ("*.css", "*.scss"),
+    "csv": ("*.csv",),
+    "dart": ("*.dart",),
+    "docker": ("*Dockerfile*",),
+    "elixir": ("*.ex", "*.eex", "*.exs", "*.heex", "*.leex", "*.livemd"),
+    "erlang": ("*.erl", "*.hrl"),
+    "go": ("*.go",),
+    "gradle": ("*.gradle", "*.gradle.kts"),
+    "graphql": ("*.graphql", "*.graphqls"),
+    "groovy": ("*.groovy", "*.gradle"),
+    "h": ("*.h", "*.hh", "*.hpp"),
+    "haskell": ("*.hs", "*.lhs", "*.cpphs", "*.c2hs", "*.hsc"),
+    "html": ("*.htm", "*.html", "*.ejs"),
+    "ini": ("*.ini",),
+    "java": ("*.java", "*.jsp", "*.jspx", "*.properties"),
+    "js": ("*.js", "*.jsx", "*.vue", "*.cjs", "*.mjs"),
+    "json": ("*.json", "composer.lock", "*.sarif"),
+    "jsonl": ("*.jsonl",),
+    "julia": ("*.jl",),
+    "kotlin": ("*.kt", "*.kts"),
+    "lua": ("*.lua",),
+    "make": ("[Gg][Nn][Uu]makefile", "[Mm]akefile", "*.mk", "*.mak"),
+    "markdown": ("*.markdown", "*.md", "*.mdown", "*.mdwn", "*.mkd", "*.mkdn", "*.mdx"),
+    "md": ("*.markdown", "*.md", "*.mdown", "*.mdwn", "*.mkd", "*.mkdn", "*.mdx"),
+    "nix": ("*.nix",),
+    "objc": ("*.h", "*.m"),
+    "ocaml": ("*.ml", "*.mli", "*.mll", "*.mly"),
+    "perl": ("*.perl", "*.pl", "*.PL", "*.plh", "*.plx", "*.pm", "*.t"),
+    "php": ("*.php", "*.php3", "*.php4", "*.php5", "*.phtml"),
+    "proto": ("*.proto",),
+    "py": ("*.py", "*.pyi"),
+    "r": ("*.R", "*.r", "*.Rmd", "*.Rnw"),
+    "rst": ("*.rst",),
+    "ruby": ("Gemfile", "*.gemspec", ".irbrc", "Rakefile", "*.rb"),
+    "rust": ("*.rs",),
+    "scala": ("*.scala", "*.sbt"),
+    "sh": ("*.bash", ".bashrc", ".bash_*", ".profile", "*.sh", "*.zsh", ".zshrc", "*.ksh"),
+    "sql": ("*.sql", "*.psql"),
+    "svelte": ("*.svelte",),
+    "swift": ("*.swift",),
+    "tex": ("*.tex", "*.ltx", "*.cls", "*.sty", "*.bib"),
+    "tf": ("*.tf", "*.tfvars"),
+    "toml": ("*.toml", "Cargo.lock"),
+    "ts": ("*.ts", "*.tsx", "*.cts", "*.mts"),
+    "txt": ("*.txt",),
+    "vim": ("*.vim", ".vimrc", ".gvimrc", "vimrc", "gvimrc"),
+    "vue": ("*.vue",),
+    "xml": ("*.xml", "*.xml.dist", "*.xsd", "*.xsl", "*.xslt", "*.svg"),
+    "yaml": ("*.yaml", "*.yml"),
+    "zig": ("*.zig",),
+}
+
+_BATCH_FILES = 32
+_POOL_MIN_FILES = 256
+"""Searches over fewer files run in threads; starting worker processes would cost more."""
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+
+@dataclass(frozen=True, slots=True)
+class SearchOptions:
+    pattern: str
+    mode: OutputMode = "files_with_matches"
+    ignore_case: bool = False
+    multiline: bool = False
+    """Let `.` match newlines and matches span lines, like `rg -U --multiline-dotall`."""
+    before_context: int = 0
+    after_context: int = 0
+    max_lines: int | None = None
+    """In `content` mode, stop reporting lines of a file after this many."""
+
+
+def compile_pattern(options: SearchOptions) -> re.Pattern[str]:
+    """Compile the search pattern, raising `re.error` if it is invalid."""
+    return _compile(options.pattern, options.ignore_case, options.multiline)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile(pattern: str, ignore_case: bool, multiline: bool) -> re.Pattern[str]:
+    flags = re.MULTILINE
+    if ignore_case:
+        flags |= re.IGNORECASE
+    if multiline:
+        flags |= re.DOTALL
+    return re.compile(pattern, flags)
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translate a ripgrep `--glob` (without `!` and anchoring `/`) to a regular expression."""
+    out: list[str] = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        c = glob[i]
+        if glob.startswith("**/", i) and (i == 0 or glob[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i) and i + 2 == n and (i == 0 or glob[i - 1] == "/"):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and (end := glob.find("]", i + 2)) != -1:
+            body = glob[i + 1 : end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append(f"[{body.replace('\\', '\\\\')}]")
+            i = end + 1
+        elif c == "{" and (end := glob.find("}", i)) != -1:
+            options = glob[i + 1 : end].split(",")
+            out.append("(?:" + "|".join(glob_to_regex(option) for option in options) + ")")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True, slots=True)
+class _Glob:
+    regex: re.Pattern[str]
+    negated: bool
+    basename: bool
+    """Match the last path component only, as globs without a `/` do."""
+    dirs_only: bool
+
+    def matches(self, path: str) -> bool:
+        return bool(self.regex.fullmatch(path.rpartition("/")[2] if self.basename else path))
+
+
+def _parse_glob(glob: str) -> _Glob:
+    negated = glob.startswith("!")
+    glob = glob.removeprefix("!")
+    dirs_only = glob.endswith("/")
+    glob = glob.rstrip("/")
+    basename = "/" not in glob
+    glob = glob.removeprefix("/")
+    return _Glob(re.compile(glob_to_regex(glob)), negated, basename, dirs_only)
+
+
+def path_filter(globs: Sequence[str], file_type: str | None) -> Callable[[str], bool]:
+    """
+    A predicate on `/`-separated paths relative to the search root, following ripgrep's rules.
+
+    The last glob that matches decides; `!` globs also exclude everything under a matching
+    directory. When there is any glob without `!`, files that match none are excluded. Raises
+    `ValueError` for an unknown `file_type`.
+    """
+    parsed = [_parse_glob(glob) for glob in globs]
+    has_positive = any(not glob.negated for glob in parsed)
+    type_regex: re.Pattern[str] | None = None
+    if file_type is not None:
+        type_globs = FILE_TYPES.get(file_type)
+        if type_globs is None:
+            raise ValueError(f"unrecognized file type: {file_type}")
+        type_regex = re.compile("|".join(glob_to_regex(glob) for glob in type_globs))
+
+    def accept(path: str) -> bool:
+        if type_regex is not None and not type_regex.fullmatch(path.rpartition("/")[2]):
+            return False
+        parts = path.split("/")
+        ancestors = ["/".join(parts[:i]) for i in range(1, len(parts))]
+        for glob in reversed(parsed):
+            if not glob.dirs_only and glob.matches(path):
+                return not glob.negated
+            if glob.negated and any(glob.matches(ancestor) for ancestor in ancestors):
+                return False
+        return not has_positive
+
+    return accept
+
+
+def list_files(root: Path, *, include_ignored: bool) -> list[str]:
+    """
+    Files under `root`, as `/`-separated paths relative to it.
+
+    Unless `include_ignored`, the ignore rules of `file_filter` apply: `.gitignore` and the
+    common build and dependency directories. Version control directories are always skipped.
+    """
+    if not include_ignored:
+        from kimi_cli.utils.file_filter import list_files_git, list_files_walk
+
+        paths = list_files_git(root)
+        if paths is None:
+            paths = list_files_walk(root, limit=sys.maxsize)
+        return [
+            path
+            for path in paths
+            if not path.endswith("/") and not any(part in VCS_DIRS for part in path.split("/"))
+        ]
+
+    files: list[str] = []
+    for current, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in VCS_DIRS)
+        relative = Path(current).relative_to(root).as_posix()
+        prefix = "" if relative == "." else relative + "/"
+        files.extend(prefix + name for name in sorted(names))
+    return files
+
+
+def search_file(path: str, options: SearchOptions) -> FileResult | None:
+    """Search one file, returning None if it has no match, is binary or cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                return None
+            with data:
+                if data.find(b"\0") != -1:
+                    return None
+                if _is_literal(options) and data.find(options.pattern.encode()) == -1:
+                    return None
+                text = str(data, "utf-8", "replace")
+    except OSError:
+        return None
+    return _search_text(text, options)
+
+
+def _is_literal(options: SearchOptions) -> bool:
+    pattern = options.pattern
+    return (
+        not options.ignore_case
+        and pattern.isascii()
+        and bool(pattern)
+        and not any(c in _REGEX_META for c in pattern)
+    )
+
+
+def _search_text(text: str, options: SearchOptions) -> FileResult | None:
+    regex = compile_pattern(options)
+    find = _multiline_matches if options.multiline else _line_matches
+    matched = find(regex, text)
+    if not matched:
+        return None
+    if options.mode != "content":
+        return sum(matched.values())
+
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    shown: set[int] = set()
+    for line in matched:
+        start = max(line - options.before_context, 0)
+        shown.update(range(start, min(line + options.after_context + 1, len(lines))))
+    result: list[ContentLine] = []
+    for line in sorted(shown):
+        result.append((line + 1, lines[line], line in matched))
+        if options.max_lines is not None and len(result) >= options.max_lines:
+            break
+    return result
+
+
+def _line_matches(regex: re.Pattern[str], text: str) -> dict[int, int]:
+    """Matches per 0-based line, for patterns that may not cross line ends."""
+    matched: dict[int, int] = {}
+    line = 0
+    pos = 0
+    for m in regex.finditer(text):
+        if "\n" in m.group():
+            # Matching line by line would not find this, and may find what it hid.
+            return _line_by_line_matches(regex, text)
+        line += text.count("\n", pos, m.start())
+        pos = m.start()
+        if m.start() == len(text) and text.endswith("\n"):
+            # An empty match after the final newline is not on a line
+            break
+        matched[line] = matched.get(line, 0) + 1
+    return matched
+
+
+def _line_by_line_matches(regex: re.Pattern[str], text: str) -> dict[int, int]:
+    matched: dict[int, int] = {}
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    for i, line in enumerate(lines):
+        count = sum(1 for _ in regex.finditer(line))
+        if count:
+            matched[i] = count
+    return matched
+
+
+def _multiline_matches(regex: re.Pattern[str], text: str) -> dict[int, int]:
+    """Matches keyed by each 0-based line they cover; a match counts on its first line only."""
+    matched: dict[int, int] = {}
+    for m in regex.finditer(text):
+        if m.start() == len(text) and (not text or text.endswith("\n")):
+            break
+        first = text.count("\n", 0, m.start())
+        # A match that ends with a newline does not cover the line after it.
+        last = text.count("\n", 0, max(m.end() - 1, m.start()))
+        matched[first] = matched.get(first, 0) + 1
+        for line in range(first + 1, last + 1):
+            matched.setdefault(line, 0)
+    return matched
+
+
+def _search_batch(paths: Sequence[str], options: SearchOptions) -> list[tuple[str, FileResult]]:
+    results: list[tuple[str, FileResult]] = []
+    for path in paths:
+        # Like ripgrep, do not follow symlinks found while walking.
+        if os.path.islink(path):
+            continue
+        result = search_file(path, options)
+        if result is not None:
+            results.append((path, result))
+    return results
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_disabled = False
+"""Set once worker processes failed, after which searches run in threads."""
+_pool_lock = threading.Lock()
+
+
+def _process_pool() -> Executor | None:
+    global _pool, _pool_disabled
+    with _pool_lock:
+        if _pool is None and not _pool_disabled:
+            try:
+                # Forking a process that runs threads can deadlock; start clean workers.
+                _pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError) as e:
+                logger.warning("Cannot start search worker processes: {error}", error=e)
+                _pool_disabled = True
+        return _pool
+
+
+def _disable_pool(pool: Executor) -> None:
+    global _pool, _pool_disabled
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+        _pool_disabled = True
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def search_files(
+    paths: Sequence[str], options: SearchOptions
+) -> AsyncGenerator[tuple[str, FileResult]]:
+    """
+    Search `paths` in batches, yielding `(path, result)` for files with matches in path order.
+
+    Large searches run in worker processes across all cores. Only a few batches are in flight
+    at a time, so closing the generator early stops the search soon. If the worker processes
+    break, the rest of the search and every later one run in threads instead.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _process_pool() if len(paths) >= _POOL_MIN_FILES else None
+    workers = getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+    batches = (paths[i : i + _BATCH_FILES] for i in range(0, len(paths), _BATCH_FILES))
+    pending: deque[tuple[Sequence[str], asyncio.Future[list[tuple[str, FileResult]]]]] = deque(
+        (batch, loop.run_in_executor(executor, _search_batch, batch, options))
+        for batch in itertools.islice(batches, 2 * workers)
+    )
+    try:
+        while pending:
+            try:
+                results = await pending[0][1]
+            except BrokenProcessPool as e:
+                if executor is None:
+                    raise
+                logger.warning("Search worker processes broke, using threads: {error}", error=e)
+                _disable_pool(executor)
+                executor = None
+                for _, future in pending:
+                    _discard_future(future)
+                pending = deque(
+                    (batch, loop.run_in_executor(None, _search_batch, batch, options))
+                    for batch, _ in pending
+                )
+                continue
+            pending.popleft()
+            if (batch := next(batches, None)) is not None:
+                pending.append(
+                    (batch, loop.run_in_executor(executor, _search_batch, batch, options))
+                )
+            for result in results:
+                yield result
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def _discard_future(future: asyncio.Future[Any]) -> None:
+    # Retrieve the error of a failed future so that it is not reported as unhandled.
+    if not future.cancel() and not future.cancelled():
+        future.exception()
@@ -0,0 +1,239 @@
+"""Offline token counting for context accounting and the UI.
+
+The counts here are estimates that get replaced by the provider-reported usage
+after every LLM call; they only need to be close enough to decide when to
+compact and what to show before the next call. A BPE tokenizer can be plugged
+in through the ``[tokenizer]`` config section, otherwise (or when it cannot be
+loaded) a CJK-aware character heuristic is used.
+"""
+
+from __future__ import annotations
+
+import importlib
+import math
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from kosong.message import Message, TextPart
+
+from kimi_cli.utils.logging import logger
+
+if TYPE_CHECKING:
+    from kimi_cli.config import TokenizerConfig
+
+
+class Tokenizer(Protocol):
+    @property
+    def name(self) -> str:
+        """A name that identifies the tokenizer and its vocabulary."""
+        ...
+
+    def count(self, text: str) -> int:
+        """Count the tokens of ``text``."""
+        ...
+
+
+def estimate_tokens_heuristic(text: str) -> float:
+    """Estimate token count for mixed CJK/Latin text.
+
+    Returns a **float** so that callers can accumulate across small chunks
+    without per-chunk floor truncation (e.g. a 3-char ASCII chunk would
+    yield 0 if truncated to int immediately, but 0.75 as float).
+
+    Heuristics based on common BPE tokenizers (cl100k, o200k):
+    - CJK ideographs: ~1.5 tokens per character (often split into 2-byte pieces)
+    - Latin / ASCII: ~1 token per 4 characters (words average ~4 chars)
+    """
+    cjk = 0
+    other = 0
+    for ch in text:
+        cp = ord(ch)
+        if (
+            0x4E00 <= cp <= 0x9FFF  # CJK Unified Ideographs
+            or 0x3400 <= cp <= 0x4DBF  # CJK Extension A
+            or 0xF900 <= cp <= 0xFAFF  # CJK Compatibility Ideographs
+            or 0x3000 <= cp <= 0x303F  # CJK Symbols and Punctuation
+            or 0xFF00 <= cp <= 0xFFEF  # Fullwidth Forms
+        ):
+            cjk += 1
+        else:
+            other += 1
+    return cjk * 1.5 + other / 4
+
+
+class HeuristicTokenizer:
+    """The fallback tokenizer, see `estimate_tokens_heuristic`."""
+
+    @property
+    def name(self) -> str:
+        return "heuristic"
+
+    def count(self, text: str) -> int:
+        return math.ceil(estimate_tokens_heuristic(text))
+
+
+class TiktokenTokenizer:
+    """
+    A BPE tokenizer backed by the optional ``tiktoken`` package.
+
+    The encoding is loaded by `load`, or on the first call to `count`. tiktoken
+    downloads the vocabulary on first use; ``cache_dir`` points it at a directory
+    with pre-downloaded vocabulary files instead (``TIKTOKEN_CACHE_DIR``). Loading
+    errors are raised from `load` and `count`.
+    """
+
+    def __init__(self, encoding: str, cache_dir: str | None = None) -> None:
+        self._encoding_name = encoding
+        self._cache_dir = cache_dir
+        self._encoding: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return f"tiktoken:{self._encoding_name}"
+
+    @property
+    def loaded(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        encoding = self._encoding or self.load()
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def load(self) -> Any:
+        with self._lock:
+            if self._encoding is not None:
+                return self._encoding
+            # optional dependency, not installed by default
+            tiktoken: Any = importlib.import_module("tiktoken")
+            if self._cache_dir is not None:
+                os.environ["TIKTOKEN_CACHE_DIR"] = str(Path(self._cache_dir).expanduser())
+            self._encoding = tiktoken.get_encoding(self._encoding_name)
+            logger.debug("Loaded tokenizer: {name}", name=self.name)
+            return self._encoding
+
+
+_HEURISTIC = HeuristicTokenizer()
+_tokenizer: Tokenizer = _HEURISTIC
+
+_MESSAGE_CACHE_SIZE = 4096
+# Keyed by `id()`; the weak reference tells whether the id still belongs to the same message.
+_message_counts: OrderedDict[int, tuple[weakref.ref[Message], str, int]] = OrderedDict()
+_message_counts_lock = threading.Lock()
+
+
+def configure_tokenizer(config: TokenizerConfig) -> None:
+    """
+    Select the tokenizer used by `count_tokens` and `count_message_tokens`.
+
+    A tiktoken encoding is loaded in a background thread, since it may have to be downloaded;
+    the heuristic is used until it is ready, and for good if it cannot be loaded.
+    """
+    match config.backend:
+        case "tiktoken":
+            tokenizer = TiktokenTokenizer(config.encoding, config.cache_dir)
+            set_tokenizer(tokenizer)
+            threading.Thread(
+                target=_preload, args=(tokenizer,), name="tokenizer-load", daemon=True
+            ).start()
+        case "heuristic":
+            set_tokenizer(_HEURISTIC)
+
+
+def _preload(tokenizer: TiktokenTokenizer) -> None:
+    try:
+        tokenizer.load()
+    except Exception as e:
+        if _tokenizer is tokenizer:
+            _fall_back(e)
+
+
+def set_tokenizer(tokenizer: Tokenizer) -> None:
+    global _tokenizer
+    _tokenizer = tokenizer
+
+
+def get_tokenizer() -> Tokenizer:
+    return _tokenizer
+
+
+def _active_tokenizer() -> Tokenizer:
+    """The configured tokenizer, or the heuristic while it is still being loaded."""
+    tokenizer = _tokenizer
+    if isinstance(tokenizer, TiktokenTokenizer) and not tokenizer.loaded:
+        return _HEURISTIC
+    return tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of ``text`` with the configured tokenizer.
+
+    Falls back to the heuristic for good if the configured tokenizer fails.
+    """
+    tokenizer = _active_tokenizer()
+    try:
+        return tokenizer.count(text)
+    except Exception as e:
+        _fall_back(e)
+        return _HEURISTIC.count(text)
+
+
+def estimate_tokens(text: str) -> float:
+    """Like `count_tokens`, but keeps the fraction of the heuristic for small chunks."""
+    if isinstance(_active_tokenizer(), HeuristicTokenizer):
+        return estimate_tokens_heuristic(text)
+    return count_tokens(text)
+
+
+def count_message_tokens(message: Message) -> int:
+    """
+    Count the tokens of the text in ``message``: text parts and tool calls.
+
+    Think parts and media are not counted. Counts are cached per message object,
+    so history messages must not be mutated once counted. The cache does not keep
+    messages alive.
+    """
+    tokenizer_name = _active_tokenizer().name
+    key = id(message)
+    with _message_counts_lock:
+        cached = _message_counts.get(key)
+        if cached is not None and cached[0]() is message and cached[1] == tokenizer_name:
+            _message_counts.move_to_end(key)
+            return cached[2]
+
+    count = 0
+    for part in message.content:
+        if isinstance(part, TextPart):
+            count += count_tokens(part.text)
+    for tool_call in message.tool_calls or []:
+        count += count_tokens(tool_call.function.name)
+        if tool_call.function.arguments:
+            count += count_tokens(tool_call.function.arguments)
+
+    with _message_counts_lock:
+        _message_counts[key] = (weakref.ref(message), tokenizer_name, count)
+        _message_counts.move_to_end(key)
+        while len(_message_counts) > _MESSAGE_CACHE_SIZE:
+            _message_counts.popitem(last=False)
+    return count
+
+
+def count_messages_tokens(messages: Sequence[Message]) -> int:
+    return sum(count_message_tokens(message) for message in messages)
+
+
+def _fall_back(error: Exception) -> None:
+    global _tokenizer
+    if isinstance(_tokenizer, HeuristicTokenizer):
+        return
+    logger.warning(
+        "Failed to use tokenizer {name}, falling back to the heuristic: {error}",
+        name=_tokenizer.name,
+        error=error,
+    )
+    _tokenizer = _HEURISTIC
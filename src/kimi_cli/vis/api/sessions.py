@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import io
 import json
@@ -9,8 +10,9 @@ import logging
 import re
 import shutil
 import zipfile
+from collections.abc import Iterable
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 from uuid import uuid4
 
 import aiofiles
@@ -18,30 +20,15 @@ from fastapi import APIRouter, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 
 from kimi_cli.metadata import load_metadata
+from kimi_cli.session_catalog import CatalogEntry, get_session_catalog
 from kimi_cli.share import get_share_dir
 from kimi_cli.wire.file import WireFileMetadata, parse_wire_file_line
+from kimi_cli.wire.scan import iter_events, scan_wire_file
 
 router = APIRouter(prefix="/api/vis", tags=["vis"])
 logger = logging.getLogger(__name__)
 
 
-def collect_events(
-    msg_type: str,
-    payload: dict[str, Any],
-    out: list[tuple[str, dict[str, Any]]],
-) -> None:
-    """Recursively unwrap SubagentEvent and collect (type, payload) pairs."""
-    if msg_type == "SubagentEvent":
-        inner: dict[str, Any] | None = payload.get("event")
-        if isinstance(inner, dict):
-            inner_type: str = inner.get("type", "")
-            inner_payload: dict[str, Any] = inner.get("payload", {})
-            if inner_type:
-                collect_events(inner_type, inner_payload, out)
-    else:
-        out.append((msg_type, payload))
-
-
 _SESSION_ID_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
 _IMPORTED_HASH = "__imported__"
 
@@ -90,41 +77,25 @@ def get_work_dir_for_hash(hash_dir_name: str) -> str | None:
 def _extract_title_from_wire(wire_path: Path, max_bytes: int = 8192) -> tuple[str, int]:
     """Extract title and turn count from the beginning of wire.jsonl.
 
-    Only reads up to *max_bytes* to avoid blocking on large files.
+    Only reads the lines that start within *max_bytes* to avoid blocking on large files.
     Returns (title, turn_count).
     """
     title = ""
     turn_count = 0
-    try:
-        with wire_path.open(encoding="utf-8") as f:
-            bytes_read = 0
-            for line in f:
-                bytes_read += len(line.encode("utf-8"))
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    parsed = parse_wire_file_line(line)
-                except Exception:
-                    continue
-                if isinstance(parsed, WireFileMetadata):
-                    continue
-                if parsed.message.type == "TurnBegin":
-                    turn_count += 1
-                    if turn_count == 1:
-                        user_input = parsed.message.payload.get("user_input", "")
-                        if isinstance(user_input, str):
-                            title = user_input[:100]
-                        elif isinstance(user_input, list) and user_input:
-                            first = user_input[0]
-                            if isinstance(first, dict):
-                                title = str(first.get("text", ""))[:100]
-                # Stop once we exceed the byte budget — title is extracted from
-                # the first TurnBegin so this is a hard upper bound on I/O.
-                if bytes_read > max_bytes:
-                    break
-    except Exception:
-        pass
+    for record in scan_wire_file(wire_path, types=("TurnBegin",), end=max_bytes + 1):
+        turn_count += 1
+        if turn_count > 1:
+            continue
+        try:
+            user_input = record.payload().get("user_input", "")
+        except ValueError:
+            continue
+        if isinstance(user_input, str):
+            title = user_input[:100]
+        elif isinstance(user_input, list) and user_input:
+            first = cast(list[Any], user_input)[0]
+            if isinstance(first, dict):
+                title = str(cast(dict[str, Any], first).get("text", ""))[:100]
     return title, turn_count
 
 
@@ -202,20 +173,41 @@ def _scan_session_dir(
     }
 
 
+def _catalog_session_info(entry: CatalogEntry) -> dict[str, Any]:
+    """Session info, as `_scan_session_dir` returns it, from the session catalog."""
+    wire_size = entry.wire_size or 0
+    context_size = entry.context_size or 0
+    state_size = entry.state_size or 0
+    return {
+        "session_id": entry.session_id,
+        "session_dir": str(entry.session_dir),
+        "work_dir": entry.work_dir,
+        "work_dir_hash": entry.work_dir_hash,
+        "title": entry.custom_title or entry.first_input[:100],
+        "last_updated": entry.last_modified,
+        "has_wire": entry.wire_size is not None,
+        "has_context": entry.context_size is not None,
+        "has_state": entry.state_size is not None,
+        "metadata": entry.state().model_dump(mode="json"),
+        "wire_size": wire_size,
+        "context_size": context_size,
+        "state_size": state_size,
+        "total_size": wire_size + context_size + state_size,
+        "turns": entry.turns,
+        "imported": False,
+        "subagent_count": entry.subagent_count,
+    }
+
+
 def _list_sessions_sync() -> list[dict[str, Any]]:
     """Synchronous session scanning — called from a thread pool."""
-    results: list[dict[str, Any]] = []
-
-    sessions_root = get_share_dir() / "sessions"
-    if sessions_root.exists():
-        for work_dir_hash_dir in sessions_root.iterdir():
-            if not work_dir_hash_dir.is_dir():
-                continue
-            work_dir = get_work_dir_for_hash(work_dir_hash_dir.name)
-            for session_dir in work_dir_hash_dir.iterdir():
-                info = _scan_session_dir(session_dir, work_dir_hash_dir.name, work_dir)
-                if info:
-                    results.append(info)
+    catalog = get_session_catalog()
+    catalog.sync()
+    results = [
+        _catalog_session_info(entry)
+        for entry in catalog.list_sessions(order_by="last_modified")
+        if not entry.is_legacy
+    ]
 
     imported_root = _get_imported_root()
     if imported_root.exists():
@@ -236,8 +228,6 @@ def _list_sessions_sync() -> list[dict[str, Any]]:
 @router.get("/sessions")
 async def list_sessions() -> list[dict[str, Any]]:
     """List all available sessions across all work directories."""
-    import asyncio
-
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(None, _list_sessions_sync)
 
@@ -362,63 +352,62 @@ async def get_session_summary(work_dir_hash: str, session_id: str) -> dict[str,
     if not wire_path.exists():
         return zeros
 
+    return {**zeros, **await asyncio.to_thread(_summarize_wire, wire_path)}
+
+
+# Records whose payload the summary reads; the others are only counted by type.
+_SUMMARY_PAYLOAD_TYPES = frozenset(
+    {"SubagentEvent", "ToolResult", "ApprovalResponse", "StatusUpdate"}
+)
+
+
+def _summarize_wire(wire_path: Path) -> dict[str, Any]:
     turns = steps = tool_calls = errors = compactions = 0
     input_tokens = output_tokens = 0
     first_ts = 0.0
     last_ts = 0.0
 
-    async with aiofiles.open(wire_path, encoding="utf-8") as f:
-        async for line in f:
-            line = line.strip()
-            if not line:
-                continue
+    for record in scan_wire_file(wire_path):
+        events: Iterable[tuple[str, dict[str, Any]]] = [(record.type, {})]
+        if record.type in _SUMMARY_PAYLOAD_TYPES:
             try:
-                parsed = parse_wire_file_line(line)
-            except Exception:
+                # Unwrap SubagentEvent recursively
+                events = iter_events(record.type, record.payload())
+            except ValueError:
                 logger.debug("Skipped malformed line in %s", wire_path)
                 continue
-            if isinstance(parsed, WireFileMetadata):
-                continue
 
-            ts = parsed.timestamp
-            msg_type = parsed.message.type
-            payload = parsed.message.payload
-
-            if first_ts == 0:
-                first_ts = ts
-            last_ts = ts
-
-            # Collect (type, payload) pairs, unwrapping SubagentEvent recursively
-            events_to_process: list[tuple[str, dict[str, Any]]] = []
-            collect_events(msg_type, payload, events_to_process)
-
-            for ev_type, ev_payload in events_to_process:
-                if ev_type == "TurnBegin":
-                    turns += 1
-                elif ev_type == "StepBegin":
-                    steps += 1
-                elif ev_type == "ToolCall":
-                    tool_calls += 1
-                elif ev_type == "CompactionBegin":
-                    compactions += 1
-                elif ev_type == "StepInterrupted":
+        if first_ts == 0:
+            first_ts = record.timestamp
+        last_ts = record.timestamp
+
+        for ev_type, ev_payload in events:
+            if ev_type == "TurnBegin":
+                turns += 1
+            elif ev_type == "StepBegin":
+                steps += 1
+            elif ev_type == "ToolCall":
+                tool_calls += 1
+            elif ev_type == "CompactionBegin":
+                compactions += 1
+            elif ev_type == "StepInterrupted":
+                errors += 1
+            elif ev_type == "ToolResult":
+                rv: dict[str, Any] | None = ev_payload.get("return_value")
+                if isinstance(rv, dict) and rv.get("is_error"):
+                    errors += 1
+            elif ev_type == "ApprovalResponse":
+                if ev_payload.get("response") == "reject":
                     errors += 1
-                elif ev_type == "ToolResult":
-                    rv: dict[str, Any] | None = ev_payload.get("return_value")
-                    if isinstance(rv, dict) and rv.get("is_error"):
-                        errors += 1
-                elif ev_type == "ApprovalResponse":
-                    if ev_payload.get("response") == "reject":
-                        errors += 1
-                elif ev_type == "StatusUpdate":
-                    tu: dict[str, Any] | None = ev_payload.get("token_usage")
-                    if isinstance(tu, dict):
-                        input_tokens += (
-                            int(tu.get("input_other", 0))
-                            + int(tu.get("input_cache_read", 0))
-                            + int(tu.get("input_cache_creation", 0))
-                        )
-                        output_tokens += int(tu.get("output", 0))
+            elif ev_type == "StatusUpdate":
+                tu: dict[str, Any] | None = ev_payload.get("token_usage")
+                if isinstance(tu, dict):
+                    input_tokens += (
+                        int(tu.get("input_other", 0))
+                        + int(tu.get("input_cache_read", 0))
+                        + int(tu.get("input_cache_creation", 0))
+                    )
+                    output_tokens += int(tu.get("output", 0))
 
     return {
         "turns": turns,
@@ -429,10 +418,6 @@ async def get_session_summary(work_dir_hash: str, session_id: str) -> dict[str,
         "duration_sec": last_ts - first_ts if last_ts > first_ts else 0,
         "input_tokens": input_tokens,
         "output_tokens": output_tokens,
-        "wire_size": wire_size,
-        "context_size": context_size,
-        "state_size": state_size,
-        "total_size": wire_size + context_size + state_size,
     }
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 import time
 from collections import defaultdict
 from datetime import UTC, datetime, timedelta
@@ -9,41 +10,40 @@ from typing import Any
 
 from fastapi import APIRouter
 
-from kimi_cli.share import get_share_dir
-from kimi_cli.vis.api.sessions import collect_events, get_work_dir_for_hash
-from kimi_cli.wire.file import WireFileMetadata, parse_wire_file_line
+from kimi_cli.session_catalog import SessionCatalog, get_session_catalog
 
 router = APIRouter(prefix="/api/vis", tags=["vis"])
 
 
-# Simple in-memory cache: (result, timestamp)
-_cache: dict[str, tuple[dict[str, Any], float]] = {}
-_CACHE_TTL = 60  # seconds
+# The usage of each session is kept in the session catalog, and updated from what was appended
+# to its wire file since. Once the catalog has been synced, requests are served from it while it
+# is synced again in the background if it is older than this.
+_SYNC_INTERVAL = 60  # seconds
+_background_sync: threading.Thread | None = None
+_background_sync_lock = threading.Lock()
+
+
+def _sync_in_background(catalog: SessionCatalog) -> None:
+    global _background_sync
+    with _background_sync_lock:
+        if _background_sync is not None and _background_sync.is_alive():
+            return
+        _background_sync = threading.Thread(
+            target=catalog.sync, name="vis-statistics-sync", daemon=True
+        )
+        _background_sync.start()
 
 
 @router.get("/statistics")
 def get_statistics() -> dict[str, Any]:
     """Aggregate statistics across all sessions."""
-    now = time.time()
-    cached = _cache.get("statistics")
-    if cached and (now - cached[1]) < _CACHE_TTL:
-        return cached[0]
-
-    sessions_root = get_share_dir() / "sessions"
-    if not sessions_root.exists():
-        empty: dict[str, Any] = {
-            "total_sessions": 0,
-            "total_turns": 0,
-            "total_tokens": {"input": 0, "output": 0},
-            "total_duration_sec": 0,
-            "tool_usage": [],
-            "daily_usage": [],
-            "per_project": [],
-        }
-        _cache["statistics"] = (empty, now)
-        return empty
-
-    total_sessions = 0
+    catalog = get_session_catalog()
+    if catalog.synced_at is None:
+        catalog.sync()
+    elif time.time() - catalog.synced_at >= _SYNC_INTERVAL:
+        _sync_in_background(catalog)
+    sessions = catalog.session_stats()
+
     total_turns = 0
     total_input_tokens = 0
     total_output_tokens = 0
@@ -58,107 +58,31 @@ def get_statistics() -> dict[str, Any]:
     # work_dir -> { sessions, turns }
     project_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"sessions": 0, "turns": 0})
 
-    for work_dir_hash_dir in sessions_root.iterdir():
-        if not work_dir_hash_dir.is_dir():
-            continue
-        work_dir = get_work_dir_for_hash(work_dir_hash_dir.name) or work_dir_hash_dir.name
-
-        for session_dir in work_dir_hash_dir.iterdir():
-            if not session_dir.is_dir():
-                continue
-
-            wire_path = session_dir / "wire.jsonl"
-            if not wire_path.exists():
-                continue
-
-            total_sessions += 1
-            session_turns = 0
-            session_input_tokens = 0
-            session_output_tokens = 0
-            first_ts = 0.0
-            last_ts = 0.0
-            session_date: str | None = None
-
-            # Track pending tool calls for error attribution
-            pending_tools: dict[str, str] = {}  # tool_call_id -> tool_name
-
-            try:
-                with wire_path.open(encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            parsed = parse_wire_file_line(line)
-                        except Exception:
-                            continue
-                        if isinstance(parsed, WireFileMetadata):
-                            continue
-
-                        ts = parsed.timestamp
-                        msg_type = parsed.message.type
-                        payload = parsed.message.payload
-
-                        if first_ts == 0:
-                            first_ts = ts
-                            # Determine date from first timestamp
-                            try:
-                                dt = datetime.fromtimestamp(ts, tz=UTC)
-                                session_date = dt.strftime("%Y-%m-%d")
-                            except Exception:
-                                pass
-                        last_ts = ts
-
-                        # Collect (type, payload) pairs, unwrapping SubagentEvent recursively
-                        events_to_process: list[tuple[str, dict[str, Any]]] = []
-                        collect_events(msg_type, payload, events_to_process)
-
-                        for ev_type, ev_payload in events_to_process:
-                            if ev_type == "TurnBegin":
-                                session_turns += 1
-                            elif ev_type == "ToolCall":
-                                fn: dict[str, Any] | None = ev_payload.get("function")
-                                tool_id: str = ev_payload.get("id", "")
-                                if isinstance(fn, dict):
-                                    name: str = fn.get("name", "unknown")
-                                    tool_stats[name]["count"] += 1
-                                    if tool_id:
-                                        pending_tools[tool_id] = name
-                            elif ev_type == "ToolResult":
-                                tool_call_id: str = ev_payload.get("tool_call_id", "")
-                                rv: dict[str, Any] | None = ev_payload.get("return_value")
-                                if isinstance(rv, dict) and rv.get("is_error"):
-                                    tool_name = pending_tools.get(tool_call_id)
-                                    if tool_name:
-                                        tool_stats[tool_name]["error_count"] += 1
-                                pending_tools.pop(tool_call_id, None)
-                            elif ev_type == "StatusUpdate":
-                                tu: dict[str, Any] | None = ev_payload.get("token_usage")
-                                if isinstance(tu, dict):
-                                    session_input_tokens += (
-                                        int(tu.get("input_other", 0))
-                                        + int(tu.get("input_cache_read", 0))
-                                        + int(tu.get("input_cache_creation", 0))
-                                    )
-                                    session_output_tokens += int(tu.get("output", 0))
-            except Exception:
-                continue
-
-            total_turns += session_turns
-            total_input_tokens += session_input_tokens
-            total_output_tokens += session_output_tokens
-
-            duration = last_ts - first_ts if last_ts > first_ts else 0
-            total_duration_sec += duration
-
-            # Aggregate daily
-            if session_date:
-                daily_stats[session_date]["sessions"] += 1
-                daily_stats[session_date]["turns"] += session_turns
-
-            # Aggregate per project
-            project_stats[work_dir]["sessions"] += 1
-            project_stats[work_dir]["turns"] += session_turns
+    for session in sessions:
+        total_turns += session.turns
+        total_input_tokens += session.input_tokens
+        total_output_tokens += session.output_tokens
+
+        first_ts = session.first_timestamp or 0.0
+        last_ts = session.last_timestamp or 0.0
+        total_duration_sec += last_ts - first_ts if last_ts > first_ts else 0
+
+        for name, (count, error_count) in session.tool_usage.items():
+            tool_stats[name]["count"] += count
+            tool_stats[name]["error_count"] += error_count
+
+        # Aggregate daily, by the date of the first record
+        if session.first_timestamp is not None:
+            session_date = datetime.fromtimestamp(session.first_timestamp, tz=UTC).strftime(
+                "%Y-%m-%d"
+            )
+            daily_stats[session_date]["sessions"] += 1
+            daily_stats[session_date]["turns"] += session.turns
+
+        # Aggregate per project
+        work_dir = session.work_dir or session.work_dir_hash
+        project_stats[work_dir]["sessions"] += 1
+        project_stats[work_dir]["turns"] += session.turns
 
     # Build tool_usage: top 20 by count
     tool_usage = sorted(
@@ -195,8 +119,8 @@ def get_statistics() -> dict[str, Any]:
         reverse=True,
     )[:10]
 
-    result: dict[str, Any] = {
-        "total_sessions": total_sessions,
+    return {
+        "total_sessions": len(sessions),
         "total_turns": total_turns,
         "total_tokens": {"input": total_input_tokens, "output": total_output_tokens},
         "total_duration_sec": total_duration_sec,
@@ -204,6 +128,3 @@ def get_statistics() -> dict[str, Any]:
         "daily_usage": daily_usage,
         "per_project": per_project,
     }
-
-    _cache["statistics"] = (result, now)
-    return result
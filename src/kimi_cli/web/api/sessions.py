@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import itertools
 import json
 import mimetypes
 import os
 import shutil
 import time
+from collections.abc import Generator
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, cast
@@ -17,12 +20,14 @@ from uuid import UUID, uuid4
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, status
 from fastapi.responses import FileResponse, Response
 from kaos.path import KaosPath
+from kosong.message import MergeableMixin
 from pydantic import BaseModel, Field
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from kimi_cli import logger
 from kimi_cli.metadata import load_metadata, save_metadata
 from kimi_cli.session import Session as KimiCLISession
+from kimi_cli.utils.file_index import shared_file_index
 from kimi_cli.utils.subprocess_env import get_clean_env
 from kimi_cli.web.auth import is_origin_allowed, is_private_ip, verify_token
 from kimi_cli.web.models import (
@@ -34,7 +39,11 @@ from kimi_cli.web.models import (
     SessionStatus,
     UpdateSessionRequest,
 )
-from kimi_cli.web.runner.messages import new_session_status_message, send_history_complete
+from kimi_cli.web.runner.messages import (
+    DeltaRun,
+    new_session_status_message,
+    send_history_complete,
+)
 from kimi_cli.web.runner.process import KimiCLIRunner
 from kimi_cli.web.store.sessions import (
     JointSession,
@@ -50,8 +59,14 @@ from kimi_cli.wire.jsonrpc import (
     JSONRPCInMessageAdapter,
     JSONRPCPromptMessage,
 )
+from kimi_cli.wire.scan import scan_wire_file
 from kimi_cli.wire.serde import deserialize_wire_message
-from kimi_cli.wire.types import is_request
+from kimi_cli.wire.types import (
+    TurnBegin,
+    is_request,
+    is_request_type,
+    wire_message_type,
+)
 
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
 work_dirs_router = APIRouter(prefix="/api/work-dirs", tags=["work-dirs"])
@@ -190,9 +205,24 @@ def _ensure_public_file_access_allowed(
         )
 
 
-def _read_wire_lines(wire_file: Path) -> list[str]:
-    """Read and parse wire.jsonl into JSONRPC event strings (runs in thread)."""
-    result: list[str] = []
+REPLAY_BATCH_MAX_MESSAGES = 500
+REPLAY_BATCH_MAX_CHARS = 1 << 20
+REPLAY_READ_AHEAD = 500
+"""Messages (or batch frames) read from disk per thread hop while replaying."""
+
+
+def _iter_wire_events(
+    wire_file: Path, *, compact: bool = False, from_turn: int = 0, to_turn: int | None = None
+) -> Generator[str]:
+    """Yield the records of wire.jsonl as JSONRPC message strings, reading line by line.
+
+    With *compact*, runs of mergeable messages (content and tool call deltas) are merged into
+    whole parts first. Only turns *from_turn* up to, not including, *to_turn* are replayed,
+    counting the ``TurnBegin`` records from 0; records before the first turn belong to turn 0.
+    """
+    turn = 0
+    turns_begun = 0
+    pending: DeltaRun | None = None
     with open(wire_file, encoding="utf-8") as f:
         for line in f:
             line = line.strip()
@@ -200,49 +230,134 @@ def _read_wire_lines(wire_file: Path) -> list[str]:
                 continue
             try:
                 record = json.loads(line)
-                if not isinstance(record, dict):
-                    continue
-                record = cast(dict[str, Any], record)
-                record_type = record.get("type")
-                if isinstance(record_type, str) and record_type == "metadata":
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            message_raw = cast(dict[str, Any], record).get("message")
+            if not isinstance(message_raw, dict):
+                # Includes the metadata header
+                continue
+            message_raw = cast(dict[str, Any], message_raw)
+            type_name = message_raw.get("type")
+            msg_type = wire_message_type(type_name) if isinstance(type_name, str) else None
+            if msg_type is None:
+                continue
+
+            if msg_type is TurnBegin:
+                turn = turns_begun
+                turns_begun += 1
+            if turn < from_turn:
+                continue
+            if to_turn is not None and turn >= to_turn:
+                break
+
+            if compact and issubclass(msg_type, MergeableMixin):
+                try:
+                    message = cast(MergeableMixin, deserialize_wire_message(message_raw))
+                except ValueError:
                     continue
-                message_raw = record.get("message")
-                if not isinstance(message_raw, dict):
+                if pending is not None and pending.merge(message):
                     continue
-                message_raw = cast(dict[str, Any], message_raw)
-                message = deserialize_wire_message(message_raw)
-                _is_req = is_request(message)
-                event_msg: dict[str, Any] = {
-                    "jsonrpc": "2.0",
-                    "method": "request" if _is_req else "event",
-                    "params": message_raw,
-                }
-                if _is_req:
-                    # JSON-RPC requests require a top-level ``id`` so the
-                    # client can correlate its response.  Use the request's
-                    # own ``id`` field (e.g. ApprovalRequest.id,
-                    # QuestionRequest.id).  Note: ``message_raw`` wraps data
-                    # as ``{"type": ..., "payload": {...}}`` so the id lives
-                    # on the deserialized object, not at the raw dict top level.
-                    event_msg["id"] = message.id
-                result.append(json.dumps(event_msg, ensure_ascii=False))
-            except (json.JSONDecodeError, KeyError, ValueError, TypeError):
+                if pending is not None:
+                    yield pending.text
+                pending = DeltaRun(message)
                 continue
-    return result
+
+            if pending is not None:
+                yield pending.text
+                pending = None
+            if (text := _jsonrpc_text(msg_type, message_raw)) is not None:
+                yield text
+    if pending is not None:
+        yield pending.text
 
 
-async def replay_history(ws: WebSocket, session_dir: Path) -> None:
-    """Replay historical wire messages from wire.jsonl to a WebSocket."""
+def _jsonrpc_text(msg_type: type, message_raw: dict[str, Any]) -> str | None:
+    if not is_request_type(msg_type):
+        event_msg: dict[str, Any] = {"jsonrpc": "2.0", "method": "event", "params": message_raw}
+        return json.dumps(event_msg, ensure_ascii=False)
+    try:
+        message = deserialize_wire_message(message_raw)
+    except ValueError:
+        return None
+    assert is_request(message)
+    # JSON-RPC requests require a top-level ``id`` so the client can correlate its response.
+    # Use the request's own ``id`` field (e.g. ApprovalRequest.id, QuestionRequest.id).
+    # Note: ``message_raw`` wraps data as ``{"type": ..., "payload": {...}}`` so the id lives
+    # on the deserialized object, not at the raw dict top level.
+    request_msg: dict[str, Any] = {
+        "jsonrpc": "2.0",
+        "method": "request",
+        "params": message_raw,
+        "id": message.id,
+    }
+    return json.dumps(request_msg, ensure_ascii=False)
+
+
+def _iter_replay_frames(
+    wire_file: Path, *, compact: bool, from_turn: int = 0, to_turn: int | None = None
+) -> Generator[str]:
+    """WebSocket frames replaying wire.jsonl: one per message, or JSON arrays of messages."""
+    events = _iter_wire_events(wire_file, compact=compact, from_turn=from_turn, to_turn=to_turn)
+    if not compact:
+        yield from events
+        return
+    batch: list[str] = []
+    size = 0
+    for event in events:
+        batch.append(event)
+        size += len(event)
+        if len(batch) >= REPLAY_BATCH_MAX_MESSAGES or size >= REPLAY_BATCH_MAX_CHARS:
+            yield "[" + ",".join(batch) + "]"
+            batch = []
+            size = 0
+    if batch:
+        yield "[" + ",".join(batch) + "]"
+
+
+async def replay_history(
+    ws: WebSocket, session_dir: Path, *, compact: bool = False, from_turn: int = 0
+) -> None:
+    """Replay historical wire messages from wire.jsonl to a WebSocket.
+
+    In *compact* mode, deltas are merged into whole parts and messages are sent in batches,
+    as JSON arrays, starting from turn *from_turn*.
+    """
     wire_file = session_dir / "wire.jsonl"
     if not await asyncio.to_thread(wire_file.exists):
         return
 
+    frames = _iter_replay_frames(wire_file, compact=compact, from_turn=from_turn)
+    read_ahead = max(REPLAY_READ_AHEAD // REPLAY_BATCH_MAX_MESSAGES, 1) if compact else None
+    read: asyncio.Task[list[str]] | None = None
     try:
-        lines = await asyncio.to_thread(_read_wire_lines, wire_file)
-        for event_text in lines:
-            await ws.send_text(event_text)
+        while True:
+            read = asyncio.create_task(
+                asyncio.to_thread(
+                    lambda: list(itertools.islice(frames, read_ahead or REPLAY_READ_AHEAD))
+                )
+            )
+            # Shielded, so that a cancelled replay does not abandon the thread reading `frames`
+            if not (chunk := await asyncio.shield(read)):
+                break
+            for frame in chunk:
+                await ws.send_text(frame)
     except Exception:
         pass
+    finally:
+        # `frames` cannot be closed while the thread is still advancing it.
+        if read is not None and not read.done():
+            with contextlib.suppress(Exception):
+                await asyncio.shield(read)
+        frames.close()
+
+
+def _query_int(value: str | None) -> int:
+    try:
+        return max(int(value), 0) if value is not None else 0
+    except ValueError:
+        return 0
 
 
 @router.get("/", summary="List all sessions")
@@ -273,11 +388,14 @@ async def list_sessions(
     # Run auto-archive in background (throttled internally, runs at most once per 5 minutes)
     await asyncio.to_thread(run_auto_archive)
 
-    sessions = load_sessions_page(limit=limit, offset=offset, query=q, archived=archived)
+    sessions = await asyncio.to_thread(
+        load_sessions_page, limit=limit, offset=offset, query=q, archived=archived
+    )
     for session in sessions:
         session_process = runner.get_session(session.session_id)
         session.is_running = session_process is not None and session_process.is_running
         session.status = session_process.status if session_process else None
+        session.send_queue = session_process.send_queue_stats if session_process else None
     return cast(list[Session], sessions)
 
 
@@ -287,11 +405,12 @@ async def get_session(
     runner: KimiCLIRunner = Depends(get_runner),
 ) -> Session | None:
     """Get a session by ID."""
-    session = load_session_by_id(session_id)
+    session = await asyncio.to_thread(load_session_by_id, session_id)
     if session is not None:
         session_process = runner.get_session(session_id)
         session.is_running = session_process is not None and session_process.is_running
         session.status = session_process.status if session_process else None
+        session.send_queue = session_process.send_queue_stats if session_process else None
     return session
 
 
@@ -421,7 +540,7 @@ async def get_session_upload_file(
     path: str,
 ) -> Response:
     """Get a file from a session's uploads directory."""
-    session = load_session_by_id(session_id)
+    session = await asyncio.to_thread(load_session_by_id, session_id)
     if session is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -469,7 +588,7 @@ async def get_session_file(
     request: Request,
 ) -> Response:
     """Get a file or list directory from session work directory."""
-    session = load_session_by_id(session_id)
+    session = await asyncio.to_thread(load_session_by_id, session_id)
     if session is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -519,20 +638,17 @@ async def get_session_file(
         )
 
     if file_path.is_dir():
+        listing = shared_file_index(work_dir).listdir(file_path.relative_to(work_dir).as_posix())
         result: list[dict[str, str | int]] = []
-        for subpath in file_path.iterdir():
+        for entry in listing or ():
             if restrict_sensitive_apis:
-                rel_subpath = rel_path / subpath.name
+                rel_subpath = rel_path / entry.name
                 if _is_sensitive_relative_path(rel_subpath):
                     continue
-            if subpath.is_dir():
-                result.append({"name": subpath.name, "type": "directory"})
+            if entry.is_dir:
+                result.append({"name": entry.name, "type": "directory"})
             else:
-                try:
-                    size = subpath.stat().st_size
-                except OSError:
-                    size = 0
-                result.append({"name": subpath.name, "type": "file", "size": size})
+                result.append({"name": entry.name, "type": "file", "size": entry.size})
         result.sort(key=lambda x: (cast(str, x["type"]), cast(str, x["name"])))
         return Response(content=json.dumps(result), media_type="application/json")
 
@@ -616,7 +732,7 @@ async def update_session(
     invalidate_sessions_cache()
 
     # Return updated session
-    updated_session = load_session_by_id(session_id)
+    updated_session = await asyncio.to_thread(load_session_by_id, session_id)
     if updated_session is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -625,55 +741,45 @@ async def update_session(
     return updated_session
 
 
+_FIRST_TURN_TYPES = frozenset({"TurnBegin", "ContentPart", "TurnEnd"})
+
+
 def extract_first_turn_from_wire(session_dir: Path) -> tuple[str, str] | None:
     """Extract the first turn's user message and assistant response from wire.jsonl.
 
     Returns:
         tuple[str, str] | None: (user_message, assistant_response) or None if not found
     """
-    wire_file = session_dir / "wire.jsonl"
-    if not wire_file.exists():
-        return None
-
     user_message: str | None = None
     assistant_response_parts: list[str] = []
     in_first_turn = False
 
-    try:
-        with open(wire_file, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    record = json.loads(line)
-                    message = record.get("message", {})
-                    msg_type = message.get("type")
-
-                    if msg_type == "TurnBegin":
-                        if in_first_turn:
-                            # Second turn started, stop
-                            break
-                        in_first_turn = True
-                        user_input = message.get("payload", {}).get("user_input")
-                        if user_input:
-                            from kosong.message import Message
-
-                            msg = Message(role="user", content=user_input)
-                            user_message = msg.extract_text(" ")
-
-                    elif msg_type == "ContentPart" and in_first_turn:
-                        payload = message.get("payload", {})
-                        if payload.get("type") == "text" and payload.get("text"):
-                            assistant_response_parts.append(payload["text"])
-
-                    elif msg_type == "TurnEnd" and in_first_turn:
-                        break
-
-                except json.JSONDecodeError:
-                    continue
-    except OSError:
-        return None
+    for record in scan_wire_file(session_dir / "wire.jsonl", types=_FIRST_TURN_TYPES):
+        if record.type == "TurnBegin":
+            if in_first_turn:
+                # Second turn started, stop
+                break
+            try:
+                user_input = record.payload().get("user_input")
+            except ValueError:
+                continue
+            in_first_turn = True
+            if user_input:
+                from kosong.message import Message
+
+                msg = Message(role="user", content=user_input)
+                user_message = msg.extract_text(" ")
+
+        elif record.type == "ContentPart" and in_first_turn:
+            try:
+                payload = record.payload()
+            except ValueError:
+                continue
+            if payload.get("type") == "text" and payload.get("text"):
+                assistant_response_parts.append(payload["text"])
+
+        elif record.type == "TurnEnd" and in_first_turn:
+            break
 
     if user_message and assistant_response_parts:
         return (user_message, "".join(assistant_response_parts))
@@ -941,9 +1047,15 @@ async def session_stream(
             await session_process.add_websocket_and_begin_replay(websocket)
             attached = True
 
-            # Replay history
+            # Replay history; `replay=compact` asks for merged deltas in batches, and
+            # `from_turn` leaves earlier turns to be loaded from `/history` on demand.
             try:
-                await replay_history(websocket, session_dir)
+                await replay_history(
+                    websocket,
+                    session_dir,
+                    compact=websocket.query_params.get("replay") == "compact",
+                    from_turn=_query_int(websocket.query_params.get("from_turn")),
+                )
             except Exception as e:
                 logger.warning(f"Failed to replay history: {e}")
 
@@ -1106,10 +1218,40 @@ async def get_startup_dir(request: Request) -> str:
     return request.app.state.startup_dir
 
 
+@router.get("/{session_id}/history", summary="Get compacted session history")
+async def get_session_history(
+    session_id: UUID,
+    from_turn: int = 0,
+    to_turn: int | None = None,
+) -> Response:
+    """Get turns *from_turn* up to *to_turn* of the history as one JSON array of messages.
+
+    The messages are those a compact WebSocket replay sends, so a client that connected with
+    ``from_turn`` can load the turns before it lazily.
+    """
+    session = await asyncio.to_thread(load_session_by_id, session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+    wire_file = session.kimi_cli_session.dir / "wire.jsonl"
+
+    def _read() -> str:
+        if not wire_file.exists():
+            return "[]"
+        events = _iter_wire_events(
+            wire_file, compact=True, from_turn=max(from_turn, 0), to_turn=to_turn
+        )
+        return "[" + ",".join(events) + "]"
+
+    return Response(content=await asyncio.to_thread(_read), media_type="application/json")
+
+
 @router.get("/{session_id}/git-diff", summary="Get git diff stats")
 async def get_session_git_diff(session_id: UUID) -> GitDiffStats:
     """get git diff stats for the session's work directory"""
-    session = load_session_by_id(session_id)
+    session = await asyncio.to_thread(load_session_by_id, session_id)
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -23,6 +23,17 @@ class SessionStatus(BaseModel):
     updated_at: datetime = Field(..., description="Timestamp for this state")
 
 
+class SendQueueStats(BaseModel):
+    """Send queues of the WebSockets attached to a running web session."""
+
+    websockets: int = Field(..., description="Number of WebSockets with a send queue")
+    depth: int = Field(..., description="Messages queued across all WebSockets")
+    max_depth: int = Field(..., description="Messages in the deepest queue")
+    peak_depth: int = Field(..., description="Deepest any queue has been")
+    coalesced: int = Field(..., description="Queued deltas merged into the one queued before them")
+    resyncs: int = Field(..., description="Clients closed to resync because they fell behind")
+
+
 class SessionNoticePayload(BaseModel):
     """Payload for session notice events."""
 
@@ -69,6 +80,9 @@ class Session(BaseModel):
     last_updated: datetime = Field(..., description="Last updated timestamp")
     is_running: bool = Field(default=False, description="Whether the session is running")
     status: SessionStatus | None = Field(default=None, description="Session runtime status")
+    send_queue: SendQueueStats | None = Field(
+        default=None, description="WebSocket send queues of the running session"
+    )
     work_dir: str | None = Field(default=None, description="Working directory for the session")
     session_dir: str | None = Field(default=None, description="Session directory path")
     archived: bool = Field(default=False, description="Whether the session is archived")
@@ -1,13 +1,17 @@
 """JSON-RPC message helpers for Kimi CLI web interface."""
 
-from typing import Literal
+import json
+from typing import Literal, cast
 from uuid import uuid4
 
 from fastapi import WebSocket
+from kosong.message import MergeableMixin
 from pydantic import BaseModel, ConfigDict
 from starlette.websockets import WebSocketState
 
 from kimi_cli.web.models import SessionStatus
+from kimi_cli.wire.serde import serialize_wire_message
+from kimi_cli.wire.types import WireMessage
 
 
 class _MessageBase(BaseModel):
@@ -55,3 +59,38 @@ async def send_history_complete(ws: WebSocket) -> bool:
         return True
     except Exception:
         return False
+
+
+def event_text(message: WireMessage) -> str:
+    """Serialize a wire message as a JSON-RPC ``event`` message."""
+    params = serialize_wire_message(message)
+    return json.dumps({"jsonrpc": "2.0", "method": "event", "params": params}, ensure_ascii=False)
+
+
+class DeltaRun:
+    """A run of streamed deltas (content and tool call parts) merged into one whole part."""
+
+    __slots__ = ("_part", "_text")
+
+    def __init__(self, delta: MergeableMixin, text: str | None = None) -> None:
+        """
+        Args:
+            delta: The first delta of the run, merged into in place.
+            text: The JSON-RPC event `delta` was parsed from, if any.
+        """
+        self._part = delta
+        self._text = text
+
+    def merge(self, delta: MergeableMixin) -> bool:
+        """Merge `delta` into the run; False if it starts a new run instead."""
+        if not self._part.merge_in_place(delta):
+            return False
+        self._text = None
+        return True
+
+    @property
+    def text(self) -> str:
+        """The JSON-RPC event of the merged part, serialized once it is asked for."""
+        if self._text is None:
+            self._text = event_text(cast(WireMessage, self._part))
+        return self._text
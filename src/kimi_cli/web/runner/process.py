@@ -20,19 +20,21 @@ from kosong.message import ContentPart, ImageURLPart, TextPart
 from PIL import Image
 from PIL.Image import Image as PILImage
 from pydantic import TypeAdapter
-from starlette.websockets import WebSocket, WebSocketState
+from starlette.websockets import WebSocket
 
 from kimi_cli import logger
 from kimi_cli.config import load_config
 from kimi_cli.llm import ModelCapability
 from kimi_cli.utils.subprocess_env import get_clean_env
 from kimi_cli.web.models import (
+    SendQueueStats,
     SessionNoticeEvent,
     SessionNoticePayload,
     SessionState,
     SessionStatus,
 )
 from kimi_cli.web.runner.messages import new_session_status_message
+from kimi_cli.web.runner.sender import SendQueueMetrics, WebSocketSender
 from kimi_cli.web.store.sessions import load_session_by_id
 from kimi_cli.wire.jsonrpc import (
     JSONRPCCancelMessage,
@@ -69,6 +71,8 @@ class SessionProcess:
     - WebSocket fanout supports "join while running":
       - New clients replay `wire.jsonl` history first.
       - Live messages during replay are buffered per-WS and flushed afterwards.
+    - Each WebSocket is sent to by its own `WebSocketSender` from a bounded queue, so a slow
+      client neither stalls the read loop nor the other clients.
 
     Locks:
     - `_lock` guards worker lifecycle and busy state.
@@ -91,9 +95,9 @@ class SessionProcess:
             updated_at=datetime.now(UTC),
         )
         self._process: asyncio.subprocess.Process | None = None
-        self._websockets: set[WebSocket] = set()
+        self._senders: dict[WebSocket, WebSocketSender] = {}
         self._websocket_count = 0
-        self._replay_buffers: dict[WebSocket, list[str]] = {}
+        self._send_metrics = SendQueueMetrics()
         self._read_task: asyncio.Task[None] | None = None
         self._expecting_exit = False
         self._lock = asyncio.Lock()
@@ -130,9 +134,29 @@ class SessionProcess:
         """Get the number of connected WebSockets."""
         return self._websocket_count
 
+    @property
+    def send_queue_stats(self) -> SendQueueStats:
+        """Depths of the WebSocket send queues and how the slow-consumer policy applied."""
+        depths = [sender.depth for sender in self._senders.values()]
+        metrics = self._send_metrics
+        return SendQueueStats(
+            websockets=len(depths),
+            depth=sum(depths),
+            max_depth=max(depths, default=0),
+            peak_depth=metrics.peak_depth,
+            coalesced=metrics.coalesced,
+            resyncs=metrics.resyncs,
+        )
+
     async def send_status_snapshot(self, ws: WebSocket) -> None:
         """Send the current status snapshot to a specific WebSocket."""
-        await ws.send_text(new_session_status_message(self._status).model_dump_json())
+        message = new_session_status_message(self._status).model_dump_json()
+        sender = self._senders.get(ws)
+        if sender is None:
+            await ws.send_text(message)
+        else:
+            # After the messages already queued for it
+            sender.put(message)
 
     def _build_status(
         self,
@@ -385,7 +409,7 @@ class SessionProcess:
 
     async def _encode_uploaded_files(self) -> AsyncGenerator[ContentPart]:
         """Encode uploaded files for sending to the model."""
-        session = load_session_by_id(self.session_id)
+        session = await asyncio.to_thread(load_session_by_id, self.session_id)
         assert session is not None
 
         uploads_dir = session.kimi_cli_session.dir / "uploads"
@@ -533,35 +557,14 @@ class SessionProcess:
         return None
 
     async def _broadcast(self, message: str) -> None:
-        """Broadcast a message to all connected WebSockets."""
-        disconnected: set[WebSocket] = set()
-
+        """Queue a message for all connected WebSockets."""
         async with self._ws_lock:
-            websockets = list(self._websockets)
-            to_send: list[WebSocket] = []
-            for ws in websockets:
-                buffer = self._replay_buffers.get(ws)
-                if buffer is not None:
-                    buffer.append(message)
-                else:
-                    to_send.append(ws)
-
-        for ws in to_send:
-            try:
-                if ws.client_state == WebSocketState.CONNECTED:
-                    await ws.send_text(message)
-                else:
-                    disconnected.add(ws)
-            except Exception as e:
-                logger.warning(f"websocket failed: {e.__class__.__name__} {e}")
-                disconnected.add(ws)
+            disconnected = [ws for ws, sender in self._senders.items() if not sender.put(message)]
+            for ws in disconnected:
+                del self._senders[ws]
+            self._websocket_count = len(self._senders)
 
         if disconnected:
-            async with self._ws_lock:
-                self._websockets -= disconnected
-                self._websocket_count = len(self._websockets)
-                for ws in disconnected:
-                    self._replay_buffers.pop(ws, None)
             logger.debug(
                 f"Broadcast: removed {len(disconnected)} disconnected ws, "
                 f"remaining={self._websocket_count}"
@@ -570,67 +573,41 @@ class SessionProcess:
     async def add_websocket_and_begin_replay(self, ws: WebSocket) -> None:
         """Atomically attach a WebSocket and enter replay mode for it."""
         async with self._ws_lock:
-            if ws not in self._websockets:
-                self._websockets.add(ws)
-                self._websocket_count = len(self._websockets)
-            self._replay_buffers.setdefault(ws, [])
+            if ws not in self._senders:
+                self._senders[ws] = WebSocketSender(ws, self._send_metrics)
+                self._websocket_count = len(self._senders)
         logger.debug(f"WebSocket added (replay mode), count={self._websocket_count}")
 
     async def end_replay(self, ws: WebSocket) -> None:
-        """Flush buffered live messages for a websocket after history replay."""
-        while True:
-            async with self._ws_lock:
-                buffer = self._replay_buffers.get(ws)
-                if buffer is None:
-                    return
-                if not buffer:
-                    self._replay_buffers.pop(ws, None)
-                    return
-                chunk = buffer.copy()
-                buffer.clear()
-
-            if ws.client_state != WebSocketState.CONNECTED:
-                logger.warning("end_replay: ws not connected, cleaning up replay buffer")
-                async with self._ws_lock:
-                    self._replay_buffers.pop(ws, None)
-                return
-            for message in chunk:
-                try:
-                    await ws.send_text(message)
-                except Exception as e:
-                    # Send failed — pop the replay buffer so _broadcast()
-                    # sends directly (or detects disconnect) on the next call.
-                    # Do NOT remove ws from _websockets here; let _broadcast()
-                    # or session_stream's finally block handle cleanup.
-                    logger.warning(f"end_replay: send_text failed during buffer flush: {e}")
-                    async with self._ws_lock:
-                        self._replay_buffers.pop(ws, None)
-                    return
+        """Start sending the live messages buffered for a websocket during history replay."""
+        async with self._ws_lock:
+            sender = self._senders.get(ws)
+            if sender is not None:
+                sender.start()
 
     async def _close_all_websockets(self) -> None:
         """Close all connected WebSockets."""
         async with self._ws_lock:
-            websockets = list(self._websockets)
-            self._websockets.clear()
+            senders = list(self._senders.values())
+            self._senders.clear()
             self._websocket_count = 0
-            self._replay_buffers.clear()
 
-        for ws in websockets:
-            try:
-                if ws.client_state == WebSocketState.CONNECTED:
-                    await ws.close(code=1001, reason="Session process exited")
-            except Exception:
-                # Ignore errors closing already-disconnected WebSockets
-                pass
+        await asyncio.gather(
+            *(
+                sender.close(code=1001, reason="Session process exited", drain_timeout=1.0)
+                for sender in senders
+            )
+        )
 
     async def remove_websocket(self, ws: WebSocket) -> None:
         """Remove a WebSocket connection from this session."""
         async with self._ws_lock:
-            if ws in self._websockets:
-                self._websockets.discard(ws)
-                self._websocket_count = len(self._websockets)
+            sender = self._senders.pop(ws, None)
+            if sender is not None:
+                self._websocket_count = len(self._senders)
                 logger.debug(f"WebSocket removed, count={self._websocket_count}")
-            self._replay_buffers.pop(ws, None)
+        if sender is not None:
+            await sender.stop()
 
     async def send_message(self, message: str) -> None:
         """Send a message to the subprocess stdin."""
@@ -0,0 +1,183 @@
+"""Per-WebSocket delivery of the messages a session broadcasts.
+
+Each WebSocket attached to a `SessionProcess` gets a `WebSocketSender`: a bounded queue and a
+task that sends from it, so a slow client only delays itself and never the worker read loop
+or the other clients. While the client replays history, its messages wait in the queue.
+
+A streamed delta (content or tool call part) queued right behind another one of the same part is
+merged into it, so a client that falls behind receives whole parts. If the queue still fills up,
+it is dropped and the WebSocket is closed with `RESYNC_CLOSE_CODE`, after which the client
+reconnects and replays history.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, cast
+
+from kosong.message import MergeableMixin
+from starlette.websockets import WebSocket, WebSocketState
+
+from kimi_cli import logger
+from kimi_cli.web.runner.messages import DeltaRun
+from kimi_cli.wire.serde import deserialize_wire_message
+from kimi_cli.wire.types import wire_message_type
+
+SEND_QUEUE_MAX_MESSAGES = 2000
+"""Messages queued for a WebSocket before the slow-consumer policy applies."""
+RESYNC_CLOSE_CODE = 4012
+"""Close code telling the client that it fell behind and should reconnect to resync."""
+
+
+@dataclass(slots=True)
+class SendQueueMetrics:
+    """Counters shared by the senders of a session."""
+
+    peak_depth: int = 0
+    """Deepest any queue has been."""
+    coalesced: int = 0
+    """Queued messages merged into others."""
+    resyncs: int = 0
+    """Clients closed to resync because they fell behind."""
+
+
+class WebSocketSender:
+    """Sends the messages queued for one WebSocket from its own task."""
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        metrics: SendQueueMetrics,
+        *,
+        max_messages: int = SEND_QUEUE_MAX_MESSAGES,
+    ) -> None:
+        self.ws = ws
+        self._metrics = metrics
+        self._max_messages = max_messages
+        self._queue: deque[str | DeltaRun] = deque()
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._resync_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        """Number of queued messages."""
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the sender stopped accepting messages."""
+        return self._closed
+
+    def put(self, message: str) -> bool:
+        """Queue a message; return False once the WebSocket is no longer sent to."""
+        if self._closed:
+            return False
+        delta = _parse_delta(message) if self._queue else None
+        if delta is not None and self._merge_into_tail(delta):
+            self._metrics.coalesced += 1
+            return True
+        if len(self._queue) >= self._max_messages:
+            self._resync()
+            return False
+        self._queue.append(DeltaRun(delta, message) if delta is not None else message)
+        if len(self._queue) > self._metrics.peak_depth:
+            self._metrics.peak_depth = len(self._queue)
+        self._drained.clear()
+        self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        """Start sending, once the client has replayed history."""
+        if self._task is None and not self._closed:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sending and drop the queued messages."""
+        self._closed = True
+        self._queue.clear()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def close(self, code: int, reason: str, *, drain_timeout: float = 0.0) -> None:
+        """Stop sending and close the WebSocket.
+
+        Args:
+            drain_timeout: Seconds to wait for the queued messages to be sent first.
+        """
+        if drain_timeout > 0 and self._task is not None and not self._closed:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._drained.wait(), drain_timeout)
+        await self.stop()
+        with contextlib.suppress(Exception):
+            if self.ws.client_state == WebSocketState.CONNECTED:
+                await self.ws.close(code=code, reason=reason)
+
+    def _merge_into_tail(self, delta: MergeableMixin) -> bool:
+        """Merge `delta` into the last queued message if that is a delta of the same part."""
+        tail = self._queue[-1]
+        if isinstance(tail, str):
+            # Queued while the queue was empty, so not parsed yet.
+            if (tail_delta := _parse_delta(tail)) is None:
+                return False
+            tail = self._queue[-1] = DeltaRun(tail_delta, tail)
+        return tail.merge(delta)
+
+    def _resync(self) -> None:
+        logger.warning(
+            f"WebSocket fell behind by {len(self._queue)} messages; closing it to resync"
+        )
+        self._metrics.resyncs += 1
+        self._closed = True
+        self._queue.clear()
+        self._resync_task = asyncio.create_task(
+            self.close(RESYNC_CLOSE_CODE, "Client fell behind; reconnect to resync")
+        )
+
+    async def _run(self) -> None:
+        while not self._closed:
+            if not self._queue:
+                self._drained.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            entry = self._queue.popleft()
+            try:
+                if self.ws.client_state != WebSocketState.CONNECTED:
+                    break
+                await self.ws.send_text(entry if isinstance(entry, str) else entry.text)
+            except Exception as e:
+                logger.warning(f"websocket failed: {e.__class__.__name__} {e}")
+                break
+        # Detached from the session by the next broadcast
+        self._closed = True
+        self._queue.clear()
+
+
+# Only events of these types can be merged; the others are passed on without parsing them.
+_DELTA_MARKERS = ('"ContentPart"', '"ToolCall"', '"ToolCallPart"')
+
+
+def _parse_delta(text: str) -> MergeableMixin | None:
+    if not any(marker in text for marker in _DELTA_MARKERS):
+        return None
+    try:
+        message = json.loads(text)
+        if message.get("method") != "event" or not isinstance(message["params"], dict):
+            return None
+        params = cast(dict[str, Any], message["params"])
+        msg_type = wire_message_type(params.get("type", ""))
+        if msg_type is None or not issubclass(msg_type, MergeableMixin):
+            return None
+        return cast(MergeableMixin, deserialize_wire_message(params))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
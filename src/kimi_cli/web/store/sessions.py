@@ -1,19 +1,14 @@
-"""Session storage with simple in-memory caching for web UI.
+"""Session storage for web UI, backed by the session catalog.
 
 ## Design Philosophy
 
-This module uses a simple cache-aside pattern with TTL fallback:
+Sessions are listed from the on-disk session catalog (see `kimi_cli.session_catalog`), which
+pages, filters and searches them in SQLite. Reconciling the catalog with the session files
+stats every session, so it is throttled:
 
-1. **Cache on read**: First read populates cache, subsequent reads hit cache
-2. **Invalidate on write**: API mutations call invalidate_sessions_cache()
-3. **TTL fallback**: Cache expires after CACHE_TTL seconds as safety net
-
-## Applicable Scope
-
-This design works well when:
-- Single worker process (e.g., `uvicorn app:app` without -w flag)
-- All mutations go through the same API
-- Occasional staleness (up to CACHE_TTL) from external changes is acceptable
+1. **Sync on read**: A read reconciles the catalog first, unless it did less than CACHE_TTL ago
+2. **Invalidate on write**: API mutations call invalidate_sessions_cache() so the next read syncs
+3. **TTL fallback**: Changes made by other processes show up within CACHE_TTL seconds
 """
 
 from __future__ import annotations
@@ -28,7 +23,14 @@ from pydantic import ConfigDict, Field
 
 from kimi_cli.metadata import WorkDirMeta, load_metadata
 from kimi_cli.session import Session as KimiCLISession
-from kimi_cli.session_state import SessionState, load_session_state, save_session_state
+from kimi_cli.session_catalog import (
+    SEARCH_TITLE_WIDTH,
+    CatalogEntry,
+    SessionCatalog,
+    get_session_catalog,
+    work_dir_hash,
+)
+from kimi_cli.session_state import SessionState, save_session_state
 from kimi_cli.web.models import Session
 from kimi_cli.wire.file import WireFile
 
@@ -40,8 +42,7 @@ AUTO_ARCHIVE_DAYS = 15  # Sessions older than this will be auto-archived
 
 _sessions_cache: list[JointSession] | None = None
 _cache_timestamp: float = 0.0
-_sessions_index_cache: list[SessionIndexEntry] | None = None
-_index_cache_timestamp: float = 0.0
+_catalog_sync_timestamp: float = 0.0
 
 
 def invalidate_sessions_cache() -> None:
@@ -50,11 +51,22 @@ def invalidate_sessions_cache() -> None:
     Call this after any mutation (create/update/delete).
     This ensures the next read sees fresh data.
     """
-    global _sessions_cache, _cache_timestamp, _sessions_index_cache, _index_cache_timestamp
+    global _sessions_cache, _cache_timestamp, _catalog_sync_timestamp
     _sessions_cache = None
     _cache_timestamp = 0.0
-    _sessions_index_cache = None
-    _index_cache_timestamp = 0.0
+    _catalog_sync_timestamp = 0.0
+
+
+def _synced_catalog(*, force: bool = False) -> SessionCatalog:
+    """The session catalog, reconciled with the session files at most every CACHE_TTL."""
+    global _catalog_sync_timestamp
+
+    catalog = get_session_catalog()
+    now = time.time()
+    if force or (now - _catalog_sync_timestamp) >= CACHE_TTL:
+        catalog.sync()
+        _catalog_sync_timestamp = now
+    return catalog
 
 
 class JointSession(Session):
@@ -77,79 +89,6 @@ class SessionIndexEntry:
     state: SessionState
 
 
-def _derive_title_from_wire(session_dir: Path) -> str:
-    wire_file = session_dir / "wire.jsonl"
-    if not wire_file.exists():
-        return "Untitled"
-
-    try:
-        import json
-
-        from kosong.message import Message
-
-        from kimi_cli.utils.string import shorten
-
-        with open(wire_file, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    record = json.loads(line)
-                    message = record.get("message", {})
-                    if message.get("type") == "TurnBegin":
-                        user_input = message.get("payload", {}).get("user_input")
-                        if user_input:
-                            msg = Message(role="user", content=user_input)
-                            text = msg.extract_text(" ")
-                            return shorten(text, width=300)
-                except json.JSONDecodeError:
-                    continue
-    except Exception:
-        pass
-    return "Untitled"
-
-
-def _iter_session_dirs(wd: WorkDirMeta) -> list[tuple[Path, Path]]:
-    session_dirs: list[tuple[Path, Path]] = []
-
-    # Latest sessions
-    for context_file in wd.sessions_dir.glob("*/context.jsonl"):
-        session_dir = context_file.parent
-        session_dirs.append((session_dir, context_file))
-
-    # Legacy sessions
-    for context_file in wd.sessions_dir.glob("*.jsonl"):
-        session_dir = context_file.parent / context_file.stem
-        converted_context_file = session_dir / "context.jsonl"
-        if converted_context_file.exists():
-            continue
-        session_dirs.append((session_dir, context_file))
-
-    return session_dirs
-
-
-def _ensure_title(entry: SessionIndexEntry, *, refresh: bool) -> None:
-    """Ensure session has a title.
-
-    Reads title exclusively from SessionState.custom_title (source of truth).
-    Falls back to deriving from wire.jsonl if custom_title is not set.
-    """
-    if entry.state.custom_title:
-        entry.title = entry.state.custom_title
-        return
-
-    if not refresh:
-        if entry.title and entry.title != "Untitled":
-            return
-        entry.title = "Untitled"
-        return
-
-    # Derive title from wire.jsonl (no caching — title will be persisted
-    # to SessionState by the soul layer or generate-title endpoint)
-    entry.title = _derive_title_from_wire(entry.session_dir)
-
-
 def _build_kimi_session(entry: SessionIndexEntry) -> KimiCLISession:
     from kaos.path import KaosPath
 
@@ -193,45 +132,52 @@ def _should_auto_archive(last_updated: datetime, state: SessionState) -> bool:
     return age_days >= AUTO_ARCHIVE_DAYS
 
 
+# Session IDs that `_index_entries` can parse, so that pages are filtered before the LIMIT
+_SESSION_ID_GLOB = "-".join("[0-9a-fA-F]" * n for n in (8, 4, 4, 4, 12))
+
+
+def _work_dirs() -> dict[str, WorkDirMeta]:
+    return {work_dir_hash(wd): wd for wd in load_metadata().work_dirs}
+
+
+def _index_entries(
+    entries: list[CatalogEntry], work_dirs: dict[str, WorkDirMeta] | None = None
+) -> list[SessionIndexEntry]:
+    if work_dirs is None:
+        work_dirs = _work_dirs()
+    index: list[SessionIndexEntry] = []
+    for entry in entries:
+        wd = work_dirs.get(entry.work_dir_hash)
+        if wd is None:
+            continue
+        try:
+            session_id = UUID(entry.session_id)
+        except ValueError:
+            continue
+        index.append(
+            SessionIndexEntry(
+                session_id=session_id,
+                session_dir=entry.session_dir,
+                context_file=entry.context_file,
+                work_dir=wd.path,
+                work_dir_meta=wd,
+                last_updated=datetime.fromtimestamp(entry.updated_at, tz=UTC),
+                title=entry.title(SEARCH_TITLE_WIDTH),
+                state=entry.state(),
+            )
+        )
+    return index
+
+
 def _build_sessions_index() -> list[SessionIndexEntry]:
-    """Build the sessions index from disk.
+    """Build the sessions index from a freshly synced catalog.
 
     Note: This function only reads data and does NOT perform auto-archive writes.
     Auto-archive is handled separately by run_auto_archive() to avoid disk writes
     during read operations.
     """
-    metadata = load_metadata()
-    entries: list[SessionIndexEntry] = []
-
-    for wd in metadata.work_dirs:
-        for session_dir, context_file in _iter_session_dirs(wd):
-            try:
-                session_id = UUID(session_dir.name)
-            except (ValueError, AttributeError, TypeError):
-                continue
-
-            if not context_file.exists():
-                continue
-
-            last_updated = datetime.fromtimestamp(context_file.stat().st_mtime, tz=UTC)
-            state = load_session_state(session_dir)
-            title = state.custom_title or "Untitled"
-
-            entries.append(
-                SessionIndexEntry(
-                    session_id=session_id,
-                    session_dir=session_dir,
-                    context_file=context_file,
-                    work_dir=wd.path,
-                    work_dir_meta=wd,
-                    last_updated=last_updated,
-                    title=title,
-                    state=state,
-                )
-            )
-
-    entries.sort(key=lambda x: (x.last_updated, str(x.session_id)), reverse=True)
-    return entries
+    catalog = _synced_catalog(force=True)
+    return _index_entries(catalog.list_sessions(has_context=True, known_work_dir=True))
 
 
 # Track when auto-archive was last run to avoid running too frequently
@@ -276,29 +222,11 @@ def run_auto_archive() -> int:
     return archived_count
 
 
-def _load_sessions_index_cached() -> list[SessionIndexEntry]:
-    global _sessions_index_cache, _index_cache_timestamp
-
-    now = time.time()
-    if _sessions_index_cache is not None and (now - _index_cache_timestamp) < CACHE_TTL:
-        return _sessions_index_cache
-
-    _sessions_index_cache = _build_sessions_index()
-    _index_cache_timestamp = now
-    return _sessions_index_cache
-
-
 def load_all_sessions() -> list[JointSession]:
     """Load all sessions from all work directories."""
-    entries = _load_sessions_index_cached()
-    sessions: list[JointSession] = []
-
-    for entry in entries:
-        _ensure_title(entry, refresh=False)
-        sessions.append(_build_joint_session(entry))
-
-    sessions.sort(key=lambda x: x.last_updated, reverse=True)
-    return sessions
+    catalog = _synced_catalog()
+    entries = _index_entries(catalog.list_sessions(has_context=True, known_work_dir=True))
+    return [_build_joint_session(entry) for entry in entries]
 
 
 def load_all_sessions_cached() -> list[JointSession]:
@@ -339,89 +267,36 @@ def load_sessions_page(
             - True: Only return archived sessions.
             - False: Only return non-archived sessions.
     """
-    entries = list(_load_sessions_index_cached())
-
-    # Filter by archived status
-    if archived is None or archived is False:
-        entries = [e for e in entries if not e.state.archived]
-    else:
-        entries = [e for e in entries if e.state.archived]
-
-    if query:
-        query_text = query.strip().lower()
-        if query_text:
-            for entry in entries:
-                _ensure_title(entry, refresh=True)
-            entries = [
-                entry
-                for entry in entries
-                if query_text in entry.title.lower() or query_text in (entry.work_dir or "").lower()
-            ]
-
     if offset < 0:
         offset = 0
     if limit <= 0:
         limit = 100
 
-    page_entries = entries[offset : offset + limit]
-
-    if not query:
-        for entry in page_entries:
-            if not entry.title or entry.title == "Untitled":
-                _ensure_title(entry, refresh=True)
-
-    return [_build_joint_session(entry) for entry in page_entries]
+    catalog = _synced_catalog()
+    work_dirs = _work_dirs()
+    entries = catalog.list_sessions(
+        work_dir_hashes=work_dirs.keys(),
+        archived=bool(archived),
+        has_context=True,
+        known_work_dir=True,
+        session_id_glob=_SESSION_ID_GLOB,
+        query=query,
+        limit=limit,
+        offset=offset,
+    )
+    return [_build_joint_session(entry) for entry in _index_entries(entries, work_dirs)]
 
 
 def load_session_by_id(id: UUID) -> JointSession | None:
-    """Load a session by ID.
+    """Load a session by ID, re-indexing it in the catalog first if its files changed.
 
-    This function first checks the cache/disk scan, then falls back to
-    directly constructing the session from metadata if not found (handles
-    newly created sessions with empty context files).
+    This also finds sessions created since the catalog was last synced, including newly
+    created sessions with empty context files.
     """
-    global_metadata = load_metadata()
-    session_id_str = str(id)
-
-    for wd in global_metadata.work_dirs:
-        session_dir = wd.sessions_dir / session_id_str
-        context_file = session_dir / "context.jsonl"
-
-        if context_file.exists():
-            last_updated = datetime.fromtimestamp(context_file.stat().st_mtime, tz=UTC)
-            state = load_session_state(session_dir)
-            entry = SessionIndexEntry(
-                session_id=id,
-                session_dir=session_dir,
-                context_file=context_file,
-                work_dir=wd.path,
-                work_dir_meta=wd,
-                last_updated=last_updated,
-                title="Untitled",
-                state=state,
-            )
-            _ensure_title(entry, refresh=True)
-            return _build_joint_session(entry)
-
-        # Legacy sessions: context.jsonl stored directly in sessions_dir
-        legacy_context = wd.sessions_dir / f"{session_id_str}.jsonl"
-        if legacy_context.exists():
-            last_updated = datetime.fromtimestamp(legacy_context.stat().st_mtime, tz=UTC)
-            state = load_session_state(session_dir)
-            entry = SessionIndexEntry(
-                session_id=id,
-                session_dir=session_dir,
-                context_file=legacy_context,
-                work_dir=wd.path,
-                work_dir_meta=wd,
-                last_updated=last_updated,
-                title="Untitled",
-                state=state,
-            )
-            _ensure_title(entry, refresh=True)
-            return _build_joint_session(entry)
-
-    return None
+    entry = get_session_catalog().find(str(id))
+    if entry is None or entry.context_size is None:
+        return None
+    return next((_build_joint_session(e) for e in _index_entries([entry])), None)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import copy
+from typing import TYPE_CHECKING
 
 from kosong.message import MergeableMixin
 
@@ -10,7 +11,16 @@ from kimi_cli.utils.aioqueue import Queue, QueueShutDown
 from kimi_cli.utils.broadcast import BroadcastQueue
 from kimi_cli.utils.logging import logger
 from kimi_cli.wire.file import WireFile
-from kimi_cli.wire.types import ContentPart, ToolCallPart, WireMessage, is_wire_message
+from kimi_cli.wire.types import (
+    ContentPart,
+    ToolCallPart,
+    TurnEnd,
+    WireMessage,
+    is_wire_message,
+)
+
+if TYPE_CHECKING:
+    from kimi_cli.config import WireConfig
 
 WireMessageQueue = BroadcastQueue[WireMessage]
 
@@ -20,7 +30,12 @@ class Wire:
     A spmc channel for communication between the soul and the UI during a soul run.
     """
 
-    def __init__(self, *, file_backend: WireFile | None = None):
+    def __init__(
+        self,
+        *,
+        file_backend: WireFile | None = None,
+        record_config: WireConfig | None = None,
+    ):
         self._raw_queue = WireMessageQueue()
         self._merged_queue = WireMessageQueue()
 
@@ -28,7 +43,9 @@ class Wire:
 
         if file_backend is not None:
             # record all complete Wire messages to the file backend
-            self._recorder = _WireRecorder(file_backend, self._merged_queue.subscribe())
+            self._recorder = _WireRecorder(
+                file_backend, self._merged_queue.subscribe(), record_config
+            )
         else:
             self._recorder = None
 
@@ -66,12 +83,18 @@ class Wire:
 class WireSoulSide:
     """
     The soul side of a `Wire`.
+
+    Messages are published without copying, so the same object may be seen by every raw
+    subscriber, the merged subscribers and the sender. Subscribers must treat received messages
+    as read-only.
     """
 
     def __init__(self, raw_queue: WireMessageQueue, merged_queue: WireMessageQueue):
         self._raw_queue = raw_queue
         self._merged_queue = merged_queue
         self._merge_buffer: MergeableMixin | None = None
+        self._merge_buffer_shared = False
+        """Whether the merge buffer is still the sent message and must be copied before a merge."""
 
     def send(self, msg: WireMessage) -> None:
         if not isinstance(msg, ContentPart | ToolCallPart):
@@ -86,13 +109,14 @@ class WireSoulSide:
         # merge and send merged message
         match msg:
             case MergeableMixin():
+                if self._merge_buffer is not None and self._merge_buffer_shared:
+                    self._merge_buffer = copy.deepcopy(self._merge_buffer)
+                    self._merge_buffer_shared = False
                 if self._merge_buffer is None:
-                    self._merge_buffer = copy.deepcopy(msg)
-                elif self._merge_buffer.merge_in_place(msg):
-                    pass
-                else:
+                    self._merge_buffer, self._merge_buffer_shared = msg, True
+                elif not self._merge_buffer.merge_in_place(msg):
                     self.flush()
-                    self._merge_buffer = copy.deepcopy(msg)
+                    self._merge_buffer, self._merge_buffer_shared = msg, True
             case _:
                 self.flush()
                 self._send_merged(msg)
@@ -128,8 +152,27 @@ class WireUISide:
 
 
 class _WireRecorder:
-    def __init__(self, wire_file: WireFile, queue: Queue[WireMessage]) -> None:
-        self._wire_file = wire_file
+    """
+    Records merged wire messages through one buffered `WireFileWriter` per run.
+
+    Records are written in batches (see `WireConfig` for thresholds), at every
+    `TurnEnd` and when the wire shuts down.
+    """
+
+    def __init__(
+        self,
+        wire_file: WireFile,
+        queue: Queue[WireMessage],
+        config: WireConfig | None = None,
+    ) -> None:
+        if config is None:
+            self._writer = wire_file.open_writer()
+        else:
+            self._writer = wire_file.open_writer(
+                flush_bytes=config.record_flush_bytes,
+                flush_interval=config.record_flush_interval_ms / 1000,
+                fsync=config.record_fsync,
+            )
         self._task = asyncio.create_task(self._consume_loop(queue))
 
     async def join(self) -> None:
@@ -137,12 +180,32 @@ class _WireRecorder:
             await self._task
 
     async def _consume_loop(self, queue: Queue[WireMessage]) -> None:
-        while True:
-            try:
-                msg = await queue.get()
+        try:
+            while True:
+                try:
+                    msg = await self._next_message(queue)
+                except QueueShutDown:
+                    break
+                if msg is None:
+                    await self._writer.flush()
+                    continue
                 await self._record(msg)
-            except QueueShutDown:
-                break
+        finally:
+            await self._writer.close()
+
+    async def _next_message(self, queue: Queue[WireMessage]) -> WireMessage | None:
+        """Wait for the next message, or return None when buffered records are due."""
+        timeout = self._writer.flush_due_in()
+        if timeout is None:
+            return await queue.get()
+        try:
+            return await asyncio.wait_for(queue.get(), timeout)
+        except TimeoutError:
+            return None
 
     async def _record(self, msg: WireMessage) -> None:
-        await self._wire_file.append_message(msg)
+        self._writer.append_message(msg)
+        if isinstance(msg, TurnEnd):
+            await self._writer.flush()
+        else:
+            await self._writer.flush_if_needed()
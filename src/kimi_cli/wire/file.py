@@ -3,13 +3,14 @@ from __future__ import annotations
 import json
 import time
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Literal
 
 import aiofiles
 from pydantic import BaseModel, ConfigDict, ValidationError
 
+from kimi_cli.utils.io import AppendWriter, FsyncPolicy
 from kimi_cli.utils.logging import logger
 from kimi_cli.wire.protocol import WIRE_PROTOCOL_LEGACY_VERSION, WIRE_PROTOCOL_VERSION
 from kimi_cli.wire.types import WireMessage, WireMessageEnvelope
@@ -60,6 +61,7 @@ def parse_wire_file_line(line: str) -> WireFileMetadata | WireMessageRecord:
 class WireFile:
     path: Path
     protocol_version: str = WIRE_PROTOCOL_VERSION
+    _writer: WireFileWriter | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.path.exists():
@@ -122,6 +124,11 @@ class WireFile:
         await self.append_record(record)
 
     async def append_record(self, record: WireMessageRecord) -> None:
+        if (writer := self._writer) is not None:
+            # Keep ordering with records buffered by an open writer.
+            writer.append_record(record)
+            await writer.flush()
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
         needs_header = not self.path.exists() or self.path.stat().st_size == 0
         async with aiofiles.open(self.path, mode="a", encoding="utf-8") as f:
@@ -130,6 +137,98 @@ class WireFile:
                 await f.write(_dump_line(metadata))
             await f.write(_dump_line(record))
 
+    def open_writer(
+        self,
+        *,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        fsync: FsyncPolicy = "never",
+    ) -> WireFileWriter:
+        """
+        Open a buffered writer that keeps the wire file open until it is closed.
+
+        While the writer is open, `append_message` and `append_record` on this
+        `WireFile` go through it, so records are written in the order they were
+        appended.
+        """
+        if self._writer is not None and not self._writer.closed:
+            raise RuntimeError(f"Wire file {self.path} already has an open writer")
+        writer = WireFileWriter(
+            self, flush_bytes=flush_bytes, flush_interval=flush_interval, fsync=fsync
+        )
+        self._writer = writer
+        return writer
+
+
+class WireFileWriter:
+    """
+    Batched appender for a `WireFile`, created by `WireFile.open_writer`.
+
+    Records are serialized when appended and written to disk in batches: once
+    `flush_bytes` are buffered, once `flush_interval` seconds have passed since
+    the oldest buffered record (see `flush_due_in`), on explicit `flush`, and on
+    `close`.
+
+    Crash consistency: every batch ends on a line boundary. A crash loses at most
+    the records appended since the last flush and leaves at most one torn last
+    line, which `iter_records` and the other readers skip. Records that were
+    flushed with `fsync="flush"` (or before `close` with `fsync="close"`) survive
+    power loss as well.
+    """
+
+    def __init__(
+        self,
+        wire_file: WireFile,
+        *,
+        flush_bytes: int,
+        flush_interval: float,
+        fsync: FsyncPolicy,
+    ) -> None:
+        self._wire_file = wire_file
+        self._flush_bytes = flush_bytes
+        self._flush_interval = flush_interval
+        self._writer = AppendWriter(wire_file.path, fsync=fsync)
+        path = wire_file.path
+        if not path.exists() or path.stat().st_size == 0:
+            metadata = WireFileMetadata(protocol_version=wire_file.protocol_version)
+            self._writer.buffer(_dump_line(metadata))
+
+    @property
+    def closed(self) -> bool:
+        return self._writer.closed
+
+    def append_message(self, msg: WireMessage, *, timestamp: float | None = None) -> None:
+        record = WireMessageRecord.from_wire_message(
+            msg,
+            timestamp=time.time() if timestamp is None else timestamp,
+        )
+        self.append_record(record)
+
+    def append_record(self, record: WireMessageRecord) -> None:
+        """Buffer a record. Call `flush_if_needed` to honour the size threshold."""
+        self._writer.buffer(_dump_line(record))
+
+    def flush_due_in(self) -> float | None:
+        """Seconds until buffered records are due by time, or None if nothing is buffered."""
+        pending_since = self._writer.pending_since
+        if pending_since is None:
+            return None
+        return max(0.0, pending_since + self._flush_interval - time.monotonic())
+
+    async def flush_if_needed(self) -> None:
+        if self._writer.pending_bytes >= self._flush_bytes or self.flush_due_in() == 0.0:
+            await self._writer.flush()
+
+    async def flush(self) -> None:
+        await self._writer.flush()
+
+    async def close(self) -> None:
+        try:
+            await self._writer.close()
+        finally:
+            if self._wire_file._writer is self:  # pyright: ignore[reportPrivateUsage]
+                self._wire_file._writer = None  # pyright: ignore[reportPrivateUsage]
+
 
 def _dump_line(model: BaseModel) -> str:
     return json.dumps(model.model_dump(mode="json"), ensure_ascii=False) + "\n"
@@ -0,0 +1,186 @@
+"""
+Fast scanning of wire files for readers that only need a few fields of some records.
+
+`parse_wire_file_line` validates every record into its pydantic model, which dominates the
+time of readers that look at the type of each record and the payload of a few. The scanner
+here maps the file into memory and reads the type and timestamp of each record from the line
+prefix that `WireFile` writes, so lines of other types are skipped without being decoded or
+copied. Payloads are decoded with `json` on request and are plain dicts, not validated.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import mmap
+import os
+import re
+from collections.abc import Collection, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from kimi_cli.utils.logging import logger
+
+# A non-blank line. The lines written by `WireFile` start with the timestamp and the message
+# type, which are captured; lines laid out differently are decoded to read them.
+_LINE = re.compile(
+    rb'^[ \t]*(?:\{"timestamp":[ ]?(-?[0-9.eE+-]+),[ ]?"message":[ ]?\{"type":[ ]?"(\w+)"'
+    rb"[^\n]*|[^\n]*\S[^\n]*)",
+    re.MULTILINE,
+)
+_METADATA_PREFIX = re.compile(rb'[ \t]*\{"type":[ ]?"metadata"')
+_MMAP_MIN_SIZE = 64 * 1024
+
+type _Buffer = bytes | mmap.mmap
+
+
+@functools.cache
+def _type_names(types: frozenset[str]) -> re.Pattern[bytes]:
+    """Match the given message types as JSON strings."""
+    return re.compile(b'"(?:' + b"|".join(re.escape(t.encode()) for t in sorted(types)) + b')"')
+
+
+@dataclass(slots=True)
+class WireRecordView:
+    """A message record of a wire file, read without validating it."""
+
+    type: str
+    timestamp: float
+    line: bytes
+    end: int
+    """Offset just past the line in the file."""
+
+    def payload(self) -> dict[str, Any]:
+        """Decode the payload of the message.
+
+        Raises:
+            ValueError: If the line is not a complete message record.
+        """
+        try:
+            payload = json.loads(self.line)["message"].get("payload", {})
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError("not a wire message record") from e
+        if not isinstance(payload, dict):
+            raise ValueError("wire message payload is not an object")
+        return cast(dict[str, Any], payload)
+
+
+def scan_wire_file(
+    path: Path,
+    *,
+    types: Collection[str] | None = None,
+    start: int = 0,
+    end: int | None = None,
+    partial: bool = True,
+) -> Iterator[WireRecordView]:
+    """Yield the message records of a wire file, skipping metadata and malformed lines.
+
+    Args:
+        path: The wire file.
+        types: Only yield records of these message types; all of them if None.
+        start: Offset to start at, which must be the start of a line.
+        end: Stop before the first line that starts at or after this offset.
+        partial: Whether to read a last line that does not end with a newline yet. Writers
+            only append whole lines, so such a line is normally still being written.
+
+    A missing or unreadable file yields nothing.
+    """
+    types = None if types is None else frozenset(types)
+    try:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                # Mapping costs more than reading small files
+                yield from _scan(f.read(), types, start, end, partial)
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                yield from _scan(buf, types, start, end, partial)
+    except ValueError:
+        return  # Emptied before it was mapped
+    except OSError:
+        if path.exists():
+            logger.exception("Failed to read wire file {file}:", file=path)
+
+
+def _scan(
+    buf: _Buffer,
+    types: frozenset[str] | None,
+    start: int,
+    end: int | None,
+    partial: bool,
+) -> Iterator[WireRecordView]:
+    size = len(buf)
+    if end is None or end > size:
+        end = size
+    if types is None:
+        lines = _all_lines(buf, start, end)
+    else:
+        # Only lines that mention one of the types can be records of them, so the others are
+        # skipped by searching for the names.
+        lines = _candidate_lines(buf, _type_names(types), start, end)
+    for match in lines:
+        line_end = match.end()
+        if line_end == size and not partial:
+            return  # Not followed by a newline, so still being written
+        next_line = min(line_end + 1, size)
+        if (type_ := match.group(2)) is not None:
+            type_ = type_.decode()
+            if types is not None and type_ not in types:
+                continue
+            try:
+                timestamp = float(match.group(1))
+            except ValueError:
+                continue
+            yield WireRecordView(type_, timestamp, match.group(0), next_line)
+        elif (record := _decode(match.group(0), next_line)) is not None:
+            if types is None or record.type in types:
+                yield record
+
+
+def _all_lines(buf: _Buffer, start: int, end: int) -> Iterator[re.Match[bytes]]:
+    # Read to the end of the line that `end` falls in
+    newline = buf.find(b"\n", end - 1) if end > start else start
+    return _LINE.finditer(buf, start, len(buf) if newline < 0 else newline)
+
+
+def _candidate_lines(
+    buf: _Buffer, names: re.Pattern[bytes], pos: int, end: int
+) -> Iterator[re.Match[bytes]]:
+    while (found := names.search(buf, pos)) is not None:
+        line_start = buf.rfind(b"\n", pos, found.start()) + 1 or pos
+        if line_start >= end:
+            return
+        newline = buf.find(b"\n", found.end())
+        line_end = len(buf) if newline < 0 else newline
+        if (match := _LINE.match(buf, line_start, line_end)) is not None:
+            yield match
+        pos = line_end + 1
+
+
+def _decode(line: bytes, end: int) -> WireRecordView | None:
+    """Read a line that is not in the layout `WireFile` writes."""
+    if _METADATA_PREFIX.match(line) is not None:
+        return None
+    try:
+        record = json.loads(line)
+        type_ = record["message"]["type"]
+        timestamp = float(record["timestamp"])
+    except (ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(type_, str):
+        return None
+    return WireRecordView(type_, timestamp, line, end)
+
+
+def iter_events(type_: str, payload: dict[str, Any]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield the event, or the event that a `SubagentEvent` wraps, recursively."""
+    if type_ != "SubagentEvent":
+        yield type_, payload
+        return
+    inner = payload.get("event")
+    if isinstance(inner, dict):
+        inner = cast(dict[str, Any], inner)
+        inner_type = inner.get("type")
+        inner_payload = inner.get("payload", {})
+        if isinstance(inner_type, str) and inner_type and isinstance(inner_payload, dict):
+            yield from iter_events(inner_type, cast(dict[str, Any], inner_payload))
@@ -619,6 +619,11 @@ def is_request(msg: Any) -> TypeGuard[Request]:
     return isinstance(msg, _REQUEST_TYPES)
 
 
+def is_request_type(cls: type) -> bool:
+    """Check if the message class is a Request class."""
+    return issubclass(cls, _REQUEST_TYPES)
+
+
 def is_wire_message(msg: Any) -> TypeGuard[WireMessage]:
     """Check if the message is a WireMessage."""
     return isinstance(msg, _WIRE_MESSAGE_TYPES)
@@ -631,6 +636,11 @@ _NAME_TO_WIRE_MESSAGE_TYPE: dict[str, type[WireMessage]] = {
 _NAME_TO_WIRE_MESSAGE_TYPE["ApprovalRequestResolved"] = ApprovalResponse
 
 
+def wire_message_type(name: str) -> type[WireMessage] | None:
+    """The message class named by a `WireMessageEnvelope.type`, or None if unknown."""
+    return _NAME_TO_WIRE_MESSAGE_TYPE.get(name)
+
+
 class WireMessageEnvelope(BaseModel):
     type: str
     payload: dict[str, JsonType]
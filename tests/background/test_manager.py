@@ -12,6 +12,7 @@ from kosong.tooling.empty import EmptyToolset
 from kimi_cli.approval_runtime import ApprovalRequestRecord, ApprovalRuntimeEvent, ApprovalSource
 from kimi_cli.background import TaskRuntime, TaskSpec
 from kimi_cli.background.agent_runner import BackgroundAgentRunner
+from kimi_cli.background.control import WorkerControlServer
 from kimi_cli.notifications import NotificationDelivery, NotificationEvent, NotificationView
 from kimi_cli.soul.agent import Agent as SoulAgent
 from kimi_cli.soul.context import Context
@@ -632,6 +633,90 @@ def test_recover_marks_stale_running_task_as_lost(runtime):
     assert recovered.runtime.failure_reason == "Background worker heartbeat expired"
 
 
+@pytest.mark.asyncio
+async def test_recover_keeps_stale_task_whose_worker_answers_ping(runtime, tmp_path):
+    manager = runtime.background_tasks
+    store = manager.store
+    spec = TaskSpec(
+        id="b1111112",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="quiet worker",
+        tool_call_id="tool-1b",
+        command="sleep 10",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    control_socket = tmp_path / "w.sock"
+    server = await WorkerControlServer.start(control_socket, on_kill=lambda: None)
+    assert server is not None
+    store.write_runtime(
+        spec.id,
+        TaskRuntime(
+            status="running",
+            started_at=time.time() - 60,
+            heartbeat_at=time.time() - 60,
+            updated_at=time.time() - 60,
+            control_socket=str(control_socket),
+        ),
+    )
+
+    try:
+        # The ping runs in the background; until it has been answered the task is kept.
+        manager.recover()
+        assert store.merged_view(spec.id).runtime.status == "running"
+        await asyncio.gather(*manager._worker_pings.values())  # pyright: ignore[reportPrivateUsage]
+        manager.recover()
+        assert store.merged_view(spec.id).runtime.status == "running"
+    finally:
+        await server.close()
+
+    # Pinged recently, so the next reconcile does not ask again.
+    manager.recover()
+    assert store.merged_view(spec.id).runtime.status == "running"
+
+
+@pytest.mark.asyncio
+async def test_recover_marks_stale_task_lost_once_its_ping_fails(runtime, tmp_path):
+    manager = runtime.background_tasks
+    store = manager.store
+    spec = TaskSpec(
+        id="b1111113",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="dead worker",
+        tool_call_id="tool-1c",
+        command="sleep 10",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    store.write_runtime(
+        spec.id,
+        TaskRuntime(
+            status="running",
+            started_at=time.time() - 60,
+            heartbeat_at=time.time() - 60,
+            updated_at=time.time() - 60,
+            control_socket=str(tmp_path / "gone.sock"),
+        ),
+    )
+
+    manager.recover()
+    assert store.merged_view(spec.id).runtime.status == "running"
+    await asyncio.gather(*manager._worker_pings.values())  # pyright: ignore[reportPrivateUsage]
+    manager.recover()
+
+    recovered = store.merged_view(spec.id)
+    assert recovered.runtime.status == "lost"
+    assert recovered.runtime.failure_reason == "Background worker heartbeat expired"
+
+
 def test_recover_marks_stale_agent_task_lost_and_clears_instance_running_state(runtime):
     manager = runtime.background_tasks
     store = manager.store
@@ -1008,6 +1093,41 @@ def test_reconcile_does_not_republish_same_terminal_notification(runtime):
     assert second == []
 
 
+def test_reconcile_skips_tasks_already_notified(runtime, monkeypatch):
+    manager = runtime.background_tasks
+    store = manager.store
+    spec = TaskSpec(
+        id="b2222226",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="settled task",
+        tool_call_id="tool-3f",
+        command="echo done",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    store.write_runtime(
+        spec.id,
+        TaskRuntime(status="completed", exit_code=0, finished_at=time.time()),
+    )
+    assert len(manager.reconcile(limit=4)) == 1
+
+    merged: list[str] = []
+    merged_view = store.merged_view
+
+    def _merged_view(task_id: str):
+        merged.append(task_id)
+        return merged_view(task_id)
+
+    monkeypatch.setattr(store, "merged_view", _merged_view)
+
+    assert manager.reconcile(limit=4) == []
+    assert merged == []
+
+
 def test_publish_terminal_notifications_limit_skips_deduped_results(runtime, monkeypatch):
     manager = runtime.background_tasks
     store = manager.store
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from kimi_cli.background import TaskRuntime, TaskSpec
+from kimi_cli.background.output import OutputLog
+
+
+def test_read_lines_and_tail_across_checkpoints(tmp_path: Path) -> None:
+    path = tmp_path / "output.log"
+    path.write_text("".join(f"line {i}\n" for i in range(20)), encoding="utf-8")
+    log = OutputLog(path, stride=4)
+
+    assert log.line_count() == 20
+    assert log.read_lines(9, 3).text == "line 9\nline 10\nline 11\n"
+    assert log.read_lines(18, 10).text == "line 18\nline 19\n"
+    assert log.read_lines(25, 1).text == ""
+    assert log.tail(max_lines=2, max_bytes=1000) == "line 18\nline 19"
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write("line 20\npartial")
+
+    assert log.line_count() == 22
+    assert log.read_lines(19, 5).text == "line 19\nline 20\npartial"
+    assert log.tail(max_lines=3, max_bytes=1000) == "line 19\nline 20\npartial"
+    assert log.tail(max_lines=3, max_bytes=10) == "20\npartial"
+
+
+def test_index_restarts_after_truncation(tmp_path: Path) -> None:
+    path = tmp_path / "output.log"
+    path.write_text("a\nb\nc\n", encoding="utf-8")
+    log = OutputLog(path, stride=2)
+    assert log.line_count() == 3
+
+    path.write_text("x\n", encoding="utf-8")
+
+    assert log.line_count() == 1
+    assert log.read_lines(0, 2).text == "x\n"
+
+
+def test_reads_stay_on_utf8_boundaries(tmp_path: Path) -> None:
+    path = tmp_path / "output.log"
+    path.write_text("a中文b", encoding="utf-8")  # 中 and 文 are three bytes each
+    log = OutputLog(path)
+
+    first = log.read_since(0, 3)
+    assert (first.text, first.next_offset) == ("a", 1)
+    # A window smaller than one character still returns that character.
+    second = log.read_since(first.next_offset, 1)
+    assert (second.text, second.next_offset) == ("中", 4)
+    # Starting inside a character skips to the next one.
+    assert log.read_since(2, 100).text == "文b"
+    assert log.tail(max_lines=1, max_bytes=5) == "文b"
+
+
+def test_tail_and_read_since_do_not_index_lines(tmp_path: Path) -> None:
+    path = tmp_path / "output.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)), encoding="utf-8")
+    log = OutputLog(path, stride=4)
+
+    assert log.tail(max_lines=2, max_bytes=1000) == "line 998\nline 999"
+    assert log.tail(max_lines=0, max_bytes=1000) == ""
+    assert log.read_since(0, 7).text == "line 0\n"
+    assert log._indexed_size == 0  # pyright: ignore[reportPrivateUsage]
+
+
+async def test_follow_output_yields_appended_output_until_finished(runtime) -> None:
+    manager = runtime.background_tasks
+    store = manager.store
+    spec = TaskSpec(
+        id="b5555556",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="follow task",
+        tool_call_id="tool-follow",
+        command="echo hi",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    store.write_runtime(spec.id, TaskRuntime(status="running"))
+    output_path = store.output_path(spec.id)
+
+    async def _produce() -> None:
+        for text in ("one\n", "two\n"):
+            await asyncio.sleep(0.05)
+            with output_path.open("a", encoding="utf-8") as f:
+                f.write(text)
+        await asyncio.sleep(0.05)
+        store.write_runtime(spec.id, TaskRuntime(status="completed", exit_code=0))
+
+    producer = asyncio.create_task(_produce())
+    chunks = [chunk.text async for chunk in manager.follow_output(spec.id)]
+    await producer
+
+    assert "".join(chunks) == "one\ntwo\n"
+
+
+def test_read_output_lines_reports_eof(runtime) -> None:
+    manager = runtime.background_tasks
+    store = manager.store
+    spec = TaskSpec(
+        id="b5555557",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="lines task",
+        tool_call_id="tool-lines",
+        command="echo hi",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    store.output_path(spec.id).write_text("a\nb\nc\n", encoding="utf-8")
+
+    first = manager.read_output_lines(spec.id, start=0, count=2)
+    rest = manager.read_output_lines(spec.id, start=2, count=2)
+
+    assert (first.text, first.eof) == ("a\nb\n", False)
+    assert (rest.offset, rest.text, rest.eof) == (first.next_offset, "c\n", True)
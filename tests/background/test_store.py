@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import json
 import time
+from pathlib import Path
 
-from kimi_cli.background import BackgroundTaskStore, TaskSpec
+from kimi_cli.background import BackgroundTaskStore, TaskRuntime, TaskSpec
 
 
 def test_create_task_and_merge_view(runtime):
@@ -206,3 +207,42 @@ def test_list_views_uses_spec_created_at_when_runtime_is_corrupted(runtime):
     views = store.list_views()
 
     assert [view.spec.id for view in views] == ["b9999995", "b9999994"]
+
+
+def test_store_rereads_only_files_changed_on_disk(runtime, monkeypatch):
+    store = BackgroundTaskStore(runtime.session.context_file.parent / "tasks")
+    spec = TaskSpec(
+        id="b9999993",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="cached task",
+        tool_call_id="call-8",
+        command="echo ok",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    store.list_views()
+
+    # A worker process writes the runtime through its own store.
+    BackgroundTaskStore(store.root).write_runtime(spec.id, TaskRuntime(status="running"))
+
+    reads: list[str] = []
+    read_text = Path.read_text
+
+    def _counting_read_text(self: Path, *args, **kwargs) -> str:
+        reads.append(self.name)
+        return read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", _counting_read_text)
+
+    views = store.list_views()
+    assert [view.runtime.status for view in views] == ["running"]
+    assert reads == ["runtime.json"]
+
+    # Cached models are handed out as copies.
+    views[0].runtime.status = "failed"
+    assert store.merged_view(spec.id).runtime.status == "running"
+    assert reads == ["runtime.json"]
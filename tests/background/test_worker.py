@@ -11,6 +11,12 @@ from kimi_cli.background import (
     TaskSpec,
     run_background_task_worker,
 )
+from kimi_cli.background.control import (
+    WorkerControlServer,
+    control_socket_path,
+    send_control_command,
+    watch_worker,
+)
 from kimi_cli.background.worker import terminate_process_tree_windows
 
 
@@ -81,6 +87,123 @@ async def test_worker_respects_kill_control(runtime):
     assert view.runtime.failure_reason == "stop test"
 
 
+@pytest.mark.asyncio
+@pytest.mark.skipif(control_socket_path("b4444445") is None, reason="needs unix sockets")
+async def test_worker_control_socket_pushes_kill_and_completion(runtime):
+    store = BackgroundTaskStore(runtime.session.context_file.parent / "tasks")
+    spec = TaskSpec(
+        id="b4444445",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="sleep task",
+        tool_call_id="tool-5b",
+        command="sleep 5",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    control_socket = control_socket_path(spec.id)
+    assert control_socket is not None
+
+    # Polls far slower than the test runs: only the socket can deliver the kill in time.
+    worker_task = asyncio.create_task(
+        run_background_task_worker(
+            store.task_dir(spec.id),
+            heartbeat_interval_ms=60_000,
+            control_poll_interval_ms=60_000,
+            kill_grace_period_ms=50,
+            control_socket=control_socket,
+        )
+    )
+    while store.read_runtime(spec.id).status != "running":
+        await asyncio.sleep(0.01)
+    assert await send_control_command(control_socket, "ping") == "pong"
+    watcher = asyncio.create_task(watch_worker(control_socket))
+
+    store.write_control(
+        spec.id,
+        TaskControl(kill_requested_at=time.time(), kill_reason="stop test", force=False),
+    )
+    assert await send_control_command(control_socket, "kill") == "ok"
+
+    assert await asyncio.wait_for(watcher, timeout=5) is True
+    assert store.merged_view(spec.id).runtime.status == "killed"
+    await worker_task
+    assert not control_socket.exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(control_socket_path("b4444447") is None, reason="needs unix sockets")
+async def test_worker_heartbeats_only_once_its_control_socket_is_gone(runtime):
+    store = BackgroundTaskStore(runtime.session.context_file.parent / "tasks")
+    spec = TaskSpec(
+        id="b4444447",
+        kind="bash",
+        session_id=runtime.session.id,
+        description="sleep task",
+        tool_call_id="tool-5c",
+        command="sleep 5",
+        shell_name="bash",
+        shell_path="/bin/bash",
+        cwd=str(runtime.session.work_dir),
+        timeout_s=60,
+    )
+    store.create_task(spec)
+    control_socket = control_socket_path(spec.id)
+    assert control_socket is not None
+
+    worker_task = asyncio.create_task(
+        run_background_task_worker(
+            store.task_dir(spec.id),
+            heartbeat_interval_ms=50,
+            control_poll_interval_ms=20,
+            kill_grace_period_ms=50,
+            control_socket=control_socket,
+        )
+    )
+    while store.read_runtime(spec.id).status != "running":
+        await asyncio.sleep(0.01)
+    running = store.read_runtime(spec.id)
+    await asyncio.sleep(0.3)
+    # The socket answers, so runtime.json is left alone.
+    assert store.read_runtime(spec.id) == running
+
+    control_socket.unlink()
+    await asyncio.sleep(0.3)
+    current = store.read_runtime(spec.id)
+    assert current.heartbeat_at is not None and running.heartbeat_at is not None
+    assert current.heartbeat_at > running.heartbeat_at
+    assert current.control_socket is None
+
+    store.write_control(
+        spec.id,
+        TaskControl(kill_requested_at=time.time(), kill_reason="stop test", force=False),
+    )
+    await asyncio.wait_for(worker_task, timeout=5)
+    assert store.merged_view(spec.id).runtime.status == "killed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(control_socket_path("b4444446") is None, reason="needs unix sockets")
+async def test_control_server_refuses_shared_socket_directory(tmp_path):
+    shared = tmp_path / "kimi-bg"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    link = tmp_path / "kimi-bg-link"
+    link.symlink_to(target)
+
+    assert await WorkerControlServer.start(shared / "t.sock", on_kill=lambda: None) is None
+    assert await WorkerControlServer.start(link / "t.sock", on_kill=lambda: None) is None
+
+    server = await WorkerControlServer.start(tmp_path / "private" / "t.sock", on_kill=lambda: None)
+    assert server is not None
+    await server.close()
+
+
 @pytest.mark.asyncio
 async def test_worker_marks_timeout_as_failed(runtime):
     store = BackgroundTaskStore(runtime.session.context_file.parent / "tasks")
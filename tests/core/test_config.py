@@ -36,6 +36,8 @@ def test_default_config_dump():
                 "max_ralph_iterations": 0,
                 "reserved_context_size": 50000,
                 "compaction_trigger_ratio": 0.85,
+                "precompaction_trigger_ratio": 0.0,
+                "compaction_strategy": "simple",
             },
             "background": {
                 "max_running_tasks": 4,
@@ -53,6 +55,19 @@ def test_default_config_dump():
             "notifications": {
                 "claim_stale_after_ms": 15000,
             },
+            "context": {"durability": "flush"},
+            "http": {
+                "max_connections": 100,
+                "max_keepalive_connections": 20,
+                "keepalive_expiry_ms": 30000,
+                "http2": False,
+            },
+            "tokenizer": {"backend": "heuristic", "encoding": "o200k_base", "cache_dir": None},
+            "wire": {
+                "record_flush_bytes": 65536,
+                "record_flush_interval_ms": 1000,
+                "record_fsync": "never",
+            },
             "services": {"moonshot_search": None, "moonshot_fetch": None},
             "mcp": {"client": {"tool_call_timeout_ms": 60000}},
             "hooks": [],
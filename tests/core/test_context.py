@@ -439,3 +439,151 @@ async def test_system_prompt_is_first_line_in_file(tmp_path: Path) -> None:
     assert lines[1]["role"] == "user"
     assert lines[2]["role"] == "_checkpoint"
     assert lines[3]["role"] == "_usage"
+
+
+# --- group commit ---
+
+
+@pytest.mark.asyncio
+async def test_batch_commits_records_on_exit(tmp_path: Path) -> None:
+    path = tmp_path / "context.jsonl"
+    ctx = Context(file_backend=path)
+    await ctx.write_system_prompt("Prompt")
+
+    async with ctx.batch():
+        await ctx.checkpoint(add_user_message=False)
+        await ctx.append_message(Message(role="user", content=[TextPart(text="Hi")]))
+        await ctx.update_token_count(42)
+        assert [line["role"] for line in _read_lines(path)] == ["_system_prompt"]
+
+    assert [line["role"] for line in _read_lines(path)] == [
+        "_system_prompt",
+        "_checkpoint",
+        "user",
+        "_usage",
+    ]
+    await ctx.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_commits_on_exception_and_explicit_commit(tmp_path: Path) -> None:
+    path = tmp_path / "context.jsonl"
+    ctx = Context(file_backend=path, durability="fsync")
+
+    with pytest.raises(RuntimeError):
+        async with ctx.batch():
+            await ctx.checkpoint(add_user_message=False)
+            await ctx.commit()
+            assert [line["role"] for line in _read_lines(path)] == ["_checkpoint"]
+            await ctx.append_message(Message(role="user", content=[TextPart(text="Hi")]))
+            raise RuntimeError("step failed")
+
+    assert [line["role"] for line in _read_lines(path)] == ["_checkpoint", "user"]
+    await ctx.close()
+
+
+@pytest.mark.asyncio
+async def test_revert_and_clear_commit_pending_records_first(tmp_path: Path) -> None:
+    path = tmp_path / "context.jsonl"
+    ctx = Context(file_backend=path)
+
+    async with ctx.batch():
+        await ctx.checkpoint(add_user_message=False)
+        await ctx.append_message(Message(role="user", content=[TextPart(text="Keep")]))
+        await ctx.checkpoint(add_user_message=False)
+        await ctx.append_message(Message(role="user", content=[TextPart(text="Drop")]))
+        await ctx.revert_to(1)
+
+    assert [m.extract_text() for m in ctx.history] == ["Keep"]
+    await ctx.append_message(Message(role="user", content=[TextPart(text="After")]))
+
+    restored = Context(file_backend=path)
+    await restored.restore()
+    assert [m.extract_text() for m in restored.history] == ["Keep", "After"]
+
+    await ctx.clear()
+    await ctx.append_message(Message(role="user", content=[TextPart(text="Fresh")]))
+    assert [line["role"] for line in _read_lines(path)] == ["user"]
+    await ctx.close()
+
+
+# --- checkpoint index ---
+
+
+async def _build_context_with_checkpoints(path: Path) -> Context:
+    ctx = Context(file_backend=path)
+    await ctx.write_system_prompt("Prompt")
+    for i in range(3):
+        await ctx.checkpoint(add_user_message=True)
+        await ctx.append_message(Message(role="user", content=[TextPart(text=f"Question {i}")]))
+        await ctx.update_token_count(100 * (i + 1))
+        await ctx.append_message(Message(role="assistant", content=[TextPart(text=f"Answer {i}")]))
+    return ctx
+
+
+@pytest.mark.asyncio
+async def test_revert_with_index_truncates_file_at_checkpoint(tmp_path: Path) -> None:
+    path = tmp_path / "context.jsonl"
+    ctx = await _build_context_with_checkpoints(path)
+    before_revert = path.read_bytes()
+    cut = before_revert.index(b'{"role": "_checkpoint", "id": 2}')
+    expected_prefix = before_revert[:cut]
+    inode = path.stat().st_ino
+
+    def _no_reparse(*args: object, **kwargs: object) -> None:
+        raise AssertionError("revert_to should not re-parse the context file")
+
+    ctx._load_sync = _no_reparse  # type: ignore[method-assign]
+    await ctx.revert_to(2)
+
+    assert path.read_bytes() == expected_prefix
+    assert path.stat().st_ino == inode  # truncated in place
+    assert (tmp_path / "context_1.jsonl").read_bytes() == before_revert[cut:]
+    assert ctx.n_checkpoints == 2
+    assert ctx.token_count == 200
+    assert [m.extract_text() for m in ctx.history][-2:] == ["Question 1", "Answer 1"]
+
+    restored = Context(file_backend=path)
+    await restored.restore()
+    assert restored.history == ctx.history
+    assert restored.token_count == ctx.token_count
+    assert restored.token_count_with_pending == ctx.token_count_with_pending
+    assert restored.n_checkpoints == ctx.n_checkpoints
+
+
+@pytest.mark.asyncio
+async def test_restore_rebuilds_index_and_appends_keep_it_current(tmp_path: Path) -> None:
+    path = tmp_path / "context.jsonl"
+    await (await _build_context_with_checkpoints(path)).close()
+
+    ctx = Context(file_backend=path)
+    await ctx.restore()
+    await ctx.checkpoint(add_user_message=False)
+    await ctx.append_message(Message(role="user", content=[TextPart(text="Later")]))
+
+    reference = Context(file_backend=tmp_path / "reference.jsonl")
+    (tmp_path / "reference.jsonl").write_bytes(path.read_bytes())
+    await reference.restore()
+    await reference.revert_to(3)
+
+    ctx._load_sync = None  # type: ignore[assignment]
+    await ctx.revert_to(3)
+    assert ctx.history == reference.history
+    assert path.read_bytes() == (tmp_path / "reference.jsonl").read_bytes()
+    await ctx.revert_to(0)
+    assert [m.extract_text() for m in ctx.history] == []
+
+
+@pytest.mark.asyncio
+async def test_revert_falls_back_when_index_is_stale(tmp_path: Path) -> None:
+    path = tmp_path / "context.jsonl"
+    ctx = await _build_context_with_checkpoints(path)
+    await ctx.close()
+    # Another writer rewrote the file behind our back, shifting every offset.
+    content = path.read_text(encoding="utf-8")
+    path.write_text("\n\n" + content, encoding="utf-8")
+
+    await ctx.revert_to(1)
+
+    assert [m.extract_text() for m in ctx.history][-2:] == ["Question 0", "Answer 0"]
+    assert _read_lines(path)[-1]["role"] == "assistant"
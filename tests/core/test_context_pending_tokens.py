@@ -426,3 +426,32 @@ async def test_multiple_update_cycles(tmp_path: Path) -> None:
     # Cycle 3: Another API call
     await ctx.update_token_count(60_000)
     assert ctx.token_count_with_pending == 60_000  # pending reset again
+
+
+# --- Range estimates ---
+
+
+@pytest.mark.asyncio
+async def test_estimate_tokens_tracks_append_revert_and_clear(tmp_path: Path) -> None:
+    ctx = Context(file_backend=tmp_path / "ctx.jsonl")
+    (tmp_path / "ctx.jsonl").touch()
+
+    msgs = [_msg("user", "a" * 400), _msg("assistant", "b" * 200), _msg("user", "c" * 40)]
+    await ctx.append_message(msgs[:2])
+    await ctx.checkpoint(add_user_message=False)
+    await ctx.append_message(msgs[2])
+
+    assert ctx.estimate_tokens() == estimate_text_tokens(msgs)
+    assert ctx.estimate_tokens(1) == estimate_text_tokens(msgs[1:])
+    assert ctx.estimate_tokens(-1) == estimate_text_tokens(msgs[2:])
+    assert ctx.estimate_tokens(0, 2) == estimate_text_tokens(msgs[:2])
+
+    await ctx.revert_to(0)
+    assert ctx.estimate_tokens() == estimate_text_tokens(msgs[:2])
+
+    restored = Context(file_backend=tmp_path / "ctx.jsonl")
+    await restored.restore()
+    assert restored.estimate_tokens(1) == estimate_text_tokens(msgs[1:2])
+
+    await ctx.clear()
+    assert ctx.estimate_tokens() == 0
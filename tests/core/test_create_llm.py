@@ -542,3 +542,34 @@ def test_create_llm_kimi_thinking_keep_injected_on_explicit_thinking_true(monkey
     assert llm.chat_provider.model_parameters.get("extra_body") == snapshot(
         {"thinking": {"type": "enabled", "keep": "all"}}
     )
+
+
+def test_create_llm_shares_http_client_per_origin():
+    from kosong.contrib.chat_provider.anthropic import Anthropic
+
+    kimi_provider = LLMProvider(
+        type="kimi", base_url="https://api.test/v1", api_key=SecretStr("test-key")
+    )
+    other_provider = LLMProvider(
+        type="anthropic", base_url="https://other.test", api_key=SecretStr("test-key")
+    )
+    model = LLMModel(provider="kimi", model="kimi-base", max_context_size=4096)
+
+    llm1 = create_llm(kimi_provider, model)
+    llm2 = create_llm(kimi_provider, model)
+    llm3 = create_llm(other_provider, model)
+    assert llm1 is not None and llm2 is not None and llm3 is not None
+    assert isinstance(llm1.chat_provider, Kimi)
+    assert isinstance(llm2.chat_provider, Kimi)
+    assert isinstance(llm3.chat_provider, Anthropic)
+
+    pool = llm1.chat_provider.client._client
+    assert llm2.chat_provider.client._client is pool
+    assert llm3.chat_provider._client._client is not pool
+
+    # recovering from a connection error rebuilds the SDK client around the same pool
+    old_client = llm1.chat_provider.client
+    assert llm1.chat_provider.on_retryable_error(RuntimeError("connection reset"))
+    assert llm1.chat_provider.client is not old_client
+    assert llm1.chat_provider.client._client is pool
+    assert not pool.is_closed
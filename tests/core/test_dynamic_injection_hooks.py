@@ -70,6 +70,7 @@ def _make_compactable_soul() -> Any:
     runtime.role = "non-root"  # skip active-task-snapshot branch
     runtime.background_tasks = MagicMock()
     soul._runtime = runtime
+    soul._precompaction = None
 
     ctx = MagicMock()
     ctx.token_count = 10_000
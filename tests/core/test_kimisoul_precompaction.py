@@ -0,0 +1,121 @@
+"""Tests for speculative background compaction in KimiSoul."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from pathlib import Path
+from unittest.mock import patch
+
+from kosong.message import Message
+from kosong.tooling.empty import EmptyToolset
+
+from kimi_cli.llm import LLM
+from kimi_cli.soul.agent import Agent, Runtime
+from kimi_cli.soul.compaction import CompactionResult
+from kimi_cli.soul.context import Context
+from kimi_cli.soul.kimisoul import KimiSoul
+from kimi_cli.wire.types import TextPart
+
+
+def _msg(role: str, text: str) -> Message:
+    return Message(role=role, content=[TextPart(text=text)])  # type: ignore[arg-type]
+
+
+class _GatedCompaction:
+    """Keeps the last two messages behind a summary once `release` is set."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def compact(
+        self, messages: Sequence[Message], llm: LLM, *, custom_instruction: str = ""
+    ) -> CompactionResult:
+        self.calls += 1
+        await self.release.wait()
+        return CompactionResult(messages=[_msg("user", "summary"), *messages[-2:]], usage=None)
+
+
+async def _make_soul(runtime: Runtime, tmp_path: Path) -> tuple[KimiSoul, _GatedCompaction]:
+    runtime.config.loop_control.precompaction_trigger_ratio = 0.01
+    agent = Agent(
+        name="Test Agent",
+        system_prompt="Test system prompt.",
+        toolset=EmptyToolset(),
+        runtime=runtime,
+    )
+    context = Context(file_backend=tmp_path / "history.jsonl")
+    soul = KimiSoul(agent, context=context)
+    compaction = _GatedCompaction()
+    soul._compaction = compaction  # pyright: ignore[reportPrivateUsage]
+
+    await context.append_message(
+        [_msg("user", "q1"), _msg("assistant", "a1"), _msg("user", "q2"), _msg("assistant", "a2")]
+    )
+    await context.update_token_count(5_000)
+    return soul, compaction
+
+
+async def test_precompaction_is_applied_with_appended_messages(
+    runtime: Runtime, tmp_path: Path
+) -> None:
+    soul, compaction = await _make_soul(runtime, tmp_path)
+    context = soul.context
+
+    with patch("kimi_cli.soul.kimisoul.wire_send"):
+        await soul._precompact_if_needed()  # pyright: ignore[reportPrivateUsage]
+        await asyncio.sleep(0)
+        assert compaction.calls == 1
+
+        await context.append_message(_msg("user", "q3"))
+        # still running: the next step goes on with the full history
+        await soul._precompact_if_needed()  # pyright: ignore[reportPrivateUsage]
+        assert len(context.history) == 5
+
+        compaction.release.set()
+        await asyncio.sleep(0)
+        await soul._precompact_if_needed()  # pyright: ignore[reportPrivateUsage]
+
+    assert [m.extract_text() for m in context.history] == ["summary", "q2", "a2", "q3"]
+    assert compaction.calls == 1
+
+
+async def test_precompaction_is_discarded_after_revert(runtime: Runtime, tmp_path: Path) -> None:
+    soul, compaction = await _make_soul(runtime, tmp_path)
+    context = soul.context
+    await context.checkpoint(add_user_message=False)
+    await context.append_message(_msg("user", "q3"))
+
+    with (
+        patch("kimi_cli.soul.kimisoul.wire_send"),
+        patch.object(soul.hook_engine, "trigger") as trigger,
+    ):
+        await soul._precompact_if_needed()  # pyright: ignore[reportPrivateUsage]
+        precompaction = soul._precompaction  # pyright: ignore[reportPrivateUsage]
+        assert precompaction is not None
+        await context.revert_to(0)
+        # Dropped without waiting for the compaction, which is never released.
+        applied = await soul._apply_precompaction(wait=True)  # pyright: ignore[reportPrivateUsage]
+
+    assert not applied
+    assert precompaction.task.cancelled()
+    trigger.assert_not_called()
+    assert [m.extract_text() for m in context.history] == ["q1", "a1", "q2", "a2"]
+
+
+async def test_manual_compaction_cancels_precompaction(runtime: Runtime, tmp_path: Path) -> None:
+    soul, compaction = await _make_soul(runtime, tmp_path)
+
+    with patch("kimi_cli.soul.kimisoul.wire_send"):
+        await soul._precompact_if_needed()  # pyright: ignore[reportPrivateUsage]
+        precompaction = soul._precompaction  # pyright: ignore[reportPrivateUsage]
+        assert precompaction is not None
+        await asyncio.sleep(0)
+        compaction.release.set()
+        await soul.compact_context(manual=True)
+
+    assert precompaction.task.cancelled()
+    assert soul._precompaction is None  # pyright: ignore[reportPrivateUsage]
+    assert compaction.calls == 2
+    assert [m.extract_text() for m in soul.context.history] == ["summary", "q2", "a2"]
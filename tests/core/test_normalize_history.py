@@ -1,10 +1,10 @@
-"""Tests for normalize_history in the dynamic_injection module."""
+"""Tests for normalize_history and HistoryNormalizer in the dynamic_injection module."""
 
 from __future__ import annotations
 
 from kosong.message import ContentPart, Message, TextPart
 
-from kimi_cli.soul.dynamic_injection import normalize_history
+from kimi_cli.soul.dynamic_injection import HistoryNormalizer, normalize_history
 
 
 def _text(part: ContentPart) -> str:
@@ -123,3 +123,44 @@ def test_notification_messages_not_merged_with_user_messages() -> None:
     ]
     result = normalize_history(msgs)
     assert len(result) == 2
+
+
+def test_incremental_normalizer_matches_full_normalization() -> None:
+    history = [
+        Message(role="user", content=[TextPart(text="A")]),
+        Message(role="user", content=[TextPart(text="B")]),
+    ]
+    normalizer = HistoryNormalizer()
+    first = normalizer.normalize(history)
+    assert first == normalize_history(history)
+
+    history.append(Message(role="assistant", content=[TextPart(text="X")]))
+    second = normalizer.normalize(history)
+    assert second == normalize_history(history)
+    # the unchanged merged message is reused rather than rebuilt
+    assert second[0] is first[0]
+
+    history.append(Message(role="user", content=[TextPart(text="C")]))
+    history.append(Message(role="user", content=[TextPart(text="D")]))
+    third = normalizer.normalize(history)
+    assert third == normalize_history(history)
+    assert third[0] is first[0]
+
+
+def test_incremental_normalizer_handles_revert_and_replacement() -> None:
+    history = [
+        Message(role="user", content=[TextPart(text="A")]),
+        Message(role="assistant", content=[TextPart(text="X")]),
+        Message(role="user", content=[TextPart(text="B")]),
+        Message(role="user", content=[TextPart(text="C")]),
+    ]
+    normalizer = HistoryNormalizer()
+    normalizer.normalize(history)
+
+    reverted = history[:3]
+    result = normalizer.normalize(reverted)
+    assert result == normalize_history(reverted)
+    assert result[2] is history[2]
+
+    compacted = [Message(role="user", content=[TextPart(text="summary")])]
+    assert normalizer.normalize(compacted) == compacted
@@ -76,7 +76,7 @@ def _patch_create_deps(monkeypatch, *, session_plan_mode: bool = False):
         "load_agent",
         AsyncMock(return_value=SimpleNamespace(name="test", system_prompt="sp")),
     )
-    monkeypatch.setattr(app_module, "Context", lambda _path: fake_context)
+    monkeypatch.setattr(app_module, "Context", lambda _path, **_kwargs: fake_context)
     monkeypatch.setattr(app_module, "KimiSoul", FakeSoul)
 
     return FakeSoul, runtime_create_calls
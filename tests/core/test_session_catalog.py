@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+from kaos.path import KaosPath
+
+from kimi_cli import session_catalog
+from kimi_cli.metadata import WorkDirMeta, load_metadata, save_metadata
+from kimi_cli.session_catalog import SessionCatalog, work_dir_hash
+from kimi_cli.session_state import SessionState, save_session_state
+from kimi_cli.wire.file import WireFileMetadata, WireMessageRecord
+from kimi_cli.wire.protocol import WIRE_PROTOCOL_VERSION
+from kimi_cli.wire.types import TextPart, TurnBegin, TurnEnd
+
+
+@pytest.fixture
+def share_dir(monkeypatch, tmp_path: Path) -> Path:
+    share_dir = tmp_path / "share"
+    share_dir.mkdir()
+
+    def _get_share_dir() -> Path:
+        share_dir.mkdir(parents=True, exist_ok=True)
+        return share_dir
+
+    monkeypatch.setattr("kimi_cli.share.get_share_dir", _get_share_dir)
+    monkeypatch.setattr("kimi_cli.metadata.get_share_dir", _get_share_dir)
+    return share_dir
+
+
+@pytest.fixture
+def work_dir_meta(share_dir: Path, tmp_path: Path) -> WorkDirMeta:
+    metadata = load_metadata()
+    wd = metadata.new_work_dir_meta(KaosPath.unsafe_from_local_path(tmp_path / "work"))
+    save_metadata(metadata)
+    return wd
+
+
+@pytest.fixture
+def catalog(share_dir: Path):
+    catalog = SessionCatalog(share_dir / "sessions.db", share_dir / "sessions")
+    yield catalog
+    catalog.close()
+
+
+def _append_turn(session_dir: Path, text: str) -> None:
+    wire_file = session_dir / "wire.jsonl"
+    lines: list[str] = []
+    if not wire_file.exists():
+        metadata = WireFileMetadata(protocol_version=WIRE_PROTOCOL_VERSION)
+        lines.append(metadata.model_dump_json())
+    for msg in (TurnBegin(user_input=[TextPart(text=text)]), TurnEnd()):
+        lines.append(
+            WireMessageRecord.from_wire_message(msg, timestamp=time.time()).model_dump_json()
+        )
+    with wire_file.open("a", encoding="utf-8") as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+def _make_session(wd: WorkDirMeta, session_id: str, *turns: str, mtime: float) -> Path:
+    session_dir = wd.sessions_dir / session_id
+    session_dir.mkdir()
+    context_file = session_dir / "context.jsonl"
+    context_file.write_text(
+        "".join(json.dumps({"role": "user", "content": t}) + "\n" for t in turns),
+        encoding="utf-8",
+    )
+    for text in turns:
+        _append_turn(session_dir, text)
+    _set_mtime(session_dir, mtime)
+    return session_dir
+
+
+def _set_mtime(session_dir: Path, mtime: float) -> None:
+    # Files older than the racy window are trusted not to change while mtime and size hold
+    for path in session_dir.iterdir():
+        os.utime(path, (mtime, mtime))
+
+
+def test_sync_indexes_sessions(catalog: SessionCatalog, work_dir_meta: WorkDirMeta) -> None:
+    now = time.time()
+    old = _make_session(work_dir_meta, "old", "fix the parser", "and the tests", mtime=now - 60)
+    new = _make_session(work_dir_meta, "new", "write docs", mtime=now - 30)
+    empty = work_dir_meta.sessions_dir / "empty"
+    empty.mkdir()
+    (empty / "context.jsonl").write_text(json.dumps({"role": "_system_prompt"}) + "\n")
+
+    catalog.sync()
+
+    entries = catalog.list_sessions(empty=False)
+    assert [e.session_id for e in entries] == ["new", "old"]
+    assert entries[1].turns == 2
+    assert entries[1].title(50) == "fix the parser"
+    assert entries[1].work_dir == work_dir_meta.path
+    assert entries[1].work_dir_hash == work_dir_hash(work_dir_meta)
+    assert entries[1].updated_at == pytest.approx(now - 60)
+    empty_entry = catalog.get(empty)
+    assert empty_entry is not None and empty_entry.is_empty
+
+    assert [e.session_id for e in catalog.list_sessions(empty=False, query="DOCS")] == ["new"]
+    assert len(catalog.list_sessions(empty=False, query=Path(work_dir_meta.path).name)) == 2
+    assert [e.session_id for e in catalog.list_sessions(empty=False, offset=1, limit=5)] == ["old"]
+
+    save_session_state(SessionState(archived=True, custom_title="Archived"), old)
+    catalog.sync()
+    archived = catalog.list_sessions(archived=True)
+    assert [(e.session_id, e.title(50)) for e in archived] == [("old", "Archived")]
+    assert [e.session_id for e in catalog.list_sessions(archived=False, empty=False)] == ["new"]
+
+    shutil.rmtree(new)
+    catalog.sync()
+    assert catalog.get(new) is None
+
+
+def test_sync_reads_only_changes(
+    catalog: SessionCatalog, work_dir_meta: WorkDirMeta, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = time.time()
+    session_dir = _make_session(work_dir_meta, "s", "first", mtime=now - 60)
+    _make_session(work_dir_meta, "other", "other", mtime=now - 60)
+    catalog.sync()
+
+    states_loaded: list[Path] = []
+    scanned_from: list[int] = []
+    original_scan = session_catalog._WireScan.scan
+
+    def load_state(path: Path) -> SessionState:
+        states_loaded.append(path)
+        return SessionState()
+
+    def scan(self: session_catalog._WireScan, path: Path, size: int) -> session_catalog._WireScan:
+        scanned_from.append(self.offset)
+        return original_scan(self, path, size)
+
+    monkeypatch.setattr(session_catalog, "load_session_state", load_state)
+    monkeypatch.setattr(session_catalog._WireScan, "scan", scan)
+
+    catalog.sync()
+    assert states_loaded == []
+    assert scanned_from == []
+
+    offset = (session_dir / "wire.jsonl").stat().st_size
+    _append_turn(session_dir, "second")
+    _set_mtime(session_dir, now - 50)
+    catalog.sync()
+
+    assert states_loaded == []
+    assert scanned_from == [offset]
+    entry = catalog.get(session_dir)
+    assert entry is not None
+    assert entry.turns == 2
+    assert entry.first_input == "first"
+
+
+def _append_records(session_dir: Path, *messages: tuple[float, str, dict[str, object]]) -> None:
+    with (session_dir / "wire.jsonl").open("a", encoding="utf-8") as f:
+        for timestamp, type_, payload in messages:
+            record = {"timestamp": timestamp, "message": {"type": type_, "payload": payload}}
+            f.write(json.dumps(record) + "\n")
+
+
+def test_session_stats_follow_appended_records(
+    catalog: SessionCatalog, work_dir_meta: WorkDirMeta
+) -> None:
+    now = time.time()
+    session_dir = _make_session(work_dir_meta, "s", mtime=now - 60)
+    tool_call = {"type": "function", "id": "call-1", "function": {"name": "Shell"}}
+    usage = {"input_other": 10, "input_cache_read": 5, "output": 3}
+    _append_records(
+        session_dir,
+        (1000.0, "TurnBegin", {"user_input": "run it"}),
+        (1001.0, "ToolCall", tool_call),
+        (1002.0, "StatusUpdate", {"token_usage": usage}),
+    )
+    _set_mtime(session_dir, now - 60)
+    catalog.sync()
+
+    [stats] = catalog.session_stats()
+    assert (stats.turns, stats.input_tokens, stats.output_tokens) == (1, 15, 3)
+    assert (stats.first_timestamp, stats.last_timestamp) == (1000.0, 1002.0)
+    assert stats.tool_usage == {"Shell": [1, 0]}
+    assert stats.work_dir == work_dir_meta.path
+
+    # The result of the call pending in the scanned part is attributed to it.
+    subagent_turn: dict[str, object] = {
+        "event": {"type": "TurnBegin", "payload": {"user_input": "sub"}}
+    }
+    _append_records(
+        session_dir,
+        (1010.0, "ToolResult", {"tool_call_id": "call-1", "return_value": {"is_error": True}}),
+        (1011.0, "SubagentEvent", subagent_turn),
+    )
+    _set_mtime(session_dir, now - 50)
+    catalog.sync()
+
+    [stats] = catalog.session_stats()
+    assert stats.turns == 2
+    assert (stats.first_timestamp, stats.last_timestamp) == (1000.0, 1011.0)
+    assert stats.tool_usage == {"Shell": [1, 1]}
+    entry = catalog.get(session_dir)
+    assert entry is not None and entry.turns == 1
+
+
+def test_corrupted_catalog_is_rebuilt(share_dir: Path, work_dir_meta: WorkDirMeta) -> None:
+    path = share_dir / "sessions.db"
+    path.write_bytes(b"not a database" * 100)
+    _make_session(work_dir_meta, "s", "hello", mtime=time.time() - 60)
+
+    catalog = SessionCatalog(path, share_dir / "sessions")
+    try:
+        catalog.sync()
+        assert catalog.path == path
+        assert [e.session_id for e in catalog.list_sessions()] == ["s"]
+    finally:
+        catalog.close()
+
+
+def test_locked_catalog_is_retried_then_raises(
+    share_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    opened: list[Path | str] = []
+    original_open = SessionCatalog._open
+
+    def open_locked(path: Path | str) -> sqlite3.Connection:
+        opened.append(path)
+        if len(opened) < 3:
+            error = sqlite3.OperationalError("database is locked")
+            error.sqlite_errorcode = sqlite3.SQLITE_BUSY
+            raise error
+        return original_open(path)
+
+    monkeypatch.setattr(SessionCatalog, "_open", staticmethod(open_locked))
+    monkeypatch.setattr(session_catalog.time, "sleep", lambda _: None)
+    path = share_dir / "sessions.db"
+
+    catalog = SessionCatalog(path, share_dir / "sessions")
+    catalog.close()
+    assert opened == [path] * 3
+    assert catalog.path == path
+
+    opened.clear()
+    monkeypatch.setattr(session_catalog, "CONNECT_ATTEMPTS", 2)
+    with pytest.raises(sqlite3.OperationalError):
+        SessionCatalog(path, share_dir / "sessions")
+    assert ":memory:" not in opened
+
+
+def test_find_indexes_new_and_changed_sessions(
+    catalog: SessionCatalog, work_dir_meta: WorkDirMeta
+) -> None:
+    now = time.time()
+    session_dir = _make_session(work_dir_meta, "s", "first", mtime=now - 60)
+
+    # Not synced yet
+    entry = catalog.find("s")
+    assert entry is not None and entry.session_dir == session_dir and entry.turns == 1
+
+    save_session_state(SessionState(custom_title="Renamed"), session_dir)
+    entry = catalog.find("s")
+    assert entry is not None and entry.title(50) == "Renamed"
+
+    shutil.rmtree(session_dir)
+    assert catalog.find("s") is None
+    assert catalog.get(session_dir) is None
+    assert catalog.find("missing") is None
+
+
+def test_list_sessions_filters_work_dirs_and_ids_before_the_limit(
+    catalog: SessionCatalog, work_dir_meta: WorkDirMeta
+) -> None:
+    now = time.time()
+    _make_session(work_dir_meta, "not-a-uuid", "a", mtime=now - 10)
+    for i in range(3):
+        _make_session(
+            work_dir_meta, f"{i}0000000-0000-4000-8000-000000000000", "b", mtime=now - 60 + i
+        )
+    catalog.sync()
+    uuid_glob = "-".join("[0-9a-f]" * n for n in (8, 4, 4, 4, 12))
+
+    page = catalog.list_sessions(
+        work_dir_hashes=[work_dir_hash(work_dir_meta)], session_id_glob=uuid_glob, limit=2
+    )
+    assert [e.session_id[0] for e in page] == ["2", "1"]
+    assert catalog.list_sessions(work_dir_hashes=[]) == []
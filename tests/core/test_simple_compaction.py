@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+
+import pytest
 from inline_snapshot import snapshot
 from kosong.chat_provider import TokenUsage
-from kosong.message import AudioURLPart, ImageURLPart, Message, VideoURLPart
+from kosong.chat_provider.mock import MockChatProvider, MockStreamedMessage
+from kosong.message import AudioURLPart, ImageURLPart, Message, ToolCall, VideoURLPart
 
 import kimi_cli.prompts as prompts
-from kimi_cli.soul.compaction import CompactionResult, SimpleCompaction, should_auto_compact
+from kimi_cli.llm import LLM
+from kimi_cli.soul.compaction import (
+    ChunkedCompaction,
+    CompactionResult,
+    SimpleCompaction,
+    should_auto_compact,
+)
 from kimi_cli.wire.types import TextPart, ThinkPart
 
 
@@ -274,3 +284,168 @@ def test_prepare_preserves_media_parts_in_recent_messages():
     # Preserved messages should keep their media parts intact
     preserved_user_msg = result.to_preserve[0]
     assert any(isinstance(p, VideoURLPart) for p in preserved_user_msg.content)
+
+
+def test_prepare_stops_preserving_at_token_budget():
+    messages = [
+        Message(role="user", content=[TextPart(text="Old question")]),
+        Message(role="assistant", content=[TextPart(text="Old answer")]),
+        Message(role="user", content=[TextPart(text="a" * 400)]),
+        Message(role="assistant", content=[TextPart(text="Latest answer")]),
+        Message(role="tool", content=[TextPart(text="b" * 40)], tool_call_id="call_1"),
+    ]
+
+    result = SimpleCompaction(max_preserved_messages=2, max_preserved_tokens=50).prepare(messages)
+
+    assert result.compact_message is not None
+    assert result.to_preserve == messages[3:]
+
+
+def test_prepare_token_budget_not_reached_keeps_message_count():
+    messages = [
+        Message(role="user", content=[TextPart(text="Latest question")]),
+        Message(role="assistant", content=[TextPart(text="Latest answer")]),
+    ]
+
+    result = SimpleCompaction(max_preserved_messages=2, max_preserved_tokens=1000).prepare(messages)
+
+    assert result.compact_message is None
+    assert result.to_preserve == messages
+
+
+# --- ChunkedCompaction ---
+
+
+class _RecordingChatProvider(MockChatProvider):
+    """Answers every compaction call with a numbered summary and records the inputs."""
+
+    def __init__(self, summary_chars: int = 0) -> None:
+        super().__init__([])
+        self.inputs: list[str] = []
+        self.summary_chars = summary_chars
+
+    async def generate(self, system_prompt, tools, history) -> MockStreamedMessage:
+        self.inputs.append(history[-1].extract_text())
+        padding = " " + "s" * self.summary_chars if self.summary_chars else ""
+        return MockStreamedMessage([TextPart(text=f"summary {len(self.inputs)}{padding}")])
+
+
+def _chunked_llm(provider: _RecordingChatProvider, max_context_size: int) -> LLM:
+    return LLM(
+        chat_provider=provider,
+        max_context_size=max_context_size,
+        capabilities=set(),
+    )
+
+
+def _conversation(n_turns: int, chars: int) -> list[Message]:
+    messages: list[Message] = []
+    for i in range(n_turns):
+        messages.append(Message(role="user", content=[TextPart(text=f"q{i} " + "a" * chars)]))
+        messages.append(Message(role="assistant", content=[TextPart(text=f"r{i} " + "b" * chars)]))
+    return messages
+
+
+async def test_chunked_compaction_single_chunk_uses_one_call():
+    provider = _RecordingChatProvider()
+    messages = _conversation(3, 40)
+
+    result = await ChunkedCompaction().compact(messages, _chunked_llm(provider, 100_000))
+
+    assert len(provider.inputs) == 1
+    assert result.messages[1:] == messages[-2:]
+    assert result.messages[0].extract_text().endswith("summary 1")
+
+
+async def test_chunked_compaction_maps_and_reduces():
+    provider = _RecordingChatProvider()
+    # 10 turns of 96 tokens per message, with chunks of 300 tokens: 3 messages per chunk
+    messages = _conversation(10, 380)
+
+    result = await ChunkedCompaction(chunk_ratio=0.3, preserved_ratio=0.3).compact(
+        messages, _chunked_llm(provider, 1_000)
+    )
+
+    map_inputs = [text for text in provider.inputs if "## Message" in text]
+    assert len(map_inputs) == 6
+    assert map_inputs[0].startswith("The following is part 1 of 6")
+    assert "## Message 17" in map_inputs[-1]
+    merge_input = provider.inputs[-1]
+    assert "## Summary 1\nsummary" in merge_input
+    assert len(provider.inputs) == 7
+    assert result.messages[0].extract_text().endswith("summary 7")
+    assert result.messages[1:] == messages[-2:]
+
+
+async def test_chunked_compaction_includes_tool_calls_and_media_placeholders():
+    provider = _RecordingChatProvider()
+    messages = [
+        Message(
+            role="user",
+            content=[
+                TextPart(text="Look:"),
+                ImageURLPart(image_url=ImageURLPart.ImageURL(url="data:image/png;base64,IMG")),
+            ],
+        ),
+        Message(
+            role="assistant",
+            content=[TextPart(text="Listing.")],
+            tool_calls=[
+                ToolCall(id="c1", function=ToolCall.FunctionBody(name="Shell", arguments="{}"))
+            ],
+        ),
+        Message(role="tool", content=[TextPart(text="file.txt")], tool_call_id="c1"),
+        Message(role="user", content=[TextPart(text="Latest question")]),
+        Message(role="assistant", content=[TextPart(text="Latest answer")]),
+    ]
+
+    await ChunkedCompaction().compact(messages, _chunked_llm(provider, 100_000))
+
+    assert "[image_url omitted]" in provider.inputs[0]
+    assert "[Tool call Shell: {}]" in provider.inputs[0]
+
+
+async def test_chunked_compaction_passes_a_lone_summary_to_the_next_round():
+    # summaries of about 120 tokens, two of which fit into a chunk of 300 tokens
+    provider = _RecordingChatProvider(summary_chars=470)
+    messages = _conversation(5, 380)
+
+    result = await ChunkedCompaction(chunk_ratio=0.3, preserved_ratio=0.3).compact(
+        messages, _chunked_llm(provider, 1_000)
+    )
+
+    # 3 chunks, 1 merge of the first two summaries, then the final merge with the third
+    assert len(provider.inputs) == 5
+    assert "## Summary 1\nsummary 1" in provider.inputs[3]
+    assert "summary 3" not in provider.inputs[3]
+    assert "## Summary 1\nsummary 4" in provider.inputs[4]
+    assert "## Summary 2\nsummary 3" in provider.inputs[4]
+    assert "summary 5" in result.messages[0].extract_text()
+
+
+async def test_chunked_compaction_cancels_sibling_calls_when_one_fails():
+    cancelled: list[str] = []
+
+    class _FailingChatProvider(_RecordingChatProvider):
+        async def generate(self, system_prompt, tools, history) -> MockStreamedMessage:
+            text = history[-1].extract_text()
+            if "part 1 of" in text:
+                raise ValueError("compaction failed")
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(text)
+                raise
+            return await super().generate(system_prompt, tools, history)
+
+    provider = _FailingChatProvider()
+    messages = _conversation(10, 380)
+
+    with pytest.raises(ValueError, match="compaction failed"):
+        await ChunkedCompaction(chunk_ratio=0.3, preserved_ratio=0.3).compact(
+            messages, _chunked_llm(provider, 1_000)
+        )
+
+    # the other chunks that were running are cancelled instead of left to finish
+    assert cancelled
+    assert provider.inputs == []
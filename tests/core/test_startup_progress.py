@@ -93,7 +93,7 @@ async def test_kimi_cli_create_reports_startup_phases(session, config, monkeypat
     monkeypatch.setattr(app_module, "create_llm", lambda *args, **kwargs: None)
     monkeypatch.setattr(app_module.Runtime, "create", fake_runtime_create)
     monkeypatch.setattr(app_module, "load_agent", fake_load_agent)
-    monkeypatch.setattr(app_module, "Context", lambda _path: fake_context)
+    monkeypatch.setattr(app_module, "Context", lambda _path, **_kwargs: fake_context)
 
     class _FakeSoul:
         def __init__(self, agent, context):
@@ -158,7 +158,7 @@ async def test_kimi_cli_create_cleans_stale_running_foreground_subagents(
     monkeypatch.setattr(app_module, "create_llm", lambda *args, **kwargs: None)
     monkeypatch.setattr(app_module.Runtime, "create", fake_runtime_create)
     monkeypatch.setattr(app_module, "load_agent", fake_load_agent)
-    monkeypatch.setattr(app_module, "Context", lambda _path: fake_context)
+    monkeypatch.setattr(app_module, "Context", lambda _path, **_kwargs: fake_context)
 
     class _FakeSoul:
         def __init__(self, agent, context):
@@ -0,0 +1,128 @@
+"""Tests for the batched wire.jsonl writer and the wire recorder."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from kimi_cli.config import WireConfig
+from kimi_cli.wire import Wire
+from kimi_cli.wire.file import WireFile
+from kimi_cli.wire.types import StepBegin, TextPart, TurnBegin, TurnEnd
+
+
+def _read_lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+async def _records(wire_file: WireFile) -> list[str]:
+    return [record.message.type async for record in wire_file.iter_records()]
+
+
+async def _wait_for_records(wire_file: WireFile, count: int) -> None:
+    for _ in range(200):
+        if len(await _records(wire_file)) >= count:
+            return
+        await asyncio.sleep(0.01)
+
+
+async def test_writer_buffers_until_threshold(tmp_path: Path) -> None:
+    wire_file = WireFile(tmp_path / "wire.jsonl")
+    writer = wire_file.open_writer(flush_bytes=10_000, flush_interval=60)
+
+    writer.append_message(TurnBegin(user_input="hi"))
+    writer.append_message(StepBegin(n=1))
+    await writer.flush_if_needed()
+    assert not wire_file.path.exists()
+
+    await writer.flush()
+    lines = _read_lines(wire_file.path)
+    assert lines[0]["type"] == "metadata"
+    assert [line["message"]["type"] for line in lines[1:]] == ["TurnBegin", "StepBegin"]
+
+    await writer.close()
+
+
+async def test_writer_flushes_on_size_threshold(tmp_path: Path) -> None:
+    wire_file = WireFile(tmp_path / "wire.jsonl")
+    writer = wire_file.open_writer(flush_bytes=1, flush_interval=60)
+
+    writer.append_message(TurnBegin(user_input="hi"))
+    await writer.flush_if_needed()
+    assert await _records(wire_file) == ["TurnBegin"]
+
+    await writer.close()
+
+
+async def test_writer_does_not_repeat_metadata_header(tmp_path: Path) -> None:
+    wire_file = WireFile(tmp_path / "wire.jsonl")
+    for _ in range(2):
+        writer = wire_file.open_writer()
+        writer.append_message(TurnEnd())
+        await writer.close()
+
+    lines = _read_lines(wire_file.path)
+    assert [line.get("type") for line in lines] == ["metadata", None, None]
+
+
+async def test_direct_append_keeps_order_with_open_writer(tmp_path: Path) -> None:
+    wire_file = WireFile(tmp_path / "wire.jsonl")
+    writer = wire_file.open_writer(flush_bytes=10_000, flush_interval=60)
+
+    writer.append_message(TurnBegin(user_input="hi"))
+    await wire_file.append_message(StepBegin(n=1))
+    writer.append_message(TurnEnd())
+    await writer.close()
+
+    assert await _records(wire_file) == ["TurnBegin", "StepBegin", "TurnEnd"]
+    # After the writer is closed, appends fall back to the direct path.
+    await wire_file.append_message(TurnEnd())
+    assert await _records(wire_file) == ["TurnBegin", "StepBegin", "TurnEnd", "TurnEnd"]
+
+
+async def test_torn_tail_after_crash_is_skipped(tmp_path: Path) -> None:
+    wire_file = WireFile(tmp_path / "wire.jsonl")
+    writer = wire_file.open_writer(fsync="flush")
+    writer.append_message(TurnBegin(user_input="hi"))
+    writer.append_message(StepBegin(n=1))
+    await writer.flush()
+    # Simulate a crash in the middle of the next batch: only a prefix of the
+    # last line reached the disk and the writer was never closed.
+    with wire_file.path.open("a", encoding="utf-8") as f:
+        f.write('{"timestamp": 1.0, "message": {"type": "Tur')
+
+    assert await _records(WireFile(wire_file.path)) == ["TurnBegin", "StepBegin"]
+
+
+async def test_recorder_writes_merged_parts_and_flushes_on_turn_end(tmp_path: Path) -> None:
+    wire_file = WireFile(tmp_path / "wire.jsonl")
+    config = WireConfig(record_flush_bytes=10_000_000, record_flush_interval_ms=60_000)
+    wire = Wire(file_backend=wire_file, record_config=config)
+
+    soul_side = wire.soul_side
+    soul_side.send(TurnBegin(user_input="hi"))
+    for chunk in ("Hel", "lo", "!"):
+        soul_side.send(TextPart(text=chunk))
+    soul_side.send(TurnEnd())
+
+    await _wait_for_records(wire_file, 3)
+    records = [record async for record in wire_file.iter_records()]
+    assert [record.message.type for record in records] == ["TurnBegin", "ContentPart", "TurnEnd"]
+    assert records[1].message.payload["text"] == "Hello!"
+
+    wire.shutdown()
+    await wire.join()
+
+
+async def test_recorder_flushes_on_interval(tmp_path: Path) -> None:
+    wire_file = WireFile(tmp_path / "wire.jsonl")
+    config = WireConfig(record_flush_bytes=10_000_000, record_flush_interval_ms=20)
+    wire = Wire(file_backend=wire_file, record_config=config)
+
+    wire.soul_side.send(TurnBegin(user_input="hi"))
+    await _wait_for_records(wire_file, 1)
+    assert await _records(wire_file) == ["TurnBegin"]
+
+    wire.shutdown()
+    await wire.join()
@@ -0,0 +1,54 @@
+"""Tests for message merging on the soul side of the wire."""
+
+from __future__ import annotations
+
+from kimi_cli.wire import Wire, WireUISide
+from kimi_cli.wire.types import StepBegin, TextPart, ToolCall, ToolCallPart, WireMessage
+
+
+async def _receive(ui_side: WireUISide, count: int) -> list[WireMessage]:
+    return [await ui_side.receive() for _ in range(count)]
+
+
+async def test_merged_messages_do_not_mutate_raw_messages() -> None:
+    wire = Wire()
+    raw = wire.ui_side(merge=False)
+    merged = wire.ui_side(merge=True)
+
+    sent: list[WireMessage] = [
+        TextPart(text="Hel"),
+        TextPart(text="lo"),
+        ToolCall(id="call_1", function=ToolCall.FunctionBody(name="Shell", arguments="{")),
+        ToolCallPart(arguments_part="}"),
+        StepBegin(n=2),
+    ]
+    for msg in sent:
+        wire.soul_side.send(msg)
+
+    raw_messages = await _receive(raw, len(sent))
+    assert all(got is msg for got, msg in zip(raw_messages, sent, strict=True))
+    assert sent[:4] == [
+        TextPart(text="Hel"),
+        TextPart(text="lo"),
+        ToolCall(id="call_1", function=ToolCall.FunctionBody(name="Shell", arguments="{")),
+        ToolCallPart(arguments_part="}"),
+    ]
+
+    assert await _receive(merged, 3) == [
+        TextPart(text="Hello"),
+        ToolCall(id="call_1", function=ToolCall.FunctionBody(name="Shell", arguments="{}")),
+        StepBegin(n=2),
+    ]
+
+
+async def test_unmerged_message_is_shared_with_merged_subscribers() -> None:
+    wire = Wire()
+    raw = wire.ui_side(merge=False)
+    merged = wire.ui_side(merge=True)
+
+    part = TextPart(text="only")
+    wire.soul_side.send(part)
+    wire.soul_side.send(StepBegin(n=2))
+
+    assert (await _receive(raw, 1))[0] is part
+    assert (await _receive(merged, 1))[0] is part
@@ -0,0 +1,88 @@
+"""Tests for the fast wire.jsonl scanner."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kimi_cli.wire.file import WireFile
+from kimi_cli.wire.scan import iter_events, scan_wire_file
+from kimi_cli.wire.types import StepBegin, TextPart, TurnBegin, TurnEnd
+
+
+async def _write_wire(path: Path) -> WireFile:
+    wire_file = WireFile(path)
+    await wire_file.append_message(TurnBegin(user_input=[TextPart(text="hi")]), timestamp=1.0)
+    await wire_file.append_message(StepBegin(n=1), timestamp=2.0)
+    await wire_file.append_message(TurnEnd(), timestamp=3.0)
+    return wire_file
+
+
+async def test_scan_matches_parsed_records(tmp_path: Path) -> None:
+    wire_file = await _write_wire(tmp_path / "wire.jsonl")
+
+    records = list(scan_wire_file(wire_file.path))
+    parsed = [record async for record in wire_file.iter_records()]
+
+    assert [(r.type, r.timestamp) for r in records] == [
+        (p.message.type, p.timestamp) for p in parsed
+    ]
+    assert [r.payload() for r in records] == [p.message.payload for p in parsed]
+    assert records[-1].end == wire_file.path.stat().st_size
+
+
+async def test_scan_filters_and_bounds(tmp_path: Path) -> None:
+    wire_file = await _write_wire(tmp_path / "wire.jsonl")
+    step, turn_end = list(scan_wire_file(wire_file.path))[1:]
+
+    assert [r.type for r in scan_wire_file(wire_file.path, types={"TurnEnd"})] == ["TurnEnd"]
+    assert [r.type for r in scan_wire_file(wire_file.path, start=step.end)] == ["TurnEnd"]
+    # Lines that start before `end` are read to their end.
+    assert [r.type for r in scan_wire_file(wire_file.path, end=step.end)] == [
+        "TurnBegin",
+        "StepBegin",
+    ]
+    assert turn_end.end > step.end
+
+
+def test_scan_skips_malformed_and_partial_lines(tmp_path: Path) -> None:
+    path = tmp_path / "wire.jsonl"
+    reordered = {"message": {"payload": {"n": 1}, "type": "StepBegin"}, "timestamp": 5}
+    torn = json.dumps({"timestamp": 6, "message": {"type": "TurnEnd", "payload": {}}})[:-3]
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps({"type": "metadata", "protocol_version": "1.3"}),
+                "not json",
+                "",
+                json.dumps(reordered),
+                torn,
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    records = list(scan_wire_file(path))
+    assert [(r.type, r.timestamp) for r in records] == [("StepBegin", 5.0), ("TurnEnd", 6.0)]
+    assert records[0].payload() == {"n": 1}
+    with pytest.raises(ValueError):
+        records[1].payload()
+
+    assert [r.type for r in scan_wire_file(path, partial=False)] == ["StepBegin"]
+    assert list(scan_wire_file(tmp_path / "missing.jsonl")) == []
+    (tmp_path / "empty.jsonl").touch()
+    assert list(scan_wire_file(tmp_path / "empty.jsonl")) == []
+
+
+def test_iter_events_unwraps_subagent_events() -> None:
+    nested = {
+        "event": {
+            "type": "SubagentEvent",
+            "payload": {"event": {"type": "ToolCall", "payload": {"id": "c1"}}},
+        }
+    }
+    assert list(iter_events("SubagentEvent", nested)) == [("ToolCall", {"id": "c1"})]
+    assert list(iter_events("SubagentEvent", {"event": None})) == []
+    assert list(iter_events("TurnEnd", {})) == [("TurnEnd", {})]
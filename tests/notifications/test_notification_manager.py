@@ -5,7 +5,8 @@ import time
 
 import pytest
 
-from kimi_cli.notifications import NotificationEvent
+from kimi_cli.config import NotificationConfig
+from kimi_cli.notifications import NotificationEvent, NotificationManager
 
 
 def test_publish_dedupes_and_tracks_sink_state(runtime) -> None:
@@ -291,3 +292,70 @@ def test_recover_skips_notification_with_structurally_invalid_event(runtime) ->
 
     views = manager.store.list_views()
     assert [view.event.id for view in views] == [event.event.id]
+
+
+def _info_event(manager, source_id: str, **kwargs) -> NotificationEvent:
+    return NotificationEvent(
+        id=manager.new_id(),
+        category="system",
+        type="system.info",
+        source_kind="test",
+        source_id=source_id,
+        title="Info",
+        body="hello",
+        **kwargs,
+    )
+
+
+def test_journal_is_shared_with_other_store_instances(tmp_path) -> None:
+    root = tmp_path / "notifications"
+    first = NotificationManager(root, NotificationConfig())
+    second = NotificationManager(root, NotificationConfig())
+
+    published = first.publish(_info_event(first, "source-1", dedupe_key="info:1"))
+    assert second.has_pending_for_sink("wire")
+
+    claimed = second.claim_for_sink("wire")
+    assert [view.event.id for view in claimed] == [published.event.id]
+    assert first.claim_for_sink("wire") == []
+    assert second.publish(_info_event(second, "source-1", dedupe_key="info:1")).event.id == (
+        published.event.id
+    )
+
+
+def test_index_is_rebuilt_for_sessions_without_journal(tmp_path) -> None:
+    root = tmp_path / "notifications"
+    manager = NotificationManager(root, NotificationConfig())
+    published = manager.publish(_info_event(manager, "source-1", dedupe_key="info:1"))
+    manager.ack("llm", published.event.id)
+    manager.store.journal_path.unlink()
+
+    reopened = NotificationManager(root, NotificationConfig())
+
+    assert not reopened.has_pending_for_sink("llm")
+    assert [view.event.id for view in reopened.claim_for_sink("shell")] == [published.event.id]
+    assert reopened.find_by_dedupe_key("info:1") is not None
+    assert reopened.store.journal_path.exists()
+
+
+def test_journal_compaction_drops_acked_notifications(tmp_path) -> None:
+    root = tmp_path / "notifications"
+    manager = NotificationManager(root, NotificationConfig())
+    for index in range(150):
+        event = manager.publish(_info_event(manager, f"source-{index}", targets=["llm"]))
+        manager.ack("llm", event.event.id)
+    kept = manager.publish(_info_event(manager, "source-kept", dedupe_key="info:kept"))
+    manager.ack("llm", kept.event.id)
+    pending = manager.publish(_info_event(manager, "source-pending"))
+
+    lines = manager.store.journal_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) < 100
+    assert kept.event.id in "".join(lines)
+
+    reopened = NotificationManager(root, NotificationConfig())
+    assert [view.event.id for view in reopened.claim_for_sink("wire")] == [
+        kept.event.id,
+        pending.event.id,
+    ]
+    assert reopened.find_by_dedupe_key("info:kept") is not None
+    assert len(reopened.store.list_views()) == 152
@@ -898,6 +898,7 @@ class TestCompactionTracking:
         runtime.role = "non-root"  # skip active-task-snapshot branch
         runtime.background_tasks = MagicMock()
         soul._runtime = runtime
+        soul._precompaction = None
 
         ctx = MagicMock()
         ctx.token_count = before_tokens
@@ -117,7 +117,7 @@ async def test_task_output_returns_completed_output(
     assert "status: completed" in result.output
     assert f"output_path: {output_path}" in result.output
     assert "output_truncated: false" in result.output
-    assert "full_output_tool: ReadFile" in result.output
+    assert "full_output_tool: TaskOutput" in result.output
     assert "full_output_hint:" in result.output
     assert "[output]" in result.output
     assert "build line 1" in result.output
@@ -279,11 +279,32 @@ async def test_task_output_surfaces_truncated_preview_and_full_log_path(runtime,
     assert "last marker" in result.output
     assert "first marker" not in result.output
     assert (
-        f'Use ReadFile(path="{output_path}", line_offset=1, n_lines=300) to inspect the full log.'
+        f'Use TaskOutput(task_id="{spec.id}", line_offset=1, n_lines=300) to inspect the full log.'
         in result.output
     )
 
 
+@pytest.mark.asyncio
+async def test_task_output_pages_through_log_lines(runtime, task_output_tool):
+    output = "".join(f"line {i}\n" for i in range(1, 11))
+    spec = _write_task(runtime, "b9999998", status="completed", output=output)
+
+    result = await task_output_tool(
+        task_output_tool.params(task_id=spec.id, line_offset=4, n_lines=3)
+    )
+
+    assert not result.is_error
+    assert result.output.endswith("[output]\nline 4\nline 5\nline 6")
+    assert "output_preview_bytes: 21" in result.output
+    assert "next_line_offset: 7" in result.output
+
+    last = await task_output_tool(
+        task_output_tool.params(task_id=spec.id, line_offset=9, n_lines=3)
+    )
+    assert last.output.endswith("[output]\nline 9\nline 10")
+    assert "next_line_offset:" not in last.output
+
+
 @pytest.mark.asyncio
 async def test_task_list_can_include_terminal_tasks(runtime, task_list_tool):
     _write_task(
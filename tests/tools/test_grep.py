@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
+from typing import Any
 
 import pytest
 from inline_snapshot import snapshot
 
-from kimi_cli.tools.file.grep_local import Grep, Params, _build_rg_args, _strip_path_prefix
+from kimi_cli.tools.file import grep_local
+from kimi_cli.tools.file.grep_local import (
+    Grep,
+    Params,
+    _build_rg_args,
+    _ContentFormatter,
+    _ContentSearch,
+    _strip_path_prefix,
+)
 from kimi_cli.tools.utils import DEFAULT_MAX_CHARS
+from kimi_cli.utils.file_index import WorkspaceFileIndex, shared_file_index
 
 
 @pytest.fixture
@@ -508,6 +520,94 @@ async def test_grep_offset_beyond_results(grep_tool: Grep):
         assert "No matches found" in result.message
 
 
+async def test_grep_follow_up_pages_reuse_results(grep_tool: Grep, tmp_path: Path, monkeypatch):
+    """Later pages of a search come from the first run until a file is added or removed."""
+    (tmp_path / "data.txt").write_text("\n".join(f"line{i} word" for i in range(10)) + "\n")
+    index = shared_file_index(tmp_path)
+    index.refresh()
+
+    def page(offset: int) -> Params:
+        return Params(
+            pattern="word", path=str(tmp_path), output_mode="content", head_limit=3, offset=offset
+        )
+
+    first = await grep_tool(page(0))
+    assert isinstance(first.output, str)
+    assert first.output.startswith("data.txt:1:line0 word")
+    # Pages are reused once the index was refreshed past the search.
+    index.refresh()
+
+    searches = 0
+    search = Grep._search
+
+    async def counting_search(self: Grep, *args: Any, **kwargs: Any):
+        nonlocal searches
+        searches += 1
+        return await search(self, *args, **kwargs)
+
+    monkeypatch.setattr(Grep, "_search", counting_search)
+    second = await grep_tool(page(3))
+    assert searches == 0
+    assert isinstance(second.output, str)
+    assert second.output.split("\n") == [
+        "data.txt:4:line3 word",
+        "data.txt:5:line4 word",
+        "data.txt:6:line5 word",
+    ]
+    assert "Use offset=6 to see more" in second.message
+
+    (tmp_path / "more.txt").write_text("word\n")
+    index.refresh()
+    await grep_tool(page(6))
+    assert searches == 1
+
+
+async def test_grep_follow_up_pages_wait_for_an_index_refresh(
+    grep_tool: Grep, tmp_path: Path, monkeypatch
+):
+    """Results are not reused until a refresh of the file index started after the search."""
+    (tmp_path / "data.txt").write_text("\n".join(f"line{i} word" for i in range(10)) + "\n")
+    shared_file_index(tmp_path).refresh()
+    monkeypatch.setattr(WorkspaceFileIndex, "refresh_in_background", lambda self: None)
+
+    def page(offset: int) -> Params:
+        return Params(
+            pattern="word", path=str(tmp_path), output_mode="content", head_limit=3, offset=offset
+        )
+
+    await grep_tool(page(0))
+    searches = 0
+    search = Grep._search
+
+    async def counting_search(self: Grep, *args: Any, **kwargs: Any):
+        nonlocal searches
+        searches += 1
+        return await search(self, *args, **kwargs)
+
+    monkeypatch.setattr(Grep, "_search", counting_search)
+    await grep_tool(page(3))
+    assert searches == 1
+
+
+def test_search_cache_is_capped_by_bytes(monkeypatch):
+    monkeypatch.setattr(grep_local, "_search_cache", OrderedDict())
+    monkeypatch.setattr(grep_local, "_search_cache_bytes", 0)
+    monkeypatch.setattr(grep_local, "_MAX_CACHED_BYTES", 100)
+
+    grep_local._cache_search(("a",), grep_local._Search(["x" * 39]))
+    grep_local._cache_search(("b",), grep_local._Search(["y" * 39]))
+    assert list(grep_local._search_cache) == [("a",), ("b",)]
+
+    # Evicts the least recently used results to stay under the limit.
+    grep_local._cache_search(("c",), grep_local._Search(["z" * 39]))
+    assert list(grep_local._search_cache) == [("b",), ("c",)]
+    assert grep_local._search_cache_bytes == 80
+
+    # Results larger than the whole cache are not kept.
+    grep_local._cache_search(("d",), grep_local._Search(["w" * 200]))
+    assert list(grep_local._search_cache) == [("b",), ("c",)]
+
+
 async def test_grep_hidden_files(grep_tool: Grep):
     """Hidden dotfiles (non-sensitive) are searchable."""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -753,6 +853,66 @@ def test_build_rg_args_flag_mapping():
     assert "foo" in tilde_args[-1]
 
 
+def test_content_formatter_matches_rg_output():
+    """Lines from `rg --json` are printed like rg's default output."""
+    formatter = _ContentFormatter(with_filename=True, line_number=True, context=True)
+    assert formatter.format("a.py", 1, "one\n", is_match=False) == ["a.py-1-one"]
+    assert formatter.format("a.py", 2, "two\nthree\n", is_match=True) == [
+        "a.py:2:two",
+        "a.py:3:three",
+    ]
+    assert formatter.format("a.py", 7, "seven\n", is_match=True) == ["--", "a.py:7:seven"]
+    assert formatter.format("b.py", 8, "eight", is_match=True) == ["--", "b.py:8:eight"]
+
+    plain = _ContentFormatter(with_filename=False, line_number=False, context=False)
+    assert plain.format("a.py", 1, "one\n", is_match=True) == ["one"]
+    assert plain.format("a.py", 5, "five\n", is_match=True) == ["five"]
+
+
+# `rg --json --line-number --context 1 --sort path -- hello proj` (ripgrep 14.1.0), run on:
+#   proj/app.py: 'import os\n\ndef hello():\n    return "hello"\n\n\nprint(hello())\n'
+#   proj/latin1.txt: b'caf\xe9 hello\nplain\n', which is not valid UTF-8
+RG_JSON_CONTEXT_OUTPUT = r"""{"type":"begin","data":{"path":{"text":"proj/app.py"}}}
+{"type":"context","data":{"path":{"text":"proj/app.py"},"lines":{"text":"\n"},"line_number":2,"absolute_offset":10,"submatches":[]}}
+{"type":"match","data":{"path":{"text":"proj/app.py"},"lines":{"text":"def hello():\n"},"line_number":3,"absolute_offset":11,"submatches":[{"match":{"text":"hello"},"start":4,"end":9}]}}
+{"type":"match","data":{"path":{"text":"proj/app.py"},"lines":{"text":"    return \"hello\"\n"},"line_number":4,"absolute_offset":24,"submatches":[{"match":{"text":"hello"},"start":12,"end":17}]}}
+{"type":"context","data":{"path":{"text":"proj/app.py"},"lines":{"text":"\n"},"line_number":5,"absolute_offset":43,"submatches":[]}}
+{"type":"context","data":{"path":{"text":"proj/app.py"},"lines":{"text":"\n"},"line_number":6,"absolute_offset":44,"submatches":[]}}
+{"type":"match","data":{"path":{"text":"proj/app.py"},"lines":{"text":"print(hello())\n"},"line_number":7,"absolute_offset":45,"submatches":[{"match":{"text":"hello"},"start":6,"end":11}]}}
+{"type":"end","data":{"path":{"text":"proj/app.py"},"binary_offset":null,"stats":{"elapsed":{"secs":0,"nanos":25362,"human":"0.000025s"},"searches":1,"searches_with_match":1,"bytes_searched":60,"bytes_printed":1029,"matched_lines":3,"matches":3}}}
+{"type":"begin","data":{"path":{"text":"proj/latin1.txt"}}}
+{"type":"match","data":{"path":{"text":"proj/latin1.txt"},"lines":{"bytes":"Y2Fm6SBoZWxsbwo="},"line_number":1,"absolute_offset":0,"submatches":[{"match":{"text":"hello"},"start":5,"end":10}]}}
+{"type":"context","data":{"path":{"text":"proj/latin1.txt"},"lines":{"text":"plain\n"},"line_number":2,"absolute_offset":11,"submatches":[]}}
+{"type":"end","data":{"path":{"text":"proj/latin1.txt"},"binary_offset":null,"stats":{"elapsed":{"secs":0,"nanos":5425,"human":"0.000005s"},"searches":1,"searches_with_match":1,"bytes_searched":17,"bytes_printed":396,"matched_lines":1,"matches":1}}}
+{"data":{"elapsed_total":{"human":"0.000391s","nanos":390853,"secs":0},"stats":{"bytes_printed":1425,"bytes_searched":77,"elapsed":{"human":"0.000031s","nanos":30787,"secs":0},"matched_lines":4,"matches":4,"searches":2,"searches_with_match":2}},"type":"summary"}
+"""
+
+
+async def test_content_search_reads_recorded_rg_json():
+    """Recorded `rg --json` output is printed like rg prints the same search itself."""
+    stdout = asyncio.StreamReader()
+    stdout.feed_data(RG_JSON_CONTEXT_OUTPUT.encode())
+    stdout.feed_eof()
+    params = Params.model_validate(
+        {"pattern": "hello", "path": "proj", "output_mode": "content", "-C": 1}
+    )
+    search = _ContentSearch(params, "proj", "proj")
+
+    assert not await search.read(stdout)
+    # `rg --line-number --context 1 --sort path -- hello proj`, with the prefix stripped
+    assert search.result(timed_out=False).lines == [
+        "app.py-2-",
+        "app.py:3:def hello():",
+        'app.py:4:    return "hello"',
+        "app.py-5-",
+        "app.py-6-",
+        "app.py:7:print(hello())",
+        "--",
+        "latin1.txt:1:caf\ufffd hello",
+        "latin1.txt-2-plain",
+    ]
+
+
 def test_strip_path_prefix_posix():
     """Prefix stripping works with POSIX paths (forward slash)."""
     output = "/home/user/project/src/a.py:42:code\n/home/user/project/src/b.py-41-context\n--\n"
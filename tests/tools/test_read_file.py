@@ -600,3 +600,75 @@ async def test_read_tail_line_truncation(read_file_tool: ReadFile, temp_work_dir
     line_4 = [x for x in output_lines if x.strip().startswith("4")][0]
     actual_content = line_4.split("\t", 1)[1]
     assert actual_content.endswith("...")
+
+
+async def test_read_pages_through_file_across_index_checkpoints(
+    read_file_tool: ReadFile, temp_work_dir: KaosPath, monkeypatch: pytest.MonkeyPatch
+):
+    """Paged and tail reads use the line index and see appended lines."""
+    from kimi_cli.tools.file import line_index
+
+    monkeypatch.setattr(line_index, "CHUNK_SIZE", 64)
+    big_file = temp_work_dir / "big.log"
+    await big_file.write_text("".join(f"row {i}\r\n" for i in range(1, 501)))
+
+    result = await read_file_tool(Params(path=str(big_file), line_offset=250, n_lines=2))
+    assert result.output == "   250\trow 250\n   251\trow 251\n"
+    assert "Total lines in file: 500." in result.message
+
+    result = await read_file_tool(Params(path=str(big_file), line_offset=-2))
+    assert result.output == "   499\trow 499\n   500\trow 500\n"
+
+    await big_file.append_text("row 501")
+    result = await read_file_tool(Params(path=str(big_file), line_offset=500))
+    assert result.output == "   500\trow 500\n   501\trow 501"
+    assert "Total lines in file: 501. End of file reached." in result.message
+
+
+async def test_line_index_is_reused_until_file_changes(temp_work_dir: KaosPath):
+    from kimi_cli.tools.file.line_index import get_line_index
+
+    path = temp_work_dir / "indexed.txt"
+    await path.write_text("a\nb\n")
+
+    first = await get_line_index(path)
+    assert first.total_lines == 2
+    assert await get_line_index(path) is first
+
+    await path.write_text("a\nb\nc")
+    second = await get_line_index(path)
+    assert second is not first
+    assert second.total_lines == 3
+
+
+async def test_line_index_reads_through_one_handle_per_backend(
+    temp_work_dir: KaosPath, monkeypatch: pytest.MonkeyPatch
+):
+    from types import SimpleNamespace
+
+    from kimi_cli.tools.file import line_index
+
+    monkeypatch.setattr(line_index, "CHUNK_SIZE", 64)
+    path = temp_work_dir / "chunked.txt"
+    await path.write_text("".join(f"row {i}\n" for i in range(200)))
+    opened: list[int] = []
+    read_chunks = KaosPath.read_chunks
+
+    def counting_read_chunks(self: KaosPath, *, offset: int = 0, chunk_size: int = 1 << 18):
+        opened.append(offset)
+        return read_chunks(self, offset=offset, chunk_size=chunk_size)
+
+    monkeypatch.setattr(KaosPath, "read_chunks", counting_read_chunks)
+
+    index = await line_index.get_line_index(path)
+    assert index.total_lines == 200
+    assert len(index.checkpoint_lines) > 10
+    assert opened == [0]
+
+    lines = [line async for _, line in line_index.iter_lines_from(path, index, 150)]
+    assert lines[0] == "row 149\n" and len(lines) == 51
+    assert len(opened) == 2
+
+    # The same path on another backend is indexed on its own.
+    monkeypatch.setattr(line_index, "get_current_kaos", lambda: SimpleNamespace(name="ssh"))
+    assert await line_index.get_line_index(path) is not index
@@ -191,7 +191,7 @@ Guidelines:
 - By default this tool is non-blocking and returns a current status/output snapshot.
 - Use `block=true` only when you intentionally want to wait for completion or timeout.
 - This tool returns structured task metadata, a fixed-size output preview, and an `output_path` for the full log.
-- When the preview is truncated, use `ReadFile` with the returned `output_path` to inspect the full log in pages.
+- When the preview is truncated, set `line_offset` and `n_lines` to page through the full log; `next_line_offset` tells where the next page starts.
 - This tool works with the generic background task system and should remain the primary read path for future task types, not just bash.
 """
     )
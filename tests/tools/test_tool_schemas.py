@@ -192,6 +192,18 @@ def test_task_output_params_schema(task_output_tool: TaskOutput):
                     "minimum": 0,
                     "type": "integer",
                 },
+                "line_offset": {
+                    "anyOf": [{"minimum": 1, "type": "integer"}, {"type": "null"}],
+                    "default": None,
+                    "description": "Optional: The 1-indexed line of the output log to start reading from. By default, a preview of the end of the log is returned. Use with `n_lines` to page through the full log.",
+                },
+                "n_lines": {
+                    "default": 300,
+                    "description": "Maximum number of log lines to read when `line_offset` is set.",
+                    "maximum": 1000,
+                    "minimum": 1,
+                    "type": "integer",
+                },
             },
             "required": ["task_id"],
             "type": "object",
@@ -0,0 +1,134 @@
+"""Tests for the shared workspace file index."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from kimi_cli.utils.file_index import WorkspaceFileIndex
+
+requires_glob_translate = pytest.mark.skipif(
+    sys.version_info < (3, 13), reason="glob.translate needs Python 3.13"
+)
+
+
+def _make_tree(root: Path) -> None:
+    for rel in (
+        "README.md",
+        "setup.py",
+        ".hidden",
+        "src/a/x.py",
+        "src/a/b/y.py",
+        "src/b/z.txt",
+        "src/.h/q.py",
+        "docs/guide.md",
+        "docs/sub/api.md",
+    ):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (root / "empty").mkdir()
+
+
+def _glob(index: WorkspaceFileIndex, pattern: str, rel: str = "") -> list[str] | None:
+    found = index.glob(pattern, rel)
+    return None if found is None else sorted(path for path, _ in found)
+
+
+def _path_glob(root: Path, pattern: str, rel: str) -> list[str]:
+    base = root / rel if rel else root
+    return sorted(p.relative_to(root).as_posix() if p != root else "" for p in base.glob(pattern))
+
+
+@requires_glob_translate
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "*",
+        "*.py",
+        ".*",
+        "[sd]*",
+        "src/*",
+        "src/a/",
+        "*/",
+        "src/**",
+        "src/**/",
+        "src/**/*.py",
+        "**/*.md",
+        "**",
+        "**/a/**",
+        "src/.h/*",
+        "docs/*/*.md",
+        "missing/**",
+        "README.md/**",
+    ],
+)
+@pytest.mark.parametrize("rel", ["", "src"])
+def test_glob_matches_path_glob(tmp_path: Path, pattern: str, rel: str) -> None:
+    _make_tree(tmp_path)
+    index = WorkspaceFileIndex(tmp_path)
+
+    assert _glob(index, pattern, rel) == _path_glob(tmp_path, pattern, rel)
+
+
+@requires_glob_translate
+def test_glob_sees_changes_after_first_index(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    index = WorkspaceFileIndex(tmp_path)
+    assert _glob(index, "src/**/*.py") == ["src/.h/q.py", "src/a/b/y.py", "src/a/x.py"]
+
+    (tmp_path / "src" / "a" / "new.py").write_text("x")
+    (tmp_path / "src" / "a" / "b" / "y.py").unlink()
+    (tmp_path / "src" / "a" / "b").rmdir()
+
+    assert _glob(index, "src/**/*.py") == ["src/.h/q.py", "src/a/new.py", "src/a/x.py"]
+    assert "src/a/b" not in {path for path, _ in index.walk()}
+
+
+@requires_glob_translate
+def test_glob_defers_to_filesystem_for_symlinks_and_parent_segments(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    index = WorkspaceFileIndex(tmp_path)
+    assert _glob(index, "src/../*.py") is None
+
+    if os.name == "nt":
+        return
+    (tmp_path / "docs" / "link").symlink_to(tmp_path / "src")
+    assert _glob(index, "docs/**/*.py") is None
+    # Symlinks outside the walked part of the tree do not matter.
+    assert _glob(index, "src/**/*.py") == ["src/.h/q.py", "src/a/b/y.py", "src/a/x.py"]
+
+
+def test_listdir_reports_current_sizes(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    index = WorkspaceFileIndex(tmp_path)
+    before = {entry.name: entry for entry in index.listdir("docs") or []}
+    assert before["sub"].is_dir
+    assert before["guide.md"].size == 1
+
+    # An in-place edit does not touch the directory mtime.
+    (tmp_path / "docs" / "guide.md").write_text("longer")
+
+    after = {entry.name: entry for entry in index.listdir("docs") or []}
+    assert after["guide.md"].size == 6
+    assert index.listdir("README.md") is None
+    assert index.listdir("missing") is None
+
+
+def test_refresh_skips_into_ignored_dirs_but_keeps_their_index(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    index = WorkspaceFileIndex(tmp_path)
+    index.refresh("node_modules")
+
+    index.refresh(skip=lambda name: name == "node_modules")
+    generation = index.generation
+    index.refresh(skip=lambda name: name == "node_modules")
+
+    paths = {path for path, _ in index.walk()}
+    assert {"node_modules", "node_modules/pkg", "src/a/b/y.py"} <= paths
+    # Nothing changed on disk, so neither did the generation.
+    assert index.generation == generation
@@ -0,0 +1,160 @@
+"""Tests for the built-in text search used when ripgrep is unavailable."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from kimi_cli.utils import text_search
+from kimi_cli.utils.text_search import (
+    SearchOptions,
+    list_files,
+    path_filter,
+    search_file,
+    search_files,
+)
+
+
+@pytest.mark.parametrize(
+    ("globs", "path", "expected"),
+    [
+        (["*.py"], "src/a.py", True),
+        (["*.py"], "src/a.pyi", False),
+        (["*.{ts,tsx}"], "web/app.tsx", True),
+        (["src/*.py"], "src/a.py", True),
+        (["src/*.py"], "src/sub/a.py", False),
+        (["src/**/*.py"], "src/sub/a.py", True),
+        (["/src/*.py"], "src/a.py", True),
+        (["!*.md"], "README.md", False),
+        (["!*.md"], "main.py", True),
+        (["!vendor"], "vendor/lib/a.py", False),
+        (["!vendor/"], "src/vendor", True),
+        (["*.py", "!test_*"], "tests/test_a.py", False),
+        (["!test_*", "*.py"], "tests/test_a.py", True),
+        (["[!a]*.txt"], "b.txt", True),
+        (["[!a]*.txt"], "a.txt", False),
+    ],
+)
+def test_path_filter_follows_rg_globs(globs: list[str], path: str, expected: bool) -> None:
+    assert path_filter(globs, None)(path) is expected
+
+
+def test_path_filter_types() -> None:
+    accept = path_filter([], "py")
+    assert accept("a/b.py")
+    assert not accept("a/b.js")
+    assert path_filter([], "make")("sub/Makefile")
+    with pytest.raises(ValueError, match="unrecognized file type: nope"):
+        path_filter([], "nope")
+
+
+def test_search_file_content_with_context(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_text("one\ntwo hit\nthree\nfour\nfive\nsix hit\r\n")
+
+    result = search_file(
+        str(path),
+        SearchOptions(pattern="hit", mode="content", before_context=1, after_context=1),
+    )
+    assert result == [
+        (1, "one", False),
+        (2, "two hit", True),
+        (3, "three", False),
+        (5, "five", False),
+        (6, "six hit\r", True),
+    ]
+    assert search_file(str(path), SearchOptions(pattern="^", mode="count_matches")) == 6
+    assert search_file(str(path), SearchOptions(pattern="HIT")) is None
+    assert search_file(str(path), SearchOptions(pattern="HIT", ignore_case=True)) == 2
+
+
+def test_search_file_lines_do_not_span_newlines(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_text("foo\nbar foo bar\n")
+
+    # `\s` would cross the line end when searching the whole file at once.
+    assert search_file(str(path), SearchOptions(pattern=r"foo\sbar", mode="content")) == [
+        (2, "bar foo bar", True)
+    ]
+
+
+def test_search_file_multiline(tmp_path: Path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_text("a\nstart\nmiddle\nend\nz\n")
+
+    options = SearchOptions(pattern="start.*?end\n", mode="content", multiline=True)
+    assert search_file(str(path), options) == [
+        (2, "start", True),
+        (3, "middle", True),
+        (4, "end", True),
+    ]
+    options = SearchOptions(pattern="start.*?end", mode="count_matches", multiline=True)
+    assert search_file(str(path), options) == 1
+
+
+def test_search_file_skips_binary_and_empty_files(tmp_path: Path) -> None:
+    (tmp_path / "bin").write_bytes(b"hit\0hit\n")
+    (tmp_path / "empty").write_bytes(b"")
+
+    assert search_file(str(tmp_path / "bin"), SearchOptions(pattern="hit")) is None
+    assert search_file(str(tmp_path / "empty"), SearchOptions(pattern="")) is None
+
+
+def test_list_files_applies_ignore_rules(tmp_path: Path) -> None:
+    for rel in ("src/a.py", ".hidden", "node_modules/pkg/index.js", ".git/config"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x")
+
+    assert sorted(list_files(tmp_path, include_ignored=False)) == [".hidden", "src/a.py"]
+    assert sorted(list_files(tmp_path, include_ignored=True)) == [
+        ".hidden",
+        "node_modules/pkg/index.js",
+        "src/a.py",
+    ]
+
+
+async def test_search_files_in_worker_processes_keeps_path_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(text_search, "_POOL_MIN_FILES", 1)
+    monkeypatch.setattr(text_search, "_BATCH_FILES", 3)
+    paths: list[str] = []
+    for i in range(20):
+        path = tmp_path / f"f{i:02d}.txt"
+        path.write_text("hit\n" * (i % 3))
+        paths.append(str(path))
+
+    found = [(path, result) async for path, result in search_files(paths, SearchOptions("hit"))]
+
+    assert found == [(path, i % 3) for i, path in enumerate(paths) if i % 3]
+
+
+class _BrokenPool(Executor):
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+        future: Future[Any] = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+
+async def test_search_files_falls_back_to_threads_when_the_pool_breaks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(text_search, "_POOL_MIN_FILES", 1)
+    monkeypatch.setattr(text_search, "_BATCH_FILES", 3)
+    monkeypatch.setattr(text_search, "_pool", _BrokenPool())
+    monkeypatch.setattr(text_search, "_pool_disabled", False)
+    paths: list[str] = []
+    for i in range(10):
+        path = tmp_path / f"f{i:02d}.txt"
+        path.write_text("hit\n" * (i % 2))
+        paths.append(str(path))
+
+    found = [path async for path, _ in search_files(paths, SearchOptions("hit"))]
+
+    assert found == paths[1::2]
+    # Later searches do not try worker processes again.
+    assert text_search._process_pool() is None  # pyright: ignore[reportPrivateUsage]
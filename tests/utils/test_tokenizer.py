@@ -0,0 +1,142 @@
+"""Tests for the offline tokenizer used for context accounting."""
+
+from __future__ import annotations
+
+import gc
+import weakref
+from collections.abc import Iterator
+
+import pytest
+from kosong.message import Message, TextPart, ThinkPart, ToolCall
+
+from kimi_cli.config import TokenizerConfig
+from kimi_cli.utils import tokenizer as tokenizer_module
+from kimi_cli.utils.tokenizer import (
+    HeuristicTokenizer,
+    TiktokenTokenizer,
+    configure_tokenizer,
+    count_message_tokens,
+    count_messages_tokens,
+    count_tokens,
+    estimate_tokens,
+    get_tokenizer,
+    set_tokenizer,
+)
+
+
+class _WordTokenizer:
+    """Counts whitespace-separated words and records every call."""
+
+    def __init__(self, name: str = "words") -> None:
+        self._name = name
+        self.calls: list[str] = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def count(self, text: str) -> int:
+        self.calls.append(text)
+        return len(text.split())
+
+
+class _BrokenTokenizer:
+    @property
+    def name(self) -> str:
+        return "broken"
+
+    def count(self, text: str) -> int:
+        raise RuntimeError("vocabulary not found")
+
+
+@pytest.fixture(autouse=True)
+def _restore_tokenizer() -> Iterator[None]:
+    previous = get_tokenizer()
+    yield
+    set_tokenizer(previous)
+
+
+def test_heuristic_counts() -> None:
+    set_tokenizer(HeuristicTokenizer())
+    assert count_tokens("a" * 80) == 20
+    assert count_tokens("abc") == 1
+    assert estimate_tokens("abc") == 0.75
+    assert count_tokens("你好") == 3
+
+
+def test_message_counts_text_and_tool_calls_but_not_thinking() -> None:
+    set_tokenizer(_WordTokenizer())
+    message = Message(
+        role="assistant",
+        content=[TextPart(text="two words"), ThinkPart(think="not counted at all")],
+        tool_calls=[
+            ToolCall(
+                id="call_1",
+                function=ToolCall.FunctionBody(name="Shell", arguments='{"command": "ls -la"}'),
+            )
+        ],
+    )
+    assert count_message_tokens(message) == 2 + 1 + 3
+
+
+def test_message_counts_are_cached_per_tokenizer() -> None:
+    words = _WordTokenizer()
+    set_tokenizer(words)
+    message = Message(role="user", content=[TextPart(text="one two three")])
+
+    assert count_messages_tokens([message, message]) == 6
+    assert words.calls == ["one two three"]
+
+    other = _WordTokenizer(name="other")
+    set_tokenizer(other)
+    assert count_message_tokens(message) == 3
+    assert other.calls == ["one two three"]
+
+
+def test_broken_tokenizer_falls_back_to_heuristic() -> None:
+    set_tokenizer(_BrokenTokenizer())
+    assert count_tokens("a" * 40) == 10
+    assert isinstance(get_tokenizer(), HeuristicTokenizer)
+
+
+def test_configure_tokenizer(monkeypatch: pytest.MonkeyPatch) -> None:
+    preloaded: list[TiktokenTokenizer] = []
+    monkeypatch.setattr(tokenizer_module, "_preload", preloaded.append)
+    configure_tokenizer(TokenizerConfig(backend="tiktoken", encoding="cl100k_base"))
+    assert isinstance(get_tokenizer(), TiktokenTokenizer)
+    assert preloaded == [get_tokenizer()]
+    assert get_tokenizer().name == "tiktoken:cl100k_base"
+
+    configure_tokenizer(TokenizerConfig())
+    assert get_tokenizer() is tokenizer_module._HEURISTIC
+
+
+def test_heuristic_is_used_until_the_encoding_is_loaded(monkeypatch: pytest.MonkeyPatch) -> None:
+    tokenizer = TiktokenTokenizer("cl100k_base")
+    monkeypatch.setattr(tokenizer, "load", lambda: pytest.fail("loaded on the counting path"))
+    set_tokenizer(tokenizer)
+
+    assert count_tokens("a" * 40) == 10
+    assert estimate_tokens("abc") == 0.75
+    assert get_tokenizer() is tokenizer
+
+
+def test_failed_preload_falls_back_to_heuristic() -> None:
+    tokenizer = TiktokenTokenizer("no-such-encoding", cache_dir="/nonexistent")
+    set_tokenizer(tokenizer)
+
+    tokenizer_module._preload(tokenizer)  # pyright: ignore[reportPrivateUsage]
+
+    assert get_tokenizer() is tokenizer_module._HEURISTIC
+
+
+def test_message_count_cache_does_not_keep_messages_alive() -> None:
+    set_tokenizer(_WordTokenizer())
+    message = Message(role="user", content=[TextPart(text="one two")])
+    assert count_message_tokens(message) == 2
+    ref = weakref.ref(message)
+
+    del message
+    gc.collect()
+
+    assert ref() is None
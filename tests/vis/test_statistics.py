@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from kimi_cli.metadata import Metadata, WorkDirMeta, save_metadata
+from kimi_cli.vis.app import create_app
+
+
+def _write_wire(session_dir: Path, *messages: tuple[float, str, dict[str, object]]) -> None:
+    session_dir.mkdir(parents=True)
+    (session_dir / "context.jsonl").write_text("{}\n", encoding="utf-8")
+    lines = [json.dumps({"type": "metadata", "protocol_version": "1.3"})]
+    for timestamp, type_, payload in messages:
+        lines.append(
+            json.dumps({"timestamp": timestamp, "message": {"type": type_, "payload": payload}})
+        )
+    (session_dir / "wire.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_vis_statistics_aggregate_sessions(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("KIMI_SHARE_DIR", str(tmp_path))
+
+    work_dir = tmp_path / "project"
+    work_dir.mkdir()
+    metadata = Metadata(work_dirs=[WorkDirMeta(path=str(work_dir))])
+    save_metadata(metadata)
+    sessions_dir = metadata.work_dirs[0].sessions_dir
+
+    now = datetime.now(tz=UTC).timestamp()
+    read_call = {"type": "function", "id": "c1", "function": {"name": "ReadFile"}}
+    _write_wire(
+        sessions_dir / "a",
+        (now - 100, "TurnBegin", {"user_input": "hi"}),
+        (now - 90, "ToolCall", read_call),
+        (now - 80, "ToolResult", {"tool_call_id": "c1", "return_value": {"is_error": True}}),
+        (now - 70, "StatusUpdate", {"token_usage": {"input_other": 7, "output": 2}}),
+        (now - 40, "TurnBegin", {"user_input": "again"}),
+    )
+    _write_wire(
+        sessions_dir / "b",
+        (now - 20, "TurnBegin", {"user_input": "hello"}),
+        (now - 10, "StatusUpdate", {"token_usage": {"input_cache_read": 3, "output": 1}}),
+    )
+
+    with TestClient(create_app()) as client:
+        response = client.get("/api/vis/statistics")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["total_sessions"] == 2
+    assert payload["total_turns"] == 3
+    assert payload["total_tokens"] == {"input": 10, "output": 3}
+    assert payload["total_duration_sec"] == 70
+    assert payload["tool_usage"] == [{"name": "ReadFile", "count": 1, "error_count": 1}]
+    assert payload["daily_usage"][-1]["sessions"] + payload["daily_usage"][-2]["sessions"] == 2
+    assert payload["per_project"] == [{"work_dir": str(work_dir), "sessions": 2, "turns": 3}]
@@ -0,0 +1,179 @@
+"""Tests for the per-WebSocket send queues of SessionProcess."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any, cast
+from uuid import UUID, uuid4
+
+import pytest
+from starlette.websockets import WebSocket, WebSocketState
+
+from kimi_cli.web.api import sessions as sessions_api
+from kimi_cli.web.models import SendQueueStats, Session
+from kimi_cli.web.runner.process import KimiCLIRunner, SessionProcess
+from kimi_cli.web.runner.sender import (
+    RESYNC_CLOSE_CODE,
+    SendQueueMetrics,
+    WebSocketSender,
+)
+
+
+class FakeWebSocket:
+    def __init__(self, *, blocked: bool = False) -> None:
+        self.client_state = WebSocketState.CONNECTED
+        self.sent: list[str] = []
+        self.closed_with: tuple[int, str] | None = None
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def send_text(self, message: str) -> None:
+        await self.unblocked.wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.closed_with = (code, reason or "")
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+def _ws(fake: FakeWebSocket) -> WebSocket:
+    return cast(WebSocket, fake)
+
+
+def _event(type_: str, payload: dict[str, Any]) -> str:
+    params = {"type": type_, "payload": payload}
+    return json.dumps({"jsonrpc": "2.0", "method": "event", "params": params})
+
+
+def _text(text: str) -> str:
+    return _event("ContentPart", {"type": "text", "text": text})
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_slow_websocket_does_not_block_others() -> None:
+    sp = SessionProcess(uuid4())
+    slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+    for fake in (slow, fast):
+        await sp.add_websocket_and_begin_replay(_ws(fake))
+        await sp.end_replay(_ws(fake))
+
+    messages = [_event("StepBegin", {"n": i}) for i in range(10)]
+    for message in messages:
+        await asyncio.wait_for(sp._broadcast(message), timeout=1)
+    await _settle()
+
+    assert fast.sent == messages
+    assert slow.sent == []
+    assert sp.send_queue_stats.max_depth == 9  # One message is being sent
+
+    slow.unblocked.set()
+    await _settle()
+    assert slow.sent == messages
+    await sp.remove_websocket(_ws(slow))
+    await sp.remove_websocket(_ws(fast))
+    assert sp.websocket_count == 0
+
+
+async def test_session_api_reports_send_queues(monkeypatch: pytest.MonkeyPatch) -> None:
+    session_id = uuid4()
+    sp = SessionProcess(session_id)
+    slow = FakeWebSocket(blocked=True)
+    await sp.add_websocket_and_begin_replay(_ws(slow))
+    await sp.end_replay(_ws(slow))
+    for i in range(3):
+        await sp._broadcast(_event("StepBegin", {"n": i}))
+    await _settle()
+
+    def load_session(id: UUID) -> Session:
+        return Session(session_id=id, title="Test", last_updated=datetime.now(UTC))
+
+    monkeypatch.setattr(sessions_api, "load_session_by_id", load_session)
+    runner = cast(KimiCLIRunner, SimpleNamespace(get_session=lambda _id: sp))
+    session = await sessions_api.get_session(session_id, runner=runner)
+
+    assert session is not None
+    assert session.send_queue == SendQueueStats(
+        websockets=1, depth=2, max_depth=2, peak_depth=3, coalesced=0, resyncs=0
+    )
+    await sp.remove_websocket(_ws(slow))
+
+
+async def test_messages_wait_for_replay_to_end() -> None:
+    sp = SessionProcess(uuid4())
+    fake = FakeWebSocket()
+    await sp.add_websocket_and_begin_replay(_ws(fake))
+
+    await sp._broadcast("live-1")
+    await sp._broadcast("live-2")
+    await _settle()
+    assert fake.sent == []
+
+    await sp.end_replay(_ws(fake))
+    await sp.send_status_snapshot(_ws(fake))
+    await _settle()
+    assert fake.sent[:2] == ["live-1", "live-2"]
+    assert json.loads(fake.sent[2])["method"] == "session_status"
+    await sp.remove_websocket(_ws(fake))
+
+
+async def test_queued_deltas_are_merged_into_runs_of_parts() -> None:
+    metrics = SendQueueMetrics()
+    fake = FakeWebSocket()
+    sender = WebSocketSender(_ws(fake), metrics)
+    step = _event("StepBegin", {"n": 1})
+    messages = [_text("Hel"), _text("lo"), step, _text("a"), _text("b"), "not json", _text("x")]
+
+    for message in messages:
+        assert sender.put(message)
+    sender.start()
+    await _settle()
+
+    assert len(fake.sent) == 5
+    assert json.loads(fake.sent[0])["params"]["payload"]["text"] == "Hello"
+    assert fake.sent[1] == step
+    assert json.loads(fake.sent[2])["params"]["payload"]["text"] == "ab"
+    assert fake.sent[3:] == ["not json", _text("x")]
+    assert metrics.coalesced == 2
+    await sender.stop()
+
+
+async def test_deltas_sent_right_away_are_not_merged() -> None:
+    fake = FakeWebSocket()
+    sender = WebSocketSender(_ws(fake), SendQueueMetrics())
+    sender.start()
+
+    for text in ("a", "b"):
+        assert sender.put(_text(text))
+        await _settle()
+
+    assert fake.sent == [_text("a"), _text("b")]
+    await sender.stop()
+
+
+async def test_full_queue_coalesces_then_resyncs() -> None:
+    metrics = SendQueueMetrics()
+    fake = FakeWebSocket()
+    sender = WebSocketSender(_ws(fake), metrics, max_messages=4)
+
+    # Deltas are merged as they are queued.
+    for i in range(10):
+        assert sender.put(_text(str(i)))
+    assert sender.depth <= 4
+    assert metrics.coalesced == 10 - sender.depth
+
+    # Messages that cannot be merged drop the client, which is told to resync.
+    results = [sender.put(_event("StepBegin", {"n": i})) for i in range(5)]
+    assert results[-1] is False
+    assert sender.closed and sender.depth == 0
+    await _settle()
+    assert fake.closed_with is not None and fake.closed_with[0] == RESYNC_CLOSE_CODE
+    assert metrics.resyncs == 1
+    assert fake.sent == []
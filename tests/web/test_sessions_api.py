@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 from typing import TYPE_CHECKING, cast
@@ -12,8 +15,20 @@ from kimi_cli.session import Session
 from kimi_cli.session_state import load_session_state, save_session_state
 from kimi_cli.web.api import sessions as sessions_api
 from kimi_cli.web.models import GenerateTitleRequest
+from kimi_cli.wire.file import WireFile
+from kimi_cli.wire.types import (
+    ApprovalRequest,
+    StepBegin,
+    TextPart,
+    ToolCall,
+    ToolCallPart,
+    TurnBegin,
+    TurnEnd,
+)
 
 if TYPE_CHECKING:
+    from fastapi import WebSocket
+
     from kimi_cli.web.runner.process import KimiCLIRunner
 
 
@@ -114,3 +129,128 @@ async def test_generate_title_preserves_concurrent_manual_title(
     assert state.custom_title == "Manual Title"
     assert state.title_generated is True
     assert state.title_generate_attempts == 0
+
+
+async def _write_history(path: Path) -> None:
+    wire_file = WireFile(path)
+    for turn in range(3):
+        await wire_file.append_message(TurnBegin(user_input=f"question {turn}"))
+        await wire_file.append_message(StepBegin(n=1))
+        for chunk in ("Hel", "lo ", f"{turn}"):
+            await wire_file.append_message(TextPart(text=chunk))
+        await wire_file.append_message(
+            ToolCall(id=f"tc-{turn}", function=ToolCall.FunctionBody(name="Shell", arguments=None))
+        )
+        for chunk in ('{"command": ', '"ls"}'):
+            await wire_file.append_message(ToolCallPart(arguments_part=chunk))
+        await wire_file.append_message(
+            ApprovalRequest(
+                id=f"a-{turn}",
+                tool_call_id=f"tc-{turn}",
+                sender="Shell",
+                action="run",
+                description="ls",
+            )
+        )
+        await wire_file.append_message(TurnEnd())
+
+
+async def test_compact_replay_merges_deltas(tmp_path: Path) -> None:
+    wire_file = tmp_path / "wire.jsonl"
+    await _write_history(wire_file)
+
+    full = [json.loads(line) for line in sessions_api._iter_wire_events(wire_file)]
+    compact = [json.loads(line) for line in sessions_api._iter_wire_events(wire_file, compact=True)]
+
+    assert len(full) == 3 * 10
+    assert [m["params"]["type"] for m in compact[:6]] == [
+        "TurnBegin",
+        "StepBegin",
+        "ContentPart",
+        "ToolCall",
+        "ApprovalRequest",
+        "TurnEnd",
+    ]
+    assert len(compact) == 3 * 6
+    assert compact[2]["params"]["payload"] == {"type": "text", "text": "Hello 0"}
+    assert compact[3]["params"]["payload"]["function"]["arguments"] == '{"command": "ls"}'
+    assert compact[4]["method"] == "request"
+    assert compact[4]["id"] == "a-0"
+    assert compact[4] == full[8]
+
+
+async def test_replay_from_turn(tmp_path: Path) -> None:
+    wire_file = tmp_path / "wire.jsonl"
+    await _write_history(wire_file)
+
+    def user_inputs(**kwargs: int) -> list[str]:
+        return [
+            m["params"]["payload"]["user_input"]
+            for line in sessions_api._iter_wire_events(wire_file, compact=True, **kwargs)
+            if (m := json.loads(line))["params"]["type"] == "TurnBegin"
+        ]
+
+    assert user_inputs(from_turn=1) == ["question 1", "question 2"]
+    assert user_inputs(to_turn=2) == ["question 0", "question 1"]
+    assert user_inputs(from_turn=2, to_turn=3) == ["question 2"]
+    assert user_inputs(from_turn=5) == []
+
+
+async def test_compact_replay_sends_batches(tmp_path: Path, monkeypatch) -> None:
+    wire_file = tmp_path / "wire.jsonl"
+    await _write_history(wire_file)
+    monkeypatch.setattr(sessions_api, "REPLAY_BATCH_MAX_MESSAGES", 4)
+
+    class _FakeWebSocket:
+        def __init__(self) -> None:
+            self.frames: list[str] = []
+
+        async def send_text(self, data: str) -> None:
+            self.frames.append(data)
+
+    ws = _FakeWebSocket()
+    await sessions_api.replay_history(cast("WebSocket", ws), tmp_path, compact=True)
+
+    batches = [json.loads(frame) for frame in ws.frames]
+    assert [len(batch) for batch in batches] == [4, 4, 4, 4, 2]
+    messages = [json.dumps(m, ensure_ascii=False) for batch in batches for m in batch]
+    assert messages == [
+        json.dumps(json.loads(line), ensure_ascii=False)
+        for line in sessions_api._iter_wire_events(wire_file, compact=True)
+    ]
+
+
+async def test_cancelled_replay_closes_frames_after_the_pending_read(
+    tmp_path: Path, monkeypatch
+) -> None:
+    (tmp_path / "wire.jsonl").write_text("")
+    reading, release = threading.Event(), threading.Event()
+    closed: list[bool] = []
+
+    def frames(*args: object, **kwargs: object):
+        try:
+            reading.set()
+            release.wait(5)
+            while True:
+                yield "frame"
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(sessions_api, "_iter_replay_frames", frames)
+
+    class _FakeWebSocket:
+        async def send_text(self, data: str) -> None:
+            pass
+
+    task = asyncio.create_task(
+        sessions_api.replay_history(cast("WebSocket", _FakeWebSocket()), tmp_path)
+    )
+    await asyncio.to_thread(reading.wait, 5)
+    task.cancel()
+    await asyncio.sleep(0.05)
+    release.set()
+
+    # Closing the generator while the thread still runs it would raise ValueError instead.
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert closed == [True]
@@ -155,6 +155,8 @@ const NEWLINE_REGEX = /\r?\n/;
 const MEDIA_TAG_PATH_REGEX = /<(?:image|video)\s+[^>]*path="([^"]*\/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\/uploads\/([^"]+))"/g;
 const BROWSER_URL_PROTOCOLS = new Set(["http:", "https:", "data:", "blob:"]);
 const WIRE_PROTOCOL_VERSION = "1.10";
+// Close code of a server that dropped messages this client was too slow to receive.
+const RESYNC_CLOSE_CODE = 4012;
 
 type StepRetryPayload = StepRetryEvent["payload"];
 
@@ -2167,9 +2169,10 @@ export function useSessionStream(
 
   // Handle incoming WebSocket message
   const handleMessage = useCallback(
-    (data: string) => {
+    (data: string | WireMessage) => {
       try {
-        const message: WireMessage = JSON.parse(data);
+        const message: WireMessage =
+          typeof data === "string" ? JSON.parse(data) : data;
 
         // Check for JSON-RPC error response
         if (message.error) {
@@ -2355,15 +2358,15 @@ export function useSessionStream(
       if (baseUrl) {
         // Convert HTTP URL to WebSocket URL
         const url = baseUrl.replace(HTTP_TO_WS_REGEX, "ws");
-        const wsUrl = `${url}/api/sessions/${sid}/stream`;
-        return token ? `${wsUrl}?token=${encodeURIComponent(token)}` : wsUrl;
+        const wsUrl = `${url}/api/sessions/${sid}/stream?replay=compact`;
+        return token ? `${wsUrl}&token=${encodeURIComponent(token)}` : wsUrl;
       }
 
       // Use current host
       const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
       const host = window.location.host;
-      const wsUrl = `${protocol}//${host}/api/sessions/${sid}/stream`;
-      return token ? `${wsUrl}?token=${encodeURIComponent(token)}` : wsUrl;
+      const wsUrl = `${protocol}//${host}/api/sessions/${sid}/stream?replay=compact`;
+      return token ? `${wsUrl}&token=${encodeURIComponent(token)}` : wsUrl;
     },
     [baseUrl],
   );
@@ -2651,6 +2654,20 @@ export function useSessionStream(
         }
 
         lastWsMessageTimeRef.current = Date.now();
+        // History is replayed in batches: one frame holding an array of messages
+        if (typeof event.data === "string" && event.data.startsWith("[")) {
+          let batch: WireMessage[];
+          try {
+            batch = JSON.parse(event.data);
+          } catch (err) {
+            console.error("[SessionStream] Failed to parse replay batch:", err);
+            return;
+          }
+          for (const message of batch) {
+            handleMessage(message);
+          }
+          return;
+        }
         handleMessage(event.data);
       };
 
@@ -2697,6 +2714,9 @@ export function useSessionStream(
           const err = new Error("Too many concurrent sessions");
           setError(err);
           onError?.(err);
+        } else if (event.code === RESYNC_CLOSE_CODE) {
+          // The server dropped messages we were too slow to receive; replay history.
+          reconnectRef.current();
         }
 
         // Mark all streaming/subagent messages as complete